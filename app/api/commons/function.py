@@ -4,7 +4,8 @@ from app.models.posts import Posts
 from app.schemas.user_settings import UserSettingsType
 from sqlalchemy.orm import Session
 from uuid import UUID
-from app.crud.user_settings_curd import get_user_settings_by_user_id
+from typing import Dict, Iterable
+from app.crud.user_settings_curd import get_cached_user_settings_by_user_ids
 class CommonFunction:
     @staticmethod
     def get_active_post_cond():
@@ -27,10 +28,27 @@ class CommonFunction:
         """
         ユーザーの通知設定を取得し、通知を送信するかどうかを返す
         """
-        need_to_send_notification = True
-        user_settings = get_user_settings_by_user_id(db, user_id, UserSettingsType.EMAIL)
-        if user_settings:
-            user_setting = user_settings.settings.get(type, True)
-            if not user_setting:
-                need_to_send_notification = False
-        return need_to_send_notification
\ No newline at end of file
+        return CommonFunction.get_users_need_to_send_notification(db, [user_id], [type])[user_id][type]
+
+    @staticmethod
+    def get_users_need_to_send_notification(
+        db: Session, user_ids: Iterable[UUID], types: Iterable[str]
+    ) -> Dict[UUID, Dict[str, bool]]:
+        """
+        複数ユーザー・複数の通知種別について、通知を送信するかどうかをまとめて返す
+
+        ユーザー設定は 1 クエリ（短命キャッシュ付き）で取得する。設定が無い種別は送信する
+
+        Returns:
+            ユーザーID → {通知種別: 送信するか}
+        """
+        user_ids = set(user_ids)
+        types = list(types)
+        settings_by_user = get_cached_user_settings_by_user_ids(db, user_ids, UserSettingsType.EMAIL)
+        return {
+            user_id: {
+                type: bool(settings_by_user.get(user_id, {}).get(type, True))
+                for type in types
+            }
+            for user_id in user_ids
+        }
\ No newline at end of file
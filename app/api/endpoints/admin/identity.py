@@ -17,7 +17,7 @@ from app.models.identity import IdentityVerifications, IdentityDocuments
 from app.models.user import Users
 from app.models.profiles import Profiles
 from app.schemas.user_settings import UserSettingsType
-from app.services.s3.presign import presign_get
+from app.services.s3.presign import presign_get_many
 
 from app.crud.identity_crud import (
     get_identity_verifications_paginated,
@@ -124,16 +124,16 @@ def get_identity_verification(
     # 身分証書類を取得
     documents = db.query(IdentityDocuments).filter(IdentityDocuments.verification_id == verification_id).all()
 
-    # 各書類のpresigned URLを生成
+    # 各書類のpresigned URLをまとめて生成
+    presigned_urls = presign_get_many("identity", [doc.storage_key for doc in documents])
     document_responses = []
     for doc in documents:
-        presigned_data = presign_get("identity", doc.storage_key)
         document_responses.append(IdentityDocumentResponse(
             id=str(doc.id),
             kind=doc.kind,
             storage_key=doc.storage_key,
             created_at=doc.created_at,
-            presigned_url=presigned_data.get("download_url")
+            presigned_url=presigned_urls.get(doc.storage_key)
         ))
 
     # クリエイター情報の有無を判定
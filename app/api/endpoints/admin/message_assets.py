@@ -302,14 +302,14 @@ def approve_message_asset(
                     else:
                         message_preview = "メディアファイルを送信しました"
 
+                # 受信者の通知設定をまとめて取得
+                preferences = CommonFunction.get_users_need_to_send_notification(
+                    db, [recipient.user_id for recipient in recipients], ["userMessages", "message"]
+                )
+
                 # 各受信者に通知とメールを送信
                 for recipient in recipients:
-                    need_to_send_recipient_notification = (
-                        CommonFunction.get_user_need_to_send_notification(
-                            db, recipient.user_id, "userMessages"
-                        )
-                    )
-                    if not need_to_send_recipient_notification:
+                    if not preferences[recipient.user_id]["userMessages"]:
                         continue
 
                     recipient_user = (
@@ -329,12 +329,7 @@ def approve_message_asset(
                     )
 
                     # メール通知を送信
-                    need_to_send_email_notification = (
-                        CommonFunction.get_user_need_to_send_notification(
-                            db, recipient_user.id, "message"
-                        )
-                    )
-                    if need_to_send_email_notification and recipient_user.email:
+                    if preferences[recipient_user.id]["message"] and recipient_user.email:
                         try:
                             conversation_url = f"{os.getenv('FRONTEND_URL', 'https://mijfans.jp/')}/message/conversation/{conversation_id}"
 
@@ -435,15 +430,15 @@ def approve_message_asset(
                         else:
                             message_preview = "メディアファイルを送信しました"
 
+                    # 受信者の通知設定をまとめて取得
+                    preferences = CommonFunction.get_users_need_to_send_notification(
+                        db, recipient_user_ids, ["userMessages", "message"]
+                    )
+
                     # 各受信者に通知とメールを送信
                     for recipient_user_id in recipient_user_ids:
                         try:
-                            need_to_send_recipient_notification = (
-                                CommonFunction.get_user_need_to_send_notification(
-                                    db, recipient_user_id, "userMessages"
-                                )
-                            )
-                            if not need_to_send_recipient_notification:
+                            if not preferences[recipient_user_id]["userMessages"]:
                                 continue
 
                             recipient_user = (
@@ -464,12 +459,7 @@ def approve_message_asset(
                             )
 
                             # メール通知を送信
-                            need_to_send_email_notification = (
-                                CommonFunction.get_user_need_to_send_notification(
-                                    db, recipient_user.id, "message"
-                                )
-                            )
-                            if need_to_send_email_notification and recipient_user.email:
+                            if preferences[recipient_user.id]["message"] and recipient_user.email:
                                 try:
                                     recipient_profile = (
                                         db.query(Profiles)
@@ -23,7 +23,7 @@ from app.api.commons.utils import resolve_media_asset_storage_key
 from app.constants.enums import MediaAssetKind, AuthenticatedFlag, PostType, PostStatus, MediaAssetStatus
 from app.services.s3.presign import get_bucket_name
 from app.core.logger import Logger
-import boto3
+from app.services.s3.client import get_client
 import os
 from app.utils.trigger_batch_notification_newpost_arrival import trigger_batch_notification_newpost_arrival
 logger = Logger.get_logger()
@@ -60,7 +60,7 @@ def check_media_uploading(db: Session, post) -> bool:
             return True
 
         # S3クライアントを初期化
-        s3_client = boto3.client(
+        s3_client = get_client(
             's3',
             region_name=AWS_REGION,
             aws_access_key_id=AWS_ACCESS_KEY_ID,
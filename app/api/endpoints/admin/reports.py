@@ -13,9 +13,10 @@ from app.crud.admin_reports_curd import (
     get_albatal_payment_transactions_period_report,
     get_albatal_consolidated_monthly_income_report,
 )
-from app.db.base import get_db
+from app.db.async_session import get_async_read_db
 from app.deps.auth import get_current_admin_user
 from app.models.admins import Admins
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.core.logger import Logger
 from datetime import datetime, time, timedelta, timezone
@@ -28,12 +29,14 @@ router = APIRouter()
 async def get_gvm_report(
     start_date: str,
     end_date: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_admin: Admins = Depends(get_current_admin_user),
 ):
     logger.info(f"Getting GVM reports for admin: {current_admin.id}")
-    gmv_reports_overalltime = __get_gmv_overalltime_report(db)
-    gmv_reports_period = __get_gmv_period_report(db, start_date, end_date)
+    gmv_reports_overalltime = await db.run_sync(__get_gmv_overalltime_report)
+    gmv_reports_period = await db.run_sync(
+        __get_gmv_period_report, start_date, end_date
+    )
 
     return {
         "gmv_overalltime": gmv_reports_overalltime["gmv_overalltime"]
@@ -137,7 +140,7 @@ def __get_gmv_period_report(db: Session, start_date: str, end_date: str):
 async def get_revenue_report(
     start_date: str,
     end_date: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_admin: Admins = Depends(get_current_admin_user),
 ):
     logger.info(f"Getting revenue reports for admin: {current_admin.id}")
@@ -147,7 +150,9 @@ async def get_revenue_report(
     end_date = datetime.combine(
         datetime.strptime(end_date, "%Y-%m-%d"), time.max, tzinfo=timezone.utc
     ) - timedelta(hours=9)
-    revenue_reports_period = get_revenue_period_report(db, start_date, end_date)
+    revenue_reports_period = await db.run_sync(
+        get_revenue_period_report, start_date, end_date
+    )
     if revenue_reports_period is None:
         raise HTTPException(status_code=500, detail="Error getting revenue reports")
     return revenue_reports_period
@@ -157,7 +162,7 @@ async def get_revenue_report(
 async def get_credix_payment_transactions_report(
     start_date: str,
     end_date: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_admin: Admins = Depends(get_current_admin_user),
 ):
     logger.info(
@@ -170,7 +175,9 @@ async def get_credix_payment_transactions_report(
         datetime.strptime(end_date, "%Y-%m-%d"), time.max, tzinfo=timezone.utc
     ) - timedelta(hours=9)
     credix_payment_transactions_reports_period = (
-        get_credix_payment_transactions_period_report(db, start_date, end_date)
+        await db.run_sync(
+            get_credix_payment_transactions_period_report, start_date, end_date
+        )
     )
     if credix_payment_transactions_reports_period is None:
         raise HTTPException(
@@ -182,7 +189,7 @@ async def get_credix_payment_transactions_report(
 async def get_albatal_payment_transactions_report(
     start_date: str,
     end_date: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_admin: Admins = Depends(get_current_admin_user),
 ):
     logger.info(
@@ -194,7 +201,9 @@ async def get_albatal_payment_transactions_report(
     end_date = datetime.combine(
         datetime.strptime(end_date, "%Y-%m-%d"), time.max, tzinfo=timezone.utc
     ) - timedelta(hours=9)
-    albatal_payment_transactions_reports_period = get_albatal_payment_transactions_period_report(db, start_date, end_date)
+    albatal_payment_transactions_reports_period = await db.run_sync(
+        get_albatal_payment_transactions_period_report, start_date, end_date
+    )
 
     if albatal_payment_transactions_reports_period is None:
         raise HTTPException(
@@ -207,7 +216,7 @@ async def get_albatal_payment_transactions_report(
 async def get_untransferred_withdraws_report(
     start_date: str,
     end_date: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_admin: Admins = Depends(get_current_admin_user),
 ):
     logger.info(
@@ -219,8 +228,8 @@ async def get_untransferred_withdraws_report(
     end_date = datetime.combine(
         datetime.strptime(end_date, "%Y-%m-%d"), time.max, tzinfo=timezone.utc
     ) - timedelta(hours=9)
-    untransferred_withdraws_reports_period = get_untransferred_withdraws_period_report(
-        db, start_date, end_date
+    untransferred_withdraws_reports_period = await db.run_sync(
+        get_untransferred_withdraws_period_report, start_date, end_date
     )
     if untransferred_withdraws_reports_period is None:
         raise HTTPException(
@@ -231,7 +240,7 @@ async def get_untransferred_withdraws_report(
 
 @router.get("/credix-income")
 async def get_credix_income_report(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_admin: Admins = Depends(get_current_admin_user),
 ):
     logger.info(f"Getting credix income reports for admin: {current_admin.id}")
@@ -254,8 +263,10 @@ async def get_credix_income_report(
     ) - timedelta(hours=9)
     end_date_of_previous_month = start_date_of_current_month - timedelta(microseconds=1)
 
-    credix_income_report = get_credix_income_period_report(
-        db, start_date_of_previous_month, end_date_of_previous_month
+    credix_income_report = await db.run_sync(
+        get_credix_income_period_report,
+        start_date_of_previous_month,
+        end_date_of_previous_month,
     )
     if credix_income_report is None:
         raise HTTPException(
@@ -270,7 +281,7 @@ async def get_credix_income_report(
 
 @router.get("/albatal-income")
 async def get_albatal_income_report(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_admin: Admins = Depends(get_current_admin_user),
 ):
     logger.info(f"Getting albatal income reports for admin: {current_admin.id}")
@@ -283,15 +294,15 @@ async def get_albatal_income_report(
         prev_year = now_utc.year
         prev_month = now_utc.month - 1
 
-    albatal_income_report = get_albatal_income_period_report(db, now_utc)
+    albatal_income_report = await db.run_sync(get_albatal_income_period_report, now_utc)
     if albatal_income_report is None:
         raise HTTPException(
             status_code=500, detail="Error getting albatal income report"
         )
 
     # Get consolidated monthly income for the current month
-    albatal_consolidated_report = get_albatal_consolidated_monthly_income_report(
-        db, now_utc.year, now_utc.month
+    albatal_consolidated_report = await db.run_sync(
+        get_albatal_consolidated_monthly_income_report, now_utc.year, now_utc.month
     )
     if albatal_consolidated_report is None:
         raise HTTPException(
@@ -309,7 +320,7 @@ async def get_provider_revenue_report(
     provider_code: str,
     start_date: str,
     end_date: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_admin: Admins = Depends(get_current_admin_user),
 ):
     logger.info(f"Getting provider revenue reports for admin: {current_admin.id}, provider: {provider_code}")
@@ -319,8 +330,8 @@ async def get_provider_revenue_report(
     end_date_dt = datetime.combine(
         datetime.strptime(end_date, "%Y-%m-%d"), time.max, tzinfo=timezone.utc
     ) - timedelta(hours=9)
-    provider_revenue_report = get_payment_provider_revenue_period_report(
-        db, provider_code, start_date_dt, end_date_dt
+    provider_revenue_report = await db.run_sync(
+        get_payment_provider_revenue_period_report, provider_code, start_date_dt, end_date_dt
     )
     if provider_revenue_report is None:
         raise HTTPException(
@@ -332,12 +343,12 @@ async def get_provider_revenue_report(
 @router.get("/provider-revenue-last-month")
 async def get_provider_revenue_last_month_report(
     provider_code: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_admin: Admins = Depends(get_current_admin_user),
 ):
     logger.info(f"Getting provider revenue last month report for admin: {current_admin.id}, provider: {provider_code}")
-    provider_revenue_report = get_payment_provider_revenue_last_month_report(
-        db, provider_code
+    provider_revenue_report = await db.run_sync(
+        get_payment_provider_revenue_last_month_report, provider_code
     )
     if provider_revenue_report is None:
         raise HTTPException(
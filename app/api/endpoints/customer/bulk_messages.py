@@ -18,6 +18,7 @@ from app.schemas.bulk_message import (
     PresignedUrlResponse,
     BulkMessageSendRequest,
     BulkMessageSendResponse,
+    BulkMessageJobStatusResponse,
 )
 from app.services.s3 import presign, keygen
 from app.constants.enums import MessageAssetType
@@ -96,10 +97,48 @@ def send_bulk_message(
         return BulkMessageSendResponse(
             message=result["message"],
             sent_count=result["sent_count"],
+            queued_count=result["queued_count"],
+            total_count=result["total_count"],
             scheduled=result["scheduled"],
-            scheduled_at=result["scheduled_at"]
+            scheduled_at=result["scheduled_at"],
+            group_by=result["group_by"],
+            status=result["status"],
         )
     except Exception as e:
         db.rollback()
         logger.error(f"一斉送信エラー: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/jobs/{group_by}", response_model=BulkMessageJobStatusResponse)
+def get_bulk_message_job_status(
+    group_by: str,
+    current_user: Users = Depends(get_current_user),
+    initial_bulk_message_domain: BulkMessageDomain = Depends(initial_bulk_message_domain),
+):
+    """
+    一斉送信ジョブの進捗取得
+    - 送信者本人のみアクセス可能
+    - 作成済み・失敗・未処理の件数を返す
+    """
+    result = initial_bulk_message_domain.get_bulk_message_job_status(group_by, current_user)
+    if result is None:
+        raise HTTPException(status_code=404, detail="一斉送信ジョブが見つかりません")
+    return BulkMessageJobStatusResponse(**result)
+
+
+@router.post("/jobs/{group_by}/retry", response_model=BulkMessageJobStatusResponse)
+def retry_bulk_message_job(
+    group_by: str,
+    current_user: Users = Depends(get_current_user),
+    initial_bulk_message_domain: BulkMessageDomain = Depends(initial_bulk_message_domain),
+):
+    """
+    一斉送信ジョブの失敗した送信先を再送
+    - 送信者本人のみアクセス可能
+    - リトライ上限に達した送信先を未処理に戻す
+    """
+    result = initial_bulk_message_domain.retry_bulk_message_job(group_by, current_user)
+    if result is None:
+        raise HTTPException(status_code=404, detail="一斉送信ジョブが見つかりません")
+    return BulkMessageJobStatusResponse(**result)
@@ -4,22 +4,16 @@ from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from typing import List
 from uuid import UUID
 import uuid
-from app.services.email.send_email import send_message_notification_email
-from app.models.profiles import Profiles
 from app.schemas.conversation import MessageAssetInfo
 from app.db.base import get_db
 from app.deps.auth import get_current_user
 from app.models.user import Users
 from app.crud import (
     conversations_crud,
-    user_crud,
-    profile_crud,
     payments_crud,
     subscriptions_crud,
     message_assets_crud,
-    notifications_crud,
 )
-from app.models.conversation_participants import ConversationParticipants
 from app.constants.enums import (
     PaymentType,
     MessageAssetStatus,
@@ -36,7 +30,6 @@ from app.schemas.message_asset import (
     PresignedUrlRequest,
     PresignedUrlResponse,
 )
-from app.api.commons.function import CommonFunction
 from app.services.s3 import presign, keygen
 from app.constants.enums import MessageAssetType
 import logging
@@ -205,6 +198,7 @@ def get_user_conversations(
     search: str = Query(None),
     sort: str = Query("last_message_desc"),
     unread_only: bool = Query(False),
+    cursor: str = Query(None),
     current_user: Users = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -217,11 +211,12 @@ def get_user_conversations(
         search: 検索キーワード（相手の名前で検索）
         sort: ソート順（last_message_desc, last_message_asc）
         unread_only: 未読のみフィルター
+        cursor: 前ページの next_cursor（指定時は skip より優先）
 
     Returns:
         会話リスト
     """
-    conversations, total = conversations_crud.get_user_conversations(
+    conversations, total, total_is_capped, next_cursor = conversations_crud.get_user_conversations(
         db=db,
         user_id=current_user.id,
         skip=skip,
@@ -229,13 +224,16 @@ def get_user_conversations(
         search=search,
         sort=sort,
         unread_only=unread_only,
+        cursor=cursor,
     )
 
     return {
         "data": conversations,
         "total": total,
+        "total_is_capped": total_is_capped,
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
     }
 
 
@@ -266,36 +264,27 @@ def get_conversation_messages(
     messages, has_next = conversations_crud.get_messages_by_conversation(
         db, conversation_id, skip, limit
     )
-    # 会話の参加者から相手のユーザー情報を取得
-    partner_user_id = None
+    # 相手のユーザー情報・プロフィール（1 クエリ）
+    partner_user_id, partner_user, partner_profile = (
+        conversations_crud.get_conversation_partner(db, conversation_id, current_user.id)
+    )
     partner_username = None
     partner_profile_name = None
+    partner_profile_username = None
     partner_avatar = None
-
-    # conversation_participantsから相手のuser_idを取得
-    participants = (
-        db.query(ConversationParticipants)
-        .filter(
-            ConversationParticipants.conversation_id == conversation_id,
-            ConversationParticipants.user_id != current_user.id,
-        )
-        .first()
+    if partner_user:
+        partner_username = partner_user.profile_name
+        partner_profile_name = partner_user.profile_name
+        if partner_profile:
+            partner_profile_username = partner_profile.username
+            if partner_profile.avatar_url:
+                partner_avatar = f"{BASE_URL}/{partner_profile.avatar_url}"
+
+    # ページ内メッセージのアセットをまとめて取得（1 クエリ）
+    assets_by_message = message_assets_crud.get_message_assets_by_message_ids(
+        db, [message.id for message, _sender, _profile, _admin in messages]
     )
 
-    if participants:
-        partner_user_id = participants.user_id
-        # 相手のユーザー情報とプロフィールを取得
-        partner_user = user_crud.get_user_by_id(db, partner_user_id)
-        partner_profile_username = None
-        if partner_user:
-            partner_username = partner_user.profile_name
-            partner_profile_name = partner_user.profile_name
-            # プロフィールから相手のusernameとアバターを取得
-            partner_profile = profile_crud.get_profile_by_user_id(db, partner_user_id)
-            if partner_profile:
-                partner_profile_username = partner_profile.username
-                if partner_profile.avatar_url:
-                    partner_avatar = f"{BASE_URL}/{partner_profile.avatar_url}"
     # メッセージレスポンスを構築
     message_responses = []
     for message, sender, profile, admin in messages:
@@ -317,11 +306,9 @@ def get_conversation_messages(
             sender_avatar = None
             sender_profile_name = "運営"
 
-        # メッセージアセット情報を取得
+        # メッセージアセット情報
         asset_response = None
-        message_assets = message_assets_crud.get_message_assets_by_message_id(
-            db, message.id
-        )
+        message_assets = assets_by_message.get(message.id)
         if message_assets:
             # 最初のアセットのみ取得（1メッセージにつき1アセット）
             asset = message_assets[0]
@@ -411,7 +398,7 @@ def get_conversation_messages(
     # ユーザーの役割情報を取得
     current_user_is_creator = current_user.role == AccountType.CREATOR
     partner_user_is_creator = False
-    if partner_user_id and partner_user:
+    if partner_user:
         partner_user_is_creator = partner_user.role == AccountType.CREATOR
 
     # クリエイター ⇔ クリエイター 用フラグ
@@ -481,6 +468,8 @@ def send_conversation_message(
         )
 
     # メッセージを作成
+    # テキストのみの場合は受信者への通知（アプリ内通知・メール・Web Push）を通知アウトボックスに積み、
+    # 送信処理はディスパッチャーで非同期に行う（アセット付きは審査承認時に通知する）
     group_by = str(uuid.uuid4())
     message = conversations_crud.create_message(
         db=db,
@@ -488,6 +477,7 @@ def send_conversation_message(
         sender_user_id=current_user.id,
         body_text=message_data.body_text,
         group_by=group_by,
+        notify_recipients=not message_data.asset_storage_key,
     )
 
     # アセットがある場合はmessage_assetレコードを作成
@@ -512,107 +502,6 @@ def send_conversation_message(
             storage_key=message_asset.storage_key,
         )
 
-    else:
-        # 通知処理（ベストエフォート - エラーでもメッセージ送信は成功とする）
-        try:
-            # 受信者を取得（送信者以外の参加者）
-            recipients = (
-                db.query(ConversationParticipants)
-                .filter(
-                    ConversationParticipants.conversation_id == conversation_id,
-                    ConversationParticipants.user_id != current_user.id,
-                )
-                .all()
-            )
-
-            # 送信者のプロフィール情報を取得
-            sender_profile = (
-                db.query(Profiles).filter(Profiles.user_id == current_user.id).first()
-            )
-            sender_avatar_url = (
-                f"{os.getenv('CDN_BASE_URL')}/{sender_profile.avatar_url}"
-                if sender_profile and sender_profile.avatar_url
-                else None
-            )
-
-            # メッセージプレビューを生成
-            if message_data.body_text:
-                message_preview = (
-                    message_data.body_text[:50]
-                    if len(message_data.body_text) > 50
-                    else message_data.body_text
-                )
-
-            # 各受信者に通知とメールを送信
-            for recipient in recipients:
-                need_to_send_notification = (
-                    CommonFunction.get_user_need_to_send_notification(
-                        db, recipient.user_id, "userMessages"
-                    )
-                )
-                if not need_to_send_notification:
-                    continue
-
-                recipient_user = (
-                    db.query(Users).filter(Users.id == recipient.user_id).first()
-                )
-                if not recipient_user:
-                    continue
-                notifications_crud.add_notification_for_new_message(
-                    db=db,
-                    recipient_user_id=recipient_user.id,
-                    sender_profile_name=current_user.profile_name or "Unknown User",
-                    sender_avatar_url=sender_avatar_url,
-                    message_preview=message_preview,
-                    conversation_id=conversation_id,
-                )
-
-                # メール通知を送信（通知可否情報を取得してから送信）
-                need_to_send_email_notification = (
-                    CommonFunction.get_user_need_to_send_notification(
-                        db, recipient_user.id, "message"
-                    )
-                )
-                if need_to_send_email_notification and recipient_user.email:
-                    logger.info(
-                        f"Attempting to send email notification to {recipient_user.email} for message {message.id}"
-                    )
-                    conversation_url = f"{os.getenv('FRONTEND_URL', 'https://mijfans.jp/')}/message/conversation/{conversation_id}"
-
-                    recipient_profile = (
-                        db.query(Profiles)
-                        .filter(Profiles.user_id == recipient_user.id)
-                        .first()
-                    )
-                    recipient_name = (
-                        recipient_profile.username
-                        if recipient_profile and recipient_profile.username
-                        else recipient_user.profile_name
-                    )
-
-                    send_message_notification_email(
-                        to=recipient_user.email,
-                        sender_name=current_user.profile_name or "Unknown User",
-                        recipient_name=recipient_name or "User",
-                        message_preview=message_preview,
-                        conversation_url=conversation_url,
-                    )
-                    logger.info(
-                        f"Email notification call completed for {recipient_user.email}"
-                    )
-                else:
-                    if not need_to_send_email_notification:
-                        logger.info(
-                            f"Email notification disabled for user {recipient_user.id}, skipping email notification"
-                        )
-                    else:
-                        logger.info(
-                            f"Recipient user {recipient_user.id} has no email address, skipping email notification"
-                        )
-        except Exception as e:
-            # 通知エラーはログに記録するが、メッセージ送信は成功とする
-            logger.error(f"Failed to send notification for message {message.id}: {e}")
-
     return MessageResponse(
         id=message.id,
         conversation_id=message.conversation_id,
@@ -21,6 +21,7 @@ from app.services.s3.keygen import post_media_image_key, post_media_video_key
 from app.schemas.commons import PresignResponseItem
 from typing import Dict, List, Union, Set, Any, Literal
 from app.services.s3.client import (
+    get_client,
     delete_ffmpeg_directory,
     delete_hls_directory_full,
     ECS_SUBNETS,
@@ -45,7 +46,6 @@ from app.core.logger import Logger
 from app.services.s3.ecs_task import run_ecs_task
 import subprocess
 import os
-import boto3
 # from app.core.config import settings
 
 logger = Logger.get_logger()
@@ -1222,7 +1222,7 @@ async def check_video_conversion_status(
             }
 
         # S3クライアントを初期化
-        s3_client = boto3.client(
+        s3_client = get_client(
             's3',
             region_name=AWS_REGION,
             aws_access_key_id=AWS_ACCESS_KEY_ID,
@@ -589,12 +589,15 @@ def _update_reservation_schedule(
         return
 
     try:
-        _update_ecs_task_schedule(
-            schedule_name=reservation_message.event_bridge_name,
-            scheduled_at=scheduled_at,
-            group_by=group_by,
-            sender_user_id=sender_user_id
-        )
+        # スケジュールはジョブ完了後に登録されるため、未登録の間はDBの日時のみ更新し、
+        # register_bulk_message_schedules_once に新しい日時で登録させる
+        if reservation_message.event_bridge_name is not None:
+            _update_ecs_task_schedule(
+                schedule_name=reservation_message.event_bridge_name,
+                scheduled_at=scheduled_at,
+                group_by=group_by,
+                sender_user_id=sender_user_id
+            )
 
         reservation_message.scheduled_at = scheduled_at
 
@@ -1,3 +1,4 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
@@ -19,6 +20,7 @@ async def get_notifications(
     type: NotificationType = Query(..., description='通知種別: 1: admin -> users 2: users -> users 3: payments 4: all'),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description='前ページの next_cursor（指定時は page より優先）'),
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
 ):
@@ -29,11 +31,12 @@ async def get_notifications(
         type: 通知種別: 1: admin -> users 2: users -> users 3: payments 4: all
         page: ページ番号
         limit: 1ページあたりの件数
+        cursor: 次ページ取得用カーソル
 
     Returns:
         NotificationUserResponse: 通知リスト
     """
-    notifications, total, has_next = get_notifications_paginated(db, current_user, type, page, limit)
+    notifications, total, total_is_capped, has_next, next_cursor = get_notifications_paginated(db, current_user, type, page, limit, cursor)
 
     return PaginatedNotificationUserResponse(
         notifications=[NotificationCreateResponse(
@@ -46,9 +49,11 @@ async def get_notifications(
           updated_at=notification.updated_at
         ) for notification in notifications],
         total=total,
+        total_is_capped=total_is_capped,
         page=page,
         total_pages=total // limit,
-        has_next=has_next
+        has_next=has_next,
+        next_cursor=next_cursor
     )
 
 @router.patch("/read")
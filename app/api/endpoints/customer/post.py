@@ -1,5 +1,6 @@
 import math
 from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.crud.time_sale_crud import (
     check_exists_price_time_sale_in_period_by_post_id,
@@ -9,6 +10,7 @@ from app.crud.time_sale_crud import (
     get_active_price_timesale,
 )
 from app.crud.payments_crud import get_payment_status_by_price_id
+from app.db.async_session import get_async_db
 from app.db.base import get_db
 from app.deps.auth import get_current_user, get_current_user_optional
 from app.constants.enums import PostStatus
@@ -320,11 +322,13 @@ async def get_new_arrivals(
 
 
 @router.get("/{post_id}/ogp-image", response_model=PostOGPResponse)
-async def get_post_ogp_image(post_id: str, db: Session = Depends(get_db)):
+async def get_post_ogp_image(
+    post_id: str, db: AsyncSession = Depends(get_async_db)
+):
     """投稿のOGP情報を取得する（Lambda@Edge用）"""
     try:
         # OGP情報を取得（投稿詳細 + クリエイター情報 + OGP画像）
-        ogp_data = get_post_ogp_data(db, post_id)
+        ogp_data = await db.run_sync(get_post_ogp_data, post_id)
 
         if not ogp_data:
             raise HTTPException(status_code=404, detail="投稿が見つかりません")
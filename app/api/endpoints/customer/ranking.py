@@ -1,16 +1,19 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.api.commons.utils import get_video_duration
-from app.constants.enums import PostType
+from app.constants.enums import PostType, RankingPeriod
 from app.crud.time_sale_crud import get_post_sale_flag_map
-from app.db.base import get_db
+from app.db.async_session import get_async_read_db
+from app.db.pagination import encode_cursor
 from app.crud.creator_crud import (
     get_ranking_creators_overall,
     get_ranking_creators_categories_overall,
     get_ranking_creators_categories_detail,
 )
 from app.crud.post_crud import (
-    get_post_ranking_overall,
+    get_post_ranking_overall_with_fallback,
     get_ranking_posts_categories_overall,
     get_ranking_posts_detail_overall,
     get_ranking_posts_detail_categories,
@@ -46,13 +49,13 @@ router = APIRouter()
 @router.get("/posts")
 async def get_ranking_posts(
     type: str = Query(..., description="Type, allowed values: overall, categories"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     try:
         if type == "overall":
-            return _get_ranking_posts_overall(db)
+            return await db.run_sync(_get_ranking_posts_overall)
         if type == "categories":
-            return _get_ranking_posts_categories(db)
+            return await db.run_sync(_get_ranking_posts_categories)
 
     except Exception as e:
         logger.error("エラーが発生しました", e)
@@ -68,68 +71,13 @@ def _get_ranking_posts_overall(db: Session) -> RankingOverallResponse:
     Returns:
         RankingResponse: Ranking posts
     """
-    ranking_posts_all_time = get_post_ranking_overall(db, limit=6, period="all_time")
-    # ranking_posts_monthly = get_ranking_posts_overall_monthly(db, limit=6)
-    ranking_posts_monthly = get_post_ranking_overall(db, limit=6, period="monthly")
-    # ranking_posts_weekly = get_ranking_posts_overall_weekly(db, limit=6)
-    ranking_posts_weekly = get_post_ranking_overall(db, limit=6, period="weekly")
-    # ranking_posts_daily = get_ranking_posts_overall_daily(db, limit=6)
-    ranking_posts_daily = get_post_ranking_overall(db, limit=6, period="daily")
-
-    tracking_daily = [str(post.Posts.id) for post in ranking_posts_daily]
-    if len(ranking_posts_daily) < 6:
-        for post in ranking_posts_weekly:
-            if str(post.Posts.id) in tracking_daily:
-                continue
-            if len(ranking_posts_daily) < 6:
-                ranking_posts_daily.append(post)
-                tracking_daily.append(str(post.Posts.id))
-            else:
-                break
-        for post in ranking_posts_monthly:
-            if str(post.Posts.id) in tracking_daily:
-                continue
-            if len(ranking_posts_daily) < 6:
-                ranking_posts_daily.append(post)
-                tracking_daily.append(str(post.Posts.id))
-            else:
-                break
-        for post in ranking_posts_all_time:
-            if str(post.Posts.id) in tracking_daily:
-                continue
-            if len(ranking_posts_daily) < 6:
-                ranking_posts_daily.append(post)
-                tracking_daily.append(str(post.Posts.id))
-            else:
-                break
-    tracking_weekly = [str(post.Posts.id) for post in ranking_posts_weekly]
-    if len(ranking_posts_weekly) < 6:
-        for post in ranking_posts_monthly:
-            if str(post.Posts.id) in tracking_weekly:
-                continue
-            if len(ranking_posts_weekly) < 6:
-                ranking_posts_weekly.append(post)
-                tracking_weekly.append(str(post.Posts.id))
-            else:
-                break
-        for post in ranking_posts_all_time:
-            if str(post.Posts.id) in tracking_weekly:
-                continue
-            if len(ranking_posts_weekly) < 6:
-                ranking_posts_weekly.append(post)
-                tracking_weekly.append(str(post.Posts.id))
-            else:
-                break
-    tracking_monthly = [str(post.Posts.id) for post in ranking_posts_monthly]
-    if len(ranking_posts_monthly) < 6:
-        for post in ranking_posts_all_time:
-            if str(post.Posts.id) in tracking_monthly:
-                continue
-            if len(ranking_posts_monthly) < 6:
-                ranking_posts_monthly.append(post)
-                tracking_monthly.append(str(post.Posts.id))
-            else:
-                break
+    ranking_posts, filled_ranking_posts = get_post_ranking_overall_with_fallback(
+        db, limit=6
+    )
+    ranking_posts_all_time = ranking_posts[RankingPeriod.ALL_TIME]
+    ranking_posts_monthly = filled_ranking_posts[RankingPeriod.MONTHLY]
+    ranking_posts_weekly = filled_ranking_posts[RankingPeriod.WEEKLY]
+    ranking_posts_daily = filled_ranking_posts[RankingPeriod.DAILY]
 
     return RankingOverallResponse(
         all_time=[
@@ -598,7 +546,8 @@ async def get_ranking_posts_detail(
     ),
     page: int = 1,
     per_page: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="next_cursor of previous page (overall only)"),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """
     Get ranking posts detail
@@ -608,6 +557,7 @@ async def get_ranking_posts_detail(
         page: Page number
         per_page: Number of items per page
         term: Term is term example is 'all_time', 'monthly', 'weekly', 'daily'
+        cursor: Cursor for next page (overall only, takes precedence over page)
     Returns:
         RankingOverallResponse: Ranking posts
     """
@@ -621,18 +571,22 @@ async def get_ranking_posts_detail(
         )
     try:
         if category == "overall":
-            return _get_ranking_posts_overall_detail(db, page, per_page, term)
+            return await db.run_sync(
+                _get_ranking_posts_overall_detail, page, per_page, term, cursor
+            )
         else:
-            return _get_ranking_posts_categories_detail(
-                db, category, page, per_page, term
+            return await db.run_sync(
+                _get_ranking_posts_categories_detail, category, page, per_page, term
             )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("エラーが発生しました", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 def _get_ranking_posts_overall_detail(
-    db: Session, page: int, per_page: int, term: str
+    db: Session, page: int, per_page: int, term: str, cursor: Optional[str] = None
 ) -> RankingOverallResponse | HTTPException:
     """
     Get overall ranking posts detail
@@ -642,23 +596,20 @@ def _get_ranking_posts_overall_detail(
         page: Page number
         per_page: Number of items per page
         terms: Terms is terms example is 'all_time', 'monthly', 'weekly', 'daily'
+        cursor: Cursor for next page (rank keyset)
     Returns:
         RankingOverallResponse: Ranking posts
     """
-    if term == "all_time":
-        result = get_ranking_posts_detail_overall(db, page, per_page, period="all_time")
-    elif term == "monthly":
-        result = get_ranking_posts_detail_overall(db, page, per_page, period="monthly")
-    elif term == "weekly":
-        result = get_ranking_posts_detail_overall(db, page, per_page, period="weekly")
-    elif term == "daily":
-        result = get_ranking_posts_detail_overall(db, page, per_page, period="daily")
-    else:
+    if term not in ("all_time", "monthly", "weekly", "daily"):
         raise HTTPException(status_code=400, detail="Invalid terms")
+    result = get_ranking_posts_detail_overall(
+        db, page, per_page, period=term, cursor=cursor
+    )
 
     next_page, previous_page, has_next, has_previous = __process_pagination(
         result, page, per_page
     )
+    next_cursor = encode_cursor([result[-1].rank]) if has_next else None
 
     return RankingPostsDetailResponse(
         posts=[
@@ -676,18 +627,19 @@ def _get_ranking_posts_overall_detail(
                 creator_avatar_url=f"{BASE_URL}/{post.avatar_url}"
                 if post.avatar_url
                 else None,
-                rank=idx + ((page - 1) * per_page) + 1,
+                rank=post.rank,
                 duration=get_video_duration(post.duration_sec)
                 if post.Posts.post_type == PostType.VIDEO and post.duration_sec
                 else ("画像" if post.Posts.post_type == PostType.IMAGE else ""),
                 is_time_sale=post.Posts.is_time_sale,
             )
-            for idx, post in enumerate(result)
+            for post in result
         ],
         next_page=next_page,
         previous_page=previous_page,
         has_next=has_next,
         has_previous=has_previous,
+        next_cursor=next_cursor,
     )
 
 
@@ -801,12 +753,12 @@ def __process_pagination(result: list, page: int, per_page: int) -> dict:
 async def get_ranking_creators(
     type: str = Query(..., description="Type, allowed values: overall, categories"),
     current_user: Users = Depends(get_current_user_optional),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     if type == "overall":
-        return _get_ranking_creators_overall(db, current_user)
+        return await db.run_sync(_get_ranking_creators_overall, current_user)
     elif type == "categories":
-        return _get_ranking_creators_categories(db, current_user)
+        return await db.run_sync(_get_ranking_creators_categories, current_user)
     else:
         raise HTTPException(status_code=400, detail="Invalid type")
 
@@ -1024,7 +976,7 @@ async def get_ranking_creators_detail(
     ),
     page: int = 1,
     per_page: int = 100,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Users = Depends(get_current_user_optional),
 ):
     if page < 1:
@@ -1036,12 +988,17 @@ async def get_ranking_creators_detail(
             status_code=400, detail="1ページあたりの件数は1〜100である必要があります"
         )
     if category == "overall":
-        return _get_ranking_creators_detail_overall(
-            db, term, page, per_page, current_user
+        return await db.run_sync(
+            _get_ranking_creators_detail_overall, term, page, per_page, current_user
         )
     else:
-        return _get_ranking_creators_detail_categories(
-            db, category, term, page, per_page, current_user
+        return await db.run_sync(
+            _get_ranking_creators_detail_categories,
+            category,
+            term,
+            page,
+            per_page,
+            current_user,
         )
 
 
@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from typing import Optional, List
 from uuid import UUID
 
-from app.db.base import get_db
+from app.db.base import get_db, get_read_db
 from app.deps.auth import get_current_user, get_current_user_optional
 from app.models.user import Users
 from app.crud import search_crud, search_history_crud
@@ -33,7 +33,7 @@ router = APIRouter()
 
 @router.get("/search/view/categories", response_model=SearchCategoriesResponse)
 def get_search_categories(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     検索カテゴリー取得
@@ -67,11 +67,15 @@ def search(
     ),
     page: int = Query(1, ge=1, description="ページ番号"),
     per_page: int = Query(20, ge=1, le=100, description="1ページあたりの件数"),
+    cursor: Optional[str] = Query(
+        None, description="前ページの next_cursor（type が all 以外のとき有効。page より優先）"
+    ),
     db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db),
     current_user: Users = Depends(get_current_user_optional),
 ):
     """
-    統合検索API
+    統合検索API（検索はリードレプリカ、検索履歴の保存はプライマリ）
     """
     try:
         offset = (page - 1) * per_page
@@ -89,13 +93,14 @@ def search(
             # creators タブの場合は最新投稿も取得
             include_recent_posts = type == "creators"
 
-            creators_results, creators_total = search_crud.search_creators(
-                db,
+            creators_results, creators_total, creators_total_is_capped, creators_next_cursor = search_crud.search_creators(
+                read_db,
                 query=query,
                 sort=sort,
                 limit=5 if type == "all" else per_page,
                 offset=0 if type == "all" else offset,
                 include_recent_posts=include_recent_posts,
+                cursor=None if type == "all" else cursor,
             )
 
             creators_items = []
@@ -134,8 +139,10 @@ def search(
 
             response_data["creators"] = SearchSectionResponse(
                 total=creators_total,
+                total_is_capped=creators_total_is_capped,
                 items=creators_items,
-                has_more=creators_total > len(creators_items),
+                has_more=creators_next_cursor is not None,
+                next_cursor=creators_next_cursor,
             )
             total_results += creators_total
 
@@ -143,8 +150,8 @@ def search(
         if type in ["all", "posts", "paid_posts"]:
             paid_only = type == "paid_posts"
 
-            posts_results, posts_total = search_crud.search_posts(
-                db,
+            posts_results, posts_total, posts_total_is_capped, posts_next_cursor = search_crud.search_posts(
+                read_db,
                 query=query,
                 sort=sort,
                 category_ids=[str(cid) for cid in category_ids]
@@ -154,6 +161,7 @@ def search(
                 paid_only=paid_only,
                 limit=10 if type == "all" else per_page,
                 offset=0 if type == "all" else offset,
+                cursor=None if type == "all" else cursor,
             )
 
             posts_items = [
@@ -181,15 +189,17 @@ def search(
 
             response_data["posts"] = SearchSectionResponse(
                 total=posts_total,
+                total_is_capped=posts_total_is_capped,
                 items=posts_items,
-                has_more=posts_total > len(posts_items),
+                has_more=posts_next_cursor is not None,
+                next_cursor=posts_next_cursor,
             )
             total_results += posts_total
 
         # ハッシュタグ検索
         if type in ["all", "hashtags"]:
             hashtags_results, hashtags_total = search_crud.search_hashtags(
-                db,
+                read_db,
                 query=query,
                 limit=5 if type == "all" else per_page,
                 offset=0 if type == "all" else offset,
@@ -233,6 +243,8 @@ def search(
                 pass
 
         return SearchResponse(**response_data)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 import os
 from app.db.base import get_db
+from app.db.pagination import NEXT_CURSOR_HEADER
 from app.deps.auth import get_current_user, get_current_user_optional
 from app.models.user import Users
 from app.crud import followes_crud, likes_crud, comments_crud, bookmarks_crud
@@ -44,40 +45,48 @@ def get_follow_status(
 @router.get("/followers/{user_id}", response_model=List[UserBasicResponse])
 def get_followers(
     user_id: UUID,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
 ):
-    """フォロワー一覧を取得"""
-    followers = followes_crud.get_followers(db, user_id, skip, limit)
+    """フォロワー一覧を取得（次ページのカーソルは X-Next-Cursor ヘッダーで返す）"""
+    followers, next_cursor = followes_crud.get_followers(db, user_id, skip, limit, cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return [
         UserBasicResponse(
-            id=follower_id,
-            username=username,
-            profile_name=profile_name,
-            avatar_storage_key=f"{BASE_URL}/{avatar_url}" if avatar_url else None,
+            id=row.id,
+            username=row.username,
+            profile_name=row.profile_name,
+            avatar_storage_key=f"{BASE_URL}/{row.avatar_url}" if row.avatar_url else None,
         )
-        for follower_id, profile_name, username, avatar_url in followers
+        for row in followers
     ]
 
 
 @router.get("/following/{user_id}", response_model=List[UserBasicResponse])
 def get_following(
     user_id: UUID,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
 ):
-    """フォロー中ユーザー一覧を取得"""
-    following = followes_crud.get_following(db, user_id, skip, limit)
+    """フォロー中ユーザー一覧を取得（次ページのカーソルは X-Next-Cursor ヘッダーで返す）"""
+    following, next_cursor = followes_crud.get_following(db, user_id, skip, limit, cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return [
         UserBasicResponse(
-            id=following_id,
-            username=username,
-            profile_name=profile_name,
-            avatar_storage_key=f"{BASE_URL}/{avatar_url}" if avatar_url else None,
+            id=row.id,
+            username=row.username,
+            profile_name=row.profile_name,
+            avatar_storage_key=f"{BASE_URL}/{row.avatar_url}" if row.avatar_url else None,
         )
-        for following_id, profile_name, username, avatar_url in following
+        for row in following
     ]
 
 
@@ -111,12 +120,15 @@ def get_likes_status_bulk(
     db: Session = Depends(get_db),
 ):
     """複数投稿のいいね状態を一括取得"""
-    result = {}
-    for post_id in post_ids:
-        is_liked = likes_crud.is_liked(db, post_id, current_user)
-        likes_count = likes_crud.get_likes_count(db, post_id)
-        result[str(post_id)] = {"liked": is_liked, "likes_count": likes_count}
-    return result
+    liked_post_ids = likes_crud.get_liked_post_ids(db, current_user.id, post_ids)
+    likes_count_map = likes_crud.get_likes_count_map(db, post_ids)
+    return {
+        str(post_id): {
+            "liked": post_id in liked_post_ids,
+            "likes_count": likes_count_map.get(post_id, 0),
+        }
+        for post_id in post_ids
+    }
 
 
 @router.get("/liked-posts", response_model=List[dict])
@@ -304,13 +316,19 @@ def get_bookmarks_status_bulk(
 
 @router.get("/bookmarks", response_model=List[dict])
 def get_bookmarks(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     current_user: Users = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """ブックマークした投稿一覧を取得"""
-    posts = bookmarks_crud.get_bookmarks_by_user_id(db, current_user.id, skip, limit)
+    """ブックマークした投稿一覧を取得（次ページのカーソルは X-Next-Cursor ヘッダーで返す）"""
+    posts, next_cursor = bookmarks_crud.get_bookmarks_by_user_id(
+        db, current_user.id, skip, limit, cursor
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return [
         {
             "id": post.id,
@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import app.api.endpoints.customer.message_assets as message_assets
+
+
+def _db_with(reservation_message):
+    db = MagicMock(name="SessionMock")
+    db.query.return_value.filter.return_value.first.return_value = reservation_message
+    return db
+
+
+def test_update_reservation_schedule_skips_scheduler_before_registration(monkeypatch):
+    update_schedule = MagicMock()
+    monkeypatch.setattr(message_assets, "_update_ecs_task_schedule", update_schedule)
+    reservation_message = MagicMock(event_bridge_name=None)
+    db = _db_with(reservation_message)
+    scheduled_at = datetime(2026, 11, 1, 12, 0, tzinfo=timezone.utc)
+
+    message_assets._update_reservation_schedule(db, "g1", scheduled_at, uuid4())
+
+    update_schedule.assert_not_called()
+    assert reservation_message.scheduled_at == scheduled_at
+    db.query.return_value.filter.return_value.update.assert_called_once_with({"scheduled_at": scheduled_at})
+    db.commit.assert_called_once()
+    db.rollback.assert_not_called()
+
+
+def test_update_reservation_schedule_updates_registered_schedule(monkeypatch):
+    update_schedule = MagicMock()
+    monkeypatch.setattr(message_assets, "_update_ecs_task_schedule", update_schedule)
+    reservation_message = MagicMock(event_bridge_name="send-resv-msg-g1-1")
+    db = _db_with(reservation_message)
+    scheduled_at = datetime(2026, 11, 1, 12, 0, tzinfo=timezone.utc)
+    sender_user_id = uuid4()
+
+    message_assets._update_reservation_schedule(db, "g1", scheduled_at, sender_user_id)
+
+    update_schedule.assert_called_once_with(
+        schedule_name="send-resv-msg-g1-1",
+        scheduled_at=scheduled_at,
+        group_by="g1",
+        sender_user_id=sender_user_id,
+    )
+    assert reservation_message.scheduled_at == scheduled_at
+    db.commit.assert_called_once()
@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import MagicMock
+
+import app.api.endpoints.customer.video_temp as video_temp
+import app.services.s3.presign as presign
+
+
+@pytest.fixture
+def s3_mock(monkeypatch):
+    client = MagicMock(name="S3ClientMock")
+    client.generate_presigned_url.return_value = "https://temp-bucket/temp-videos/u1/a.mp4?sig"
+    monkeypatch.setattr(presign, "s3_client", lambda is_use_accelerate_endpoint=False: client)
+    monkeypatch.setattr(presign, "TEMP_VIDEO_BUCKET_NAME", "temp-bucket")
+    presign._presign_cache.clear()
+    yield client
+    presign._presign_cache.clear()
+
+
+def test_create_sample_from_s3_reads_presigned_url(s3_mock, monkeypatch):
+    can_stream_copy = MagicMock(return_value=True)
+    cut_video = MagicMock()
+    monkeypatch.setattr(video_temp, "_can_stream_copy", can_stream_copy)
+    monkeypatch.setattr(video_temp, "_cut_video", cut_video)
+
+    sample_video_id = video_temp._create_sample_from_s3("temp-videos/u1/a.mp4", 10.0, 40.0)
+
+    params = s3_mock.generate_presigned_url.call_args.kwargs["Params"]
+    assert params == {"Bucket": "temp-bucket", "Key": "temp-videos/u1/a.mp4"}
+    can_stream_copy.assert_called_once_with("https://temp-bucket/temp-videos/u1/a.mp4?sig", 10.0)
+    kwargs = cut_video.call_args.kwargs
+    assert kwargs["input_path"] == "https://temp-bucket/temp-videos/u1/a.mp4?sig"
+    assert kwargs["output_path"].endswith(f"{sample_video_id}.mp4")
+    assert (kwargs["start_time"], kwargs["end_time"], kwargs["stream_copy"]) == (10.0, 40.0, True)
+
+
+def test_can_stream_copy_requires_keyframe_near_start(monkeypatch):
+    probe = (
+        '{"streams": [{"codec_type": "video", "codec_name": "h264"},'
+        ' {"codec_type": "audio", "codec_name": "aac"}],'
+        ' "frames": [{"media_type": "video", "pts_time": "%s"}]}'
+    )
+    run = MagicMock()
+    monkeypatch.setattr(video_temp.subprocess, "run", run)
+
+    # 開始位置ちょうど・直前のキーフレームならコピーできる
+    for pts in ("10.0", "9.96"):
+        run.return_value = MagicMock(returncode=0, stdout=probe % pts, stderr="")
+        assert video_temp._can_stream_copy("https://example/a.mp4", 10.0) is True
+
+    # 開始位置の直後のキーフレームは不可（ffmpeg は 1 つ前のキーフレームから切り出す）
+    for pts in ("10.04", "8.0"):
+        run.return_value = MagicMock(returncode=0, stdout=probe % pts, stderr="")
+        assert video_temp._can_stream_copy("https://example/a.mp4", 10.0) is False
+
+
+def test_can_stream_copy_rejects_other_codecs(monkeypatch):
+    probe = (
+        '{"streams": [{"codec_type": "video", "codec_name": "hevc"}],'
+        ' "frames": [{"media_type": "video", "pts_time": "10.0"}]}'
+    )
+    monkeypatch.setattr(
+        video_temp.subprocess, "run", MagicMock(return_value=MagicMock(returncode=0, stdout=probe, stderr=""))
+    )
+    assert video_temp._can_stream_copy("https://example/a.mp4", 10.0) is False
@@ -1,16 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.db.base import get_db
+from app.db.base import get_read_db
 from app.schemas.top import (
     CategoryResponse, RankingPostResponse, CreatorResponse, PostCreatorResponse, 
     RecentPostResponse, TopPageResponse
 )
 from app.crud.categories_crud import get_top_categories
 from app.crud.creator_crud import get_ranking_creators_overall
-from app.crud.post_crud import get_post_ranking_overall, get_recent_posts
+from app.crud.post_crud import get_post_ranking_overall_with_fallback, get_recent_posts
 from os import getenv
 from app.api.commons.utils import get_video_duration
-from app.constants.enums import PostType
+from app.constants.enums import PostType, RankingPeriod
 from app.core.logger import Logger
 from app.models.user import Users
 from app.deps.auth import get_current_user_optional
@@ -21,7 +21,7 @@ BASE_URL = getenv("CDN_BASE_URL")
 
 @router.get("/", response_model=TopPageResponse)
 def get_top_page_data(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: Users | None = Depends(get_current_user_optional)
 ) -> TopPageResponse:
     """
@@ -45,46 +45,9 @@ def get_top_page_data(
         if not top_creators:
             top_creators = get_ranking_creators_overall(db, limit=5, current_user=current_user, period="all_time")
         # new_creators = get_new_creators(db, limit=5)
-        daily_ranking_posts = get_post_ranking_overall(db, limit=6, period="daily")
-        weekly_ranking_posts = get_post_ranking_overall(db, limit=6, period="weekly")
-        monthly_ranking_posts = get_post_ranking_overall(db, limit=6, period="monthly")
-        all_time_ranking_posts = get_post_ranking_overall(db, limit=6, period="all_time")
-        
-        ranking_posts = []
-        tracking_posts = []
-        for post in daily_ranking_posts:
-            if len(ranking_posts) < 6:
-                posts_id = str(post.Posts.id)
-                if posts_id in tracking_posts:
-                    continue
-                ranking_posts.append(post)
-            else:
-                break
-        for post in weekly_ranking_posts:
-            if len(ranking_posts) < 6:
-                posts_id = str(post.Posts.id)
-                if posts_id in tracking_posts:
-                    continue
-                ranking_posts.append(post)
-            else:
-                break
-        for post in monthly_ranking_posts:
-            if len(ranking_posts) < 6:
-                posts_id = str(post.Posts.id)
-                if posts_id in tracking_posts:
-                    continue
-                ranking_posts.append(post)
-            else:
-                break
-        for post in all_time_ranking_posts:
-            if len(ranking_posts) < 6:
-                posts_id = str(post.Posts.id)
-                if posts_id in tracking_posts:
-                    continue
-                ranking_posts.append(post)
-            else:
-                break
-        
+        _, filled_ranking_posts = get_post_ranking_overall_with_fallback(db, limit=6)
+        ranking_posts = filled_ranking_posts[RankingPeriod.DAILY]
+
         return TopPageResponse(
             categories=[CategoryResponse(
                 id=str(c.id), 
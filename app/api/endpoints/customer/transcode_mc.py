@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 import json
 import os
+import uuid
 from fastapi import APIRouter, HTTPException, Depends, Path
 from sqlalchemy.orm import Session
 from app.db.base import get_db
@@ -11,21 +12,12 @@ from app.crud.media_assets_crud import (
     update_media_asset,
     get_media_assets_by_ids,
 )
-from app.services.s3.keygen import transcode_mc_hls_prefix, transcode_mc_ffmpeg_key
-from app.services.s3.image_screening import (
-    _s3_download_bytes,
-    _s3_put_bytes,
-    _is_supported_magic,
-    _sanitize_and_variants,
-    _moderation_check,
-    _make_variant_keys,
-)
+from app.services.s3.keygen import transcode_mc_hls_prefix
 from app.services.s3.client import (
     s3_client_for_mc,
     ENV,
-    MEDIA_BUCKET_NAME,
-    INGEST_BUCKET,
 )
+from app.services.image_pipeline.pipeline import ImageAsset, start_image_post_job
 from app.constants.enums import (
     MediaRenditionJobKind,
     MediaRenditionJobBackend,
@@ -33,29 +25,23 @@ from app.constants.enums import (
     PostStatus,
     PostType,
     MediaAssetStatus,
-    AuthenticatedFlag,
 )
 from app.crud.media_rendition_jobs_crud import (
     create_media_rendition_job,
+    create_image_variant_jobs,
+    get_media_rendition_jobs_by_job_id,
     update_media_rendition_job,
 )
 from app.crud.media_assets_crud import (
     update_sub_media_assets_status,
     update_media_asset_rejected_comments,
 )
-from app.crud.post_crud import (
-    add_mail_notification_for_post,
-    add_notification_for_post,
-    update_post_status,
-)
-from app.schemas.transcode_mc import TranscodeMCUpdateRequest
+from app.crud.post_crud import update_post_status
+from app.schemas.transcode_mc import TranscodeMCJobError, TranscodeMCJobStatusResponse, TranscodeMCUpdateRequest
 from app.constants.enums import MediaAssetKind
 import boto3
-from typing import Any, Optional
+from typing import Any, List, Optional
 from app.core.logger import Logger
-from app.utils.trigger_batch_notification_newpost_arrival import (
-    trigger_batch_notification_newpost_arrival,
-)
 
 logger = Logger.get_logger()
 S3 = boto3.client("s3", region_name="ap-northeast-1")
@@ -158,65 +144,41 @@ def _create_media_convert_job(
     return True
 
 
-def _process_image_asset(db: Session, asset_row: Any, post_id: str) -> Optional[Any]:
+def _start_image_pipeline(
+    db: Session, post_id: str, assets: List[Any], notify_new_post: bool
+) -> str:
     """
-    画像アセットを処理する共通処理
+    画像投稿の変換ジョブを登録し、バックグラウンドで変換を開始する
 
     Args:
         db: データベースセッション
-        asset_row: メディアアセット行
         post_id: 投稿ID
+        assets: 画像のメディアアセット行
+        notify_new_post: 完了時に新着投稿通知を送るか
 
     Returns:
-        作成されたメディアレンディション（最後のもの）
+        進捗取得用のジョブID
     """
-    # 1) 取り込み元の取得
-    src_key = asset_row.storage_key
-    img_bytes = _s3_download_bytes(INGEST_BUCKET, src_key)
-
-    # 2) マジックナンバー/整合性チェック
-    if not _is_supported_magic(img_bytes):
-        raise HTTPException(400, "Unsupported image format")
-
-    # 3) 任意: モデレーション
-    mod = _moderation_check(img_bytes, min_conf=80.0)
-    if mod["flagged"]:
-        # ここでDBをREJECTにする等の処理を行っても良い
-        raise HTTPException(
-            status_code=400, detail=f"Image rejected by moderation: {mod['labels']}"
-        )
-
-    # 4) 正規化＋派生生成
-    variants = _sanitize_and_variants(img_bytes)
+    job_id = str(uuid.uuid4())
+    rendition_job_ids = create_image_variant_jobs(db, job_id, assets)
+    db.commit()
 
-    # 出力先key
-    base_output_key = transcode_mc_ffmpeg_key(
-        creator_id=asset_row.creator_user_id,
-        post_id=asset_row.post_id,
-        ext="jpg",
+    start_image_post_job(
+        job_id,
+        post_id,
+        [
+            ImageAsset(
+                id=row.id,
+                post_id=row.post_id,
+                creator_user_id=row.creator_user_id,
+                storage_key=row.storage_key,
+            )
+            for row in assets
+        ],
+        rendition_job_ids,
+        notify_new_post=notify_new_post,
     )
-
-    # ベースキーから派生ファイルの最終保存キーを決定
-    variant_keys = _make_variant_keys(base_output_key)
-
-    # 5) DB: media_asset 更新
-    stem, _ext = base_output_key.rsplit(".", 1)
-
-    # 6) アップロード（SSE-KMS, CacheControl 付き）
-    for filename, (bytes_data, ctype) in variants.items():
-        dst_key = variant_keys[filename]
-        _s3_put_bytes(MEDIA_BUCKET_NAME, dst_key, bytes_data, ctype)
-
-        # 元画像の場合は、storage_keyを更新
-        if filename == "original.jpg":
-            media_asset_update_data = {
-                "storage_key": stem,
-                "bytes": len(bytes_data),
-                "status": MediaAssetStatus.APPROVED,
-            }
-            update_media_asset(db, asset_row.id, media_asset_update_data)
-
-    return True
+    return job_id
 
 
 @router.post("/transcode_mc/{post_id}/{post_type}")
@@ -257,52 +219,31 @@ def transcode_mc_unified(
         if not assets:
             raise HTTPException(status_code=404, detail="Media asset not found")
 
-        image_processing_result = False
-        for row in assets:
-            # HLS ABR4処理（ビデオの場合のみ）
-            if type == "video":
-                output_prefix = transcode_mc_hls_prefix(
-                    creator_id=row.creator_user_id,
-                    post_id=row.post_id,
-                    asset_id=row.id,
-                )
-
-                _create_media_convert_job(
-                    db=db,
-                    asset_row=row,
-                    post_id=post_id,
-                    job_kind=MediaRenditionJobKind.HLS_ABR4,
-                    output_prefix=output_prefix,
-                    usermeta_type="final-hls",
-                    build_settings_func=build_hls_abr2_settings,
-                )
-
-            # FFmpeg処理（画像の場合のみ）
-            if type == "image":
-                image_processing_result = _process_image_asset(db, row, post_id)
-                if not image_processing_result:
-                    raise HTTPException(
-                        status_code=500, detail="Image processing failed"
-                    )
+        # 画像は変換ジョブを登録してバックグラウンドで変換する（承認・通知は全画像の完了後）
+        if type == "image":
+            job_id = _start_image_pipeline(db, post_id, assets, notify_new_post=True)
+            return {
+                "status": True,
+                "message": "Media conversion started for image",
+                "job_id": job_id,
+            }
 
-        # 画像処理の場合のみ、最後のループ処理でステータス更新と通知を送信
-        if type == "image" and image_processing_result:
-            # 投稿ステータスの更新
-            post = update_post_status(
-                db, post_id, PostStatus.APPROVED, AuthenticatedFlag.AUTHENTICATED
+        for row in assets:
+            # HLS ABR4処理
+            output_prefix = transcode_mc_hls_prefix(
+                creator_id=row.creator_user_id,
+                post_id=row.post_id,
+                asset_id=row.id,
             )
 
-            db.commit()
-            db.refresh(post)
-
-            # Email通知を追加（メール通知設定をチェック）
-            add_mail_notification_for_post(db, post_id=post_id, type="approved")
-            # 投稿に対する通知を追加
-            add_notification_for_post(db, post, post.creator_user_id, type="approved")
-
-            # 新着投稿通知をトリガー
-            trigger_batch_notification_newpost_arrival(
-                post_id=post_id, creator_user_id=str(post.creator_user_id)
+            _create_media_convert_job(
+                db=db,
+                asset_row=row,
+                post_id=post_id,
+                job_kind=MediaRenditionJobKind.HLS_ABR4,
+                output_prefix=output_prefix,
+                usermeta_type="final-hls",
+                build_settings_func=build_hls_abr2_settings,
             )
 
         return {"status": True, "message": f"Media conversion completed for {type}"}
@@ -384,45 +325,29 @@ def transcode_mc_update(
                         f"{kind_label}のステータスをRESUBMITに更新: asset_id={asset.id}"
                     )
 
+        if type == "image":
+            job_id = _start_image_pipeline(db, post_id, assets, notify_new_post=False)
+            return {
+                "status": True,
+                "message": "Media conversion started for image",
+                "job_id": job_id,
+            }
+
         for asset in assets:
-            if type == "video":
-                output_prefix = transcode_mc_hls_prefix(
-                    creator_id=asset.creator_user_id,
-                    post_id=asset.post_id,
-                    asset_id=asset.id,
-                )
-                _create_media_convert_job(
-                    db,
-                    asset,
-                    post_id,
-                    MediaRenditionJobKind.HLS_ABR4,
-                    output_prefix,
-                    "final-hls",
-                    build_hls_abr2_settings,
-                )
-            if type == "image":
-                result = _process_image_asset(db, asset, post_id)
-                if not result:
-                    raise HTTPException(
-                        status_code=500, detail="Image processing failed"
-                    )
-                else:
-                    # 投稿ステータスの更新
-                    post = update_post_status(
-                        db,
-                        post_id,
-                        PostStatus.APPROVED,
-                        AuthenticatedFlag.AUTHENTICATED,
-                    )
-                    db.commit()
-                    db.refresh(post)
-
-                    # Email通知を追加
-                    add_mail_notification_for_post(db, post_id=post_id, type="approved")
-                    # 投稿に対する通知を追加
-                    add_notification_for_post(
-                        db, post, asset.creator_user_id, type="approved"
-                    )
+            output_prefix = transcode_mc_hls_prefix(
+                creator_id=asset.creator_user_id,
+                post_id=asset.post_id,
+                asset_id=asset.id,
+            )
+            _create_media_convert_job(
+                db,
+                asset,
+                post_id,
+                MediaRenditionJobKind.HLS_ABR4,
+                output_prefix,
+                "final-hls",
+                build_hls_abr2_settings,
+            )
 
         return {"status": True, "message": f"Media conversion completed for {type}"}
 
@@ -438,6 +363,49 @@ def transcode_mc_update(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/transcode_mc/jobs/{job_id}", response_model=TranscodeMCJobStatusResponse)
+def get_transcode_mc_job_status(
+    job_id: str = Path(..., description="Job ID"),
+    db: Session = Depends(get_db),
+):
+    """
+    画像投稿の変換ジョブの進捗を取得
+
+    Args:
+        job_id: str
+        db: Session
+
+    Returns:
+        TranscodeMCJobStatusResponse: 画像ごとの処理状況の集計と失敗理由
+    """
+    jobs = get_media_rendition_jobs_by_job_id(db, job_id)
+    if not jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    statuses = [job.status for job in jobs]
+    completed = statuses.count(MediaRenditionJobStatus.COMPLETE)
+    failed = statuses.count(MediaRenditionJobStatus.FAILED)
+    if completed + failed == len(jobs):
+        status = "failed" if failed else "completed"
+    elif statuses.count(MediaRenditionJobStatus.PENDING) == len(jobs):
+        status = "queued"
+    else:
+        status = "processing"
+
+    return TranscodeMCJobStatusResponse(
+        job_id=job_id,
+        status=status,
+        total=len(jobs),
+        completed=completed,
+        failed=failed,
+        errors=[
+            TranscodeMCJobError(asset_id=job.asset_id, error_message=job.error_message)
+            for job in jobs
+            if job.status == MediaRenditionJobStatus.FAILED
+        ],
+    )
+
+
 def update_sub_media_asset(db: Session, post_id: str) -> Optional[Any]:
     """
     サブメディアアセットを更新する
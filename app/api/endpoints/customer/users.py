@@ -45,7 +45,6 @@ from app.models.subscriptions import Subscriptions
 from app.models.payments import Payments
 from app.constants.enums import ItemType, SubscriptionStatus, PaymentStatus, PaymentType
 from app.models.plans import Plans
-from sqlalchemy import cast, String
 from app.api.commons.utils import generate_email_verification_url
 from app.crud.email_verification_crud import issue_verification_token
 from app.services.email.send_email import send_email_verification
@@ -360,7 +359,7 @@ def get_user_profile_by_username_endpoint(
         if current_user:
             has_dm_release_plan = (
                 db.query(Subscriptions)
-                .join(Plans, Subscriptions.order_id == cast(Plans.id, String))
+                .join(Plans, Subscriptions.plan_id == Plans.id)
                 .filter(
                     Subscriptions.user_id == current_user.id,
                     Subscriptions.order_type == ItemType.PLAN,
@@ -1,10 +1,13 @@
 """
 一時動画アップロード・サンプル動画切り取りAPI
 """
+import asyncio
+import json
 import os
 import uuid
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Form, Request
 from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
@@ -22,11 +25,11 @@ from app.schemas.video_temp import (
     BulkPartPresignResponse,
     PartPresignUrl,
 )
-import tempfile
 import shutil
+from app.core.config import settings
 from app.core.logger import Logger
 from app.services.s3.keygen import temp_video_key
-from app.services.s3.presign import init_multipart_temp_video, presign_multipart_part_temp_video, complete_multipart_temp_video, presign_get_temp_video
+from app.services.s3.presign import init_multipart_temp_video, presign_multipart_part_temp_video, complete_multipart_temp_video, presign_get_temp_video, presign_get
 logger = Logger.get_logger()
 router = APIRouter()
 
@@ -34,6 +37,20 @@ router = APIRouter()
 TEMP_VIDEO_DIR = os.getenv("TEMP_VIDEO_DIR", "/tmp/mij_temp_videos")
 os.makedirs(TEMP_VIDEO_DIR, exist_ok=True)
 
+# サンプル動画の切り取り（ffmpeg プロセスの完了待ち）専用のプール。
+# ffmpeg の同時実行数を SAMPLE_VIDEO_CONCURRENCY に抑え、イベントループと共有スレッドプールを塞がない
+_sample_video_executor = ThreadPoolExecutor(
+    max_workers=max(settings.SAMPLE_VIDEO_CONCURRENCY, 1),
+    thread_name_prefix="sample-video",
+)
+
+# ffmpeg が本編動画を読みに行く署名付きURLの有効期限（ffmpeg の実行時間上限より長くする）
+_SAMPLE_SOURCE_URL_EXPIRES_SEC = settings.SAMPLE_VIDEO_TIMEOUT_SEC + 300
+
+# 再エンコードせずにそのまま切り出せる（ブラウザで再生できる MP4 になる）コーデック
+_STREAM_COPY_VIDEO_CODECS = {"h264"}
+_STREAM_COPY_AUDIO_CODECS = {"aac"}
+
 
 @router.post("/video-temp/temp-upload/main-video", response_model=TempVideoMultipartInitResponse)
 async def upload_temp_main_video(
@@ -224,7 +241,6 @@ async def complete_temp_main_video_upload(
 async def create_sample_video(
     request: CreateSampleRequest,
     user: Users = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
 ):
     """
     S3の一時保存バケットにある本編動画から指定範囲を切り取ってサンプル動画を生成
@@ -247,38 +263,19 @@ async def create_sample_video(
         if request.start_time < 0 or request.end_time <= request.start_time:
             raise HTTPException(status_code=400, detail="無効な時間範囲です")
 
-        # S3から一時ファイルをダウンロード
-        from app.services.s3.client import s3_client, TEMP_VIDEO_BUCKET_NAME
-        import tempfile
-
-        s3 = s3_client()
-
-        # 一時ディレクトリに動画をダウンロード
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as temp_input:
-            s3.download_file(TEMP_VIDEO_BUCKET_NAME, s3_key, temp_input.name)
-            temp_input_path = temp_input.name
-
-        # サンプル動画の一時ファイルパスを生成
-        sample_video_id = str(uuid.uuid4())
-        temp_output_path = os.path.join(TEMP_VIDEO_DIR, f"{sample_video_id}.mp4")
-
-        try:
-            # ffmpegで切り取り
-            _cut_video(
-                input_path=temp_input_path,
-                output_path=temp_output_path,
-                start_time=request.start_time,
-                end_time=request.end_time
-            )
+        # ffmpeg はブロッキング処理のため専用プールで実行する
+        sample_video_id = await asyncio.get_running_loop().run_in_executor(
+            _sample_video_executor,
+            _create_sample_from_s3,
+            s3_key,
+            request.start_time,
+            request.end_time,
+        )
 
-            return SampleVideoResponse(
-                sample_video_url=f"/temp-videos/{sample_video_id}.mp4",
-                duration=duration
-            )
-        finally:
-            # 入力ファイルを削除
-            if os.path.exists(temp_input_path):
-                os.remove(temp_input_path)
+        return SampleVideoResponse(
+            sample_video_url=f"/temp-videos/{sample_video_id}.mp4",
+            duration=duration
+        )
 
     except HTTPException:
         raise
@@ -287,6 +284,88 @@ async def create_sample_video(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _create_sample_from_s3(s3_key: str, start_time: float, end_time: float) -> str:
+    """
+    S3の一時動画から指定範囲を切り取ったサンプル動画IDを返す（同期処理）
+
+    本編動画はダウンロードせず、ffmpeg に署名付きURLを渡して入力側シーク（-ss を -i の前に指定）で
+    読ませる（MP4 のインデックスから位置を求め、切り取り範囲付近だけを Range リクエストで取得する）。
+    開始位置がキーフレームでコーデックがそのまま使える場合は再エンコードせずにコピーする
+    """
+    source_url = presign_get(
+        "temp-video", s3_key, expires_in=_SAMPLE_SOURCE_URL_EXPIRES_SEC
+    )["download_url"]
+
+    # サンプル動画の一時ファイルパスを生成
+    sample_video_id = str(uuid.uuid4())
+    temp_output_path = os.path.join(TEMP_VIDEO_DIR, f"{sample_video_id}.mp4")
+
+    stream_copy = _can_stream_copy(source_url, start_time)
+
+    # ffmpegで切り取り
+    _cut_video(
+        input_path=source_url,
+        output_path=temp_output_path,
+        start_time=start_time,
+        end_time=end_time,
+        stream_copy=stream_copy,
+    )
+    return sample_video_id
+
+
+def _can_stream_copy(source: str, start_time: float) -> bool:
+    """
+    再エンコードせずに切り出せるか判定する
+
+    - 映像が H.264・音声が AAC（または音声なし）であること
+    - 開始位置ちょうど、または開始位置の SAMPLE_VIDEO_KEYFRAME_TOLERANCE_SEC 前までに映像のキーフレームがあること
+      （コピーの場合、ffmpeg は開始位置以前で直近のキーフレームから切り出すため。開始位置の直後にしか
+      キーフレームがないと、1 つ前のキーフレーム（最大 1 GOP 前）から始まり、指定範囲外の映像が入る）
+
+    ffprobe は開始位置付近だけを読み、キーフレームのみデコードする
+    """
+    tolerance = settings.SAMPLE_VIDEO_KEYFRAME_TOLERANCE_SEC
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-read_intervals", f"{max(start_time - tolerance, 0)}%+{tolerance * 2}",
+        "-skip_frame", "nokey",
+        "-show_entries", "stream=codec_type,codec_name:frame=media_type,pts_time",
+        "-of", "json",
+        source,
+    ]
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=settings.SAMPLE_VIDEO_TIMEOUT_SEC,
+        )
+        if result.returncode != 0:
+            logger.error(f"ffprobeエラー (return code: {result.returncode}): {result.stderr[-500:]}")
+            return False
+        probe = json.loads(result.stdout or "{}")
+    except Exception as e:
+        logger.error(f"キーフレーム確認エラー: {e}")
+        return False
+
+    streams = probe.get("streams", [])
+    video_codecs = {st.get("codec_name") for st in streams if st.get("codec_type") == "video"}
+    audio_codecs = {st.get("codec_name") for st in streams if st.get("codec_type") == "audio"}
+    if not video_codecs or not video_codecs <= _STREAM_COPY_VIDEO_CODECS:
+        return False
+    if not audio_codecs <= _STREAM_COPY_AUDIO_CODECS:
+        return False
+
+    return any(
+        frame.get("media_type") == "video"
+        and frame.get("pts_time") is not None
+        and start_time - tolerance <= float(frame["pts_time"]) <= start_time
+        for frame in probe.get("frames", [])
+    )
+
+
 def _find_temp_video_file(temp_video_id: str) -> Optional[str]:
     """
     一時動画ファイルを拡張子なしのIDから探索
@@ -331,15 +410,25 @@ def _get_video_duration(video_path: str) -> Optional[float]:
         return None
 
 
-def _cut_video(input_path: str, output_path: str, start_time: float, end_time: float):
+def _cut_video(
+    input_path: str,
+    output_path: str,
+    start_time: float,
+    end_time: float,
+    stream_copy: bool = False,
+):
     """
     ffmpegを使用して動画を切り取る
+
+    input_path はローカルファイルまたは署名付きURL。
+    入力側シーク（-ss を -i の前に指定）のため、開始位置の直前のキーフレームからだけデコードする
     """
     try:
         duration = end_time - start_time
+        is_remote = input_path.startswith(("http://", "https://"))
 
         # 入力ファイルの存在確認
-        if not os.path.exists(input_path):
+        if not is_remote and not os.path.exists(input_path):
             raise Exception(f"入力ファイルが見つかりません: {input_path}")
 
         # 出力ディレクトリの存在確認と作成
@@ -347,25 +436,46 @@ def _cut_video(input_path: str, output_path: str, start_time: float, end_time: f
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir, exist_ok=True)
 
-        logger.info(f"動画切り取り開始: {input_path} -> {output_path}")
-        logger.info(f"開始時間: {start_time}秒, 終了時間: {end_time}秒, 長さ: {duration}秒")
+        # 署名付きURLはログに出さない
+        input_label = input_path.split("?", 1)[0] if is_remote else input_path
+        logger.info(f"動画切り取り開始: {input_label} -> {output_path}")
+        logger.info(
+            f"開始時間: {start_time}秒, 終了時間: {end_time}秒, 長さ: {duration}秒, "
+            f"{'ストリームコピー' if stream_copy else '再エンコード'}"
+        )
+
+        if stream_copy:
+            codec_args = [
+                "-c", "copy",
+                "-avoid_negative_ts", "make_zero",
+            ]
+        else:
+            codec_args = [
+                "-c:v", "libx264",       # H.264エンコード
+                "-c:a", "aac",           # AACオーディオ
+                "-preset", "fast",       # 高速エンコード
+                "-crf", "23",            # 品質設定
+            ]
 
         cmd = [
             "ffmpeg",
-            "-i", input_path,
             "-ss", str(start_time),
             "-t", str(duration),
-            "-c:v", "libx264",       # H.264エンコード
-            "-c:a", "aac",           # AACオーディオ
-            "-preset", "fast",       # 高速エンコード
-            "-crf", "23",            # 品質設定
+            "-i", input_path,
+            *codec_args,
             "-y",                    # 上書き許可
             output_path
         ]
 
-        logger.info(f"ffmpegコマンド: {' '.join(cmd)}")
+        logger.info(f"ffmpegコマンド: {' '.join(cmd).replace(input_path, input_label)}")
 
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=settings.SAMPLE_VIDEO_TIMEOUT_SEC,
+        )
 
         # 標準出力と標準エラーを出力（デバッグ用）
         if result.stdout:
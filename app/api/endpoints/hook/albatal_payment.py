@@ -3,6 +3,7 @@ Albatal決済Webhookエンドポイント
 """
 
 from fastapi import APIRouter, Depends, Form, Response
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Optional, Tuple
 from uuid import UUID
@@ -276,7 +277,9 @@ async def receive_albatal_payment_webhook(
                 notification_type,
                 signature,
             )
-            _handle_wpf_payment(
+            # メール・プッシュ通知・外部API呼び出しを含むためスレッドプールで実行する
+            await run_in_threadpool(
+                _handle_wpf_payment,
                 db,
                 wpf_transaction_id,
                 wpf_status,
@@ -301,7 +304,8 @@ async def receive_albatal_payment_webhook(
                 amount,
             )
 
-            _handle_recurring_payment(
+            await run_in_threadpool(
+                _handle_recurring_payment,
                 db,
                 merchant_transaction_id,
                 status,
@@ -344,7 +348,8 @@ async def receive_albatal_chip_payment_webhook(
             notification_type,
             signature,
         )
-        _handle_wpf_chip_payment(
+        await run_in_threadpool(
+            _handle_wpf_chip_payment,
             db,
             wpf_transaction_id,
             wpf_status,
@@ -732,6 +737,7 @@ def _handle_wpf_chip_payment_success(
     chip_message.status = ConversationMessageStatus.ACTIVE
     chip_message.created_at = now
     chip_message.updated_at = now
+    conversations_crud.apply_message_visible(db, chip_message)
     db.commit()
 
     # 会話の最終メッセージ時刻を更新
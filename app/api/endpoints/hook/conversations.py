@@ -1,6 +1,6 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Cookie
 from sqlalchemy.orm import Session
-from typing import Dict, Set, Optional
+from typing import Optional
 from uuid import UUID
 import json
 import os
@@ -15,53 +15,14 @@ from app.crud.admin_crud import get_admin_by_id
 from app.crud import conversations_crud
 from app.core.logger import Logger
 from app.crud import notifications_crud
+from app.crud.notifications_curd import get_unread_count as get_notification_unread_count
+from app.services.realtime import user_events
+from app.services.realtime.connection_manager import manager
 logger = Logger.get_logger()
 BASE_URL = os.getenv("CDN_BASE_URL")
 
 router = APIRouter()
 
-# アクティブなWebSocket接続を管理
-# Key: conversation_id, Value: Set of WebSocket connections
-active_connections: Dict[str, Set[WebSocket]] = {}
-
-
-class ConnectionManager:
-    """WebSocket接続を管理するクラス"""
-
-    def __init__(self):
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
-
-    async def connect(self, websocket: WebSocket, conversation_id: str):
-        """WebSocket接続を追加"""
-        await websocket.accept()
-        if conversation_id not in self.active_connections:
-            self.active_connections[conversation_id] = set()
-        self.active_connections[conversation_id].add(websocket)
-
-    def disconnect(self, websocket: WebSocket, conversation_id: str):
-        """WebSocket接続を削除"""
-        if conversation_id in self.active_connections:
-            self.active_connections[conversation_id].discard(websocket)
-            if not self.active_connections[conversation_id]:
-                del self.active_connections[conversation_id]
-
-    async def broadcast_to_conversation(self, conversation_id: str, message: dict):
-        """特定の会話に接続している全員にメッセージを配信"""
-        if conversation_id in self.active_connections:
-            disconnected = set()
-            for connection in self.active_connections[conversation_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception:
-                    disconnected.add(connection)
-
-            # 切断されたコネクションを削除
-            for conn in disconnected:
-                self.active_connections[conversation_id].discard(conn)
-
-
-manager = ConnectionManager()
-
 
 async def get_user_from_cookie(websocket: WebSocket, db: Session) -> Optional[Users]:
     """CookieからユーザーIDを取得"""
@@ -449,3 +410,61 @@ async def websocket_conversation_endpoint(
 
         traceback.print_exc()
         manager.disconnect(websocket, conversation_id)
+
+
+@router.websocket("/me")
+async def websocket_user_channel_endpoint(
+    websocket: WebSocket, db: Session = Depends(get_db)
+):
+    """
+    ユーザー単位のWebSocketエンドポイント（未読バッジ等のポーリングの代わり）
+    - Cookieからトークンを取得
+    - 接続時に未読数のスナップショットを送信
+    - 以降は new_message / unread / read_receipt / notification イベントを push
+    """
+    user = await get_user_from_cookie(websocket, db)
+    if not user:
+        logger.error("❌ Authentication failed, closing connection")
+        await websocket.accept()
+        await websocket.close(code=4001, reason="Invalid token")
+        return
+
+    topic = user_events.user_topic(user.id)
+    await manager.connect(websocket, topic)
+    manager.subscribe(websocket, user_events.BROADCAST_NOTIFICATIONS_TOPIC)
+
+    try:
+        admin_count, users_count, payments_count = get_notification_unread_count(db, user)
+        await websocket.send_json(
+            {
+                "type": "connected",
+                "user_id": str(user.id),
+                "unread_conversations": conversations_crud.get_unread_conversation_count(
+                    db, user.id
+                ),
+                "delusion_unread": conversations_crud.get_delusion_unread(db, user.id),
+                "new_conversations_unread": conversations_crud.get_new_conversations_unread(
+                    db, user.id
+                ),
+                "notifications_unread": {
+                    "admin": admin_count,
+                    "users": users_count,
+                    "payments": payments_count,
+                },
+            }
+        )
+        # 接続中は DB を使わないため、セッションを返却しておく
+        db.close()
+
+        while True:
+            data = await websocket.receive_json()
+            if data.get("type") == "ping":
+                await websocket.send_json({"type": "pong"})
+
+    except WebSocketDisconnect:
+        logger.info(f"🔌 User {user.id} disconnected from user channel")
+    except Exception as e:
+        logger.error(f"❌ WebSocket error: {e}")
+    finally:
+        manager.disconnect(websocket, topic)
+        manager.disconnect(websocket, user_events.BROADCAST_NOTIFICATIONS_TOPIC)
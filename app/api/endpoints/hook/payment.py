@@ -1196,6 +1196,7 @@ def _handle_chip_payment_success(
                 chip_message.status = ConversationMessageStatus.ACTIVE
                 chip_message.created_at = payment_completion_time
                 chip_message.updated_at = payment_completion_time
+                conversations_crud.apply_message_visible(db, chip_message)
                 db.commit()
 
                 # Update conversation's last_message_at to payment completion time
@@ -131,11 +131,13 @@ class RenditionJobStatus:
 class MediaRenditionJobKind:
     PREVIEW_MP4 = 1 # プレビュービデオ
     HLS_ABR4 = 2 # HLS_ABR4
+    IMAGE_VARIANTS = 3 # 画像投稿の派生画像生成
 
 # メディアレンディションのバックエンド
 class MediaRenditionJobBackend:
     MEDIACONVERT = 1 # MediaConvert
     FARGATE_FFMPEG = 2 # Fargate FFmpeg
+    IMAGE_PIPELINE = 3 # API 内の画像変換パイプライン
 
 # メディアレンディションのステータス
 class MediaRenditionJobStatus:
@@ -320,4 +322,37 @@ class MessageAssetStatus:
 
 class MessageAssetType:
     IMAGE = 1 # 画像
-    VIDEO = 2 # 動画
\ No newline at end of file
+    VIDEO = 2 # 動画
+
+class RankingPeriod:
+    DAILY = "daily" # 日間
+    WEEKLY = "weekly" # 週間
+    MONTHLY = "monthly" # 月間
+    ALL_TIME = "all_time" # 全期間
+
+    ALL = (DAILY, WEEKLY, MONTHLY, ALL_TIME)
+
+# 通知アウトボックスのイベント種別
+class NotificationOutboxEventType:
+    NEW_MESSAGE = 1 # DMの新着メッセージ
+
+# 通知アウトボックスのステータス
+class NotificationOutboxStatus:
+    PENDING = 1 # 未処理
+    PROCESSING = 2 # 処理中
+    DONE = 3 # 完了
+    FAILED = 9 # エラー（リトライ上限）
+
+# 一斉送信ジョブ（reservation_message）のステータス
+class ReservationMessageStatus:
+    QUEUED = 1 # 受付済み
+    RUNNING = 2 # 処理中
+    COMPLETED = 3 # 完了
+    COMPLETED_WITH_ERRORS = 4 # 完了（一部送信失敗あり）
+
+# 一斉送信ジョブの送信先ごとのステータス
+class ReservationMessageRecipientStatus:
+    PENDING = 1 # 未処理
+    PROCESSING = 2 # 処理中
+    SENT = 3 # 作成済み（予約送信の場合は予約メッセージ作成済み）
+    FAILED = 9 # エラー（リトライ上限）
@@ -2,6 +2,7 @@
 import os
 from pydantic import EmailStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy.engine import make_url
 
 class Settings(BaseSettings):
 
@@ -14,6 +15,8 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     POSTGRES_SERVER: str
     POSTGRES_PORT: int
+    DATABASE_READ_URL: str | None = None  # リードレプリカ（postgresql+psycopg2://...）。未設定ならプライマリを使う
+    DB_READ_YOUR_WRITES_SEC: int = 5  # 更新系リクエスト後、この秒数は同じクライアントの読み取りをプライマリへ送る
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
 
@@ -50,6 +53,78 @@ class Settings(BaseSettings):
     CREDIX_ORDER_ENDPOINT: str = "/cgi-bin/credit/order.cgi"
     CREDIX_REPEATER_ENDPOINT: str = "/cgi-bin/credit/repeater.cgi"
 
+    # ランキングスナップショット設定
+    POST_RANKING_SNAPSHOT_ENABLED: bool = True
+    POST_RANKING_REFRESH_INTERVAL_SEC: int = 300  # 0 以下でバックグラウンド更新を無効化
+    POST_RANKING_SNAPSHOT_MAX_AGE_SEC: int = 1800  # これより古いスナップショットは使わずライブ集計する
+
+    # DBコネクションプール設定（同期/非同期エンジンそれぞれ・プロセスごと）
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SEC: int = 30
+    DB_POOL_RECYCLE_SEC: int = 1800
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # 0 以下で無効
+    DB_SLOW_QUERY_MS: int = 500  # これ以上かかった SQL をスロークエリとしてログ・計測する（0 で無効）
+
+    # 署名付きURLキャッシュ設定
+    PRESIGN_CACHE_MAX_ENTRIES: int = 20000  # プロセス内LRUの上限（0 でキャッシュしない）
+    PRESIGN_CACHE_SAFETY_MARGIN_SEC: int = 600  # 失効のこの秒数前からは再署名する
+    PRESIGN_CACHE_REDIS_URL: str | None = None  # 設定すると redis でプロセス間共有する（redis パッケージが必要）
+
+    # WebSocket 配信設定
+    BROADCAST_BACKEND: str = "memory"  # "memory"（単一ワーカー） | "redis" | "postgres"（LISTEN/NOTIFY）
+    BROADCAST_REDIS_URL: str | None = None  # BROADCAST_BACKEND=redis の接続先（redis パッケージが必要）
+    BROADCAST_PAYLOAD_RETENTION_SEC: int = 300  # BROADCAST_BACKEND=postgres で NOTIFY に載らないメッセージをテーブルに残す秒数
+
+    # 通知アウトボックス設定（DM新着通知・メール・Web Push の非同期送信）
+    NOTIFICATION_OUTBOX_ENABLED: bool = True  # False の場合このプロセスではディスパッチャーを起動しない
+    NOTIFICATION_OUTBOX_WORKERS: int = 2  # プロセスごとのディスパッチループ数
+    NOTIFICATION_OUTBOX_BATCH_SIZE: int = 50
+    NOTIFICATION_OUTBOX_POLL_INTERVAL_SEC: float = 5  # 起床通知が無い場合のポーリング間隔
+    NOTIFICATION_OUTBOX_MAX_ATTEMPTS: int = 5
+    NOTIFICATION_OUTBOX_RETRY_BASE_SEC: int = 30  # リトライ間隔（指数バックオフの初回）
+    NOTIFICATION_OUTBOX_STALE_SEC: int = 300  # 処理中のままこの秒数を過ぎた行は再取得する
+    NOTIFICATION_OUTBOX_EMAIL_CONCURRENCY: int = 8
+
+    # 一斉送信ジョブ設定（送信先をチャンクごとにバックグラウンドで処理）
+    BULK_MESSAGE_JOB_ENABLED: bool = True  # False の場合このプロセスではディスパッチャーを起動しない
+    BULK_MESSAGE_JOB_WORKERS: int = 2  # プロセスごとのディスパッチループ数
+    BULK_MESSAGE_JOB_CHUNK_SIZE: int = 500  # 1 トランザクションで処理する送信先の数
+    BULK_MESSAGE_JOB_POLL_INTERVAL_SEC: float = 5  # 起床通知が無い場合のポーリング間隔
+    BULK_MESSAGE_JOB_MAX_ATTEMPTS: int = 3
+    BULK_MESSAGE_JOB_RETRY_BASE_SEC: int = 30  # リトライ間隔（指数バックオフの初回）
+    BULK_MESSAGE_JOB_STALE_SEC: int = 300  # 処理中のままこの秒数を過ぎた送信先は再取得する
+    BULK_MESSAGE_SCHEDULE_MIN_LEAD_SEC: int = 60  # 予約日時を過ぎてから作成し終えた場合、この秒数後に予約送信バッチを実行する
+    BULK_MESSAGE_SCHEDULE_RETRY_SEC: int = 300  # 予約送信のスケジュール登録に失敗した場合の再試行間隔
+
+    # ユーザー設定（通知可否）のプロセス内キャッシュ
+    USER_SETTINGS_CACHE_TTL_SEC: float = 30  # 他プロセスでの設定変更はこの秒数以内に反映される（0 でキャッシュしない）
+    USER_SETTINGS_CACHE_MAX_ENTRIES: int = 100000
+
+    # Web Push 設定
+    WEB_PUSH_VAPID_SUBJECT: str = "mailto:support@mijfans.jp"
+    WEB_PUSH_CONCURRENCY: int = 32  # 並列送信数（プロセスごと）
+    WEB_PUSH_TIMEOUT_SEC: float = 10
+    WEB_PUSH_TTL_SEC: int = 0  # push サービスでの保持秒数（0 は端末がオフラインなら破棄）
+
+    # 画像投稿の変換パイプライン設定
+    IMAGE_PIPELINE_PROCESSES: int = 0  # エンコードのプロセス数（0 は CPU コア数）
+    IMAGE_PIPELINE_IO_CONCURRENCY: int = 16  # ダウンロード・審査・アップロードの並列数（プロセスごと）
+    IMAGE_PIPELINE_STALE_SEC: int = 900  # この秒数更新のない未完了ジョブは中断（プロセス停止等）とみなして再実行する
+    IMAGE_PIPELINE_SWEEP_INTERVAL_SEC: int = 300  # 中断したジョブを探す間隔（0 で無効）
+
+    # サンプル動画切り取り設定
+    SAMPLE_VIDEO_CONCURRENCY: int = 2  # ffmpeg の同時実行数（プロセスごと）
+    SAMPLE_VIDEO_TIMEOUT_SEC: int = 600  # ffmpeg / ffprobe の実行時間上限
+    SAMPLE_VIDEO_KEYFRAME_TOLERANCE_SEC: float = 0.1  # 開始位置とキーフレームのずれがこの秒数以内なら再エンコードしない
+
+    # メトリクス設定
+    METRICS_ENABLED: bool = False  # /metrics で Prometheus 形式のメトリクスを公開する（METRICS_TOKEN の設定が必須）
+    METRICS_TOKEN: str = ""  # /metrics の取得に必要なトークン（Authorization: Bearer <token>）
+
+    # ページング設定
+    PAGINATION_COUNT_CAP: int = 1000  # cursor で取得する一覧の総件数はこの件数で打ち切って数える（total_is_capped で通知）
+
     model_config = SettingsConfigDict(
         env_file=[".env.development", ".env", ".env.local"],
         case_sensitive=False,
@@ -63,4 +138,21 @@ class Settings(BaseSettings):
             f"@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return (
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        )
+
+    @property
+    def ASYNC_DATABASE_READ_URL(self) -> str | None:
+        if not self.DATABASE_READ_URL:
+            return None
+        return (
+            make_url(self.DATABASE_READ_URL)
+            .set(drivername="postgresql+asyncpg")
+            .render_as_string(hide_password=False)
+        )
+
 settings = Settings()
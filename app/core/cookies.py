@@ -5,6 +5,7 @@ from app.core.config import settings
 ACCESS_COOKIE = "access_token"
 REFRESH_COOKIE = "refresh_token"
 CSRF_COOKIE = "csrf_token"
+READ_PRIMARY_COOKIE = "read_primary_until"
 
 def set_auth_cookies(response: Response, access_token: str, refresh_token: str, csrf_token: str):
     common = {
@@ -40,3 +41,15 @@ def clear_auth_cookies(response: Response):
         response.delete_cookie(
             name, domain=settings.COOKIE_DOMAIN, path=settings.COOKIE_PATH
         )
+
+def set_read_primary_cookie(response: Response, until: int):
+    # 更新直後の読み取りをプライマリへ送る期限（UNIX秒）。改ざんされても読み取り先が変わるだけ
+    response.set_cookie(
+        READ_PRIMARY_COOKIE, str(until),
+        max_age=settings.DB_READ_YOUR_WRITES_SEC,
+        domain=settings.COOKIE_DOMAIN,
+        secure=settings.COOKIE_SECURE,
+        httponly=True,
+        samesite=settings.COOKIE_SAMESITE,
+        path=settings.COOKIE_PATH,
+    )
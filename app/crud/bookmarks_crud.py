@@ -1,9 +1,11 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
+from app.crud.engagement_stats_crud import add_post_stats_delta
+from app.db.pagination import SortKey, paginate_by_cursor
 from app.models.social import Bookmarks
 from app.models.posts import Posts
 from uuid import UUID
-from typing import List
+from typing import List, Optional, Tuple
 
 def create_bookmark(db: Session, user_id: UUID, post_id: UUID) -> Bookmarks:
     """
@@ -14,6 +16,7 @@ def create_bookmark(db: Session, user_id: UUID, post_id: UUID) -> Bookmarks:
         post_id=post_id
     )
     db.add(bookmark)
+    add_post_stats_delta(db, post_id, bookmarks=1)
     db.commit()
     db.refresh(bookmark)
     return bookmark
@@ -35,6 +38,7 @@ def delete_bookmark(db: Session, user_id: UUID, post_id: UUID) -> bool:
     
     if bookmark:
         db.delete(bookmark)
+        add_post_stats_delta(db, post_id, bookmarks=-1)
         db.commit()
         return True
     
@@ -60,20 +64,26 @@ def get_bookmarks_by_user_id(
     db: Session, 
     user_id: UUID, 
     skip: int = 0, 
-    limit: int = 20
-) -> List[Posts]:
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Tuple[List[Posts], Optional[str]]:
     """
-    ユーザーのブックマーク一覧を取得
+    ユーザーのブックマーク一覧を取得（(ブックマーク日時, 投稿ID) のキーセットでページング）
     """
-    return (
-        db.query(Posts)
+    query = (
+        db.query(Posts, Bookmarks.created_at.label("bookmarked_at"))
         .join(Bookmarks)
         .filter(Bookmarks.user_id == user_id)
-        .order_by(Bookmarks.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
     )
+    rows, next_cursor = paginate_by_cursor(
+        query,
+        [SortKey(Bookmarks.created_at), SortKey(Bookmarks.post_id)],
+        limit,
+        cursor=cursor,
+        cursor_values=lambda row: (row.bookmarked_at, row.Posts.id),
+        offset=skip
+    )
+    return [row.Posts for row in rows], next_cursor
 
 def get_bookmarks_count_by_user_id(db: Session, user_id: UUID) -> int:
     """
@@ -103,11 +113,13 @@ def toggle_bookmark(db: Session, user_id: UUID, post_id: UUID) -> dict:
     if existing_bookmark:
         # ブックマーク削除
         db.delete(existing_bookmark)
+        add_post_stats_delta(db, post_id, bookmarks=-1)
         db.commit()
         return {"bookmarked": False, "message": "ブックマークを削除しました"}
     else:
         # ブックマーク追加
         bookmark = Bookmarks(user_id=user_id, post_id=post_id)
         db.add(bookmark)
+        add_post_stats_delta(db, post_id, bookmarks=1)
         db.commit()
         return {"bookmarked": True, "message": "ブックマークに追加しました"}
\ No newline at end of file
@@ -1,13 +1,13 @@
 # app/crud/bulk_message_crud.py
 from sqlalchemy.orm import Session
-from sqlalchemy import func, distinct
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy import func, distinct, insert
+from sqlalchemy.engine import Row
 from uuid import UUID
-import uuid
 from typing import List, Dict, Optional
 from datetime import datetime
-from sqlalchemy.types import String
-from app.constants.enums import ConversationMessageStatus
+from app.constants.enums import ConversationMessageStatus, ConversationMessageType
+from app.models.conversation_messages import ConversationMessages
+from app.models.message_assets import MessageAssets
 from app.models.payments import Payments
 from app.models.subscriptions import Subscriptions
 from app.models.plans import Plans
@@ -20,7 +20,7 @@ from app.constants.enums import (
     ItemType,
     MessageAssetStatus,
 )
-from app.crud import conversations_crud, message_assets_crud
+from app.crud import conversations_crud
 from app.core.logger import Logger
 logger = Logger.get_logger()
 
@@ -80,7 +80,7 @@ def get_bulk_message_recipients(db: Session, creator_user_id: UUID) -> Dict:
             Plans.name.label('plan_name'),
             func.count(Subscriptions.id).label('subscribers_count')
         )
-        .join(Plans, Subscriptions.order_id == func.cast(Plans.id, String))
+        .join(Plans, Subscriptions.plan_id == Plans.id)
         .filter(
             Subscriptions.creator_id == creator_user_id,
             Subscriptions.order_type == ItemType.PLAN,
@@ -188,73 +188,84 @@ def get_target_user_ids(
     return list(target_user_ids)
 
 
-def send_bulk_messages(
+def create_bulk_messages(
     db: Session,
     creator_user_id: UUID,
     message_text: str,
     target_user_ids: List[UUID],
+    group_by: str,
     asset_storage_key: Optional[str] = None,
     asset_type: Optional[int] = None,
-    scheduled_at: Optional[datetime] = None
-) -> int:
+    scheduled_at: Optional[datetime] = None,
+) -> Dict[UUID, Row]:
     """
-    対象ユーザーに一斉メッセージを送信
+    対象ユーザーへの一斉送信メッセージをまとめて作成する（commit しない）
+
+    受信者ごとのループで会話取得・メッセージ作成・commit を繰り返すと数万人規模で数分かかるため、
+    会話の引き当て・作成、メッセージとアセットの作成、最終メッセージ・未読カウンタの更新を
+    すべて一括 INSERT / UPDATE ... FROM で行う
 
-    Args:
-        db: データベースセッション
-        creator_user_id: クリエイターのユーザーID
-        message_text: メッセージ本文
-        target_user_ids: 送信対象ユーザーIDリスト
-        asset_storage_key: アセットのストレージキー（任意）
-        asset_type: アセットタイプ（任意）
-        scheduled_at: 予約送信日時（任意）
     Returns:
-        送信数
+        送信先ユーザーID → 作成したメッセージの行（id, conversation_id, ... を持つ RETURNING の行）
     """
-    sent_count = 0
-    group_by = str(uuid.uuid4())
-    message_ids = []
-    for user_id in target_user_ids:
-        # 会話を取得または作成（type=2のDM）
-        conversation = conversations_crud.get_or_create_dm_conversation(
-            db=db,
-            user_id_1=creator_user_id,
-            user_id_2=user_id
-        )
+    # 会話を取得または作成（type=2のDM）
+    conversation_ids = conversations_crud.get_or_create_dm_conversations(
+        db, creator_user_id, target_user_ids
+    )
+    if not conversation_ids:
+        return {}
 
-        # メッセージを作成
-        if scheduled_at:
-            message = conversations_crud.create_bulk_message(
-                db=db,
-                conversation_id=conversation.id,
-                sender_user_id=creator_user_id,
-                body_text=message_text,
-                status=ConversationMessageStatus.PENDING,
-                scheduled_at=scheduled_at,
-                group_by=group_by
-            )
-            message_ids.append(message.id)
-        else:
-            message = conversations_crud.create_bulk_message(
-                db=db,
-                conversation_id=conversation.id,
-                sender_user_id=creator_user_id,
-                body_text=message_text,
-                status=ConversationMessageStatus.ACTIVE,
-                group_by=group_by
-            )
+    # メッセージを一括作成（予約送信は PENDING で作成し、送信時に表示対象にする）
+    status = ConversationMessageStatus.PENDING if scheduled_at else ConversationMessageStatus.ACTIVE
+    rows = db.execute(
+        insert(ConversationMessages).returning(
+            ConversationMessages.id,
+            ConversationMessages.conversation_id,
+            ConversationMessages.sender_user_id,
+            ConversationMessages.sender_admin_id,
+            ConversationMessages.type,
+            ConversationMessages.body_text,
+            ConversationMessages.created_at,
+            sort_by_parameter_order=True,
+        ),
+        [
+            {
+                "conversation_id": conversation_id,
+                "sender_user_id": creator_user_id,
+                "type": ConversationMessageType.BULK,
+                "body_text": message_text,
+                "moderation": 1,  # デフォルト: 承認済み
+                "status": status,
+                "scheduled_at": scheduled_at,
+                "group_by": group_by,
+            }
+            for conversation_id in conversation_ids.values()
+        ],
+    ).all()
 
+    # RETURNING は INSERT したパラメータの順に並ぶ
+    messages = dict(zip(conversation_ids.keys(), rows))
 
-        # アセットがある場合はmessage_assetレコードを作成
-        if asset_storage_key and asset_type:
-            message_assets_crud.create_message_asset(
-                db=db,
-                message_id=message.id,
-                asset_type=asset_type,
-                storage_key=asset_storage_key,
-                status=MessageAssetStatus.PENDING,
-            )
+    # アセットがある場合はmessage_assetレコードを一括作成
+    if asset_storage_key and asset_type:
+        db.execute(
+            insert(MessageAssets),
+            [
+                {
+                    "message_id": message.id,
+                    "asset_type": asset_type,
+                    "storage_key": asset_storage_key,
+                    "status": MessageAssetStatus.PENDING,
+                }
+                for message in rows
+            ],
+        )
 
-        sent_count += 1
+    # 即時送信: 会話の最終メッセージ情報・参加者の未読カウンタを更新
+    if not scheduled_at:
+        conversations_crud.apply_bulk_messages_visible(db, rows)
 
-    return sent_count, message_ids, group_by
\ No newline at end of file
+    logger.info(
+        f"Bulk messages created: creator={creator_user_id} group_by={group_by} recipients={len(messages)}"
+    )
+    return messages
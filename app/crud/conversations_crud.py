@@ -1,10 +1,13 @@
 import os
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, exists, or_, func
-from typing import Optional, List, Tuple
+import uuid
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import DateTime, and_, case, column, desc, exists, false, insert, or_, func, select, true, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from typing import Dict, Iterable, Optional, List, Tuple
 from uuid import UUID
 from datetime import datetime, timezone, timedelta
 
+from app.db.pagination import SortKey, count_cap_for, count_up_to, paginate_by_cursor
 from app.core.logger import Logger
 from app.models.conversations import Conversations
 from app.models.conversation_messages import ConversationMessages
@@ -19,6 +22,8 @@ from app.constants.enums import (
 )
 from app.models.profiles import Profiles
 from app.constants.messages import WelcomeMessage
+from app.services.realtime import user_events
+from app.crud import notification_outbox_crud
 
 BASE_URL = os.getenv("CDN_BASE_URL")
 
@@ -99,6 +104,10 @@ def get_or_create_delusion_conversation(db: Session, user_id: UUID) -> Conversat
     db.add(admin_message)
     db.flush()
 
+    # 参加者の未読カウンタを更新
+    apply_message_visible(db, welcome_message)
+    apply_message_visible(db, admin_message)
+
     # 会話の最終メッセージ情報を更新
     last_message = admin_message or welcome_message
     conversation.last_message_id = last_message.id
@@ -134,6 +143,28 @@ def is_user_in_conversation(db: Session, conversation_id: UUID, user_id: UUID) -
     return participant is not None
 
 
+def get_conversation_partner(
+    db: Session, conversation_id: UUID, user_id: UUID
+) -> Tuple[Optional[UUID], Optional[Users], Optional[Profiles]]:
+    """
+    会話の相手（自分以外の参加者）のユーザー・プロフィールを 1 クエリで取得
+    Returns: (相手のuser_id, user, profile)。相手がいない場合は (None, None, None)
+    """
+    row = (
+        db.query(ConversationParticipants.user_id, Users, Profiles)
+        .join(Users, Users.id == ConversationParticipants.user_id, isouter=True)
+        .join(Profiles, Profiles.user_id == ConversationParticipants.user_id, isouter=True)
+        .filter(
+            ConversationParticipants.conversation_id == conversation_id,
+            ConversationParticipants.user_id != user_id,
+        )
+        .first()
+    )
+    if row is None:
+        return None, None, None
+    return row.user_id, row.Users, row.Profiles
+
+
 # ========== メッセージ管理 ==========
 
 
@@ -162,6 +193,167 @@ def _update_conversation_last_message(
         conversation.last_message_at = message.created_at
 
 
+# ========== 未読カウンタ ==========
+
+
+def _is_visible_message():
+    """表示対象のメッセージ（未削除かつ status が NULL / ACTIVE）"""
+    return (
+        ConversationMessages.deleted_at.is_(None),
+        or_(
+            ConversationMessages.status.is_(None),
+            ConversationMessages.status == ConversationMessageStatus.ACTIVE,
+        ),
+    )
+
+
+def _is_message_sender(message: ConversationMessages):
+    sender_id = message.sender_user_id or message.sender_admin_id
+    if sender_id is None:
+        return false()
+    return ConversationParticipants.participant_id == sender_id
+
+
+def apply_message_visible(db: Session, message: ConversationMessages) -> None:
+    """
+    メッセージが表示対象になったとき（送信・決済完了・予約送信）に参加者のカウンタを更新する（commit しない）
+
+    送信者以外は unread_count +1、送信者は自分のメッセージまで既読とする。1 文の UPDATE で行い、
+    更新後の未読数を commit 後に各参加者の /ws/me へ配信する
+    """
+    is_sender = _is_message_sender(message)
+    participants = db.execute(
+        update(ConversationParticipants)
+        .where(ConversationParticipants.conversation_id == message.conversation_id)
+        .values(
+            last_visible_message_id=message.id,
+            unread_count=case(
+                (is_sender, 0), else_=ConversationParticipants.unread_count + 1
+            ),
+            last_read_message_id=case(
+                (is_sender, message.id),
+                else_=ConversationParticipants.last_read_message_id,
+            ),
+            updated_at=func.now(),
+        )
+        .returning(ConversationParticipants.user_id, ConversationParticipants.unread_count)
+        .execution_options(synchronize_session=False)
+    ).all()
+    user_events.queue_new_message(db, message, participants)
+
+
+# 一括更新で 1 文に載せる行数（VALUES のバインドパラメータ数を抑える）
+_BULK_CHUNK_SIZE = 1000
+
+
+def apply_bulk_messages_visible(db: Session, messages: List) -> None:
+    """
+    apply_message_visible の一括版（一斉送信用。commit しない）
+
+    会話ごとに 1 件ずつのメッセージについて、会話の最終メッセージ情報と参加者のカウンタを
+    チャンクごとに UPDATE ... FROM (VALUES ...) 1 文ずつで更新する。
+    messages は id / conversation_id / sender_user_id / created_at 等を持つ行（INSERT の RETURNING）
+    """
+    for start in range(0, len(messages), _BULK_CHUNK_SIZE):
+        chunk = messages[start : start + _BULK_CHUNK_SIZE]
+        visible = values(
+            column("conversation_id", PG_UUID(as_uuid=True)),
+            column("message_id", PG_UUID(as_uuid=True)),
+            column("sender_user_id", PG_UUID(as_uuid=True)),
+            column("created_at", DateTime()),
+            name="visible",
+        ).data([(m.conversation_id, m.id, m.sender_user_id, m.created_at) for m in chunk])
+
+        db.execute(
+            update(Conversations)
+            .where(Conversations.id == visible.c.conversation_id)
+            .values(
+                last_message_id=visible.c.message_id,
+                last_message_at=visible.c.created_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        is_sender = ConversationParticipants.user_id == visible.c.sender_user_id
+        participants = db.execute(
+            update(ConversationParticipants)
+            .where(ConversationParticipants.conversation_id == visible.c.conversation_id)
+            .values(
+                last_visible_message_id=visible.c.message_id,
+                unread_count=case(
+                    (is_sender, 0), else_=ConversationParticipants.unread_count + 1
+                ),
+                last_read_message_id=case(
+                    (is_sender, visible.c.message_id),
+                    else_=ConversationParticipants.last_read_message_id,
+                ),
+                updated_at=func.now(),
+            )
+            .returning(
+                ConversationParticipants.conversation_id,
+                ConversationParticipants.user_id,
+                ConversationParticipants.unread_count,
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+
+        # 受信者にだけ配信する（送信者側に件数分のイベントを流さない）
+        by_conversation = {m.conversation_id: m for m in chunk}
+        for conversation_id, user_id, unread_count in participants:
+            message = by_conversation[conversation_id]
+            if user_id != message.sender_user_id:
+                user_events.queue_new_message(db, message, [(user_id, unread_count)])
+
+
+def _retract_message_visible(db: Session, message: ConversationMessages) -> None:
+    """
+    表示対象だったメッセージが削除されたときに参加者のカウンタを戻す（commit しない）
+    """
+    last_read_at = (
+        select(ConversationMessages.created_at)
+        .where(ConversationMessages.id == ConversationParticipants.last_read_message_id)
+        .scalar_subquery()
+    )
+    # まだ読んでいなかった参加者の未読数を減らす
+    db.execute(
+        update(ConversationParticipants)
+        .where(
+            ConversationParticipants.conversation_id == message.conversation_id,
+            ~_is_message_sender(message),
+            or_(
+                ConversationParticipants.last_read_message_id.is_(None),
+                last_read_at < message.created_at,
+            ),
+        )
+        .values(
+            unread_count=func.greatest(ConversationParticipants.unread_count - 1, 0),
+            updated_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    # 最終表示メッセージだった場合は直前の表示対象メッセージに戻す
+    previous_visible = (
+        select(ConversationMessages.id)
+        .where(
+            ConversationMessages.conversation_id == message.conversation_id,
+            ConversationMessages.id != message.id,
+            *_is_visible_message(),
+        )
+        .order_by(ConversationMessages.created_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    db.execute(
+        update(ConversationParticipants)
+        .where(
+            ConversationParticipants.conversation_id == message.conversation_id,
+            ConversationParticipants.last_visible_message_id == message.id,
+        )
+        .values(last_visible_message_id=previous_visible)
+        .execution_options(synchronize_session=False)
+    )
+
+
 def _create_and_save_message(
     db: Session,
     conversation_id: UUID,
@@ -172,9 +364,11 @@ def _create_and_save_message(
     status: int = 1,
     scheduled_at: datetime | None = None,
     group_by: str | None = None,
+    notify_recipients: bool = False,
 ) -> ConversationMessages:
     """
     メッセージを作成・保存する共通関数
+    - notify_recipients: 受信者への通知（アプリ内通知・メール・Web Push）を通知アウトボックスに積む（同じトランザクションで確定）
     """
     message = ConversationMessages(
         conversation_id=conversation_id,
@@ -190,8 +384,17 @@ def _create_and_save_message(
     db.add(message)
     db.flush()
 
-    # 会話の最終メッセージ情報を更新
+    # 会話の最終メッセージ情報・参加者の未読カウンタを更新
     _update_conversation_last_message(db, conversation_id, message)
+    if message.status not in (
+        ConversationMessageStatus.INACTIVE,
+        ConversationMessageStatus.PENDING,
+    ):
+        apply_message_visible(db, message)
+    if notify_recipients:
+        notification_outbox_crud.enqueue_new_message(
+            db, message, body_text[:50] if body_text else None
+        )
 
     db.commit()
     db.refresh(message)
@@ -206,6 +409,7 @@ def create_message(
     body_text: str = "",
     status: int = 1,
     group_by: str | None = None,
+    notify_recipients: bool = False,
 ) -> ConversationMessages:
     """
     メッセージを作成
@@ -213,6 +417,7 @@ def create_message(
     - sender_user_id が指定されている場合はユーザーメッセージ
     - sender_admin_id が指定されている場合は管理者メッセージ
     - status: メッセージステータス（0=無効、1=有効）
+    - notify_recipients: 受信者への通知を通知アウトボックス経由で非同期に送る
     """
     return _create_and_save_message(
         db=db,
@@ -223,6 +428,7 @@ def create_message(
         body_text=body_text,
         status=status,
         group_by=group_by,
+        notify_recipients=notify_recipients,
     )
 
 
@@ -332,7 +538,11 @@ def delete_message(db: Session, message_id: UUID) -> bool:
     if not message:
         return False
 
+    was_visible = message.status in (None, ConversationMessageStatus.ACTIVE)
     message.deleted_at = datetime.now(timezone.utc)
+    db.flush()
+    if was_visible:
+        _retract_message_visible(db, message)
     db.commit()
     return True
 
@@ -361,7 +571,25 @@ def mark_as_read(db: Session, conversation_id: UUID, user_id: UUID, message_id:
             f"Marking message {message_id} as read for user {user_id} in conversation {conversation_id}"
         )
         participant.last_read_message_id = message_id
+        participant.unread_count = _count_unread_after(
+            db, participant, message_id
+        )
         participant.updated_at = func.now()
+        other_user_ids = [
+            row.user_id
+            for row in db.query(ConversationParticipants.user_id).filter(
+                ConversationParticipants.conversation_id == conversation_id,
+                ConversationParticipants.user_id != user_id,
+            )
+        ]
+        user_events.queue_read(
+            db,
+            conversation_id,
+            user_id,
+            message_id,
+            participant.unread_count,
+            other_user_ids,
+        )
         db.commit()
         db.refresh(participant)
         logger.info(
@@ -373,51 +601,46 @@ def mark_as_read(db: Session, conversation_id: UUID, user_id: UUID, message_id:
         )
 
 
-def get_unread_count(db: Session, conversation_id: UUID, user_id: UUID) -> int:
-    """未読メッセージ数を取得（管理人用）"""
-    participant = (
-        db.query(ConversationParticipants)
-        .filter(
-            ConversationParticipants.conversation_id == conversation_id,
-            ConversationParticipants.user_id == user_id,
-        )
-        .first()
-    )
-    if not participant:
-        return 0
+def _count_unread_after(
+    db: Session, participant: ConversationParticipants, message_id: UUID
+) -> int:
+    """
+    既読位置（message_id）より後の、自分以外が送った表示対象メッセージ数
 
-    # 最後に読んだメッセージIDがない場合は全メッセージが未読
-    if not participant.last_read_message_id:
-        return (
-            db.query(ConversationMessages)
-            .filter(
-                ConversationMessages.conversation_id == conversation_id,
-                ConversationMessages.deleted_at.is_(None),
-            )
-            .count()
+    最新メッセージまで読んだ通常のケースでは集計しない
+    """
+    if message_id == participant.last_visible_message_id:
+        return 0
+    read_at = (
+        select(ConversationMessages.created_at)
+        .where(ConversationMessages.id == message_id)
+        .scalar_subquery()
+    )
+    return (
+        db.query(func.count(ConversationMessages.id))
+        .filter(
+            ConversationMessages.conversation_id == participant.conversation_id,
+            ConversationMessages.created_at > read_at,
+            ConversationMessages.sender_user_id.is_distinct_from(participant.participant_id),
+            ConversationMessages.sender_admin_id.is_distinct_from(participant.participant_id),
+            *_is_visible_message(),
         )
-
-    # 最後に読んだメッセージ以降のメッセージ数をカウント
-    last_read_message = (
-        db.query(ConversationMessages)
-        .filter(ConversationMessages.id == participant.last_read_message_id)
-        .first()
+        .scalar()
+        or 0
     )
 
-    if not last_read_message:
-        return 0
 
+def get_unread_count(db: Session, conversation_id: UUID, user_id: UUID) -> int:
+    """未読メッセージ数を取得（管理人用）"""
     unread_count = (
-        db.query(ConversationMessages)
+        db.query(ConversationParticipants.unread_count)
         .filter(
-            ConversationMessages.conversation_id == conversation_id,
-            ConversationMessages.created_at > last_read_message.created_at,
-            ConversationMessages.deleted_at.is_(None),
+            ConversationParticipants.conversation_id == conversation_id,
+            ConversationParticipants.user_id == user_id,
         )
-        .count()
+        .scalar()
     )
-
-    return unread_count
+    return unread_count or 0
 
 
 # ========== 管理人用: 会話一覧 ==========
@@ -438,6 +661,18 @@ def get_all_delusion_conversations_for_admin(
         ConversationMessages.deleted_at.is_(None),
     )
 
+    # 最後の表示対象メッセージ（会話ごとに top-1、部分インデックスで引く）
+    last_message = (
+        select(ConversationMessages.body_text)
+        .where(
+            ConversationMessages.conversation_id == Conversations.id,
+            *_is_visible_message(),
+        )
+        .order_by(ConversationMessages.created_at.desc())
+        .limit(1)
+        .lateral("last_message")
+    )
+
     # 妄想メッセージタイプの全会話を取得
     conversations = (
         db.query(
@@ -448,6 +683,7 @@ def get_all_delusion_conversations_for_admin(
             Users.profile_name,
             Profiles.username,
             Profiles.avatar_url,
+            last_message.c.body_text.label("last_message_text"),
         )
         .join(
             ConversationParticipants,
@@ -455,6 +691,7 @@ def get_all_delusion_conversations_for_admin(
         )
         .join(Users, ConversationParticipants.user_id == Users.id)
         .join(Profiles, Users.id == Profiles.user_id)
+        .outerjoin(last_message, true())
         .filter(
             Conversations.type == ConversationType.DELUSION,
             Conversations.is_active.is_(True),
@@ -466,39 +703,22 @@ def get_all_delusion_conversations_for_admin(
         .all()
     )
 
-    result = []
-    for conv in conversations:
-        # 最後のメッセージを取得
-        last_message = None
-        if conv.last_message_at:
-            last_message_obj = (
-                db.query(ConversationMessages)
-                .join(Conversations)
-                .filter(Conversations.id == conv.id)
-                .order_by(desc(ConversationMessages.created_at))
-                .first()
-            )
-
-            if last_message_obj:
-                last_message = last_message_obj.body_text
-
-        result.append(
-            {
-                "id": conv.id,
-                "user_id": conv.user_id,
-                "user_username": conv.username,
-                "user_profile_name": conv.profile_name,
-                "user_avatar": f"{BASE_URL}/{conv.avatar_url}"
-                if conv.avatar_url
-                else None,
-                "last_message_text": last_message,
-                "last_message_at": conv.last_message_at,
-                "unread_count": 0,  # 後で実装可能
-                "created_at": conv.created_at,
-            }
-        )
-
-    return result
+    return [
+        {
+            "id": conv.id,
+            "user_id": conv.user_id,
+            "user_username": conv.username,
+            "user_profile_name": conv.profile_name,
+            "user_avatar": f"{BASE_URL}/{conv.avatar_url}"
+            if conv.avatar_url
+            else None,
+            "last_message_text": conv.last_message_text,
+            "last_message_at": conv.last_message_at,
+            "unread_count": 0,  # 後で実装可能
+            "created_at": conv.created_at,
+        }
+        for conv in conversations
+    ]
 
 
 def get_new_conversations_unread(db: Session, user_id: UUID) -> int:
@@ -555,7 +775,8 @@ def get_user_conversations(
     search: Optional[str] = None,
     sort: str = "last_message_desc",
     unread_only: bool = False,
-) -> Tuple[List[dict], int]:
+    cursor: Optional[str] = None,
+) -> Tuple[List[dict], int, bool, Optional[str]]:
     """
     ログインユーザーが参加しているtype=2の会話リストを取得
 
@@ -567,17 +788,25 @@ def get_user_conversations(
         search: 検索キーワード（相手の名前で検索）
         sort: ソート順（last_message_desc, last_message_asc）
         unread_only: 未読のみフィルター
+        cursor: 前ページの next_cursor（指定時は skip より優先）
 
     Returns:
-        Tuple[会話リスト, 全体件数]
+        Tuple[会話リスト, 全体件数（cursor 指定時は上限付き）, 全体件数を打ち切ったかどうか, 次ページのカーソル]
     """
+    from sqlalchemy.orm import aliased
+
+    PartnerParticipant = aliased(ConversationParticipants)
+    LastMessage = aliased(ConversationMessages)
+
     # 基本クエリ: ユーザーが参加しているtype=2の会話
+    # 最終メッセージ・未読数は参加者行のカウンタから取るため、会話ごとの追加クエリは不要
     query = (
         db.query(
             Conversations.id.label("conversation_id"),
             Conversations.last_message_at,
             Conversations.created_at,
-            ConversationParticipants.last_read_message_id,
+            ConversationParticipants.unread_count,
+            LastMessage.body_text.label("last_message_text"),
             Users.id.label("partner_user_id"),
             Users.profile_name.label("partner_name"),
             Profiles.avatar_url.label("partner_avatar"),
@@ -586,29 +815,26 @@ def get_user_conversations(
             ConversationParticipants,
             Conversations.id == ConversationParticipants.conversation_id,
         )
-        .filter(
-            ConversationParticipants.user_id == user_id,
-            Conversations.type
-            == ConversationType.DM,  # type=2: クリエイターとユーザーのDM
-            Conversations.is_active.is_(True),
-            Conversations.deleted_at.is_(None),
+        # 表示対象の最終メッセージがある会話のみ
+        .join(
+            LastMessage,
+            LastMessage.id == ConversationParticipants.last_visible_message_id,
         )
-    )
-
-    # 相手ユーザー情報を取得するために、もう一つのConversationParticipantsとJOIN
-    # self-join を使用して相手を特定
-    from sqlalchemy.orm import aliased
-
-    PartnerParticipant = aliased(ConversationParticipants)
-
-    query = (
-        query.join(
+        # self-join で相手ユーザーを特定
+        .join(
             PartnerParticipant,
             (PartnerParticipant.conversation_id == Conversations.id)
             & (PartnerParticipant.user_id != user_id),
         )
         .join(Users, Users.id == PartnerParticipant.user_id)
         .outerjoin(Profiles, Profiles.user_id == Users.id)
+        .filter(
+            ConversationParticipants.user_id == user_id,
+            Conversations.type
+            == ConversationType.DM,  # type=2: クリエイターとユーザーのDM
+            Conversations.is_active.is_(True),
+            Conversations.deleted_at.is_(None),
+        )
     )
 
     # 検索フィルター（相手の名前で検索）
@@ -617,127 +843,49 @@ def get_user_conversations(
 
     # 未読フィルター
     if unread_only:
-        query = query.filter(
-            (ConversationParticipants.last_read_message_id.is_(None))
-            | (
-                ConversationParticipants.last_read_message_id
-                != Conversations.last_message_id
-            )
-        )
-
-    # 最終メッセージがある会話のみをカウントするためのサブクエリ
-    # status が NULL または ACTIVE (1) のメッセージがある会話を取得（INACTIVE (0) と PENDING (2) を除外）
-    messages_with_valid_status = (
-        db.query(ConversationMessages.conversation_id)
-        .filter(
-            ConversationMessages.deleted_at.is_(None),
-            or_(
-                ConversationMessages.status.is_(None),
-                ConversationMessages.status == ConversationMessageStatus.ACTIVE,
+        query = query.filter(ConversationParticipants.unread_count > 0)
+
+    # 全体件数を取得
+    total, total_is_capped = count_up_to(db, query, count_cap_for(cursor))
+
+    # ソート + キーセットページネーション（last_message_at, id）
+    descending = sort != "last_message_asc"
+    conversations, next_cursor = paginate_by_cursor(
+        query,
+        [
+            SortKey(
+                func.coalesce(Conversations.last_message_at, Conversations.created_at),
+                descending,
             ),
-        )
-        .group_by(ConversationMessages.conversation_id)
-        .subquery()
+            SortKey(Conversations.id, descending),
+        ],
+        limit,
+        cursor=cursor,
+        cursor_values=lambda conv: (
+            conv.last_message_at or conv.created_at,
+            conv.conversation_id,
+        ),
+        offset=skip,
     )
 
-    # 最終メッセージがある会話のみをフィルタリング
-    query = query.filter(
-        Conversations.id.in_(db.query(messages_with_valid_status.c.conversation_id))
-    )
-
-    # ソート
-    if sort == "last_message_asc":
-        query = query.order_by(Conversations.last_message_at.asc())
-    else:  # last_message_desc (デフォルト)
-        query = query.order_by(Conversations.last_message_at.desc())
-
-    # 全体件数を取得（最終メッセージがある会話のみ）
-    total = query.count()
-
-    # ページネーション
-    conversations = query.offset(skip).limit(limit).all()
-
     # レスポンス構築
-    result = []
-    for conv in conversations:
-        # 最終メッセージを取得
-        last_message_text = None
-        last_message = None
-        if conv.conversation_id:
-            last_message = (
-                db.query(ConversationMessages)
-                .filter(
-                    ConversationMessages.conversation_id == conv.conversation_id,
-                    ConversationMessages.deleted_at.is_(None),
-                    or_(
-                        ConversationMessages.status.is_(None),
-                        ConversationMessages.status == ConversationMessageStatus.ACTIVE,
-                    ),
-                )
-                .order_by(ConversationMessages.created_at.desc())
-                .first()
-            )
-            if last_message:
-                last_message_text = last_message.body_text
-
-        # 最終メッセージがない場合は除外
-        if not last_message:
-            continue
-
-        # 未読件数を計算
-        unread_count = 0
-        if conv.last_read_message_id:
-            unread_count = (
-                db.query(ConversationMessages)
-                .filter(
-                    ConversationMessages.conversation_id == conv.conversation_id,
-                    ConversationMessages.created_at
-                    > (
-                        db.query(ConversationMessages.created_at)
-                        .filter(ConversationMessages.id == conv.last_read_message_id)
-                        .scalar_subquery()
-                    ),
-                    ConversationMessages.sender_user_id != user_id,
-                    ConversationMessages.deleted_at.is_(None),
-                    or_(
-                        ConversationMessages.status.is_(None),
-                        ConversationMessages.status == ConversationMessageStatus.ACTIVE,
-                    ),
-                )
-                .count()
-            )
-        else:
-            # 最終既読メッセージIDがない場合は全メッセージを未読とする
-            unread_count = (
-                db.query(ConversationMessages)
-                .filter(
-                    ConversationMessages.conversation_id == conv.conversation_id,
-                    ConversationMessages.sender_user_id != user_id,
-                    ConversationMessages.deleted_at.is_(None),
-                    or_(
-                        ConversationMessages.status.is_(None),
-                        ConversationMessages.status == ConversationMessageStatus.ACTIVE,
-                    ),
-                )
-                .count()
-            )
-
-        result.append(
-            {
-                "id": str(conv.conversation_id),
-                "partner_user_id": str(conv.partner_user_id),
-                "partner_name": conv.partner_name,
-                "partner_avatar": f"{BASE_URL}/{conv.partner_avatar}"
-                if conv.partner_avatar
-                else None,
-                "last_message_text": last_message_text,
-                "last_message_at": conv.last_message_at,
-                "unread_count": unread_count,
-                "created_at": conv.created_at,
-            }
-        )
-
-    return result, total
+    result = [
+        {
+            "id": str(conv.conversation_id),
+            "partner_user_id": str(conv.partner_user_id),
+            "partner_name": conv.partner_name,
+            "partner_avatar": f"{BASE_URL}/{conv.partner_avatar}"
+            if conv.partner_avatar
+            else None,
+            "last_message_text": conv.last_message_text,
+            "last_message_at": conv.last_message_at,
+            "unread_count": conv.unread_count,
+            "created_at": conv.created_at,
+        }
+        for conv in conversations
+    ]
+
+    return result, total, total_is_capped, next_cursor
 
 
 def get_or_create_dm_conversation(
@@ -828,62 +976,105 @@ def get_or_create_dm_conversation(
     return conversation
 
 
+def get_or_create_dm_conversations(
+    db: Session, user_id: UUID, partner_user_ids: Iterable[UUID]
+) -> Dict[UUID, UUID]:
+    """
+    1人のユーザーと複数の相手とのDM会話をまとめて取得または作成する（commit しない）
+
+    既存の会話は 1 クエリで引き当て、会話が無い相手の分だけ会話と参加者を一括 INSERT する
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID（一斉送信のクリエイター）
+        partner_user_ids: 相手のユーザーIDリスト
+
+    Returns:
+        Dict[UUID, UUID]: 相手のユーザーID → 会話ID
+    """
+    partner_user_ids = [uid for uid in dict.fromkeys(partner_user_ids) if uid != user_id]
+    if not partner_user_ids:
+        return {}
+
+    Self = aliased(ConversationParticipants)
+    Partner = aliased(ConversationParticipants)
+    rows = db.execute(
+        select(Partner.user_id, Conversations.id)
+        .join(
+            Self,
+            and_(Self.conversation_id == Conversations.id, Self.user_id == user_id),
+        )
+        .join(Partner, Partner.conversation_id == Conversations.id)
+        .where(
+            Conversations.type == ConversationType.DM,
+            Conversations.is_active.is_(True),
+            Conversations.deleted_at.is_(None),
+            Partner.user_id.in_(partner_user_ids),
+        )
+        .order_by(Conversations.created_at)
+    ).all()
+
+    conversation_ids: Dict[UUID, UUID] = {}
+    for partner_user_id, conversation_id in rows:
+        # 同じ相手との会話が複数ある場合は最も古いものを使う
+        conversation_ids.setdefault(partner_user_id, conversation_id)
+
+    missing = [uid for uid in partner_user_ids if uid not in conversation_ids]
+    if missing:
+        new_ids = {uid: uuid.uuid4() for uid in missing}
+        db.execute(
+            insert(Conversations),
+            [
+                {"id": conversation_id, "type": ConversationType.DM, "is_active": True}
+                for conversation_id in new_ids.values()
+            ],
+        )
+        db.execute(
+            insert(ConversationParticipants),
+            [
+                {
+                    "conversation_id": conversation_id,
+                    "user_id": participant_user_id,
+                    "participant_id": participant_user_id,
+                    "participant_type": ParticipantType.USER,
+                    "role": 1,  # 通常ユーザー
+                }
+                for partner_user_id, conversation_id in new_ids.items()
+                for participant_user_id in (user_id, partner_user_id)
+            ],
+        )
+        conversation_ids.update(new_ids)
+        logger.info(
+            f"Created {len(new_ids)} DM conversations for user={user_id}"
+        )
+
+    return conversation_ids
+
+
 def get_unread_conversation_count(db: Session, user_id: UUID) -> int:
     """
     未読メッセージがある会話の数を取得
     - conversations.typeが2（DM）の会話のみ
     - conversation_messages.statusが1（ACTIVE）またはnullのメッセージのみ
-    - 自分以外が送った最新メッセージで、まだ既読にしていない会話をカウント
-    - last_read_message_id と last_message_id を比較して判定
+    - 自分以外が送ったメッセージで、まだ既読にしていないものがある会話をカウント
+    - 参加者行の unread_count（送信/既読/削除時に更新）から 1 クエリで判定
     """
-    # ユーザーが参加しているtype=2（DM）の会話を取得
-    participants = (
-        db.query(ConversationParticipants)
+    return (
+        db.query(func.count(ConversationParticipants.id))
         .join(
             Conversations, ConversationParticipants.conversation_id == Conversations.id
         )
         .filter(
             ConversationParticipants.user_id == user_id,
+            ConversationParticipants.unread_count > 0,
             Conversations.type == ConversationType.DM,  # type=2: DM
             Conversations.is_active.is_(True),
             Conversations.deleted_at.is_(None),
         )
-        .all()
+        .scalar()
+        or 0
     )
 
-    unread_count = 0
-
-    for participant in participants:
-        conversation = participant.conversation
-
-        # 最後のメッセージがない場合はスキップ
-        if not conversation.last_message_id:
-            continue
-
-        # 既に既読済みの場合はスキップ
-        if participant.last_read_message_id == conversation.last_message_id:
-            continue
-
-        # 最後のメッセージを取得（statusが1（ACTIVE）またはnullのみ）
-        last_message = (
-            db.query(ConversationMessages)
-            .filter(
-                ConversationMessages.id == conversation.last_message_id,
-                ConversationMessages.deleted_at.is_(None),
-                or_(
-                    ConversationMessages.status.is_(None),
-                    ConversationMessages.status == ConversationMessageStatus.ACTIVE,
-                ),
-            )
-            .first()
-        )
-
-        # 最後のメッセージが存在し、送信者が自分以外の場合にカウント
-        if last_message and last_message.sender_user_id != user_id:
-            unread_count += 1
-
-    return unread_count
-
 
 def get_delusion_unread(db: Session, user_id: UUID) -> bool:
     """
@@ -1,14 +1,14 @@
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import distinct, literal, or_, select, func, and_, desc, cast
+from sqlalchemy import distinct, literal, or_, select, func, and_, desc
 from sqlalchemy.sql import and_ as sa_and, or_ as sa_or
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from uuid import UUID
 from datetime import datetime, timedelta, timezone
 from app.models import Bookmarks, Categories, Payments, PostCategories, Prices
 from app.models.creators import Creators
 from app.models.plans import PostPlans
 from app.models.posts import Posts
+from app.models.post_stats import CreatorStats
 from app.models.user import Users
 from app.models.identity import IdentityVerifications, IdentityDocuments
 from app.schemas.creator import (
@@ -229,10 +229,9 @@ def get_top_creators(db: Session, limit: int = 5, current_user=None):
 
     followers_agg = (
         db.query(
-            Follows.creator_user_id.label("creator_user_id"),
-            func.count(distinct(Follows.follower_user_id)).label("followers_count"),
+            CreatorStats.user_id.label("creator_user_id"),
+            CreatorStats.followers_count.label("followers_count"),
         )
-        .group_by(Follows.creator_user_id)
         .subquery("followers_agg")
     )
     if current_user is not None:
@@ -322,10 +321,9 @@ def get_ranking_creators_overall_all_time(
 
     followers_agg = (
         db.query(
-            Follows.creator_user_id.label("creator_user_id"),
-            func.count(distinct(Follows.follower_user_id)).label("followers_count"),
+            CreatorStats.user_id.label("creator_user_id"),
+            CreatorStats.followers_count.label("followers_count"),
         )
-        .group_by(Follows.creator_user_id)
         .subquery("followers_agg")
     )
     if current_user is not None:
@@ -373,7 +371,7 @@ def get_ranking_creators_overall_daily(
     """
     いいね数が多いCreator daily
     """
-    one_day_ago = datetime.now(timezone.utc) - timedelta(days=1)
+    one_day_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=1)
     now = func.now()
 
     active_post_cond = and_(
@@ -399,10 +397,9 @@ def get_ranking_creators_overall_daily(
     # 2) followers_agg: creator -> followers_count (all time)
     followers_agg = (
         db.query(
-            Follows.creator_user_id.label("creator_user_id"),
-            func.count(distinct(Follows.follower_user_id)).label("followers_count"),
+            CreatorStats.user_id.label("creator_user_id"),
+            CreatorStats.followers_count.label("followers_count"),
         )
-        .group_by(Follows.creator_user_id)
         .subquery("followers_agg")
     )
 
@@ -455,7 +452,7 @@ def get_ranking_creators_overall_weekly(
     """
     いいね数が多いCreator weekly
     """
-    one_week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    one_week_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=7)
 
     now = func.now()
 
@@ -482,10 +479,9 @@ def get_ranking_creators_overall_weekly(
     # 2) followers_agg: creator -> followers_count (all time)
     followers_agg = (
         db.query(
-            Follows.creator_user_id.label("creator_user_id"),
-            func.count(distinct(Follows.follower_user_id)).label("followers_count"),
+            CreatorStats.user_id.label("creator_user_id"),
+            CreatorStats.followers_count.label("followers_count"),
         )
-        .group_by(Follows.creator_user_id)
         .subquery("followers_agg")
     )
 
@@ -538,7 +534,7 @@ def get_ranking_creators_overall_monthly(
     """
     いいね数が多いCreator monthly
     """
-    one_month_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    one_month_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=30)
 
     now = func.now()
 
@@ -565,10 +561,9 @@ def get_ranking_creators_overall_monthly(
     # 2) followers_agg: creator -> followers_count (all time)
     followers_agg = (
         db.query(
-            Follows.creator_user_id.label("creator_user_id"),
-            func.count(distinct(Follows.follower_user_id)).label("followers_count"),
+            CreatorStats.user_id.label("creator_user_id"),
+            CreatorStats.followers_count.label("followers_count"),
         )
-        .group_by(Follows.creator_user_id)
         .subquery("followers_agg")
     )
 
@@ -667,10 +662,9 @@ def get_ranking_creators_overall_detail_overall(
     )
     followers_agg = (
         db.query(
-            Follows.creator_user_id.label("creator_user_id"),
-            func.count(distinct(Follows.follower_user_id)).label("followers_count"),
+            CreatorStats.user_id.label("creator_user_id"),
+            CreatorStats.followers_count.label("followers_count"),
         )
-        .group_by(Follows.creator_user_id)
         .subquery("followers_agg")
     )
     if current_user is not None:
@@ -958,7 +952,7 @@ def get_ranking_creators_categories_overall_daily(
     """
     いいね数が多いCreator categories overall daily
     """
-    one_day_ago = datetime.now(timezone.utc) - timedelta(days=1)
+    one_day_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=1)
 
     now = func.now()
 
@@ -1087,7 +1081,7 @@ def get_ranking_creators_categories_overall_weekly(
     """
     いいね数が多いCreator categories overall weekly
     """
-    one_week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    one_week_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=7)
 
     now = func.now()
     active_post_cond = and_(
@@ -1215,7 +1209,7 @@ def get_ranking_creators_categories_overall_monthly(
     """
     いいね数が多いCreator categories overall monthly
     """
-    one_month_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    one_month_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=30)
 
     now = func.now()
     active_post_cond = and_(
@@ -1360,7 +1354,7 @@ def get_ranking_creators_categories_detail(
     """
 
     # ---------- period window
-    now = datetime.now(timezone.utc)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
     start_dt = None
     if term == "daily":
         start_dt = now - timedelta(days=1)
@@ -1419,7 +1413,7 @@ def get_ranking_creators_categories_detail(
             Payments,
             sa_and(
                 Payments.order_type == ORDER_TYPE_PRICE,
-                cast(Payments.order_id, PG_UUID(as_uuid=True)) == Prices.id,
+                Payments.price_id == Prices.id,
                 base_payment_cond,
             ),
         )
@@ -1446,7 +1440,7 @@ def get_ranking_creators_categories_detail(
             Payments,
             sa_and(
                 Payments.order_type == ORDER_TYPE_PLAN,
-                cast(Payments.order_id, PG_UUID(as_uuid=True)) == PostPlans.plan_id,
+                Payments.plan_id == PostPlans.plan_id,
                 base_payment_cond,
             ),
         )
@@ -1507,10 +1501,9 @@ def get_ranking_creators_categories_detail(
     # =====================================================
     followers_agg = (
         db.query(
-            Follows.creator_user_id.label("creator_user_id"),
-            func.count(distinct(Follows.follower_user_id)).label("followers_count"),
+            CreatorStats.user_id.label("creator_user_id"),
+            CreatorStats.followers_count.label("followers_count"),
         )
-        .group_by(Follows.creator_user_id)
         .subquery("followers_agg")
     )
 
@@ -1643,7 +1636,7 @@ def get_ranking_creators_overall(
     """
 
     now_sql = func.now()
-    now = datetime.now(timezone.utc)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
 
     # -------- rolling window
     start_dt = None
@@ -1689,7 +1682,7 @@ def get_ranking_creators_overall(
             Payments,
             sa_and(
                 Payments.order_type == ORDER_TYPE_PRICE,
-                cast(Payments.order_id, PG_UUID(as_uuid=True)) == Prices.id,
+                Payments.price_id == Prices.id,
                 base_payment_cond,
             ),
         )
@@ -1708,7 +1701,7 @@ def get_ranking_creators_overall(
             Payments,
             sa_and(
                 Payments.order_type == ORDER_TYPE_PLAN,
-                cast(Payments.order_id, PG_UUID(as_uuid=True)) == PostPlans.plan_id,
+                Payments.plan_id == PostPlans.plan_id,
                 base_payment_cond,
             ),
         )
@@ -1762,10 +1755,9 @@ def get_ranking_creators_overall(
     # =====================================================
     followers_agg = (
         db.query(
-            Follows.creator_user_id.label("creator_user_id"),
-            func.count(distinct(Follows.follower_user_id)).label("followers_count"),
+            CreatorStats.user_id.label("creator_user_id"),
+            CreatorStats.followers_count.label("followers_count"),
         )
-        .group_by(Follows.creator_user_id)
         .subquery("followers_agg")
     )
 
@@ -1859,7 +1851,7 @@ def get_ranking_creators_categories_overall(
     """
 
     # ---------- period window
-    now = datetime.now(timezone.utc)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
     start_dt = None
     if period == "daily":
         start_dt = now - timedelta(days=1)
@@ -1909,7 +1901,7 @@ def get_ranking_creators_categories_overall(
             Payments,
             sa_and(
                 Payments.order_type == ORDER_TYPE_PRICE,
-                cast(Payments.order_id, PG_UUID(as_uuid=True)) == Prices.id,
+                Payments.price_id == Prices.id,
                 base_payment_cond,
             ),
         )
@@ -1931,7 +1923,7 @@ def get_ranking_creators_categories_overall(
             Payments,
             sa_and(
                 Payments.order_type == ORDER_TYPE_PLAN,
-                cast(Payments.order_id, PG_UUID(as_uuid=True)) == PostPlans.plan_id,
+                Payments.plan_id == PostPlans.plan_id,
                 base_payment_cond,
             ),
         )
@@ -0,0 +1,147 @@
+from typing import Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.post_stats import CreatorStats, PostStats
+from app.models.prices import Prices
+
+POST_STATS_COLUMNS = ("likes_count", "bookmarks_count", "purchase_count", "views_count")
+CREATOR_STATS_COLUMNS = ("followers_count", "following_count")
+
+
+def _upsert_counter_deltas(db: Session, model, key: dict, deltas: Dict[str, int]) -> None:
+    """
+    カウンタ行を UPSERT で増減する（commit は呼び出し側のトランザクションに任せる）
+
+    行が無ければ max(delta, 0) で作成し、既存行は col = greatest(col + delta, 0) で更新する
+    """
+    deltas = {col: delta for col, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    table = model.__table__
+    stmt = pg_insert(table).values(
+        **key, **{col: max(delta, 0) for col, delta in deltas.items()}
+    )
+    set_ = {
+        col: func.greatest(table.c[col] + delta, 0) for col, delta in deltas.items()
+    }
+    set_["updated_at"] = func.now()
+    db.execute(stmt.on_conflict_do_update(index_elements=list(key), set_=set_))
+
+
+def add_post_stats_delta(
+    db: Session,
+    post_id: UUID,
+    likes: int = 0,
+    bookmarks: int = 0,
+    purchases: int = 0,
+    views: int = 0,
+) -> None:
+    """
+    投稿カウンタを増減する（commit しない）
+    """
+    _upsert_counter_deltas(
+        db,
+        PostStats,
+        {"post_id": post_id},
+        {
+            "likes_count": likes,
+            "bookmarks_count": bookmarks,
+            "purchase_count": purchases,
+            "views_count": views,
+        },
+    )
+
+
+def add_creator_stats_delta(
+    db: Session, user_id: UUID, followers: int = 0, following: int = 0
+) -> None:
+    """
+    フォロー関連カウンタを増減する（commit しない）
+    """
+    _upsert_counter_deltas(
+        db,
+        CreatorStats,
+        {"user_id": user_id},
+        {"followers_count": followers, "following_count": following},
+    )
+
+
+def add_follow_delta(
+    db: Session, follower_user_id: UUID, creator_user_id: UUID, delta: int
+) -> None:
+    """
+    フォロー追加/解除に伴う双方のカウンタを増減する（commit しない）
+    """
+    add_creator_stats_delta(db, creator_user_id, followers=delta)
+    add_creator_stats_delta(db, follower_user_id, following=delta)
+
+
+def add_post_purchase_delta_by_price_id(
+    db: Session, price_id: Optional[UUID], delta: int
+) -> None:
+    """
+    単品購入の成功/取消に合わせて price_id が属する投稿の購入数を増減する（commit しない）
+    """
+    if price_id is None:
+        return
+    post_id = db.execute(
+        select(Prices.post_id).where(Prices.id == price_id)
+    ).scalar_one_or_none()
+    if post_id is None:
+        return
+    add_post_stats_delta(db, post_id, purchases=delta)
+
+
+def get_post_stats(db: Session, post_id: UUID) -> Dict[str, int]:
+    """
+    投稿カウンタを取得（行が無ければ全て 0）
+    """
+    row = db.execute(
+        select(*[PostStats.__table__.c[col] for col in POST_STATS_COLUMNS]).where(
+            PostStats.post_id == post_id
+        )
+    ).mappings().first()
+    return {col: (row[col] if row else 0) for col in POST_STATS_COLUMNS}
+
+
+def get_post_stats_map(db: Session, post_ids: Iterable[UUID]) -> Dict[UUID, Dict[str, int]]:
+    """
+    複数投稿のカウンタを 1 クエリで取得する（行が無い投稿は全て 0）
+    """
+    post_ids = list(post_ids)
+    if not post_ids:
+        return {}
+    rows = db.execute(
+        select(
+            PostStats.post_id, *[PostStats.__table__.c[col] for col in POST_STATS_COLUMNS]
+        ).where(PostStats.post_id.in_(post_ids))
+    ).mappings()
+    stats_by_id = {row["post_id"]: row for row in rows}
+    result = {}
+    for post_id in post_ids:
+        row = stats_by_id.get(post_id)
+        result[post_id] = {col: (row[col] if row else 0) for col in POST_STATS_COLUMNS}
+    return result
+
+
+def get_post_likes_count(db: Session, post_id: UUID) -> int:
+    """
+    投稿のいいね数を取得
+    """
+    return get_post_stats(db, post_id)["likes_count"]
+
+
+def get_creator_stats(db: Session, user_id: UUID) -> Dict[str, int]:
+    """
+    フォロワー数・フォロー数を取得（行が無ければ 0）
+    """
+    row = db.execute(
+        select(*[CreatorStats.__table__.c[col] for col in CREATOR_STATS_COLUMNS]).where(
+            CreatorStats.user_id == user_id
+        )
+    ).mappings().first()
+    return {col: (row[col] if row else 0) for col in CREATOR_STATS_COLUMNS}
@@ -2,11 +2,14 @@ import os
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
+from app.db.pagination import SortKey, paginate_by_cursor
+from app.crud.engagement_stats_crud import add_follow_delta, get_creator_stats
 from app.crud.push_noti_crud import push_notification_to_user
 from app.models import Notifications, Profiles, UserSettings
 from app.models.social import Follows
 from app.models.user import Users
 from uuid import UUID
+from typing import List, Optional, Tuple
 
 from app.schemas.notification import NotificationType
 from app.schemas.user_settings import UserSettingsType
@@ -22,13 +25,7 @@ def get_follower_count(db: Session, user_id: UUID) -> dict:
     """
     フォロワー数を取得
     """
-    followers_count = (
-        db.query(Follows).filter(Follows.creator_user_id == user_id).count()
-    )
-    following_count = (
-        db.query(Follows).filter(Follows.follower_user_id == user_id).count()
-    )
-    return {"followers_count": followers_count, "following_count": following_count}
+    return get_creator_stats(db, user_id)
 
 
 def create_follow(
@@ -39,6 +36,7 @@ def create_follow(
     """
     follow = Follows(follower_user_id=follower_user_id, creator_user_id=creator_user_id)
     db.add(follow)
+    add_follow_delta(db, follower_user_id, creator_user_id, 1)
     db.commit()
     db.refresh(follow)
     return follow
@@ -61,6 +59,7 @@ def delete_follow(db: Session, follower_user_id: UUID, creator_user_id: UUID) ->
 
     if follow:
         db.delete(follow)
+        add_follow_delta(db, follower_user_id, creator_user_id, -1)
         db.commit()
         return True
 
@@ -84,35 +83,71 @@ def is_following(db: Session, follower_user_id: UUID, creator_user_id: UUID) ->
     return follow is not None
 
 
-def get_followers(db: Session, user_id: UUID, skip: int = 0, limit: int = 20):
+def get_followers(
+    db: Session,
+    user_id: UUID,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List, Optional[str]]:
     """
     フォロワー一覧を取得（Users + Profilesの情報を返す）
+
+    (フォロー日時, ユーザーID) のキーセットでページングし、次ページのカーソルも返す
     """
-    return (
-        db.query(Users.id, Users.profile_name, Profiles.username, Profiles.avatar_url)
+    query = (
+        db.query(
+            Users.id,
+            Users.profile_name,
+            Profiles.username,
+            Profiles.avatar_url,
+            Follows.created_at.label("followed_at"),
+        )
         .join(Follows, Follows.follower_user_id == Users.id)
         .join(Profiles, Users.id == Profiles.user_id)
         .filter(Follows.creator_user_id == user_id)
-        .order_by(Follows.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    )
+    return paginate_by_cursor(
+        query,
+        [SortKey(Follows.created_at), SortKey(Follows.follower_user_id)],
+        limit,
+        cursor=cursor,
+        cursor_values=lambda row: (row.followed_at, row.id),
+        offset=skip,
     )
 
 
-def get_following(db: Session, user_id: UUID, skip: int = 0, limit: int = 20):
+def get_following(
+    db: Session,
+    user_id: UUID,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List, Optional[str]]:
     """
     フォロー中のユーザー一覧を取得（Users + Profilesの情報を返す）
+
+    (フォロー日時, ユーザーID) のキーセットでページングし、次ページのカーソルも返す
     """
-    return (
-        db.query(Users.id, Users.profile_name, Profiles.username, Profiles.avatar_url)
+    query = (
+        db.query(
+            Users.id,
+            Users.profile_name,
+            Profiles.username,
+            Profiles.avatar_url,
+            Follows.created_at.label("followed_at"),
+        )
         .join(Follows, Follows.creator_user_id == Users.id)
         .join(Profiles, Users.id == Profiles.user_id)
         .filter(Follows.follower_user_id == user_id)
-        .order_by(Follows.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    )
+    return paginate_by_cursor(
+        query,
+        [SortKey(Follows.created_at), SortKey(Follows.creator_user_id)],
+        limit,
+        cursor=cursor,
+        cursor_values=lambda row: (row.followed_at, row.id),
+        offset=skip,
     )
 
 
@@ -137,6 +172,7 @@ def toggle_follow(db: Session, follower_user_id: UUID, creator_user_id: UUID) ->
     if existing_follow:
         # フォロー解除
         db.delete(existing_follow)
+        add_follow_delta(db, follower_user_id, creator_user_id, -1)
         db.commit()
         return {"following": False, "message": "フォローを解除しました"}
     else:
@@ -145,6 +181,7 @@ def toggle_follow(db: Session, follower_user_id: UUID, creator_user_id: UUID) ->
             follower_user_id=follower_user_id, creator_user_id=creator_user_id
         )
         db.add(follow)
+        add_follow_delta(db, follower_user_id, creator_user_id, 1)
         db.commit()
         add_notification_follow(db, follower_user_id, creator_user_id)
         add_mail_notification_follow(db, follower_user_id, creator_user_id)
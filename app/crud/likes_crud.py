@@ -2,12 +2,17 @@ from datetime import datetime, timezone
 import os
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
+from app.crud.engagement_stats_crud import (
+    add_post_stats_delta,
+    get_post_likes_count,
+    get_post_stats_map,
+)
 from app.crud.push_noti_crud import push_notification_to_user
 from app.models import Notifications, Profiles, UserSettings, Users
 from app.models.social import Likes
 from app.models.posts import Posts
 from uuid import UUID
-from typing import List
+from typing import Dict, List, Set
 
 from app.schemas.notification import NotificationType
 from app.schemas.user_settings import UserSettingsType
@@ -21,8 +26,29 @@ def get_likes_count(db: Session, post_id: UUID) -> int:
     """
     いいね数を取得
     """
-    likes_count = db.query(Likes).filter(Likes.post_id == post_id).count()
-    return likes_count
+    return get_post_likes_count(db, post_id)
+
+
+def get_likes_count_map(db: Session, post_ids: List[UUID]) -> Dict[UUID, int]:
+    """
+    複数投稿のいいね数を一括取得
+    """
+    stats_map = get_post_stats_map(db, post_ids)
+    return {post_id: stats["likes_count"] for post_id, stats in stats_map.items()}
+
+
+def get_liked_post_ids(db: Session, user_id: UUID, post_ids: List[UUID]) -> Set[UUID]:
+    """
+    指定投稿のうちユーザーがいいね済みの投稿IDを一括取得
+    """
+    if not post_ids:
+        return set()
+    rows = (
+        db.query(Likes.post_id)
+        .filter(Likes.user_id == user_id, Likes.post_id.in_(post_ids))
+        .all()
+    )
+    return {row.post_id for row in rows}
 
 
 def create_like(db: Session, user_id: UUID, post_id: UUID) -> Likes:
@@ -31,6 +57,7 @@ def create_like(db: Session, user_id: UUID, post_id: UUID) -> Likes:
     """
     like = Likes(user_id=user_id, post_id=post_id)
     db.add(like)
+    add_post_stats_delta(db, post_id, likes=1)
     db.commit()
     db.refresh(like)
     return like
@@ -48,6 +75,7 @@ def delete_like(db: Session, user_id: UUID, post_id: UUID) -> bool:
 
     if like:
         db.delete(like)
+        add_post_stats_delta(db, post_id, likes=-1)
         db.commit()
         return True
 
@@ -102,12 +130,14 @@ def toggle_like(db: Session, user_id: UUID, post_id: UUID) -> dict:
     if existing_like:
         # いいね削除
         db.delete(existing_like)
+        add_post_stats_delta(db, post_id, likes=-1)
         db.commit()
         return {"liked": False, "message": "いいねを取り消しました"}
     else:
         # いいね追加
         like = Likes(user_id=user_id, post_id=post_id)
         db.add(like)
+        add_post_stats_delta(db, post_id, likes=1)
         db.commit()
         add_notification_like(db, user_id, post_id)
         add_mail_notification_like(db, user_id, post_id)
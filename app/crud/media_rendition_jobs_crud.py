@@ -1,6 +1,16 @@
-from sqlalchemy import select
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.orm import Session
+from app.constants.enums import (
+    MediaRenditionJobBackend,
+    MediaRenditionJobKind,
+    MediaRenditionJobStatus,
+)
+from app.models.media_assets import MediaAssets
 from app.models.media_rendition_jobs import MediaRenditionJobs
+from app.models.posts import Posts
 
 def create_media_rendition_job(db: Session, media_rendition_job_data: dict) -> MediaRenditionJobs:
     """
@@ -40,4 +50,112 @@ def delete_media_rendition_job(db: Session, asset_id: str) -> bool:
     """
     db.query(MediaRenditionJobs).filter(MediaRenditionJobs.asset_id == asset_id).delete()
     db.flush()  # commitではなくflushを使用（外部でcommitを制御）
-    return True
\ No newline at end of file
+    return True
+
+def create_image_variant_jobs(db: Session, job_id: str, assets: List[Any]) -> Dict[UUID, UUID]:
+    """
+    画像変換ジョブを作成（アセットごとに 1 行、同じ job_id でまとめる。commit しない）
+
+    Returns:
+        アセットID → メディアレンディションジョブID
+    """
+    rows = db.execute(
+        insert(MediaRenditionJobs)
+        .returning(MediaRenditionJobs.asset_id, MediaRenditionJobs.id, sort_by_parameter_order=True),
+        [
+            {
+                "asset_id": asset.id,
+                "kind": MediaRenditionJobKind.IMAGE_VARIANTS,
+                "backend": MediaRenditionJobBackend.IMAGE_PIPELINE,
+                "status": MediaRenditionJobStatus.PENDING,
+                "input_key": asset.storage_key,
+                "job_id": job_id,
+            }
+            for asset in assets
+        ],
+    )
+    return {row.asset_id: row.id for row in rows}
+
+
+def update_media_rendition_jobs_status(
+    db: Session,
+    media_rendition_job_ids: List[UUID],
+    status: int,
+    error_message: Optional[str] = None,
+) -> None:
+    """
+    メディアレンディションジョブのステータスをまとめて更新（commit しない）
+
+    error_message は失敗理由（失敗以外のステータスでは None にして前回の理由を消す）
+    """
+    if not media_rendition_job_ids:
+        return
+    db.execute(
+        update(MediaRenditionJobs)
+        .where(MediaRenditionJobs.id.in_(media_rendition_job_ids))
+        .values(
+            status=status,
+            error_message=error_message[:2000] if error_message else None,
+            updated_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def claim_stale_image_variant_jobs(db: Session, stale_after_sec: int, limit: int = 100) -> List[Any]:
+    """
+    中断した画像変換ジョブ（未完了のまま stale_after_sec 以上更新がない job_id）を取り戻す（commit しない）
+
+    取り戻した行は未実行に戻して updated_at を更新するため、他のプロセスが同時に取り戻すことはない
+
+    Returns:
+        (id, job_id, asset_id, input_key, post_id, creator_user_id, authenticated_flg) の行
+    """
+    unfinished = MediaRenditionJobs.status.in_(
+        [MediaRenditionJobStatus.PENDING, MediaRenditionJobStatus.PROGRESSING]
+    )
+    unfinished_job_ids = select(MediaRenditionJobs.job_id).where(
+        MediaRenditionJobs.backend == MediaRenditionJobBackend.IMAGE_PIPELINE,
+        unfinished,
+    )
+    # 完了した画像の更新も進捗とみなすため、job_id の全行の最終更新で判定する
+    stale_job_ids = (
+        select(MediaRenditionJobs.job_id)
+        .where(MediaRenditionJobs.job_id.in_(unfinished_job_ids))
+        .group_by(MediaRenditionJobs.job_id)
+        .having(func.max(MediaRenditionJobs.updated_at) < func.now() - timedelta(seconds=stale_after_sec))
+        .limit(limit)
+    )
+    claimed_ids = db.scalars(
+        select(MediaRenditionJobs.id)
+        .where(
+            MediaRenditionJobs.backend == MediaRenditionJobBackend.IMAGE_PIPELINE,
+            unfinished,
+            MediaRenditionJobs.job_id.in_(stale_job_ids),
+        )
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not claimed_ids:
+        return []
+    update_media_rendition_jobs_status(db, claimed_ids, MediaRenditionJobStatus.PENDING)
+    return db.execute(
+        select(
+            MediaRenditionJobs.id,
+            MediaRenditionJobs.job_id,
+            MediaRenditionJobs.asset_id,
+            MediaRenditionJobs.input_key,
+            MediaAssets.post_id,
+            Posts.creator_user_id,
+            Posts.authenticated_flg,
+        )
+        .join(MediaAssets, MediaAssets.id == MediaRenditionJobs.asset_id)
+        .join(Posts, Posts.id == MediaAssets.post_id)
+        .where(MediaRenditionJobs.id.in_(claimed_ids))
+    ).all()
+
+
+def get_media_rendition_jobs_by_job_id(db: Session, job_id: str) -> List[MediaRenditionJobs]:
+    """
+    job_id に紐づくメディアレンディションジョブ取得
+    """
+    return db.query(MediaRenditionJobs).filter(MediaRenditionJobs.job_id == job_id).all()
@@ -1,7 +1,7 @@
 # app/crud/message_assets_crud.py
 from sqlalchemy.orm import Session
 from uuid import UUID
-from typing import Optional, List, Tuple
+from typing import Dict, Iterable, Optional, List, Tuple
 from datetime import datetime
 from app.models.message_assets import MessageAssets
 from app.constants.enums import MessageAssetStatus, ConversationMessageStatus, ConversationMessageType
@@ -71,6 +71,35 @@ def get_message_assets_by_message_id(db: Session, message_id: UUID) -> list[Mess
     return db.query(MessageAssets).filter(MessageAssets.message_id == message_id).all()
 
 
+def get_message_assets_by_message_ids(
+    db: Session, message_ids: Iterable[UUID]
+) -> Dict[UUID, List[MessageAssets]]:
+    """
+    複数メッセージのアセットを 1 クエリでまとめて取得（メッセージ一覧用）
+
+    Args:
+        db: データベースセッション
+        message_ids: メッセージIDのリスト
+
+    Returns:
+        {message_id: MessageAssetsオブジェクトのリスト（作成順）}
+    """
+    message_ids = list(set(message_ids))
+    if not message_ids:
+        return {}
+
+    assets = (
+        db.query(MessageAssets)
+        .filter(MessageAssets.message_id.in_(message_ids))
+        .order_by(MessageAssets.created_at, MessageAssets.id)
+        .all()
+    )
+    assets_by_message: Dict[UUID, List[MessageAssets]] = {}
+    for asset in assets:
+        assets_by_message.setdefault(asset.message_id, []).append(asset)
+    return assets_by_message
+
+
 def get_pending_message_assets(
     db: Session, skip: int = 0, limit: int = 50
 ) -> list[MessageAssets]:
@@ -0,0 +1,246 @@
+from datetime import timedelta
+from typing import Dict, Iterable, List, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, event, func, insert, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.constants.enums import NotificationOutboxEventType, NotificationOutboxStatus
+from app.models.notification_outbox import NotificationOutbox, NotificationOutboxRecipients
+
+# (outbox_id, user_id)
+RecipientKey = Tuple[UUID, UUID]
+
+_SESSION_ENQUEUED_KEY = "notification_outbox_enqueued"
+
+# commit 後に呼ぶディスパッチャーの起床関数（ディスパッチャー起動時に登録される）
+_on_enqueued_committed = None
+
+
+def enqueue(db: Session, event_type: int, payload: dict) -> NotificationOutbox:
+    """
+    アウトボックスに通知イベントを積む（commit しない。呼び出し元のトランザクションと一緒に確定する）
+    """
+    entry = NotificationOutbox(
+        event_type=event_type,
+        payload=payload,
+        status=NotificationOutboxStatus.PENDING,
+    )
+    db.add(entry)
+    db.info[_SESSION_ENQUEUED_KEY] = True
+    return entry
+
+
+def _new_message_payload(message, message_preview: str | None) -> dict:
+    return {
+        "message_id": str(message.id),
+        "conversation_id": str(message.conversation_id),
+        "sender_user_id": str(message.sender_user_id),
+        "message_preview": message_preview,
+    }
+
+
+def enqueue_new_message(db: Session, message, message_preview: str | None) -> NotificationOutbox:
+    """
+    DM新着メッセージの通知（アプリ内通知・メール・Web Push）を積む
+    """
+    return enqueue(
+        db,
+        NotificationOutboxEventType.NEW_MESSAGE,
+        _new_message_payload(message, message_preview),
+    )
+
+
+def enqueue_new_messages(db: Session, messages: Iterable, message_preview: str | None) -> None:
+    """
+    DM新着メッセージの通知をまとめて積む（一斉送信用。一括 INSERT で commit しない）
+    """
+    rows = [
+        {
+            "event_type": NotificationOutboxEventType.NEW_MESSAGE,
+            "payload": _new_message_payload(message, message_preview),
+            "status": NotificationOutboxStatus.PENDING,
+        }
+        for message in messages
+    ]
+    if not rows:
+        return
+    db.execute(insert(NotificationOutbox), rows)
+    db.info[_SESSION_ENQUEUED_KEY] = True
+
+
+def set_enqueued_listener(callback) -> None:
+    """アウトボックスへの追加が commit されたときに呼ぶ関数を登録する"""
+    global _on_enqueued_committed
+    _on_enqueued_committed = callback
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session: Session) -> None:
+    if session.info.pop(_SESSION_ENQUEUED_KEY, False) and _on_enqueued_committed:
+        _on_enqueued_committed()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop(_SESSION_ENQUEUED_KEY, None)
+
+
+def claim_batch(db: Session, limit: int, stale_after_sec: int) -> List[NotificationOutbox]:
+    """
+    処理対象の行を最大 limit 件取り出して処理中にする（commit する）
+
+    FOR UPDATE SKIP LOCKED で取り出すため、複数ワーカー・複数プロセスで同時に実行してよい。
+    処理中のまま stale_after_sec を過ぎた行（ワーカー停止等）も取り戻す
+    """
+    claimable = (
+        select(NotificationOutbox.id)
+        .where(
+            or_(
+                and_(
+                    NotificationOutbox.status == NotificationOutboxStatus.PENDING,
+                    NotificationOutbox.available_at <= func.now(),
+                ),
+                and_(
+                    NotificationOutbox.status == NotificationOutboxStatus.PROCESSING,
+                    NotificationOutbox.locked_at < func.now() - timedelta(seconds=stale_after_sec),
+                ),
+            )
+        )
+        .order_by(NotificationOutbox.available_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    entries = db.scalars(
+        update(NotificationOutbox)
+        .where(NotificationOutbox.id.in_(claimable))
+        .values(
+            status=NotificationOutboxStatus.PROCESSING,
+            locked_at=func.now(),
+            attempts=NotificationOutbox.attempts + 1,
+            updated_at=func.now(),
+        )
+        .returning(NotificationOutbox)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    return entries
+
+
+def mark_done(db: Session, entry_ids: Iterable[UUID]) -> None:
+    """処理済みにする（commit する）"""
+    entry_ids = list(entry_ids)
+    if not entry_ids:
+        return
+    db.execute(
+        update(NotificationOutbox)
+        .where(NotificationOutbox.id.in_(entry_ids))
+        .values(
+            status=NotificationOutboxStatus.DONE,
+            locked_at=None,
+            last_error=None,
+            updated_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def mark_failed(
+    db: Session,
+    entries: Iterable[NotificationOutbox],
+    error: str,
+    max_attempts: int,
+    retry_base_sec: int,
+) -> None:
+    """
+    失敗を記録する（commit する）
+
+    リトライ上限までは指数バックオフで available_at を後ろにずらして未処理に戻す
+    """
+    for entry in entries:
+        give_up = entry.attempts >= max_attempts
+        delay = retry_base_sec * (2 ** max(entry.attempts - 1, 0))
+        db.execute(
+            update(NotificationOutbox)
+            .where(NotificationOutbox.id == entry.id)
+            .values(
+                status=NotificationOutboxStatus.FAILED
+                if give_up
+                else NotificationOutboxStatus.PENDING,
+                available_at=func.now() + timedelta(seconds=delay),
+                locked_at=None,
+                last_error=error[:2000],
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+
+
+def add_recipients(db: Session, keys: Iterable[RecipientKey]) -> Set[RecipientKey]:
+    """
+    受信者ごとの進捗行を作る（commit しない）
+
+    (outbox_id, user_id) の一意制約で既存の行は無視するため、リトライ時は何も作られない。
+    アプリ内通知は戻り値（今回作成できた受信者）の分だけ、同じトランザクションで作成する
+
+    Returns:
+        今回新たに作成した (outbox_id, user_id)
+    """
+    rows = [{"outbox_id": outbox_id, "user_id": user_id} for outbox_id, user_id in set(keys)]
+    if not rows:
+        return set()
+    result = db.execute(
+        pg_insert(NotificationOutboxRecipients)
+        .values(rows)
+        .on_conflict_do_nothing(constraint="uq_notification_outbox_recipients_user")
+        .returning(NotificationOutboxRecipients.outbox_id, NotificationOutboxRecipients.user_id)
+    )
+    return {(row.outbox_id, row.user_id) for row in result}
+
+
+def get_recipient_progress(
+    db: Session, outbox_ids: Iterable[UUID]
+) -> Dict[RecipientKey, NotificationOutboxRecipients]:
+    """受信者ごとの進捗を (outbox_id, user_id) をキーにして取得する"""
+    outbox_ids = list(outbox_ids)
+    if not outbox_ids:
+        return {}
+    return {
+        (row.outbox_id, row.user_id): row
+        for row in db.scalars(
+            select(NotificationOutboxRecipients).where(
+                NotificationOutboxRecipients.outbox_id.in_(outbox_ids)
+            )
+        )
+    }
+
+
+def mark_recipients_email_done(db: Session, keys: Iterable[RecipientKey]) -> None:
+    """メール送信済みにする（commit しない）"""
+    _mark_recipients(db, keys, email_done=True)
+
+
+def mark_recipients_push_done(db: Session, keys: Iterable[RecipientKey]) -> None:
+    """Web Push 送信済みにする（commit しない）"""
+    _mark_recipients(db, keys, push_done=True)
+
+
+def _mark_recipients(db: Session, keys: Iterable[RecipientKey], **values) -> None:
+    keys = list(keys)
+    if not keys:
+        return
+    db.execute(
+        update(NotificationOutboxRecipients)
+        .where(
+            tuple_(
+                NotificationOutboxRecipients.outbox_id,
+                NotificationOutboxRecipients.user_id,
+            ).in_(keys)
+        )
+        .values(**values, updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
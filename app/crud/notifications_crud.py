@@ -257,6 +257,23 @@ def add_notification_for_message_asset_rejection(
         pass
 
 
+def new_message_notification_payload(
+    sender_profile_name: str,
+    sender_avatar_url: Optional[str],
+    message_preview: str,
+    conversation_id: UUID,
+) -> dict:
+    """新着メッセージ通知の payload"""
+    return {
+        "type": "message",
+        "title": "新しいメッセージが届きました",
+        "subtitle": f"{sender_profile_name}さんからメッセージが届きました",
+        "message": message_preview,
+        "avatar": sender_avatar_url or "https://logo.mijfans.jp/bimi/logo.svg",
+        "redirect_url": f"/message/conversation/{conversation_id}",
+    }
+
+
 def add_notification_for_new_message(
     db: Session,
     recipient_user_id: UUID,
@@ -280,14 +297,9 @@ def add_notification_for_new_message(
         notification = Notifications(
             user_id=recipient_user_id,
             type=NotificationType.USERS,
-            payload={
-                "type": "message",
-                "title": "新しいメッセージが届きました",
-                "subtitle": f"{sender_profile_name}さんからメッセージが届きました",
-                "message": message_preview,
-                "avatar": sender_avatar_url or "https://logo.mijfans.jp/bimi/logo.svg",
-                "redirect_url": f"/message/conversation/{conversation_id}",
-            },
+            payload=new_message_notification_payload(
+                sender_profile_name, sender_avatar_url, message_preview, conversation_id
+            ),
             is_read=False,
             created_at=datetime.now(timezone.utc),
             updated_at=datetime.now(timezone.utc),
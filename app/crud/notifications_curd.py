@@ -4,8 +4,10 @@ from typing import Optional
 from uuid import UUID
 from sqlalchemy import asc, desc, func, or_, update, cast as sa_cast
 from sqlalchemy.dialects.postgresql import JSONB
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+from app.db.pagination import SortKey, count_cap_for, count_up_to, paginate_by_cursor
 from app.models import Users
 from app.models.notifications import Notifications
 from app.schemas.notification import NotificationCreateRequest, NotificationType
@@ -120,10 +122,21 @@ def update_notification_admin(
 
 
 def get_notifications_paginated(
-    db: Session, user: Users, type: NotificationType, page: int = 1, limit: int = 20
-) -> tuple[List[Notifications], int]:
+    db: Session,
+    user: Users,
+    type: NotificationType,
+    page: int = 1,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> tuple[List[Notifications], int, bool, bool, Optional[str]]:
     """
     通知をページングで取得
+
+    cursor 指定時は (created_at, id) のキーセットで続きを取得する（page は無視）。
+    総件数は page 指定時は正確に、cursor 指定時は上限付きで数える
+
+    Returns:
+        (通知リスト, 総件数, 総件数を打ち切ったかどうか, 次ページの有無, 次ページのカーソル)
     """
     try:
         skip = (page - 1) * limit
@@ -144,7 +157,6 @@ def get_notifications_paginated(
                     # Notifications.target_role.in_(target_role),
                     # Notifications.created_at >= user.created_at
                 )
-                .order_by(desc(Notifications.created_at))
             )
         elif type == NotificationType.USERS:
             query = (
@@ -154,7 +166,6 @@ def get_notifications_paginated(
                     Notifications.type == type,
                     Notifications.created_at >= user.created_at,
                 )
-                .order_by(desc(Notifications.created_at))
             )
         elif type == NotificationType.PAYMENTS:
             query = (
@@ -164,7 +175,6 @@ def get_notifications_paginated(
                     Notifications.type == type,
                     Notifications.created_at >= user.created_at,
                 )
-                .order_by(desc(Notifications.created_at))
             )
         elif type == NotificationType.ALL:
             query = (
@@ -190,15 +200,22 @@ def get_notifications_paginated(
                         ),
                     ),
                 )
-                .order_by(desc(Notifications.created_at))
             )
-        total = query.count()
-        notifications = query.offset(skip).limit(limit).all()
-        has_next = (skip + limit) < total
-        return notifications, total, has_next
+        total, total_is_capped = count_up_to(db, query, count_cap_for(cursor))
+        notifications, next_cursor = paginate_by_cursor(
+            query,
+            [SortKey(Notifications.created_at), SortKey(Notifications.id)],
+            limit,
+            cursor=cursor,
+            cursor_values=lambda n: (n.created_at, n.id),
+            offset=skip,
+        )
+        return notifications, total, total_is_capped, next_cursor is not None, next_cursor
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Get notifications paginated error: {e}")
-        return [], 0, False
+        return [], 0, False, False, None
 
 
 def mark_notification_as_read(
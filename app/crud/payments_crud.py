@@ -4,13 +4,33 @@ Payments CRUD操作
 from uuid import UUID
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
+from app.crud.engagement_stats_crud import add_post_purchase_delta_by_price_id
 from app.models.payments import Payments
 from datetime import datetime, timezone
 from app.models.providers import Providers
-from app.constants.enums import PaymentType, PaymentStatus
+from app.constants.enums import PaymentType, PaymentStatus, ItemType
 from typing import List, Optional, Tuple
 from sqlalchemy import func
 
+def resolve_order_reference_ids(
+    order_type: Optional[int], order_id: Optional[str]
+) -> Tuple[Optional[UUID], Optional[UUID]]:
+    """
+    order_type / order_id から型付きの (price_id, plan_id) を求める
+
+    order_type: 1=price_id（単品）, 2=plan_id（サブスク）
+    チップなど UUID でない order_id の場合は (None, None)
+    """
+    if not order_id or order_type not in (ItemType.POST, ItemType.PLAN):
+        return None, None
+    try:
+        reference_id = UUID(str(order_id))
+    except ValueError:
+        return None, None
+    if order_type == ItemType.PLAN:
+        return None, reference_id
+    return reference_id, None
+
 def create_payment(
     db: Session,
     transaction_id: UUID,
@@ -28,11 +48,14 @@ def create_payment(
     paid_at: Optional[datetime] = datetime.now(timezone.utc),  # Noneの場合は設定しない
 ) -> Payments:
     """決済履歴作成"""
+    price_id, plan_id = resolve_order_reference_ids(order_type, order_id)
     payment_data = {
         "transaction_id": transaction_id,
         "payment_type": payment_type,
         "order_id": order_id,
         "order_type": order_type,
+        "price_id": price_id,
+        "plan_id": plan_id,
         "provider_id": provider_id,
         "provider_payment_id": provider_payment_id,
         "buyer_user_id": buyer_user_id,
@@ -49,6 +72,8 @@ def create_payment(
     
     payment = Payments(**payment_data)
     db.add(payment)
+    if status == PaymentStatus.SUCCEEDED:
+        add_post_purchase_delta_by_price_id(db, price_id, 1)
     db.commit()
     db.refresh(payment)
     return payment
@@ -65,11 +90,14 @@ def create_free_payment(
     platform_fee: int = 0,
 ) -> Payments:
     """0円プラン・商品用の決済履歴作成（transaction_id, provider関連はNULL）"""
+    price_id, plan_id = resolve_order_reference_ids(order_type, order_id)
     payment = Payments(
         transaction_id=None,  # 0円なのでtransaction不要
         payment_type=payment_type,
         order_id=order_id,
         order_type=order_type,
+        price_id=price_id,
+        plan_id=plan_id,
         provider_id=None,  # 0円なのでプロバイダーなし
         provider_payment_id=None,  # 0円なのでプロバイダー決済IDなし
         buyer_user_id=buyer_user_id,
@@ -81,6 +109,7 @@ def create_free_payment(
         platform_fee=platform_fee,
     )
     db.add(payment)
+    add_post_purchase_delta_by_price_id(db, price_id, 1)
     db.flush()
     return payment
 
@@ -145,6 +174,11 @@ def update_payment_status_by_transaction_id(
     payment = db.query(Payments).filter(Payments.transaction_id == transaction_id).first()
     if not payment:
         raise HTTPException(status_code=404, detail="Payment not found")
+    # 成功状態への遷移/成功状態からの遷移（返金等）で購入数を増減
+    was_succeeded = payment.status == PaymentStatus.SUCCEEDED
+    is_succeeded = status == PaymentStatus.SUCCEEDED
+    if was_succeeded != is_succeeded:
+        add_post_purchase_delta_by_price_id(db, payment.price_id, 1 if is_succeeded else -1)
     payment.status = status
     payment.payment_amount = payment_amount
     payment.payment_price = payment_price
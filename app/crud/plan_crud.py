@@ -26,7 +26,7 @@ from app.models.social import Likes, Comments
 from app.models.prices import Prices
 from app.api.commons.utils import get_video_duration
 from app.models.user import Users
-from sqlalchemy import func, and_, String
+from sqlalchemy import func, and_
 from app.constants.function import CommonFunction
 from app.models.payments import Payments
 from app.core.logger import Logger
@@ -819,7 +819,7 @@ def get_single_purchases_by_user_id(
             Prices.price.label("purchase_price"),
             Subscriptions.created_at.label("purchase_created_at"),
         )
-        .join(Prices, Subscriptions.order_id == func.cast(Prices.id, String))
+        .join(Prices, Subscriptions.price_id == Prices.id)
         .join(Posts, Prices.post_id == Posts.id)
         .join(Users, Posts.creator_user_id == Users.id)
         .join(Profiles, Users.id == Profiles.user_id)
@@ -3,7 +3,6 @@ import os
 from fastapi import HTTPException
 from sqlalchemy.orm import Session, aliased
 from sqlalchemy import (
-    cast,
     distinct,
     func,
     desc,
@@ -13,9 +12,11 @@ from sqlalchemy import (
     Text,
     or_,
     case,
+    literal,
+    select,
 )
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.sql.expression import or_ as sa_or, and_ as sa_and
+from app.crud.engagement_stats_crud import get_post_likes_count
 from app.crud.push_noti_crud import push_notification_to_user
 from app.crud.subscriptions_crud import check_viewing_rights
 from app.crud.time_sale_crud import (
@@ -28,6 +29,7 @@ from app.models import Payments, UserSettings
 from app.models.genres import Genres
 from app.models.notifications import Notifications
 from app.models.posts import Posts
+from app.models.post_stats import PostStats
 from app.models.social import Follows, Likes, Bookmarks, Comments
 from uuid import UUID
 from datetime import datetime, timezone, timedelta
@@ -51,14 +53,26 @@ from app.models.plans import Plans, PostPlans
 from app.models.prices import Prices
 from app.models.media_rendition_jobs import MediaRenditionJobs
 from app.models.subscriptions import Subscriptions
-from app.constants.enums import PostType, SubscriptionType, SubscriptionStatus
+from app.constants.enums import PostType, SubscriptionType, SubscriptionStatus, RankingPeriod
 from app.schemas.user_settings import UserSettingsType
 from app.services.email.send_email import (
     send_post_approval_email,
     send_post_rejection_email,
 )
-from app.services.s3.presign import presign_get
+from app.services.s3.presign import presign_get_many
+from app.core.config import settings
 from app.core.logger import Logger
+from app.db.pagination import decode_cursor
+from app.crud.post_ranking_snapshot_crud import (
+    get_fresh_snapshot_periods,
+    get_post_ranking_snapshot_heads,
+    get_post_ranking_snapshot_page,
+    group_ranking_rows,
+    ranking_rows_query,
+    replace_post_ranking_snapshots,
+    try_lock_post_ranking_snapshot,
+)
+from app.constants.function import CommonFunction
 
 logger = Logger.get_logger()
 # エイリアスを定義
@@ -106,10 +120,10 @@ def get_total_likes_by_user_id(db: Session, user_id: UUID) -> int:
     ユーザーの投稿についた総合いいね数を取得
     """
 
-    # いいねテーブルと結合していいね数を取得
+    # 投稿ごとのいいね数カウンタを合算
     total_likes = (
-        db.query(func.count(Likes.post_id))
-        .join(Posts, Likes.post_id == Posts.id)
+        db.query(func.sum(PostStats.likes_count))
+        .join(Posts, PostStats.post_id == Posts.id)
         .filter(Posts.creator_user_id == user_id)
         .filter(Posts.deleted_at.is_(None))  # 削除されていない投稿のみ
         .scalar()
@@ -305,7 +319,7 @@ def _build_post_status_query(
         .join(
             Payments,
             (Payments.order_type == 1)
-            & (cast(Payments.order_id, PG_UUID(as_uuid=True)) == Prices.id),
+            & (Payments.price_id == Prices.id),
         )
         .filter(Payments.status == PaymentStatus.SUCCEEDED)
         .group_by(Prices.post_id)
@@ -873,7 +887,7 @@ def get_bought_posts_by_user_id(db: Session, user_id: UUID) -> List[tuple]:
         .select_from(Subscriptions)
         .join(
             Prices,
-            Prices.id == func.cast(Subscriptions.order_id, PG_UUID(as_uuid=True)),
+            Prices.id == Subscriptions.price_id,
         )
         .filter(valid_subscription_filter)
         .filter(Subscriptions.order_type == SubscriptionType.PLAN)
@@ -887,7 +901,7 @@ def get_bought_posts_by_user_id(db: Session, user_id: UUID) -> List[tuple]:
         )
         .select_from(Subscriptions)
         .join(
-            Plans, Plans.id == func.cast(Subscriptions.order_id, PG_UUID(as_uuid=True))
+            Plans, Plans.id == Subscriptions.plan_id
         )
         .join(PostPlans, PostPlans.plan_id == Plans.id)
         .filter(valid_subscription_filter)
@@ -1152,7 +1166,7 @@ def get_ranking_posts_overall_monthly(db: Session, limit: int = 50):
     """
     月間でいいね数が多い投稿を取得
     """
-    one_month_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    one_month_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=30)
 
     now = func.now()
     active_post_cond = and_(
@@ -1214,7 +1228,7 @@ def get_ranking_posts_overall_weekly(db: Session, limit: int = 50):
     """
     週間でいいね数が多い投稿を取得
     """
-    one_week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    one_week_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=7)
     now = func.now()
     active_post_cond = and_(
         Posts.status == PostStatus.APPROVED,
@@ -1276,7 +1290,7 @@ def get_ranking_posts_overall_daily(db: Session, limit: int = 50):
     """
     日間でいいね数が多い投稿を取得
     """
-    one_day_ago = datetime.now(timezone.utc) - timedelta(days=1)
+    one_day_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=1)
     now = func.now()
     active_post_cond = and_(
         Posts.status == PostStatus.APPROVED,
@@ -1441,10 +1455,7 @@ def _get_post_categories(db: Session, post_id: str) -> list:
 
 def _get_likes_count(db: Session, post_id: str) -> int:
     """投稿のいいね数を取得"""
-    return (
-        db.query(func.count(Likes.post_id)).filter(Likes.post_id == post_id).scalar()
-        or 0
-    )
+    return get_post_likes_count(db, post_id)
 
 
 def _get_sale_info(db: Session, post_id: str) -> dict:
@@ -1607,6 +1618,28 @@ def _get_media_info_for_creator(db: Session, post_id: str, status: int) -> dict:
     ogp_image = None
     images = []
     upload_flg = True if status != PostStatus.APPROVED else False
+    presign_image_statuses = [
+        MediaAssetStatus.PENDING,
+        MediaAssetStatus.RESUBMIT,
+        MediaAssetStatus.CONVERTING,
+    ]
+
+    # 署名付きURLが必要なキーは 1 つのクライアントでまとめて署名する
+    presigned_urls = {}
+    if upload_flg:
+        presigned_urls = presign_get_many(
+            "ingest",
+            [
+                media_asset.storage_key
+                for media_asset in media_assets
+                if media_asset.kind
+                in (MediaAssetKind.SAMPLE_VIDEO, MediaAssetKind.MAIN_VIDEO)
+                or (
+                    media_asset.kind == MediaAssetKind.IMAGES
+                    and media_asset.status in presign_image_statuses
+                )
+            ],
+        )
 
     for media_asset in media_assets:
         if media_asset.kind == MediaAssetKind.THUMBNAIL:
@@ -1617,8 +1650,7 @@ def _get_media_info_for_creator(db: Session, post_id: str, status: int) -> dict:
             }
         elif media_asset.kind == MediaAssetKind.SAMPLE_VIDEO:
             if upload_flg:
-                presign_url = presign_get("ingest", media_asset.storage_key)
-                sample_video_url = presign_url["download_url"]
+                sample_video_url = presigned_urls.get(media_asset.storage_key)
             else:
                 sample_video_url = f"{MEDIA_CDN_URL}/{media_asset.storage_key}"
 
@@ -1631,8 +1663,7 @@ def _get_media_info_for_creator(db: Session, post_id: str, status: int) -> dict:
             }
         elif media_asset.kind == MediaAssetKind.MAIN_VIDEO:
             if upload_flg:
-                presign_url = presign_get("ingest", media_asset.storage_key)
-                main_video_url = presign_url["download_url"]
+                main_video_url = presigned_urls.get(media_asset.storage_key)
             else:
                 main_video_url = f"{MEDIA_CDN_URL}/{media_asset.storage_key}"
 
@@ -1644,13 +1675,8 @@ def _get_media_info_for_creator(db: Session, post_id: str, status: int) -> dict:
                 "reject_comments": media_asset.reject_comments,
             }
         elif media_asset.kind == MediaAssetKind.IMAGES:
-            if upload_flg and media_asset.status in [
-                MediaAssetStatus.PENDING,
-                MediaAssetStatus.RESUBMIT,
-                MediaAssetStatus.CONVERTING,
-            ]:
-                presign_url = presign_get("ingest", media_asset.storage_key)
-                image_url = presign_url["download_url"]
+            if upload_flg and media_asset.status in presign_image_statuses:
+                image_url = presigned_urls.get(media_asset.storage_key)
             else:
                 image_url = f"{MEDIA_CDN_URL}/{media_asset.storage_key}_1080w.webp"
             images.append(
@@ -1857,7 +1883,7 @@ def get_ranking_creators_overall_daily(db: Session, limit: int = 500):
     """
     いいね数が多いCreator daily
     """
-    one_day_ago = datetime.now(timezone.utc) - timedelta(days=1)
+    one_day_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=1)
     return (
         db.query(
             Users,
@@ -1892,7 +1918,7 @@ def get_ranking_creators_overall_weekly(db: Session, limit: int = 500):
     """
     いいね数が多いCreator weekly
     """
-    one_week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    one_week_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=7)
     return (
         db.query(
             Users,
@@ -1927,7 +1953,7 @@ def get_ranking_creators_overall_monthly(db: Session, limit: int = 500):
     """
     いいね数が多いCreator monthly
     """
-    one_month_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    one_month_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=30)
     return (
         db.query(
             Users,
@@ -2001,7 +2027,7 @@ def get_ranking_creators_overall_detail_daily(
     """
     いいね数が多いCreator daily
     """
-    one_day_ago = datetime.now(timezone.utc) - timedelta(days=1)
+    one_day_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=1)
     offset = (page - 1) * limit
     return (
         db.query(
@@ -2040,7 +2066,7 @@ def get_ranking_creators_overall_detail_weekly(
     """
     いいね数が多いCreator weekly
     """
-    one_week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    one_week_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=7)
     offset = (page - 1) * limit
     return (
         db.query(
@@ -2079,7 +2105,7 @@ def get_ranking_creators_overall_detail_monthly(
     """
     いいね数が多いCreator monthly
     """
-    one_month_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    one_month_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=30)
     offset = (page - 1) * limit
     return (
         db.query(
@@ -2532,7 +2558,7 @@ def get_ranking_posts_detail_categories_daily(
     """
     各ジャンルでいいね数が多い投稿を取得 Daily
     """
-    one_day_ago = datetime.now(timezone.utc) - timedelta(days=1)
+    one_day_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=1)
     offset = (page - 1) * limit
 
     now = func.now()
@@ -2629,7 +2655,7 @@ def get_ranking_posts_detail_categories_weekly(
     """
     各ジャンルでいいね数が多い投稿を取得 Weekly
     """
-    one_week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    one_week_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=7)
     offset = (page - 1) * limit
 
     now = func.now()
@@ -2726,7 +2752,7 @@ def get_ranking_posts_detail_categories_monthly(
     """
     各ジャンルでいいね数が多い投稿を取得 Monthy
     """
-    one_month_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    one_month_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=30)
     offset = (page - 1) * limit
 
     now = func.now()
@@ -2942,7 +2968,7 @@ def get_ranking_posts_categories_daily(db: Session, limit: int = 50):
     """
     各カテゴリーでいいね数が多い投稿を取得 Daily
     """
-    one_day_ago = datetime.now(timezone.utc) - timedelta(days=1)
+    one_day_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=1)
 
     now = func.now()
     active_post_cond = and_(
@@ -3068,7 +3094,7 @@ def get_ranking_posts_categories_weekly(db: Session, limit: int = 50):
     """
     各カテゴリーでいいね数が多い投稿を取得 Weekly
     """
-    one_week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    one_week_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=7)
 
     now = func.now()
     active_post_cond = and_(
@@ -3194,7 +3220,7 @@ def get_ranking_posts_categories_monthly(db: Session, limit: int = 50):
     """
     各カテゴリーでいいね数が多い投稿を取得 Monthly
     """
-    one_month_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    one_month_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=30)
 
     now = func.now()
     active_post_cond = and_(
@@ -3384,7 +3410,7 @@ def get_ranking_posts_detail_overall_monthly(
     """
     月間でいいね数が多い投稿を取得
     """
-    one_month_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    one_month_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=30)
     now = func.now()
     active_post_cond = and_(
         Posts.status == PostStatus.APPROVED,
@@ -3448,7 +3474,7 @@ def get_ranking_posts_detail_overall_weekly(
     """
     週間でいいね数が多い投稿を取得
     """
-    one_week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    one_week_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=7)
     now = func.now()
     active_post_cond = and_(
         Posts.status == PostStatus.APPROVED,
@@ -3513,7 +3539,7 @@ def get_ranking_posts_detail_overall_daily(
     """
     日間でいいね数が多い投稿を取得
     """
-    one_day_ago = datetime.now(timezone.utc) - timedelta(days=1)
+    one_day_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=1)
     now = func.now()
     active_post_cond = and_(
         Posts.status == PostStatus.APPROVED,
@@ -3957,351 +3983,372 @@ def mark_post_as_deleted(db: Session, post_id: str, user_id: str):
     return True
 
 
+def _get_post_ranking_overall_live(
+    db: Session, period: str, limit: int, after_rank: int
+):
+    """
+    スナップショットを使わずにその場で集計する（スナップショットと同じ共通 CTE を 1 期間分だけ使う）
+    """
+    period_rows_sq = _build_post_ranking_period_rows_sq(
+        db, (period,), max_rank=after_rank + limit, after_rank=after_rank
+    )
+    return ranking_rows_query(db, period_rows_sq).limit(limit).all()
+
+
+def _set_time_sale_flags(db: Session, rows: list) -> None:
+    post_ids = [row[0].id for row in rows]
+    post_sale_map = get_post_sale_flag_map(db, post_ids)
+    for row in rows:
+        row[0].is_time_sale = bool(post_sale_map.get(row[0].id, False))
+
+
 def get_post_ranking_overall(
-    db: Session, limit: int = 20, period: str = "all_time", page: int = 1
+    db: Session,
+    limit: int = 20,
+    period: str = "all_time",
+    page: int = 1,
+    after_rank: int | None = None,
+    cursor: str | None = None,
 ):
     """
     Phase1: best post per creator (unique creators)
     Phase2: remaining posts by old logic (exclude post_ids from phase1)
     Pagination applies to the combined list: [phase1 ...] + [phase2 ...]
+
+    有効なスナップショットがあれば (period, rank) のキーセットで読み、
+    なければライブ集計する。cursor（前ページ最終行の rank）/ after_rank を渡すと page より優先される。
     """
+    if cursor:
+        (after_rank,) = decode_cursor(cursor, 1)
+    if period not in RankingPeriod.ALL:
+        period = RankingPeriod.ALL_TIME
 
     # ---------- pagination
     if page < 1:
         page = 1
     if limit < 1:
         limit = 20
-    offset = (page - 1) * limit
+    if after_rank is None or after_rank < 0:
+        after_rank = (page - 1) * limit
 
-    # ---------- time + active post
-    now_sql = func.now()
-    now = datetime.now(timezone.utc)
-    active_post_cond = sa_and(
-        Posts.status == PostStatus.APPROVED,
-        Posts.deleted_at.is_(None),
-        sa_or(Posts.scheduled_at.is_(None), Posts.scheduled_at <= now_sql),
-        sa_or(Posts.expiration_at.is_(None), Posts.expiration_at > now_sql),
-    )
+    if settings.POST_RANKING_SNAPSHOT_ENABLED and period in get_fresh_snapshot_periods(
+        db, [period]
+    ):
+        rows = get_post_ranking_snapshot_page(db, period, limit, after_rank)
+    else:
+        rows = _get_post_ranking_overall_live(db, period, limit, after_rank)
 
-    PAYMENT_SUCCEEDED = PaymentStatus.SUCCEEDED
-    ORDER_TYPE_PLAN = PaymentType.PLAN
-    ORDER_TYPE_PRICE = PaymentType.SINGLE
-    MIN_PAYMENT_PRICE = 500
+    # ---------- time sale flag
+    _set_time_sale_flags(db, rows)
 
-    # ---------- period rolling window (UTC naive)
-    start_dt = None
-    if period == "daily":
-        start_dt = now - timedelta(days=1)
-    elif period == "weekly":
-        start_dt = now - timedelta(days=7)
-    elif period == "monthly":
-        start_dt = now - timedelta(days=30)
-    # all_time => None
+    return rows
+
+
+# 期間ごとのローリングウィンドウ（日数）。all_time は期間制限なし
+RANKING_PERIOD_DAYS = {
+    RankingPeriod.DAILY: 1,
+    RankingPeriod.WEEKLY: 7,
+    RankingPeriod.MONTHLY: 30,
+}
+
+
+def _build_post_ranking_multi_period_cte(db: Session, periods: tuple = RankingPeriod.ALL):
+    """
+    指定期間の購入数・ブックマーク数を 1 回の集計で求め、期間ごとの順位を付ける
+
+    スナップショット更新・トップの複数期間取得・ランキング詳細のページング（1 期間）で共通に使う
+
+    Returns:
+        period ごとに purchase_count_{period} / bookmark_count_{period} /
+        eligible_{period} / rank_{period} を持つ CTE
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    start_dts = {
+        period: now - timedelta(days=RANKING_PERIOD_DAYS[period])
+        for period in periods
+        if period in RANKING_PERIOD_DAYS
+    }
 
-    # ---------- base payment condition (for counting)
     base_payment_cond = sa_and(
-        Payments.status == PAYMENT_SUCCEEDED,
-        Payments.payment_price >= MIN_PAYMENT_PRICE,
+        Payments.status == PaymentStatus.SUCCEEDED,
+        Payments.payment_price >= 500,
         Payments.paid_at.isnot(None),
     )
-    if start_dt is not None:
-        base_payment_cond = sa_and(base_payment_cond, Payments.paid_at >= start_dt)
 
-    # ---------- purchase_count per post (price)
-    price_purchase_sq = (
-        db.query(
+    # ---------- purchases (price + plan) : 1 row / (post, payment)
+    payments_cte = union_all(
+        select(
             Prices.post_id.label("post_id"),
-            func.count(func.distinct(Payments.id)).label("purchase_count"),
-        )
-        .join(
+            Payments.id.label("payment_id"),
+            Payments.paid_at.label("paid_at"),
+        ).join(
             Payments,
             sa_and(
-                Payments.order_type == ORDER_TYPE_PRICE,
-                cast(Payments.order_id, PG_UUID(as_uuid=True)) == Prices.id,
+                Payments.order_type == PaymentType.SINGLE,
+                Payments.price_id == Prices.id,
                 base_payment_cond,
             ),
-        )
-        .group_by(Prices.post_id)
-        .subquery()
-    )
-
-    # ---------- purchase_count per post (plan)
-    plan_purchase_sq = (
-        db.query(
+        ),
+        select(
             PostPlans.post_id.label("post_id"),
-            func.count(func.distinct(Payments.id)).label("purchase_count"),
-        )
-        .join(
+            Payments.id.label("payment_id"),
+            Payments.paid_at.label("paid_at"),
+        ).join(
             Payments,
             sa_and(
-                Payments.order_type == ORDER_TYPE_PLAN,
-                cast(Payments.order_id, PG_UUID(as_uuid=True)) == PostPlans.plan_id,
+                Payments.order_type == PaymentType.PLAN,
+                Payments.plan_id == PostPlans.plan_id,
                 base_payment_cond,
             ),
+        ),
+    ).cte("ranking_payments")
+
+    purchase_count = func.count(distinct(payments_cte.c.payment_id))
+    purchase_sq = (
+        select(
+            payments_cte.c.post_id,
+            *[
+                purchase_count.label(f"purchase_count_{RankingPeriod.ALL_TIME}")
+                for period in periods
+                if period == RankingPeriod.ALL_TIME
+            ],
+            *[
+                purchase_count.filter(payments_cte.c.paid_at >= start_dt).label(
+                    f"purchase_count_{period}"
+                )
+                for period, start_dt in start_dts.items()
+            ],
         )
-        .group_by(PostPlans.post_id)
-        .subquery()
-    )
-
-    # ---------- merge purchases
-    union_sq = (
-        db.query(
-            price_purchase_sq.c.post_id.label("post_id"),
-            price_purchase_sq.c.purchase_count.label("purchase_count"),
-        )
-        .union_all(
-            db.query(
-                plan_purchase_sq.c.post_id.label("post_id"),
-                plan_purchase_sq.c.purchase_count.label("purchase_count"),
-            )
-        )
-        .subquery()
+        .group_by(payments_cte.c.post_id)
+        .subquery("purchase_sq")
     )
 
-    purchase_merged_sq = (
-        db.query(
-            union_sq.c.post_id.label("post_id"),
-            func.sum(union_sq.c.purchase_count).label("purchase_count"),
+    bookmark_count = func.count(distinct(Bookmarks.user_id))
+    bookmark_sq = (
+        select(
+            Bookmarks.post_id,
+            *[
+                bookmark_count.label(f"bookmark_count_{RankingPeriod.ALL_TIME}")
+                for period in periods
+                if period == RankingPeriod.ALL_TIME
+            ],
+            *[
+                bookmark_count.filter(Bookmarks.created_at >= start_dt).label(
+                    f"bookmark_count_{period}"
+                )
+                for period, start_dt in start_dts.items()
+            ],
         )
-        .group_by(union_sq.c.post_id)
-        .subquery()
+        .group_by(Bookmarks.post_id)
+        .subquery("bookmark_sq")
     )
 
-    # ---------- bookmark_count per post (within period if specified)
-    bookmark_q = db.query(
-        Bookmarks.post_id.label("post_id"),
-        func.count(func.distinct(Bookmarks.user_id)).label("bookmark_count"),
-    )
-    if start_dt is not None:
-        bookmark_q = bookmark_q.filter(Bookmarks.created_at >= start_dt)
-    bookmark_sq = bookmark_q.group_by(Bookmarks.post_id).subquery()
-
-    # ---------- activity OR filter (only for daily/weekly/monthly)
-    payment_activity_sq = None
-    bookmark_activity_sq = None
-    period_or_cond = None
-
-    if start_dt is not None:
-        price_paid_posts_sq = db.query(Prices.post_id.label("post_id")).join(
-            Payments,
-            sa_and(
-                Payments.order_type == ORDER_TYPE_PRICE,
-                cast(Payments.order_id, PG_UUID(as_uuid=True)) == Prices.id,
-                Payments.status == PAYMENT_SUCCEEDED,
-                Payments.paid_at.isnot(None),
-                Payments.paid_at >= start_dt,
-                Payments.payment_price >= MIN_PAYMENT_PRICE,
-            ),
-        )
-        plan_paid_posts_sq = db.query(PostPlans.post_id.label("post_id")).join(
-            Payments,
-            sa_and(
-                Payments.order_type == ORDER_TYPE_PLAN,
-                cast(Payments.order_id, PG_UUID(as_uuid=True)) == PostPlans.plan_id,
-                Payments.status == PAYMENT_SUCCEEDED,
-                Payments.paid_at.isnot(None),
-                Payments.paid_at >= start_dt,
-                Payments.payment_price >= MIN_PAYMENT_PRICE,
-            ),
-        )
-        payment_activity_sq = price_paid_posts_sq.union(plan_paid_posts_sq).subquery()
-
-        bookmark_activity_sq = (
-            db.query(Bookmarks.post_id.label("post_id"))
-            .filter(Bookmarks.created_at >= start_dt)
-            .subquery()
-        )
-
-        period_or_cond = sa_or(
-            payment_activity_sq.c.post_id.isnot(None),
-            bookmark_activity_sq.c.post_id.isnot(None),
-            Posts.created_at >= start_dt,
-        )
+    # ---------- metrics: 1 row / active post
+    metric_cols = []
+    for period in periods:
+        purchase = func.coalesce(purchase_sq.c[f"purchase_count_{period}"], 0)
+        bookmark = func.coalesce(bookmark_sq.c[f"bookmark_count_{period}"], 0)
+        metric_cols += [
+            purchase.label(f"purchase_count_{period}"),
+            bookmark.label(f"bookmark_count_{period}"),
+        ]
+        # 期間内に購入・ブックマーク・投稿のいずれかがあるものだけを対象にする
+        if period in start_dts:
+            eligible = sa_or(
+                purchase > 0, bookmark > 0, Posts.created_at >= start_dts[period]
+            )
+        else:
+            eligible = literal(True)
+        metric_cols.append(eligible.label(f"eligible_{period}"))
 
-    # ---------- base dataset: 1 row / post
-    base_q = (
-        db.query(
+    metrics_sq = (
+        select(
             Posts.id.label("post_id"),
             Posts.creator_user_id.label("creator_user_id"),
             Posts.created_at.label("created_at"),
-            func.coalesce(purchase_merged_sq.c.purchase_count, 0).label(
-                "purchase_count"
-            ),
-            func.coalesce(bookmark_sq.c.bookmark_count, 0).label("bookmark_count"),
-            Users.profile_name.label("profile_name"),
-            Users.offical_flg.label("offical_flg"),
-            Profiles.username.label("username"),
-            Profiles.avatar_url.label("avatar_url"),
-            MediaAssets.storage_key.label("thumbnail_key"),
-            VideoAssets.duration_sec.label("duration_sec"),
+            *metric_cols,
         )
-        .select_from(Posts)
         .join(Users, Posts.creator_user_id == Users.id)
         .join(Profiles, Users.id == Profiles.user_id)
-        .outerjoin(purchase_merged_sq, purchase_merged_sq.c.post_id == Posts.id)
+        .outerjoin(purchase_sq, purchase_sq.c.post_id == Posts.id)
         .outerjoin(bookmark_sq, bookmark_sq.c.post_id == Posts.id)
-        .outerjoin(
-            MediaAssets,
-            sa_and(
-                Posts.id == MediaAssets.post_id,
-                MediaAssets.kind == MediaAssetKind.THUMBNAIL,
-            ),
-        )
-        .outerjoin(
-            VideoAssets,
-            sa_and(
-                Posts.id == VideoAssets.post_id,
-                VideoAssets.kind == MediaAssetKind.MAIN_VIDEO,
-            ),
-        )
-        .filter(active_post_cond)
+        .where(CommonFunction.get_active_post_cond())
+        .subquery("metrics_sq")
     )
 
-    if period_or_cond is not None:
-        base_q = (
-            base_q.outerjoin(
-                payment_activity_sq, payment_activity_sq.c.post_id == Posts.id
-            )
-            .outerjoin(bookmark_activity_sq, bookmark_activity_sq.c.post_id == Posts.id)
-            .filter(period_or_cond)
+    def _score_order(sq, period):
+        return (
+            sq.c[f"purchase_count_{period}"].desc(),
+            sq.c[f"bookmark_count_{period}"].desc(),
+            sq.c.created_at.desc(),
+            sq.c.post_id.desc(),
         )
 
-    base_sq = base_q.group_by(
-        Posts.id,
-        Posts.creator_user_id,
-        Posts.created_at,
-        Users.profile_name,
-        Users.offical_flg,
-        Profiles.username,
-        Profiles.avatar_url,
-        MediaAssets.storage_key,
-        VideoAssets.duration_sec,
-        purchase_merged_sq.c.purchase_count,
-        bookmark_sq.c.bookmark_count,
-    ).subquery("base_sq")
-
-    # ---------- phase1: best post / creator
-    creator_rank_sq = db.query(
-        base_sq,
-        func.row_number()
-        .over(
-            partition_by=base_sq.c.creator_user_id,
-            order_by=(
-                base_sq.c.purchase_count.desc(),
-                base_sq.c.bookmark_count.desc(),
-                base_sq.c.created_at.desc(),
-                base_sq.c.post_id.desc(),  # tie-break for stable paging
-            ),
-        )
-        .label("rn_creator"),
+    # ---------- phase1: best post / creator (per period)
+    creator_rank_sq = select(
+        metrics_sq,
+        *[
+            func.row_number()
+            .over(
+                partition_by=(
+                    metrics_sq.c[f"eligible_{period}"],
+                    metrics_sq.c.creator_user_id,
+                ),
+                order_by=_score_order(metrics_sq, period),
+            )
+            .label(f"rn_creator_{period}")
+            for period in periods
+        ],
     ).subquery("creator_rank_sq")
 
-    phase1_sq = (
-        db.query(creator_rank_sq)
-        .filter(creator_rank_sq.c.rn_creator == 1)
-        .subquery("phase1_sq")
-    )
+    # ---------- combined order: phase1 → phase2 (per period)
+    ranked_cte = select(
+        creator_rank_sq,
+        *[
+            func.row_number()
+            .over(
+                partition_by=creator_rank_sq.c[f"eligible_{period}"],
+                order_by=(
+                    case(
+                        (creator_rank_sq.c[f"rn_creator_{period}"] == 1, 1), else_=2
+                    ),
+                    *_score_order(creator_rank_sq, period),
+                ),
+            )
+            .label(f"rank_{period}")
+            for period in periods
+        ],
+    ).cte("ranking_ranked")
 
-    phase1_total = db.query(func.count()).select_from(phase1_sq).scalar() or 0
+    return ranked_cte
 
-    # ---------- phase2: all posts excluding phase1 post_ids (no duplicate post_id)
-    phase2_sq = (
-        db.query(base_sq)
-        .filter(~base_sq.c.post_id.in_(db.query(phase1_sq.c.post_id)))
-        .subquery("phase2_sq")
-    )
 
-    rows = []
+def _build_post_ranking_period_rows_sq(
+    db: Session,
+    periods: tuple = RankingPeriod.ALL,
+    max_rank: int | None = None,
+    after_rank: int | None = None,
+):
+    """
+    共通 CTE から期間ごとの行 (period, rank, post_id, ...) を UNION ALL で展開する
 
-    # ========== pagination across combined list ==========
-    if offset < phase1_total:
-        take1 = min(limit, phase1_total - offset)
+    after_rank < rank <= max_rank の行だけに絞れる（ページング用）
+    """
+    ranked_cte = _build_post_ranking_multi_period_cte(db, periods)
+
+    selects = []
+    for period in periods:
+        rank_col = ranked_cte.c[f"rank_{period}"]
+        stmt = select(
+            literal(period).label("period"),
+            rank_col.label("rank"),
+            ranked_cte.c.post_id,
+            ranked_cte.c.creator_user_id,
+            ranked_cte.c.created_at,
+            ranked_cte.c[f"purchase_count_{period}"].label("purchase_count"),
+            ranked_cte.c[f"bookmark_count_{period}"].label("bookmark_count"),
+        ).where(ranked_cte.c[f"eligible_{period}"])
+        if max_rank is not None:
+            stmt = stmt.where(rank_col <= max_rank)
+        if after_rank:
+            stmt = stmt.where(rank_col > after_rank)
+        selects.append(stmt)
+
+    return union_all(*selects).subquery("period_rows_sq")
+
+
+def get_post_ranking_overall_by_periods(
+    db: Session, limit: int = 6, periods: tuple = RankingPeriod.ALL
+) -> Dict[str, list]:
+    """
+    複数期間の上位 limit 件をまとめて取得する（トップ・ランキングページ用）
 
-        part1 = (
-            db.query(
-                Posts,
-                phase1_sq.c.purchase_count.label("purchase_count"),
-                phase1_sq.c.bookmark_count.label("bookmark_count"),
-                phase1_sq.c.profile_name,
-                phase1_sq.c.offical_flg,
-                phase1_sq.c.username,
-                phase1_sq.c.avatar_url,
-                phase1_sq.c.thumbnail_key,
-                phase1_sq.c.duration_sec,
-            )
-            .join(phase1_sq, phase1_sq.c.post_id == Posts.id)
-            .order_by(
-                phase1_sq.c.purchase_count.desc(),
-                phase1_sq.c.bookmark_count.desc(),
-                phase1_sq.c.created_at.desc(),
-                phase1_sq.c.post_id.desc(),
-            )
-            .offset(offset)
-            .limit(take1)
-            .all()
+    スナップショットが古い期間は共通 CTE で 1 回だけライブ集計する
+    """
+    fresh_periods = (
+        get_fresh_snapshot_periods(db, periods)
+        if settings.POST_RANKING_SNAPSHOT_ENABLED
+        else set()
+    )
+    result = get_post_ranking_snapshot_heads(
+        db, [period for period in periods if period in fresh_periods], limit
+    )
+
+    stale_periods = tuple(period for period in periods if period not in fresh_periods)
+    if stale_periods:
+        period_rows_sq = _build_post_ranking_period_rows_sq(
+            db, stale_periods, max_rank=limit
         )
-        rows.extend(part1)
+        rows = ranking_rows_query(db, period_rows_sq).all()
+        result.update(group_ranking_rows(rows, stale_periods, limit))
 
-        take2 = limit - take1
-        if take2 > 0:
-            part2 = (
-                db.query(
-                    Posts,
-                    phase2_sq.c.purchase_count.label("purchase_count"),
-                    phase2_sq.c.bookmark_count.label("bookmark_count"),
-                    phase2_sq.c.profile_name,
-                    phase2_sq.c.offical_flg,
-                    phase2_sq.c.username,
-                    phase2_sq.c.avatar_url,
-                    phase2_sq.c.thumbnail_key,
-                    phase2_sq.c.duration_sec,
-                )
-                .join(phase2_sq, phase2_sq.c.post_id == Posts.id)
-                .order_by(
-                    phase2_sq.c.purchase_count.desc(),
-                    phase2_sq.c.bookmark_count.desc(),
-                    phase2_sq.c.created_at.desc(),
-                    phase2_sq.c.post_id.desc(),
-                )
-                .offset(0)
-                .limit(take2)
-                .all()
-            )
-            rows.extend(part2)
-    else:
-        phase2_offset = offset - phase1_total
+    _set_time_sale_flags(db, [row for period in periods for row in result[period]])
 
-        rows = (
-            db.query(
-                Posts,
-                phase2_sq.c.purchase_count.label("purchase_count"),
-                phase2_sq.c.bookmark_count.label("bookmark_count"),
-                phase2_sq.c.profile_name,
-                phase2_sq.c.offical_flg,
-                phase2_sq.c.username,
-                phase2_sq.c.avatar_url,
-                phase2_sq.c.thumbnail_key,
-                phase2_sq.c.duration_sec,
-            )
-            .join(phase2_sq, phase2_sq.c.post_id == Posts.id)
-            .order_by(
-                phase2_sq.c.purchase_count.desc(),
-                phase2_sq.c.bookmark_count.desc(),
-                phase2_sq.c.created_at.desc(),
-                phase2_sq.c.post_id.desc(),
-            )
-            .offset(phase2_offset)
-            .limit(limit)
-            .all()
-        )
+    return {period: result[period] for period in periods}
 
-    # ---------- time sale flag
-    post_ids = [row[0].id for row in rows]
-    post_sale_map = get_post_sale_flag_map(db, post_ids)
-    for row in rows:
-        row[0].is_time_sale = bool(post_sale_map.get(row[0].id, False))
 
-    return rows
+def fill_post_ranking_with_fallback(
+    ranking_posts: Dict[str, list], limit: int = 6
+) -> Dict[str, list]:
+    """
+    件数が足りない期間を、より長い期間のランキングで重複なく補完する
+
+    daily ← weekly ← monthly ← all_time の順に補完する
+    """
+    periods = [
+        RankingPeriod.DAILY,
+        RankingPeriod.WEEKLY,
+        RankingPeriod.MONTHLY,
+        RankingPeriod.ALL_TIME,
+    ]
+    filled: Dict[str, list] = {}
+    for idx, period in enumerate(periods):
+        rows = list(ranking_posts.get(period, []))[:limit]
+        tracking = {row.Posts.id for row in rows}
+        for fallback_period in periods[idx + 1 :]:
+            if len(rows) >= limit:
+                break
+            for row in ranking_posts.get(fallback_period, []):
+                if len(rows) >= limit:
+                    break
+                if row.Posts.id in tracking:
+                    continue
+                rows.append(row)
+                tracking.add(row.Posts.id)
+        filled[period] = rows
+    return filled
+
+
+def get_post_ranking_overall_with_fallback(db: Session, limit: int = 6):
+    """
+    4 期間のランキングと、補完済みのランキングをまとめて返す
+
+    Returns:
+        (ranking_posts, filled_ranking_posts): いずれも {period: rows}
+    """
+    ranking_posts = get_post_ranking_overall_by_periods(db, limit=limit)
+    return ranking_posts, fill_post_ranking_with_fallback(ranking_posts, limit)
+
+
+def refresh_post_ranking_snapshots(
+    db: Session, periods: tuple = RankingPeriod.ALL, min_interval_sec: int = 0
+) -> Dict[str, int] | None:
+    """
+    ランキングスナップショットを共通 CTE 1 回の集計で再計算して置き換える
+
+    他ワーカーが更新中、または min_interval_sec 以内に更新済みの場合は None
+    """
+    try:
+        if not try_lock_post_ranking_snapshot(db, periods, min_interval_sec):
+            db.rollback()
+            return None
+        period_rows_sq = _build_post_ranking_period_rows_sq(db, periods)
+        counts = replace_post_ranking_snapshots(db, periods, period_rows_sq)
+        db.commit()
+        return counts
+    except Exception:
+        db.rollback()
+        raise
 
 
 def _build_category_base_sq(db: Session, period: str = "all_time"):
@@ -4313,7 +4360,7 @@ def _build_category_base_sq(db: Session, period: str = "all_time"):
       - payment_activity_sq, bookmark_activity_sq, period_or_cond (for OR activity filter)
     """
     now_sql = func.now()
-    now = datetime.now(timezone.utc)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
     active_post_cond = sa_and(
         Posts.status == PostStatus.APPROVED,
         Posts.deleted_at.is_(None),
@@ -4354,7 +4401,7 @@ def _build_category_base_sq(db: Session, period: str = "all_time"):
             Payments,
             sa_and(
                 Payments.order_type == ORDER_TYPE_PRICE,
-                cast(Payments.order_id, PG_UUID(as_uuid=True)) == Prices.id,
+                Payments.price_id == Prices.id,
                 base_payment_cond,
             ),
         )
@@ -4372,7 +4419,7 @@ def _build_category_base_sq(db: Session, period: str = "all_time"):
             Payments,
             sa_and(
                 Payments.order_type == ORDER_TYPE_PLAN,
-                cast(Payments.order_id, PG_UUID(as_uuid=True)) == PostPlans.plan_id,
+                Payments.plan_id == PostPlans.plan_id,
                 base_payment_cond,
             ),
         )
@@ -4423,7 +4470,7 @@ def _build_category_base_sq(db: Session, period: str = "all_time"):
             Payments,
             sa_and(
                 Payments.order_type == ORDER_TYPE_PRICE,
-                cast(Payments.order_id, PG_UUID(as_uuid=True)) == Prices.id,
+                Payments.price_id == Prices.id,
                 Payments.status == PAYMENT_SUCCEEDED,
                 Payments.paid_at.isnot(None),
                 Payments.paid_at >= start_dt,
@@ -4434,7 +4481,7 @@ def _build_category_base_sq(db: Session, period: str = "all_time"):
             Payments,
             sa_and(
                 Payments.order_type == ORDER_TYPE_PLAN,
-                cast(Payments.order_id, PG_UUID(as_uuid=True)) == PostPlans.plan_id,
+                Payments.plan_id == PostPlans.plan_id,
                 Payments.status == PAYMENT_SUCCEEDED,
                 Payments.paid_at.isnot(None),
                 Payments.paid_at >= start_dt,
@@ -4623,9 +4670,13 @@ def get_ranking_posts_categories_overall(
 
 
 def get_ranking_posts_detail_overall(
-    db: Session, page: int = 1, limit: int = 20, period: str = "all_time"
+    db: Session,
+    page: int = 1,
+    limit: int = 20,
+    period: str = "all_time",
+    cursor: str | None = None,
 ):
-    return get_post_ranking_overall(db, limit, period, page)
+    return get_post_ranking_overall(db, limit, period, page, cursor=cursor)
 
 
 def get_ranking_posts_detail_categories(
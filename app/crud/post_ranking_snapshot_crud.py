@@ -0,0 +1,233 @@
+from datetime import timedelta
+from typing import Dict, Iterable, List, Set
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql.expression import and_ as sa_and
+
+from app.constants.enums import MediaAssetKind
+from app.constants.function import CommonFunction
+from app.core.config import settings
+from app.models.media_assets import MediaAssets
+from app.models.post_ranking_snapshots import (
+    PostRankingSnapshots,
+    PostRankingSnapshotStates,
+)
+from app.models.posts import Posts
+from app.models.profiles import Profiles
+from app.models.user import Users
+
+ThumbnailAssets = aliased(MediaAssets)
+VideoAssets = aliased(MediaAssets)
+
+# スナップショット以降に非公開になった投稿を除外しても件数が足りるよう多めに読む
+SNAPSHOT_HEAD_OVERFETCH = 2
+# 複数ワーカーが同時に同じ期間を再計算しないための advisory lock の名前空間
+SNAPSHOT_LOCK_NAMESPACE = 7301
+
+
+def get_fresh_snapshot_periods(db: Session, periods: Iterable[str]) -> Set[str]:
+    """
+    有効期限内のスナップショットが存在する期間を返す
+    """
+    periods = list(periods)
+    if not periods:
+        return set()
+    threshold = func.now() - timedelta(seconds=settings.POST_RANKING_SNAPSHOT_MAX_AGE_SEC)
+    rows = db.execute(
+        select(PostRankingSnapshotStates.period).where(
+            PostRankingSnapshotStates.period.in_(periods),
+            PostRankingSnapshotStates.refreshed_at >= threshold,
+        )
+    ).scalars().all()
+    return set(rows)
+
+
+def ranking_rows_query(db: Session, source):
+    """
+    get_post_ranking_overall と同じ列構成で (period, rank) 付きのランキング行を読むクエリ
+
+    source は period, rank, post_id, purchase_count, bookmark_count の列を持つ
+    テーブルまたはサブクエリ
+    """
+    return (
+        db.query(
+            Posts,
+            source.c.purchase_count.label("purchase_count"),
+            source.c.bookmark_count.label("bookmark_count"),
+            Users.profile_name.label("profile_name"),
+            Users.offical_flg.label("offical_flg"),
+            Profiles.username.label("username"),
+            Profiles.avatar_url.label("avatar_url"),
+            ThumbnailAssets.storage_key.label("thumbnail_key"),
+            VideoAssets.duration_sec.label("duration_sec"),
+            source.c.rank.label("rank"),
+            source.c.period.label("period"),
+        )
+        .select_from(source)
+        .join(Posts, Posts.id == source.c.post_id)
+        .join(Users, Posts.creator_user_id == Users.id)
+        .join(Profiles, Users.id == Profiles.user_id)
+        .outerjoin(
+            ThumbnailAssets,
+            sa_and(
+                Posts.id == ThumbnailAssets.post_id,
+                ThumbnailAssets.kind == MediaAssetKind.THUMBNAIL,
+            ),
+        )
+        .outerjoin(
+            VideoAssets,
+            sa_and(
+                Posts.id == VideoAssets.post_id,
+                VideoAssets.kind == MediaAssetKind.MAIN_VIDEO,
+            ),
+        )
+        .filter(CommonFunction.get_active_post_cond())
+        .distinct(source.c.period, source.c.rank)
+        .order_by(source.c.period, source.c.rank)
+    )
+
+
+def group_ranking_rows(
+    rows: List[tuple], periods: Iterable[str], limit: int
+) -> Dict[str, List[tuple]]:
+    """
+    period 列で振り分けて各期間 limit 件までに切り詰める
+    """
+    out: Dict[str, List[tuple]] = {period: [] for period in periods}
+    for row in rows:
+        if row.period in out and len(out[row.period]) < limit:
+            out[row.period].append(row)
+    return out
+
+
+def get_post_ranking_snapshot_page(
+    db: Session, period: str, limit: int, after_rank: int = 0
+) -> List[tuple]:
+    """
+    (period, rank) の主キーを使って after_rank より後ろの limit 件を取得する
+    """
+    snapshots = PostRankingSnapshots.__table__
+    return (
+        ranking_rows_query(db, snapshots)
+        .filter(snapshots.c.period == period, snapshots.c.rank > after_rank)
+        .limit(limit)
+        .all()
+    )
+
+
+def get_post_ranking_snapshot_heads(
+    db: Session, periods: Iterable[str], limit: int
+) -> Dict[str, List[tuple]]:
+    """
+    複数期間の上位 limit 件を 1 クエリで取得する
+    """
+    periods = list(periods)
+    if not periods:
+        return {}
+
+    snapshots = PostRankingSnapshots.__table__
+    rows = (
+        ranking_rows_query(db, snapshots)
+        .filter(
+            snapshots.c.period.in_(periods),
+            snapshots.c.rank <= limit * SNAPSHOT_HEAD_OVERFETCH,
+        )
+        .all()
+    )
+    return group_ranking_rows(rows, periods, limit)
+
+
+def try_lock_post_ranking_snapshot(
+    db: Session, periods: Iterable[str], min_interval_sec: int = 0
+) -> bool:
+    """
+    スナップショット更新ロックを取得する（トランザクション終了で解放）
+
+    他ワーカーが更新中、または全期間が min_interval_sec 以内に更新済みなら False
+    """
+    periods = list(periods)
+    locked = db.execute(
+        select(
+            func.pg_try_advisory_xact_lock(
+                SNAPSHOT_LOCK_NAMESPACE, func.hashtext(",".join(periods))
+            )
+        )
+    ).scalar()
+    if not locked:
+        return False
+    if min_interval_sec <= 0:
+        return True
+
+    recently_refreshed = db.execute(
+        select(func.count()).where(
+            PostRankingSnapshotStates.period.in_(periods),
+            PostRankingSnapshotStates.refreshed_at
+            >= func.now() - timedelta(seconds=min_interval_sec),
+        )
+    ).scalar()
+    return recently_refreshed < len(periods)
+
+
+def replace_post_ranking_snapshots(
+    db: Session, periods: Iterable[str], period_rows_sq
+) -> Dict[str, int]:
+    """
+    期間のスナップショットを period_rows_sq の内容で置き換える（commit は呼び出し側）
+
+    period_rows_sq は period, rank, post_id, creator_user_id, created_at,
+    purchase_count, bookmark_count の列を持つサブクエリ
+    """
+    periods = list(periods)
+    db.execute(
+        delete(PostRankingSnapshots).where(PostRankingSnapshots.period.in_(periods))
+    )
+    db.execute(
+        insert(PostRankingSnapshots).from_select(
+            [
+                "period",
+                "rank",
+                "post_id",
+                "creator_user_id",
+                "purchase_count",
+                "bookmark_count",
+                "post_created_at",
+            ],
+            select(
+                period_rows_sq.c.period,
+                period_rows_sq.c.rank,
+                period_rows_sq.c.post_id,
+                period_rows_sq.c.creator_user_id,
+                period_rows_sq.c.purchase_count,
+                period_rows_sq.c.bookmark_count,
+                period_rows_sq.c.created_at,
+            ),
+        )
+    )
+
+    counts = {period: 0 for period in periods}
+    counts.update(
+        db.execute(
+            select(PostRankingSnapshots.period, func.count())
+            .where(PostRankingSnapshots.period.in_(periods))
+            .group_by(PostRankingSnapshots.period)
+        ).all()
+    )
+
+    stmt = pg_insert(PostRankingSnapshotStates).values(
+        [
+            {"period": period, "row_count": count, "refreshed_at": func.now()}
+            for period, count in counts.items()
+        ]
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[PostRankingSnapshotStates.period],
+            set_={
+                "row_count": stmt.excluded.row_count,
+                "refreshed_at": stmt.excluded.refreshed_at,
+            },
+        )
+    )
+    return counts
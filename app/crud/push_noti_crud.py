@@ -1,6 +1,7 @@
 import json
-import os
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from typing import Dict, List, Tuple
 from uuid import UUID
 from app.schemas.push_noti import (
     SubscribePushNotificationRequest,
@@ -10,7 +11,7 @@ from app.schemas.push_noti import (
 from app.models.push_notifications import PushNotifications
 from datetime import datetime, timezone
 from app.core.logger import Logger
-from pywebpush import webpush, WebPushException
+from app.services.notifications.web_push import WebPushSubscription, get_web_push_sender
 
 
 logger = Logger.get_logger()
@@ -70,47 +71,64 @@ def create_or_update_push_notification(
 
 
 def push_notification_to_user(db: Session, user_id: UUID, payload: dict) -> None:
+    push_notification_to_users(db, [(user_id, payload)])
+
+
+def push_notification_to_users(
+    db: Session, items: List[Tuple[UUID, dict]]
+) -> None:
+    """
+    複数ユーザーへ Web Push を送る
+
+    購読情報は 1 クエリでまとめて取得し、送信は共有クライアントで並列に行う。
+    失効していた購読は 1 回の UPDATE でまとめて無効化する
+
+    Args:
+        items: (user_id, {"title", "body", "url"}) のリスト
+    """
+    if not items:
+        return
     try:
-        now = datetime.now(timezone.utc)
-        title = payload.get("title", "")
-        body = payload.get("body", "")
-        url = payload.get("url", "https://mijfans.jp")
-        push_notifications = (
+        user_ids = {user_id for user_id, _payload in items}
+        subscriptions_by_user: Dict[UUID, List[WebPushSubscription]] = {}
+        for push_notification in (
             db.query(PushNotifications)
-            .filter(PushNotifications.user_id == user_id)
+            .filter(PushNotifications.user_id.in_(user_ids))
             .filter(PushNotifications.is_active.is_(True))
             .all()
-        )
-        for push_notification in push_notifications:
-            try:
-                sub = {
-                    "endpoint": push_notification.endpoint,
-                    "keys": {
-                        "p256dh": push_notification.p256dh,
-                        "auth": push_notification.auth,
-                    },
-                }
-                webpush(
-                    subscription_info=sub,
-                    data=json.dumps(
-                        {
-                            "title": title,
-                            "body": body,
-                            "url": url,
-                        }
-                    ),
-                    vapid_private_key=os.environ.get("VAPID_PRIVATE_KEY"),
-                    vapid_claims={
-                        "sub": "mailto:support@mijfans.jp",
-                    },
+        ):
+            subscriptions_by_user.setdefault(push_notification.user_id, []).append(
+                WebPushSubscription(
+                    id=push_notification.id,
+                    endpoint=push_notification.endpoint,
+                    p256dh=push_notification.p256dh,
+                    auth=push_notification.auth,
                 )
-            except WebPushException as e:
-                logger.error(f"Error pushing notification to user: {e}")
-                push_notification.is_active = False
-                push_notification.updated_at = now
-                db.flush()
+            )
+
+        messages = []
+        for user_id, payload in items:
+            subscriptions = subscriptions_by_user.get(user_id)
+            if not subscriptions:
                 continue
-        db.commit()
+            data = json.dumps(
+                {
+                    "title": payload.get("title", ""),
+                    "body": payload.get("body", ""),
+                    "url": payload.get("url", "https://mijfans.jp"),
+                }
+            ).encode()
+            messages.extend((subscription, data) for subscription in subscriptions)
+
+        expired_ids = get_web_push_sender().send(messages)
+        if expired_ids:
+            db.execute(
+                update(PushNotifications)
+                .where(PushNotifications.id.in_(expired_ids))
+                .values(is_active=False, updated_at=datetime.now(timezone.utc))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
     except Exception as e:
         db.rollback()
         logger.error(f"Error pushing notification to user: {e}")
@@ -1,8 +1,20 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, case, column, exists, func, insert, or_, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
-from app.models.reservation_message import ReservationMessage
+from app.constants.enums import ReservationMessageRecipientStatus, ReservationMessageStatus
+from app.models.reservation_message import ReservationMessage, ReservationMessageRecipients
+
+# 送信先を一括 INSERT / UPDATE する際の 1 文あたりの行数
+_CHUNK_SIZE = 1000
+
 
 class ReservationMessageCrud:
     def __init__(self, db: Session):
@@ -12,4 +24,324 @@ class ReservationMessageCrud:
         self.db.add(reservation_message)
         self.db.commit()
         self.db.refresh(reservation_message)
-        return reservation_message
\ No newline at end of file
+        return reservation_message
+
+    ########################################################
+    # 一斉送信ジョブ
+    ########################################################
+    def create_bulk_message_job(
+        self,
+        group_by: str,
+        sender_user_id: UUID,
+        message_text: str,
+        target_user_ids: List[UUID],
+        asset_storage_key: Optional[str] = None,
+        asset_type: Optional[int] = None,
+        scheduled_at: Optional[datetime] = None,
+    ) -> ReservationMessage:
+        """
+        一斉送信ジョブと送信先を登録する（commit しない）
+
+        メッセージの作成はディスパッチャーが送信先をチャンクごとに取り出して行う
+        """
+        job = ReservationMessage(
+            group_by=group_by,
+            sender_user_id=sender_user_id,
+            message_text=message_text,
+            asset_storage_key=asset_storage_key,
+            asset_type=asset_type,
+            scheduled_at=scheduled_at,
+            status=ReservationMessageStatus.QUEUED,
+            total_count=len(target_user_ids),
+        )
+        self.db.add(job)
+        self.db.flush()
+
+        for start in range(0, len(target_user_ids), _CHUNK_SIZE):
+            self.db.execute(
+                insert(ReservationMessageRecipients),
+                [
+                    {
+                        "reservation_message_id": job.id,
+                        "user_id": user_id,
+                        "status": ReservationMessageRecipientStatus.PENDING,
+                    }
+                    for user_id in target_user_ids[start : start + _CHUNK_SIZE]
+                ],
+            )
+        return job
+
+    def get_bulk_message_job(self, group_by: str, sender_user_id: UUID) -> Optional[ReservationMessage]:
+        """送信者の一斉送信ジョブを group_by で取得"""
+        return (
+            self.db.query(ReservationMessage)
+            .filter(
+                ReservationMessage.group_by == group_by,
+                ReservationMessage.sender_user_id == sender_user_id,
+            )
+            .first()
+        )
+
+    def get_bulk_message_jobs_by_ids(self, job_ids: Iterable[UUID]) -> Dict[UUID, ReservationMessage]:
+        """一斉送信ジョブを ID でまとめて取得"""
+        return {
+            job.id: job
+            for job in self.db.query(ReservationMessage)
+            .filter(ReservationMessage.id.in_(list(job_ids)))
+            .all()
+        }
+
+    def get_recipient_counts(self, job_id: UUID) -> Dict[int, int]:
+        """
+        送信先のステータスごとの件数
+
+        Returns:
+            ReservationMessageRecipientStatus → 件数
+        """
+        rows = (
+            self.db.query(ReservationMessageRecipients.status, func.count())
+            .filter(ReservationMessageRecipients.reservation_message_id == job_id)
+            .group_by(ReservationMessageRecipients.status)
+            .all()
+        )
+        return {status: count for status, count in rows}
+
+    def claim_recipients(self, limit: int, stale_after_sec: int) -> List[ReservationMessageRecipients]:
+        """
+        処理対象の送信先を最大 limit 件取り出して処理中にする（commit する）
+
+        FOR UPDATE SKIP LOCKED で取り出すため、複数ワーカー・複数プロセスで同時に実行してよい。
+        処理中のまま stale_after_sec を過ぎた行（ワーカー停止等）も取り戻す
+        """
+        claimable = (
+            select(ReservationMessageRecipients.id)
+            .where(
+                or_(
+                    and_(
+                        ReservationMessageRecipients.status == ReservationMessageRecipientStatus.PENDING,
+                        ReservationMessageRecipients.available_at <= func.now(),
+                    ),
+                    and_(
+                        ReservationMessageRecipients.status == ReservationMessageRecipientStatus.PROCESSING,
+                        ReservationMessageRecipients.locked_at < func.now() - timedelta(seconds=stale_after_sec),
+                    ),
+                )
+            )
+            .order_by(ReservationMessageRecipients.available_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        recipients = self.db.scalars(
+            update(ReservationMessageRecipients)
+            .where(ReservationMessageRecipients.id.in_(claimable))
+            .values(
+                status=ReservationMessageRecipientStatus.PROCESSING,
+                locked_at=func.now(),
+                attempts=ReservationMessageRecipients.attempts + 1,
+                updated_at=func.now(),
+            )
+            .returning(ReservationMessageRecipients)
+            .execution_options(synchronize_session=False)
+        ).all()
+
+        # 初めて取り出されたジョブを処理中にする
+        job_ids = {recipient.reservation_message_id for recipient in recipients}
+        if job_ids:
+            self.db.execute(
+                update(ReservationMessage)
+                .where(
+                    ReservationMessage.id.in_(job_ids),
+                    ReservationMessage.status == ReservationMessageStatus.QUEUED,
+                )
+                .values(
+                    status=ReservationMessageStatus.RUNNING,
+                    started_at=func.now(),
+                    updated_at=func.now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+        self.db.commit()
+        return recipients
+
+    def mark_recipients_sent(
+        self,
+        recipients: List[ReservationMessageRecipients],
+        messages: Dict[UUID, Row],
+    ) -> None:
+        """
+        作成したメッセージを記録して送信済みにする（commit しない。メッセージ作成と同じトランザクションで確定する）
+
+        messages は送信先ユーザーID → 作成したメッセージ（自分自身宛て等で作成しなかった送信先は含まれない）
+        """
+        for start in range(0, len(recipients), _CHUNK_SIZE):
+            chunk = recipients[start : start + _CHUNK_SIZE]
+            sent = values(
+                column("id", PG_UUID(as_uuid=True)),
+                column("message_id", PG_UUID(as_uuid=True)),
+                name="sent",
+            ).data(
+                [
+                    (
+                        recipient.id,
+                        messages[recipient.user_id].id if recipient.user_id in messages else None,
+                    )
+                    for recipient in chunk
+                ]
+            )
+            self.db.execute(
+                update(ReservationMessageRecipients)
+                .where(ReservationMessageRecipients.id == sent.c.id)
+                .values(
+                    status=ReservationMessageRecipientStatus.SENT,
+                    message_id=sent.c.message_id,
+                    locked_at=None,
+                    last_error=None,
+                    updated_at=func.now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+    def mark_recipients_failed(
+        self,
+        recipients: Iterable[ReservationMessageRecipients],
+        error: str,
+        max_attempts: int,
+        retry_base_sec: int,
+    ) -> None:
+        """
+        送信先の失敗を記録する（commit する）
+
+        リトライ上限までは指数バックオフで available_at を後ろにずらして未処理に戻す
+        """
+        for recipient in recipients:
+            give_up = recipient.attempts >= max_attempts
+            delay = retry_base_sec * (2 ** max(recipient.attempts - 1, 0))
+            self.db.execute(
+                update(ReservationMessageRecipients)
+                .where(ReservationMessageRecipients.id == recipient.id)
+                .values(
+                    status=ReservationMessageRecipientStatus.FAILED
+                    if give_up
+                    else ReservationMessageRecipientStatus.PENDING,
+                    available_at=func.now() + timedelta(seconds=delay),
+                    locked_at=None,
+                    last_error=error[:2000],
+                    updated_at=func.now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+        self.db.commit()
+
+    def finish_completed_jobs(self, job_ids: Iterable[UUID]) -> List[UUID]:
+        """
+        未処理・処理中の送信先が残っていないジョブを完了にする（commit する）
+
+        Returns:
+            今回完了にしたジョブID
+        """
+        job_ids = list(job_ids)
+        if not job_ids:
+            return []
+
+        def recipients_in(*statuses):
+            return exists().where(
+                ReservationMessageRecipients.reservation_message_id == ReservationMessage.id,
+                ReservationMessageRecipients.status.in_(statuses),
+            )
+
+        finished = self.db.scalars(
+            update(ReservationMessage)
+            .where(
+                ReservationMessage.id.in_(job_ids),
+                ReservationMessage.status.in_(
+                    [ReservationMessageStatus.QUEUED, ReservationMessageStatus.RUNNING]
+                ),
+                ~recipients_in(
+                    ReservationMessageRecipientStatus.PENDING,
+                    ReservationMessageRecipientStatus.PROCESSING,
+                ),
+            )
+            .values(
+                status=case(
+                    (
+                        recipients_in(ReservationMessageRecipientStatus.FAILED),
+                        ReservationMessageStatus.COMPLETED_WITH_ERRORS,
+                    ),
+                    else_=ReservationMessageStatus.COMPLETED,
+                ),
+                finished_at=func.now(),
+                updated_at=func.now(),
+            )
+            .returning(ReservationMessage.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        self.db.commit()
+        return finished
+
+    def claim_jobs_awaiting_schedule(self, limit: int, retry_after_sec: int) -> List[ReservationMessage]:
+        """
+        全送信先のメッセージを作成し終え、予約送信のスケジュールが未登録のジョブを取り出す（commit しない）
+
+        FOR UPDATE SKIP LOCKED で行ロックを取るため、スケジュールを登録して commit するまで
+        他のワーカーは同じジョブを取り出さない。
+        登録に失敗したジョブ（updated_at が finished_at より後）は retry_after_sec ごとに再試行する
+        """
+        return (
+            self.db.query(ReservationMessage)
+            .filter(
+                ReservationMessage.scheduled_at.isnot(None),
+                ReservationMessage.event_bridge_name.is_(None),
+                ReservationMessage.status.in_(
+                    [ReservationMessageStatus.COMPLETED, ReservationMessageStatus.COMPLETED_WITH_ERRORS]
+                ),
+                or_(
+                    ReservationMessage.updated_at <= ReservationMessage.finished_at,
+                    ReservationMessage.updated_at < func.now() - timedelta(seconds=retry_after_sec),
+                ),
+            )
+            .order_by(ReservationMessage.finished_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+    def set_job_schedule(self, job: ReservationMessage, schedule_name: str) -> None:
+        """予約送信のスケジュールを登録済みにする（commit しない）"""
+        job.event_bridge_name = schedule_name
+        job.updated_at = func.now()
+
+    def mark_job_schedule_failed(self, job: ReservationMessage) -> None:
+        """スケジュール登録の失敗を記録する（commit しない。updated_at から再試行時刻を判定する）"""
+        job.updated_at = func.now()
+
+    def retry_failed_recipients(self, job: ReservationMessage) -> int:
+        """
+        リトライ上限に達した送信先を未処理に戻し、ジョブを再開する（commit する）
+
+        Returns:
+            未処理に戻した件数
+        """
+        result = self.db.execute(
+            update(ReservationMessageRecipients)
+            .where(
+                ReservationMessageRecipients.reservation_message_id == job.id,
+                ReservationMessageRecipients.status == ReservationMessageRecipientStatus.FAILED,
+            )
+            .values(
+                status=ReservationMessageRecipientStatus.PENDING,
+                attempts=0,
+                available_at=func.now(),
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            job.status = ReservationMessageStatus.RUNNING
+            job.finished_at = None
+            if job.scheduled_at is not None:
+                # 登録済みのスケジュールが再送分の作成前に実行されることがあるため、完了後に登録し直す
+                # （実行前のスケジュールと同じ時刻になる場合は登録済みのものをそのまま使う）
+                job.event_bridge_name = None
+        self.db.commit()
+        return result.rowcount
@@ -253,10 +253,7 @@ def get_sales_history_by_creator(
                 and_(
                     Payments.order_type == PaymentType.SINGLE,
                     Payments.payment_type != PaymentType.CHIP,
-                    case(
-                        (Payments.payment_type == PaymentType.CHIP, None),
-                        else_=cast(Payments.order_id, PG_UUID)
-                    ) == Prices.id,
+                    Payments.price_id == Prices.id,
                 ),
             )
             .outerjoin(
@@ -272,10 +269,7 @@ def get_sales_history_by_creator(
                 and_(
                     Payments.order_type == PaymentType.PLAN,
                     Payments.payment_type != PaymentType.CHIP,
-                    case(
-                        (Payments.payment_type == PaymentType.CHIP, None),
-                        else_=cast(Payments.order_id, PG_UUID)
-                    ) == Plans.id,
+                    Payments.plan_id == Plans.id,
                 ),
             )
             .where(
@@ -847,10 +841,7 @@ def get_payments_by_user_id(
                 and_(
                     Payments.order_type == 1,
                     Payments.payment_type != PaymentType.CHIP,
-                    case(
-                        (Payments.payment_type == PaymentType.CHIP, None),
-                        else_=cast(Payments.order_id, PG_UUID)
-                    ) == Prices.id,
+                    Payments.price_id == Prices.id,
                 ),
             )
             .outerjoin(
@@ -858,10 +849,7 @@ def get_payments_by_user_id(
                 and_(
                     Payments.order_type == 2,
                     Payments.payment_type != PaymentType.CHIP,
-                    case(
-                        (Payments.payment_type == PaymentType.CHIP, None),
-                        else_=cast(Payments.order_id, PG_UUID)
-                    ) == Plans.id,
+                    Payments.plan_id == Plans.id,
                 ),
             )
             .outerjoin(
@@ -5,13 +5,14 @@ from typing import List, Optional, Tuple
 from uuid import UUID
 
 from app.crud.time_sale_crud import get_post_sale_flag_map
+from app.db.pagination import SortKey, count_cap_for, count_up_to, paginate_by_cursor
 from app.models.user import Users
 from app.models.profiles import Profiles
 from app.models.posts import Posts
 from app.models.tags import Tags, PostTags
 from app.models.post_categories import PostCategories
-from app.models.social import Follows, Likes
 from app.models.media_assets import MediaAssets
+from app.models.post_stats import CreatorStats, PostStats
 from app.models.prices import Prices
 from app.constants.enums import PostStatus, AccountType, MediaAssetKind
 
@@ -23,7 +24,8 @@ def search_creators(
     limit: int = 5,
     offset: int = 0,
     include_recent_posts: bool = False,
-) -> Tuple[List, int]:
+    cursor: Optional[str] = None,
+) -> Tuple[List, int, bool, Optional[str]]:
     """
     クリエイター検索
 
@@ -34,9 +36,10 @@ def search_creators(
         limit: 取得件数
         offset: オフセット
         include_recent_posts: 最新投稿5件を含めるかどうか
+        cursor: 前ページの next_cursor（指定時は offset より優先）
 
     Returns:
-        (結果リスト, 総件数)
+        (結果リスト, 総件数（cursor 指定時は上限付き）, 総件数を打ち切ったかどうか, 次ページのカーソル)
     """
     # 検索クエリの前処理
     query_lower = query.lower().strip()
@@ -57,12 +60,12 @@ def search_creators(
             Profiles.username,
             Profiles.avatar_url,
             Profiles.bio,
-            func.count(Follows.creator_user_id).label("followers_count"),
+            func.coalesce(CreatorStats.followers_count, 0).label("followers_count"),
             Users.is_identity_verified.label("is_verified"),
             func.count(Posts.id).label("posts_count"),
         )
         .join(Profiles, Users.id == Profiles.user_id)
-        .outerjoin(Follows, Users.id == Follows.creator_user_id)
+        .outerjoin(CreatorStats, Users.id == CreatorStats.user_id)
         .outerjoin(Posts, and_(Users.id == Posts.creator_user_id, active_post_cond))
         .filter(Users.deleted_at.is_(None))
         .filter(Users.role == AccountType.CREATOR)
@@ -74,6 +77,7 @@ def search_creators(
             Profiles.avatar_url,
             Profiles.bio,
             Users.is_identity_verified,
+            CreatorStats.followers_count,
         )
     )
 
@@ -88,15 +92,16 @@ def search_creators(
 
     base_query = base_query.filter(search_conditions)
 
-    # 総件数取得（サブクエリで効率化）
-    from sqlalchemy import select
-
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total = db.execute(count_query).scalar()
+    # 総件数取得（cursor 指定時は上限付き）
+    total, total_is_capped = count_up_to(db, base_query, count_cap_for(cursor))
 
     # ソート
     if sort == "popularity":
-        base_query = base_query.order_by(desc("followers_count"))
+        sort_keys = [
+            SortKey(func.coalesce(CreatorStats.followers_count, 0)),
+            SortKey(Users.id),
+        ]
+        cursor_values = lambda r: (r.followers_count, r.id)
     else:  # relevance
         # スコアリング: 完全一致 > 前方一致 > 部分一致
         relevance_score = case(
@@ -110,10 +115,19 @@ def search_creators(
                 func.to_tsvector("simple", func.coalesce(Profiles.bio, "")), tsquery
             ),
         )
-        base_query = base_query.order_by(desc(relevance_score))
-
-    # ページネーション
-    results = base_query.limit(limit).offset(offset).all()
+        base_query = base_query.add_columns(relevance_score.label("relevance"))
+        sort_keys = [SortKey(relevance_score), SortKey(Users.id)]
+        cursor_values = lambda r: (r.relevance, r.id)
+
+    # ページネーション（キーセット）
+    results, next_cursor = paginate_by_cursor(
+        base_query,
+        sort_keys,
+        limit,
+        cursor=cursor,
+        cursor_values=cursor_values,
+        offset=offset,
+    )
 
     # 最新投稿を取得する場合
     if include_recent_posts and results:
@@ -185,9 +199,9 @@ def search_creators(
                 )
             )
 
-        return enhanced_results, total
+        return enhanced_results, total, total_is_capped, next_cursor
 
-    return results, total
+    return results, total, total_is_capped, next_cursor
 
 
 def search_posts(
@@ -199,7 +213,8 @@ def search_posts(
     paid_only: bool = False,
     limit: int = 10,
     offset: int = 0,
-) -> Tuple[List, int]:
+    cursor: Optional[str] = None,
+) -> Tuple[List, int, bool, Optional[str]]:
     """
     投稿検索
 
@@ -212,9 +227,10 @@ def search_posts(
         paid_only: 単品販売のみ (price > 0)
         limit: 取得件数
         offset: オフセット
+        cursor: 前ページの next_cursor（指定時は offset より優先）
 
     Returns:
-        (結果リスト, 総件数)
+        (結果リスト, 総件数（cursor 指定時は上限付き）, 総件数を打ち切ったかどうか, 次ページのカーソル)
     """
     query_lower = query.lower().strip()
     tsquery = func.plainto_tsquery("simple", query)
@@ -256,13 +272,13 @@ def search_posts(
             Profiles.username,
             Profiles.avatar_url,
             thumbnail_subq.c.storage_key.label("thumbnail_key"),
-            func.count(Likes.post_id).label("likes_count"),
+            func.coalesce(PostStats.likes_count, 0).label("likes_count"),
         )
         .join(Users, Posts.creator_user_id == Users.id)
         .join(Profiles, Users.id == Profiles.user_id)
         .join(thumbnail_subq, Posts.id == thumbnail_subq.c.post_id)
         .outerjoin(video_asset_subq, Posts.id == video_asset_subq.c.post_id)
-        .outerjoin(Likes, Posts.id == Likes.post_id)
+        .outerjoin(PostStats, Posts.id == PostStats.post_id)
     )
 
     # 単品販売フィルタ
@@ -285,6 +301,7 @@ def search_posts(
             Profiles.avatar_url,
             thumbnail_subq.c.storage_key,
             video_asset_subq.c.duration_sec,
+            PostStats.likes_count,
         )
     )
 
@@ -311,15 +328,13 @@ def search_posts(
     if post_type:
         base_query = base_query.filter(Posts.post_type == post_type)
 
-    # 総件数取得
-    from sqlalchemy import select
-
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total = db.execute(count_query).scalar()
+    # 総件数取得（cursor 指定時は上限付き）
+    total, total_is_capped = count_up_to(db, base_query, count_cap_for(cursor))
 
     # ソート
     if sort == "popularity":
-        base_query = base_query.order_by(desc("likes_count"))
+        sort_keys = [SortKey(func.coalesce(PostStats.likes_count, 0)), SortKey(Posts.id)]
+        cursor_values = lambda r: (r.likes_count, r.id)
     else:  # relevance
         relevance_score = (
             func.ts_rank(
@@ -328,9 +343,23 @@ def search_posts(
             )
             * 3.0
         )
-        base_query = base_query.order_by(desc(relevance_score), desc(Posts.created_at))
-
-    results = base_query.limit(limit).offset(offset).all()
+        base_query = base_query.add_columns(relevance_score.label("relevance"))
+        sort_keys = [
+            SortKey(relevance_score),
+            SortKey(Posts.created_at),
+            SortKey(Posts.id),
+        ]
+        cursor_values = lambda r: (r.relevance, r.created_at, r.id)
+
+    # ページネーション（キーセット）
+    results, next_cursor = paginate_by_cursor(
+        base_query,
+        sort_keys,
+        limit,
+        cursor=cursor,
+        cursor_values=cursor_values,
+        offset=offset,
+    )
 
     post_ids = [r.id for r in results]
     sale_map = get_post_sale_flag_map(db, post_ids)
@@ -339,7 +368,7 @@ def search_posts(
         for r in results
     ]
 
-    return enriched_results, total
+    return enriched_results, total, total_is_capped, next_cursor
 
 
 def search_hashtags(
@@ -6,6 +6,7 @@ from app.models.social import (
     ProfileViewsTracking,
     PostPurchasesTracking,
 )
+from app.crud.engagement_stats_crud import add_post_stats_delta
 from app.core.logger import Logger as CoreLogger
 
 
@@ -49,6 +50,7 @@ class SocialCrud:
                 created_at=now,
             )
             self.db.add(post_view_tracking)
+            add_post_stats_delta(self.db, post_id, views=1)
             self.db.commit()
             return True
         except Exception as e:
@@ -7,12 +7,11 @@ from uuid import UUID
 from sqlalchemy.orm import Session
 from app.api.endpoints.hook.payment import SUBSCRIPTION_DURATION_DAYS
 from app.models.subscriptions import Subscriptions
+from app.crud.payments_crud import resolve_order_reference_ids
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import HTTPException
-from sqlalchemy import or_
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
-from sqlalchemy import cast
+from sqlalchemy import or_, select
 from app.models.prices import Prices
 from app.models.plans import Plans, PostPlans
 from datetime import datetime, timezone
@@ -38,12 +37,15 @@ def create_subscription(
     status: int = 1,  # 1=active
 ) -> Subscriptions:
     """サブスクリプション作成"""
+    price_id, plan_id = resolve_order_reference_ids(order_type, order_id)
     subscription = Subscriptions(
         access_type=access_type,
         user_id=user_id,
         creator_id=creator_id,
         order_id=order_id,
         order_type=order_type,
+        price_id=price_id,
+        plan_id=plan_id,
         access_start=access_start,
         access_end=access_end,
         next_billing_date=next_billing_date,
@@ -69,12 +71,15 @@ def create_expired_subscription(
 ) -> Subscriptions:
     now = datetime.now(timezone.utc)
     next_billing_date = now + timedelta(days=SUBSCRIPTION_DURATION_DAYS)
+    price_id, plan_id = resolve_order_reference_ids(order_type, order_id)
     subscription = Subscriptions(
         access_type=SubscriptionType.PLAN,
         user_id=user_id,
         creator_id=creator_id,
         order_id=order_id,
         order_type=order_type,
+        price_id=price_id,
+        plan_id=plan_id,
         status=SubscriptionStatus.EXPIRED,
         cancel_at_period_end=True,
         failed_payment_count=1,
@@ -98,40 +103,29 @@ def check_viewing_rights(db: Session, post_id: str, user_id: str | None) -> bool
     subscriptionsテーブルで有効な権限があるかを確認:
     - status=1 (active)
     - access_end が NULL または 現在日時より後
-    - order_id が当該投稿のprice_idまたは投稿が属するplanのいずれかに合致
+    - price_id が当該投稿のprice、または plan_id が投稿が属するplanのいずれかに合致
     """
     if not user_id:
         return False
 
     now = datetime.now(timezone.utc)
 
-    # 投稿のpriceを取得
-    price = db.query(Prices).filter(Prices.post_id == post_id).first()
-
-    # 投稿が属するplanを取得
-    plan_ids = db.query(PostPlans.plan_id).filter(PostPlans.post_id == post_id).all()
-    # plan_idsが空でも許容する
-    plan_id_list = [str(plan.plan_id) for plan in plan_ids] if plan_ids else []
-
-    # order_idのリスト（price_id + plan_ids）
-    valid_order_ids = []
-    if price:
-        valid_order_ids.append(str(price.id))
-    if plan_id_list:
-        valid_order_ids.extend(plan_id_list)
-
-    if not valid_order_ids:
-        return False
+    # 投稿のprice / 投稿が属するplan（型付きの列でインデックスを使う）
+    post_price_ids = select(Prices.id).where(Prices.post_id == post_id)
+    post_plan_ids = select(PostPlans.plan_id).where(PostPlans.post_id == post_id)
 
     # 有効なsubscriptionが存在するかチェック
     subscription = (
-        db.query(Subscriptions)
+        db.query(Subscriptions.id)
         .filter(
             Subscriptions.user_id == user_id,
             Subscriptions.status.in_(
                 [SubscriptionStatus.ACTIVE, SubscriptionStatus.CANCELED]
             ),  # active
-            Subscriptions.order_id.in_(valid_order_ids),
+            or_(
+                Subscriptions.price_id.in_(post_price_ids),
+                Subscriptions.plan_id.in_(post_plan_ids),
+            ),
             or_(Subscriptions.access_end.is_(None), Subscriptions.access_end > now),
         )
         .first()
@@ -263,12 +257,15 @@ def create_free_subscription(
     payment_id: UUID,
 ) -> Subscriptions:
     """0円プラン・商品用のサブスクリプション作成（無期限）"""
+    price_id, plan_id = resolve_order_reference_ids(order_type, order_id)
     subscription = Subscriptions(
         access_type=access_type,
         user_id=user_id,
         creator_id=creator_id,
         order_id=order_id,
         order_type=order_type,
+        price_id=price_id,
+        plan_id=plan_id,
         access_start=datetime.now(timezone.utc),
         access_end=None,  # 無期限
         next_billing_date=None,  # 無期限なので課金なし
@@ -293,7 +290,7 @@ def get_subscription_by_user_id(db: Session, user_id: UUID, partner_user_id: UUI
         .join(
             Plans,
             (Subscriptions.order_type == PaymentTransactionType.SUBSCRIPTION)
-            & (cast(Subscriptions.order_id, PG_UUID) == Plans.id),
+            & (Subscriptions.plan_id == Plans.id),
         )
         .filter(
             Subscriptions.user_id == user_id,
@@ -316,7 +313,7 @@ def get_dm_release_plan_subscription(db: Session, user_id: UUID, partner_user_id
         .join(
             Plans,
             (Subscriptions.order_type == PaymentTransactionType.SUBSCRIPTION)
-            & (cast(Subscriptions.order_id, PG_UUID) == Plans.id),
+            & (Subscriptions.plan_id == Plans.id),
         )
         .filter(
             Subscriptions.user_id == user_id,
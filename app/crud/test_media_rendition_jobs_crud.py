@@ -0,0 +1,50 @@
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.constants.enums import MediaRenditionJobStatus
+from app.crud import media_rendition_jobs_crud
+
+
+def _compile(statement):
+    return statement.compile(dialect=postgresql.dialect())
+
+
+def test_failed_status_keeps_reason_and_other_status_clears_it():
+    db = MagicMock(name="SessionMock")
+    job_id = uuid4()
+
+    media_rendition_jobs_crud.update_media_rendition_jobs_status(
+        db, [job_id], MediaRenditionJobStatus.FAILED, "Image rejected by moderation"
+    )
+    media_rendition_jobs_crud.update_media_rendition_jobs_status(
+        db, [job_id], MediaRenditionJobStatus.PROGRESSING
+    )
+
+    failed, progressing = [_compile(call.args[0]).params for call in db.execute.call_args_list]
+    assert failed["error_message"] == "Image rejected by moderation"
+    assert progressing["error_message"] is None
+
+
+def test_claim_stale_jobs_locks_rows_and_requeues_them():
+    db = MagicMock(name="SessionMock")
+    claimed = [uuid4()]
+    db.scalars.return_value.all.return_value = claimed
+
+    media_rendition_jobs_crud.claim_stale_image_variant_jobs(db, 900)
+
+    sql = str(_compile(db.scalars.call_args.args[0]))
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "HAVING max(media_rendition_jobs.updated_at) < now()" in sql
+    requeue = _compile(db.execute.call_args_list[0].args[0]).params
+    assert requeue["status"] == MediaRenditionJobStatus.PENDING
+    db.commit.assert_not_called()
+
+
+def test_claim_stale_jobs_without_candidates():
+    db = MagicMock(name="SessionMock")
+    db.scalars.return_value.all.return_value = []
+
+    assert media_rendition_jobs_crud.claim_stale_image_variant_jobs(db, 900) == []
+    db.execute.assert_not_called()
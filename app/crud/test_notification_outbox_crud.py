@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.constants.enums import NotificationOutboxStatus
+from app.crud import notification_outbox_crud
+
+
+def _compile(statement):
+    return statement.compile(dialect=postgresql.dialect())
+
+
+def test_claim_batch_skips_locked_rows_and_commits():
+    db = MagicMock(name="SessionMock")
+    entries = [SimpleNamespace(id=uuid4())]
+    db.scalars.return_value.all.return_value = entries
+
+    assert notification_outbox_crud.claim_batch(db, 10, 300) == entries
+
+    sql = str(_compile(db.scalars.call_args.args[0]))
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "RETURNING" in sql
+    db.commit.assert_called_once()
+
+
+def test_mark_failed_backs_off_then_gives_up():
+    db = MagicMock(name="SessionMock")
+    retry = SimpleNamespace(id=uuid4(), attempts=2)
+    give_up = SimpleNamespace(id=uuid4(), attempts=5)
+
+    notification_outbox_crud.mark_failed(db, [retry, give_up], "boom", 5, 30)
+
+    (retry_stmt,), (give_up_stmt,) = [call.args for call in db.execute.call_args_list]
+    retry_params = _compile(retry_stmt).params
+    assert retry_params["status"] == NotificationOutboxStatus.PENDING
+    assert retry_params["last_error"] == "boom"
+    assert _compile(give_up_stmt).params["status"] == NotificationOutboxStatus.FAILED
+    db.commit.assert_called_once()
+
+
+def test_mark_done_ignores_empty_ids():
+    db = MagicMock(name="SessionMock")
+
+    notification_outbox_crud.mark_done(db, [])
+
+    db.execute.assert_not_called()
+    db.commit.assert_not_called()
+
+
+def test_add_recipients_is_idempotent_on_unique_key():
+    db = MagicMock(name="SessionMock")
+    key = (uuid4(), uuid4())
+    db.execute.return_value = [SimpleNamespace(outbox_id=key[0], user_id=key[1])]
+
+    assert notification_outbox_crud.add_recipients(db, [key, key]) == {key}
+
+    statement = db.execute.call_args.args[0]
+    sql = str(_compile(statement))
+    assert "ON CONFLICT ON CONSTRAINT uq_notification_outbox_recipients_user DO NOTHING" in sql
+    assert "RETURNING" in sql
+    db.commit.assert_not_called()
+
+
+def test_add_recipients_without_keys_does_nothing():
+    db = MagicMock(name="SessionMock")
+
+    assert notification_outbox_crud.add_recipients(db, []) == set()
+    db.execute.assert_not_called()
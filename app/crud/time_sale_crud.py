@@ -2,7 +2,7 @@ import math
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 from fastapi import HTTPException
-from sqlalchemy import and_, func, or_, select, case, String, cast, tuple_
+from sqlalchemy import and_, func, or_, select, case, tuple_
 from sqlalchemy.orm import Session
 from uuid import UUID
 from app.constants.enums import PaymentStatus
@@ -40,7 +40,7 @@ def get_price_time_sale_by_post_id(
             Payments.paid_at.is_not(None),
             Payments.paid_at >= start_bound,
             Payments.paid_at <= end_bound,
-            Payments.order_id == cast(TimeSale.price_id, String),
+            Payments.price_id == TimeSale.price_id,
         )
         .correlate(TimeSale)
         .scalar_subquery()
@@ -183,7 +183,7 @@ def get_plan_time_sale_by_plan_id(
             Payments.paid_at.is_not(None),
             Payments.paid_at >= start_bound,
             Payments.paid_at <= end_bound,
-            Payments.order_id == cast(TimeSale.plan_id, String),
+            Payments.plan_id == TimeSale.plan_id,
             Payments.payment_price == TimeSale.sale_price,
         )
         .correlate(TimeSale)
@@ -321,7 +321,7 @@ def get_active_price_timesale(db: Session, post_id: UUID, price_id: UUID) -> Tim
             Payments.paid_at.is_not(None),
             Payments.paid_at >= start_bound,
             Payments.paid_at <= end_bound,
-            Payments.order_id == cast(TimeSale.price_id, String),
+            Payments.price_id == TimeSale.price_id,
             Payments.payment_price == TimeSale.sale_price,
         )
         .correlate(TimeSale)
@@ -408,7 +408,7 @@ def get_active_price_timesale_pairs(
             Payments.paid_at.is_not(None),
             Payments.paid_at >= start_bound,
             Payments.paid_at <= end_bound,
-            Payments.order_id == cast(TimeSale.price_id, String),
+            Payments.price_id == TimeSale.price_id,
             Payments.payment_price == TimeSale.sale_price,
         )
         .correlate(TimeSale)
@@ -470,7 +470,7 @@ def get_active_plan_timesale_map(db: Session, plan_ids: List[UUID]) -> dict:
             Payments.paid_at.is_not(None),
             Payments.paid_at >= start_bound,
             Payments.paid_at <= end_bound,
-            Payments.order_id == cast(TimeSale.plan_id, String),
+            Payments.plan_id == TimeSale.plan_id,
             Payments.payment_price == TimeSale.sale_price,
         )
         .correlate(TimeSale)
@@ -561,7 +561,7 @@ def get_active_plan_timesale(db: Session, plan_id: UUID) -> dict:
             Payments.paid_at.is_not(None),
             Payments.paid_at >= start_bound,
             Payments.paid_at <= end_bound,
-            Payments.order_id == cast(TimeSale.plan_id, String),
+            Payments.plan_id == TimeSale.plan_id,
             Payments.payment_price == TimeSale.sale_price,
         )
         .correlate(TimeSale)
@@ -642,7 +642,7 @@ def get_plan_time_sale_by_id(db: Session, time_sale_id: UUID):
             Payments.paid_at.is_not(None),
             Payments.paid_at >= start_bound,
             Payments.paid_at <= end_bound,
-            Payments.order_id == cast(TimeSale.plan_id, String),
+            Payments.plan_id == TimeSale.plan_id,
             Payments.payment_price == TimeSale.sale_price,
         )
         .correlate(TimeSale)
@@ -699,7 +699,7 @@ def get_price_time_sale_by_id(db: Session, time_sale_id: UUID):
             Payments.paid_at.is_not(None),
             Payments.paid_at >= start_bound,
             Payments.paid_at <= end_bound,
-            Payments.order_id == cast(TimeSale.price_id, String),
+            Payments.price_id == TimeSale.price_id,
             Payments.payment_price == TimeSale.sale_price,
         )
         .correlate(TimeSale)
@@ -770,7 +770,7 @@ def get_post_sale_flag_map(db: Session, post_ids: List[UUID]) -> Dict[UUID, bool
                 Payments.paid_at.is_not(None),
                 Payments.paid_at >= TimeSale.start_date,
                 Payments.paid_at <= TimeSale.end_date,
-                Payments.order_id == cast(TimeSale.price_id, String),
+                Payments.price_id == TimeSale.price_id,
                 Payments.payment_price == TimeSale.sale_price,
             )
             .correlate(TimeSale)
@@ -837,7 +837,7 @@ def get_post_sale_flag_map(db: Session, post_ids: List[UUID]) -> Dict[UUID, bool
                     Payments.paid_at.is_not(None),
                     Payments.paid_at >= TimeSale.start_date,
                     Payments.paid_at <= TimeSale.end_date,
-                    Payments.order_id == cast(TimeSale.plan_id, String),
+                    Payments.plan_id == TimeSale.plan_id,
                     Payments.payment_price == TimeSale.sale_price,
                 )
                 .correlate(TimeSale)
@@ -915,7 +915,7 @@ def get_post_time_sale_details_map(
                 Payments.paid_at.is_not(None),
                 Payments.paid_at >= TimeSale.start_date,
                 Payments.paid_at <= TimeSale.end_date,
-                Payments.order_id == cast(TimeSale.price_id, String),
+                Payments.price_id == TimeSale.price_id,
                 Payments.payment_price == TimeSale.sale_price,
             )
             .correlate(TimeSale)
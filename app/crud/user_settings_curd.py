@@ -1,15 +1,107 @@
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
 
 from app.models.user_settings import UserSettings
 from app.schemas.user_settings import UserSettingsType
+from app.core.config import settings as app_settings
 from app.core.logger import Logger
 logger = Logger.get_logger()
 
+
+class UserSettingsCache:
+    """
+    ユーザー設定（settings の dict）の短命キャッシュ
+
+    プロセス内の上限付きLRU。設定が無いユーザーも None としてキャッシュする。
+    自プロセスでの更新時は invalidate し、他プロセスでの更新は ttl_sec 以内に反映される
+    """
+
+    def __init__(self, max_entries: int, ttl_sec: float):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self._entries: "OrderedDict[Tuple[UUID, int], Tuple[Optional[dict], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[Tuple[UUID, int]]) -> Tuple[Dict[Tuple[UUID, int], Optional[dict]], List[Tuple[UUID, int]]]:
+        """
+        (キャッシュにあった設定, キャッシュに無かったキー) を返す
+        """
+        hits: Dict[Tuple[UUID, int], Optional[dict]] = {}
+        misses: List[Tuple[UUID, int]] = []
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] > now:
+                    self._entries.move_to_end(key)
+                    hits[key] = entry[0]
+                else:
+                    if entry is not None:
+                        del self._entries[key]
+                    misses.append(key)
+        return hits, misses
+
+    def set_many(self, items: Dict[Tuple[UUID, int], Optional[dict]]) -> None:
+        if self.max_entries <= 0 or self.ttl_sec <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_sec
+        with self._lock:
+            for key, value in items.items():
+                self._entries[key] = (value, expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: UUID, type: int) -> None:
+        with self._lock:
+            self._entries.pop((user_id, int(type)), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_settings_cache = UserSettingsCache(
+    max_entries=app_settings.USER_SETTINGS_CACHE_MAX_ENTRIES,
+    ttl_sec=app_settings.USER_SETTINGS_CACHE_TTL_SEC,
+)
+
 def get_user_settings_by_user_id(db: Session, user_id: UUID, type: UserSettingsType) -> UserSettings:
     return db.query(UserSettings).filter(UserSettings.user_id == user_id, UserSettings.type == type).first()
 
+def get_user_settings_by_user_ids(db: Session, user_ids: Iterable[UUID], type: UserSettingsType) -> Dict[UUID, dict]:
+    """
+    複数ユーザーの設定を 1 クエリで取得する（設定が無いユーザーは含まない）
+    """
+    user_ids = list(set(user_ids))
+    if not user_ids:
+        return {}
+    rows = (
+        db.query(UserSettings.user_id, UserSettings.settings)
+        .filter(UserSettings.user_id.in_(user_ids), UserSettings.type == type)
+        .all()
+    )
+    return {row.user_id: row.settings or {} for row in rows}
+
+def get_cached_user_settings_by_user_ids(db: Session, user_ids: Iterable[UUID], type: UserSettingsType) -> Dict[UUID, dict]:
+    """
+    get_user_settings_by_user_ids のキャッシュ付き版（通知の送信可否判定用。設定が無いユーザーは含まない）
+
+    キャッシュに無いユーザーの分だけ 1 クエリで取得する
+    """
+    hits, misses = _settings_cache.get_many((user_id, int(type)) for user_id in set(user_ids))
+    result = {user_id: value for (user_id, _type), value in hits.items() if value is not None}
+    if misses:
+        fetched = get_user_settings_by_user_ids(db, [user_id for user_id, _type in misses], type)
+        _settings_cache.set_many({key: fetched.get(key[0]) for key in misses})
+        result.update(fetched)
+    return result
+
 def update_user_settings_by_user_id(db: Session, user_id: UUID, type: UserSettingsType, settings: dict) -> UserSettings:
     try:
         user_settings = get_user_settings_by_user_id(db, user_id, type)
@@ -23,12 +115,14 @@ def update_user_settings_by_user_id(db: Session, user_id: UUID, type: UserSettin
             )
             db.add(user_settings)
             db.commit()
+            _settings_cache.invalidate(user_id, type)
             db.refresh(user_settings)
             return user_settings
         else:
             user_settings.settings = settings
             user_settings.updated_at = datetime.now(timezone.utc)
             db.commit()
+            _settings_cache.invalidate(user_id, type)
             db.refresh(user_settings)
             return user_settings
     except Exception as e:
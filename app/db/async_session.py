@@ -0,0 +1,50 @@
+from typing import AsyncIterator
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.engine import create_async_db_engine
+from app.middlewares.read_your_writes import reads_from_primary
+
+# 非同期エンジン（asyncpg）。async def エンドポイントでイベントループを止めずに DB I/O を行う
+async_engine = create_async_db_engine()
+
+# expire_on_commit=False: commit 後に属性アクセスで暗黙の再読込（同期 I/O）が走らないようにする
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+# リードレプリカ（DATABASE_READ_URL 未設定時はプライマリと同じエンジン）
+async_read_engine = (
+    create_async_db_engine(settings.ASYNC_DATABASE_READ_URL, label="replica_async")
+    if settings.ASYNC_DATABASE_READ_URL
+    else async_engine
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine, autoflush=False, expire_on_commit=False
+)
+
+
+# FastAPI用の非同期DB依存関数
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    AsyncSession を返す
+
+    既存の同期 crud 関数は `await db.run_sync(crud_func, *args)` で呼び出せる
+    （crud_func の第1引数に同期 Session が渡され、I/O は asyncpg 上で非同期に行われる）
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# 読み取り専用の async def エンドポイント用（レプリカへ振り分け）
+async def get_async_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    集計・レポートなど読み取りのみのエンドポイント用 AsyncSession
+
+    直前に更新したクライアント（read-your-writes Cookie あり）はプライマリから読む
+    """
+    factory = AsyncSessionLocal if reads_from_primary(request) else AsyncReadSessionLocal
+    async with factory() as db:
+        yield db
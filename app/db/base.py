@@ -1,16 +1,27 @@
-from sqlalchemy import create_engine, MetaData
+from fastapi import Request
+from sqlalchemy import MetaData
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.engine import create_db_engine
+from app.middlewares.read_your_writes import reads_from_primary
 
 # DB接続用URL（.envから取得）
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-# エンジン作成
-engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
+# エンジン作成（プール設定・計測は app.db.engine に集約）
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
 
 # セッション作成
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# リードレプリカ（DATABASE_READ_URL 未設定時はプライマリと同じエンジン）
+read_engine = (
+    create_db_engine(settings.DATABASE_READ_URL, label="replica")
+    if settings.DATABASE_READ_URL
+    else engine
+)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
 # Naming convention helps Alembic autogenerate sensible constraint names
 NAMING_CONVENTION = {
     "ix": "ix_%(column_0_label)s",
@@ -34,3 +45,19 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# 読み取り専用エンドポイント用のDB依存関数（レプリカへ振り分け）
+def get_read_db(request: Request):
+    """
+    集計・検索など読み取りのみのエンドポイント用セッション
+
+    直前に更新したクライアント（read-your-writes Cookie あり）はプライマリから読む。
+    書き込みが必要な処理には get_db を併用すること
+    """
+    factory = SessionLocal if reads_from_primary(request) else ReadSessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,103 @@
+"""
+DBエンジン生成
+
+同期（psycopg2）/非同期（asyncpg）のエンジンはすべてここで作る。
+プール設定・ステートメントタイムアウトは Settings から取り、計測（app.db.metrics）を必ず登録する
+"""
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.metrics import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    instrument_engine,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+def _pool_kwargs() -> Dict[str, Any]:
+    return {
+        "pool_pre_ping": True,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SEC,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SEC,
+    }
+
+
+def _naive_utc(value: Any) -> Any:
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _naive_utc_params(params: Any) -> Any:
+    if isinstance(params, dict):
+        return {key: _naive_utc(value) for key, value in params.items()}
+    if isinstance(params, (list, tuple)):
+        return type(params)(_naive_utc(value) for value in params)
+    return params
+
+
+def _to_naive_utc_parameters(conn, cursor, statement, parameters, context, executemany):
+    """
+    タイムゾーン付きの datetime パラメータを UTC の naive に変換する（before_cursor_execute）
+
+    日時カラムはすべて timestamp without time zone（UTC）。psycopg2 はタイムゾーン付きの値も
+    文字列で渡せるが、asyncpg は型エラーにするため、非同期エンジンでは送信前に揃える
+    """
+    if executemany:
+        return statement, [_naive_utc_params(params) for params in parameters]
+    return statement, _naive_utc_params(parameters)
+
+
+def create_db_engine(url: Optional[str] = None, label: str = "primary") -> Engine:
+    """
+    同期エンジンを作成する（label はメトリクスのラベル）
+    """
+    connect_args: Dict[str, Any] = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+
+    engine = create_engine(
+        url or settings.DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        connect_args=connect_args,
+        **_pool_kwargs(),
+    )
+    instrument_engine(engine, label)
+    return engine
+
+
+def create_async_db_engine(
+    url: Optional[str] = None, label: str = "primary_async"
+) -> "AsyncEngine":
+    """
+    非同期エンジンを作成する（label はメトリクスのラベル）
+    """
+    # 同期エンジンのみ使う経路（alembic 等）で greenlet を必須にしないよう遅延 import する
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    connect_args: Dict[str, Any] = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+        }
+
+    engine = create_async_engine(
+        url or settings.ASYNC_DATABASE_URL,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        connect_args=connect_args,
+        **_pool_kwargs(),
+    )
+    event.listen(
+        engine.sync_engine, "before_cursor_execute", _to_naive_utc_parameters, retval=True
+    )
+    instrument_engine(engine.sync_engine, label)
+    return engine
@@ -0,0 +1,217 @@
+"""
+DBコネクションプール・クエリの計測
+
+プールの待ち時間・保持時間・使用中接続数とスロークエリを Prometheus メトリクスとして記録する。
+ワーカー数やプールサイズを実測値から決めるためのもの（/metrics で公開）
+
+複数ワーカーで動かす場合は起動前に環境変数 PROMETHEUS_MULTIPROC_DIR（起動ごとに空にしたディレクトリ）を
+設定する。prometheus_client の multiprocess モードになり、/metrics は全ワーカーの値を集計して返す
+"""
+import hmac
+import os
+import time
+from typing import Optional, Tuple
+
+from fastapi import Header, HTTPException
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+from app.core.logger import Logger
+
+logger = Logger.get_logger()
+
+_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "プールから接続を取得するまでの待ち時間（新規接続の確立を含む）",
+    ["engine"],
+    buckets=_LATENCY_BUCKETS,
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "QueuePool limit によるチェックアウトのタイムアウト回数",
+    ["engine"],
+)
+POOL_CONNECTION_HOLD = Histogram(
+    "db_pool_connection_hold_seconds",
+    "接続をチェックアウトしてから返却するまでの時間",
+    ["engine"],
+    buckets=_LATENCY_BUCKETS,
+)
+# multiprocess モードでは稼働中のワーカーの値を合計する
+POOL_IN_USE = Gauge(
+    "db_pool_in_use",
+    "使用中（チェックアウト中）の接続数",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+POOL_SIZE = Gauge(
+    "db_pool_size", "プールの常駐接続数（pool_size）", ["engine"], multiprocess_mode="livesum"
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "pool_size を超えて開いている接続数",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL 1 文の実行時間",
+    ["engine"],
+    buckets=_LATENCY_BUCKETS,
+)
+SLOW_QUERIES = Counter(
+    "db_slow_queries_total",
+    "DB_SLOW_QUERY_MS を超えた SQL の件数",
+    ["engine"],
+)
+
+
+class _InstrumentedPoolMixin:
+    """
+    接続取得（キュー待ちを含む）の所要時間とタイムアウトを計測するプール
+    """
+
+    metrics_label: str = "default"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.labels(engine=self.metrics_label).inc()
+            logger.warning(
+                f"DB pool checkout timed out: engine={self.metrics_label} "
+                f"size={self.size()} overflow={self.overflow()} in_use={self.checkedout()}"
+            )
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.labels(engine=self.metrics_label).observe(
+                time.perf_counter() - started
+            )
+
+    def recreate(self):
+        # engine.dispose() で作り直されたプールにもラベルを引き継ぐ
+        pool = super().recreate()
+        pool.metrics_label = self.metrics_label
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine: Engine, label: str) -> None:
+    """
+    同期エンジン（AsyncEngine の場合は sync_engine）にプール・クエリ計測を登録する
+    """
+    if isinstance(engine.pool, _InstrumentedPoolMixin):
+        engine.pool.metrics_label = label
+
+    # multiprocess モードでは set_function の値を集計できないため、チェックアウト/返却時に更新する
+    POOL_SIZE.labels(engine=label).set(_pool_stat(engine, "size"))
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        POOL_IN_USE.labels(engine=label).inc()
+        POOL_OVERFLOW.labels(engine=label).set(max(_pool_stat(engine, "overflow"), 0))
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            POOL_CONNECTION_HOLD.labels(engine=label).observe(
+                time.perf_counter() - checked_out_at
+            )
+            POOL_IN_USE.labels(engine=label).dec()
+        POOL_OVERFLOW.labels(engine=label).set(max(_pool_stat(engine, "overflow"), 0))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started_at"].pop()
+        _observe_query(label, statement, time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(exception_context):
+        # 失敗した SQL は after_cursor_execute が呼ばれないため開始時刻を捨てる
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started_at"):
+            conn.info["query_started_at"].pop()
+
+
+def _pool_stat(engine: Engine, name: str) -> float:
+    method = getattr(engine.pool, name, None)
+    return float(method()) if callable(method) else 0.0
+
+
+def _observe_query(label: str, statement: str, elapsed: float) -> None:
+    QUERY_DURATION.labels(engine=label).observe(elapsed)
+    threshold_ms: Optional[int] = settings.DB_SLOW_QUERY_MS
+    if threshold_ms and elapsed * 1000 >= threshold_ms:
+        SLOW_QUERIES.labels(engine=label).inc()
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.0f}ms, engine={label}): "
+            f"{' '.join(statement.split())[:1000]}"
+        )
+
+
+def _is_multiprocess() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def verify_metrics_token(authorization: Optional[str] = Header(None)) -> None:
+    """
+    /metrics の認証（Authorization: Bearer <METRICS_TOKEN>）
+    """
+    expected = f"Bearer {settings.METRICS_TOKEN}"
+    if (
+        not settings.METRICS_TOKEN
+        or not authorization
+        or not hmac.compare_digest(authorization.encode(), expected.encode())
+    ):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Prometheus のテキスト形式でメトリクスを出力する
+
+    Returns:
+        (本文, Content-Type)
+    """
+    if _is_multiprocess():
+        # 全ワーカーが書き出した値を集計する（リクエストごとにレジストリを作る）
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_metrics_process_dead() -> None:
+    """
+    ワーカー終了時に呼ぶ（multiprocess モードで終了したワーカーの livesum ゲージを集計から外す）
+    """
+    if _is_multiprocess():
+        multiprocess.mark_process_dead(os.getpid())
@@ -3,8 +3,7 @@ from pathlib import Path
 from alembic import command
 from alembic.config import Config
 from alembic.script import ScriptDirectory
-from sqlalchemy import create_engine, text
-from app.db.session import SQLALCHEMY_DATABASE_URL
+from app.db.base import engine
 from alembic.runtime.migration import MigrationContext
 
 def run_migrations() -> None:
@@ -16,7 +15,6 @@ def run_migrations() -> None:
     script = ScriptDirectory.from_config(cfg)
     head_rev = script.get_current_head()
     try:
-        engine = create_engine(SQLALCHEMY_DATABASE_URL)
         with engine.connect() as conn:
             context = MigrationContext.configure(conn)
             current_rev = context.get_current_revision()
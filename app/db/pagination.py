@@ -0,0 +1,162 @@
+"""
+キーセット（カーソル）ページング共通処理
+
+offset は深いページほど読み飛ばし行が増え、count() は毎回全件を集計する。
+ここではソートキーの最終値を不透明なカーソル文字列にして次ページの WHERE 条件に使い、
+どのページでも先頭ページと同じコストで取得できるようにする。
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+
+# リストをそのまま返す既存APIでは、次ページのカーソルをこのレスポンスヘッダーで返す
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class SortKey(NamedTuple):
+    """ソートキー（末尾に一意なキー（id 等）を必ず含めること）"""
+
+    column: ColumnElement
+    descending: bool = True
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"u": str(value)}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and len(value) == 1:
+        (tag, raw), = value.items()
+        if tag == "dt":
+            return datetime.fromisoformat(raw)
+        if tag == "d":
+            return date.fromisoformat(raw)
+        if tag == "u":
+            return UUID(raw)
+        if tag == "n":
+            return Decimal(raw)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    ソートキーの値をカーソル文字列にする
+    """
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    カーソル文字列をソートキーの値に戻す（不正な場合は 400）
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("cursor size mismatch")
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_condition(sort_keys: Sequence[SortKey], values: Sequence[Any]) -> ColumnElement:
+    """
+    (k1, k2, ...) がカーソル位置より後ろにある行の条件
+
+    昇順/降順が混在してもよいよう、k1 > v1 OR (k1 = v1 AND k2 > v2) ... の形に展開する
+    """
+    conditions = []
+    for i, key in enumerate(sort_keys):
+        after = key.column < values[i] if key.descending else key.column > values[i]
+        equals = [sort_keys[j].column == values[j] for j in range(i)]
+        conditions.append(and_(*equals, after) if equals else after)
+    return or_(*conditions)
+
+
+def paginate_by_cursor(
+    query: Query,
+    sort_keys: Sequence[SortKey],
+    limit: int,
+    cursor: Optional[str] = None,
+    cursor_values: Optional[Callable[[Any], Sequence[Any]]] = None,
+    offset: int = 0,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    クエリをキーセットでページングする
+
+    Args:
+        query: ORDER BY / LIMIT を付ける前のクエリ
+        sort_keys: ソートキー（末尾は一意キー）
+        limit: 取得件数
+        cursor: 前ページの next_cursor（指定時は offset より優先）
+        cursor_values: 行からソートキーの値を取り出す関数
+        offset: 旧クライアント向けのオフセット（cursor 未指定時のみ使用）
+
+    Returns:
+        (行リスト, 次ページのカーソル（最終ページなら None）)
+    """
+    if cursor:
+        query = query.filter(
+            keyset_condition(sort_keys, decode_cursor(cursor, len(sort_keys)))
+        )
+    query = query.order_by(
+        *[key.column.desc() if key.descending else key.column.asc() for key in sort_keys]
+    )
+    if offset and not cursor:
+        query = query.offset(offset)
+
+    # 1 件多く読んで次ページの有無を判定する（count() 不要）
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(cursor_values(rows[-1]))
+
+
+def count_up_to(db: Session, query: Query, cap: Optional[int] = None) -> Tuple[int, bool]:
+    """
+    件数を数える（cap 指定時のみ上限付き）
+
+    ページ番号を表示するクライアントには正確な件数が必要なため、既定では打ち切らない。
+    カーソルで無限スクロールするクライアントだけ cap を指定し、履歴が増えてもコストを一定にする
+
+    Returns:
+        (件数, cap で打ち切ったかどうか)
+    """
+    query = query.order_by(None)
+    if cap is None:
+        counted = query.subquery()
+        return db.execute(select(func.count()).select_from(counted)).scalar() or 0, False
+    # cap + 1 件まで数えて打ち切りの有無を判定する
+    limited = query.limit(cap + 1).subquery()
+    total = db.execute(select(func.count()).select_from(limited)).scalar() or 0
+    if total > cap:
+        return cap, True
+    return total, False
+
+
+def count_cap_for(cursor: Optional[str]) -> Optional[int]:
+    """
+    count_up_to に渡す上限（cursor 指定時のみ PAGINATION_COUNT_CAP、それ以外は正確に数える）
+    """
+    return settings.PAGINATION_COUNT_CAP if cursor else None
@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta, timezone
+
+from app.db.engine import _to_naive_utc_parameters
+
+JST = timezone(timedelta(hours=9))
+
+
+def test_aware_datetime_parameters_become_naive_utc():
+    aware = datetime(2026, 10, 17, 9, 0, tzinfo=JST)
+    naive = datetime(2026, 10, 17, 0, 0)
+
+    statement, params = _to_naive_utc_parameters(
+        None, None, "SELECT $1, $2, $3", (aware, naive, "x"), None, False
+    )
+
+    assert statement == "SELECT $1, $2, $3"
+    assert params == (datetime(2026, 10, 17, 0, 0), naive, "x")
+    assert params[0].tzinfo is None
+
+
+def test_executemany_and_dict_parameters():
+    aware = datetime(2026, 10, 17, 0, 0, tzinfo=timezone.utc)
+
+    _statement, params = _to_naive_utc_parameters(
+        None, None, "INSERT", [(aware, 1), (aware, 2)], None, True
+    )
+    assert params == [(aware.replace(tzinfo=None), 1), (aware.replace(tzinfo=None), 2)]
+
+    _statement, params = _to_naive_utc_parameters(
+        None, None, "SELECT", {"since": aware}, None, False
+    )
+    assert params == {"since": aware.replace(tzinfo=None)}
@@ -0,0 +1,61 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+import app.db.metrics as metrics
+from app.db.metrics import (
+    POOL_IN_USE,
+    POOL_SIZE,
+    instrument_engine,
+    render_metrics,
+    verify_metrics_token,
+)
+
+
+def test_metrics_token_is_required(monkeypatch):
+    monkeypatch.setattr(metrics.settings, "METRICS_TOKEN", "secret")
+
+    verify_metrics_token("Bearer secret")
+    for authorization in (None, "", "Bearer wrong", "secret", "Bearer ｓｅｃｒｅｔ"):
+        with pytest.raises(HTTPException) as exc:
+            verify_metrics_token(authorization)
+        assert exc.value.status_code == 401
+
+
+def test_metrics_are_rejected_without_configured_token(monkeypatch):
+    monkeypatch.setattr(metrics.settings, "METRICS_TOKEN", "")
+
+    with pytest.raises(HTTPException):
+        verify_metrics_token("Bearer ")
+
+
+def test_pool_gauges_follow_checkout_and_checkin(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}", poolclass=QueuePool, pool_size=3)
+    instrument_engine(engine, "test-pool")
+    in_use = POOL_IN_USE.labels(engine="test-pool")
+
+    assert POOL_SIZE.labels(engine="test-pool")._value.get() == 3
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert in_use._value.get() == 1
+    assert in_use._value.get() == 0
+    engine.dispose()
+
+
+def test_render_metrics_without_multiprocess(monkeypatch):
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+
+    body, content_type = render_metrics()
+
+    assert b"db_pool_in_use" in body
+    assert content_type.startswith("text/plain")
+
+
+def test_render_metrics_collects_multiprocess_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    body, _content_type = render_metrics()
+
+    # 他のワーカーが書き出したファイルがなければ空（プロセス内のレジストリは使わない）
+    assert b"db_pool_in_use" not in body
@@ -0,0 +1,107 @@
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine
+from sqlalchemy.orm import Session
+
+import app.db.pagination as pagination
+from app.db.pagination import (
+    SortKey,
+    count_cap_for,
+    count_up_to,
+    decode_cursor,
+    encode_cursor,
+    paginate_by_cursor,
+)
+
+_metadata = MetaData()
+_items = Table(
+    "items",
+    _metadata,
+    Column("id", Integer, primary_key=True),
+    Column("score", Integer, nullable=False),
+    Column("name", String(20)),
+)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    _metadata.create_all(engine)
+    session = Session(engine)
+    # score は重複させ、id でタイブレークされることを確認する
+    session.execute(
+        _items.insert(),
+        [{"id": i, "score": i // 3, "name": f"item-{i}"} for i in range(1, 11)],
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_cursor_round_trip_keeps_value_types():
+    values = [datetime(2026, 10, 17, 9, 30), date(2026, 10, 17), uuid4(), Decimal("1.50"), 3, "x"]
+
+    cursor = encode_cursor(values)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, len(values)) == values
+
+
+@pytest.mark.parametrize("cursor", ["!!!", encode_cursor([1, 2]), "bm90LWpzb24"])
+def test_decode_cursor_rejects_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, 3)
+    assert exc.value.status_code == 400
+
+
+def test_paginate_by_cursor_walks_all_rows_once(db):
+    sort_keys = [SortKey(_items.c.score), SortKey(_items.c.id)]
+    seen = []
+    cursor = None
+    while True:
+        rows, cursor = paginate_by_cursor(
+            db.query(_items),
+            sort_keys,
+            4,
+            cursor=cursor,
+            cursor_values=lambda r: (r.score, r.id),
+        )
+        seen.extend(r.id for r in rows)
+        if cursor is None:
+            break
+
+    assert seen == [10, 9, 8, 7, 6, 5, 4, 3, 2, 1]
+
+
+def test_paginate_by_cursor_uses_offset_without_cursor(db):
+    rows, next_cursor = paginate_by_cursor(
+        db.query(_items),
+        [SortKey(_items.c.id, descending=False)],
+        3,
+        cursor_values=lambda r: (r.id,),
+        offset=8,
+    )
+
+    assert [r.id for r in rows] == [9, 10]
+    assert next_cursor is None
+
+
+def test_count_up_to_is_exact_without_cap(db):
+    assert count_up_to(db, db.query(_items)) == (10, False)
+
+
+def test_count_up_to_reports_capped_total(db):
+    assert count_up_to(db, db.query(_items), 5) == (5, True)
+    assert count_up_to(db, db.query(_items), 10) == (10, False)
+    assert count_up_to(db, db.query(_items).filter(_items.c.score == 0), 5) == (2, False)
+
+
+def test_count_cap_only_applies_to_cursor_requests(monkeypatch):
+    monkeypatch.setattr(pagination.settings, "PAGINATION_COUNT_CAP", 100)
+
+    assert count_cap_for(None) is None
+    assert count_cap_for(encode_cursor([1])) == 100
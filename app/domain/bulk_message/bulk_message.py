@@ -2,24 +2,18 @@ from __future__ import annotations
 from logging import Logger
 from sqlalchemy.orm import Session
 from app.core.logger import Logger as CoreLogger
-from app.crud import bulk_message_crud, user_crud, notifications_crud, profile_crud
+from app.crud import bulk_message_crud
 from app.schemas.bulk_message import PresignedUrlRequest, BulkMessageSendRequest
-from app.constants.enums import MessageAssetType
-from typing import List
-from datetime import datetime
+from app.constants.enums import MessageAssetType, ReservationMessageRecipientStatus
+from typing import Optional
 from app.models.reservation_message import ReservationMessage
 from app.models.user import Users
 from app.crud.reservation_message_crud import ReservationMessageCrud
 from app.services.s3 import presign, keygen
-from app.services.s3.client import scheduler_client
 import uuid
 from uuid import UUID
-from app.services.email.send_email import send_message_notification_email
+from app.services.bulk_message.job_dispatcher import wake_bulk_message_dispatcher
 from app.api.commons.function import CommonFunction
-from app.models.profiles import Profiles
-import os
-import json
-from datetime import timezone, timedelta
 from app.core.logger import Logger as CoreLogger
 
 class BulkMessageDomain:
@@ -68,10 +62,10 @@ class BulkMessageDomain:
         """
         一斉送信の処理
         - スケジュールを定義する前に、送信先とアセットのチェックを行う
-        - スケジュール送信または即時送信の処理
+        - 送信先を一斉送信ジョブとして登録（メッセージの作成・通知はディスパッチャーがバックグラウンドで行う）
+        - 予約送信の場合、スケジュールはディスパッチャーがメッセージを作成し終えてから定義する
         - 送信先が1つも選択されていない場合はエラー
         - アセットがある場合はasset_typeも必要
-        - メッセージを送信先に送信
         Args:
             request (BulkMessageSendRequest): リクエスト
             current_user (Users): 現在のユーザー
@@ -80,40 +74,76 @@ class BulkMessageDomain:
             # スケジュールを定義する前に、送信先とアセットのチェックを行う
             self.__check_schedule_name(request)
 
-            sent_count, message_ids, group_by, target_user_ids = self._handle_message_sending(request, current_user)
-
-            # スケジュール送信または即時送信の処理
-            if request.scheduled_at:
-                self._handle_scheduled_message(group_by, request.scheduled_at, current_user.id)
-            else:
-                self._handle_immediate_message(request, target_user_ids, current_user.id)
+            job = self._handle_message_sending(request, current_user)
 
+            # ジョブと送信先を確定してからディスパッチャーを起こす
+            self.db.commit()
+            wake_bulk_message_dispatcher()
 
+            # 受付時点では未作成（進捗は get_bulk_message_job_status で取得する）
             return {
-                "message": "一斉送信が完了しました",
-                "sent_count": sent_count,
-                "scheduled": False,
-                "scheduled_at": None
+                "message": "一斉送信を受け付けました",
+                "sent_count": 0,
+                "queued_count": job.total_count,
+                "total_count": job.total_count,
+                "scheduled": request.scheduled_at is not None,
+                "scheduled_at": request.scheduled_at,
+                "group_by": job.group_by,
+                "status": job.status,
             }
         except Exception as e:
             self.db.rollback()
             self.logger.error(f"一斉送信エラー: {e}")
             raise Exception(status_code=500, detail=str(e))
-     
+
+    def get_bulk_message_job_status(self, group_by: str, current_user: Users) -> Optional[dict]:
+        """
+        一斉送信ジョブの進捗を取得
+
+        Args:
+            group_by (str): 一斉送信のグループ化キー
+            current_user (Users): 現在のユーザー
+
+        Returns:
+            dict: ジョブの進捗（自分のジョブが見つからない場合は None）
+        """
+        job = self.reservation_message_crud.get_bulk_message_job(group_by, current_user.id)
+        if job is None:
+            return None
+        return self.__job_status(job)
+
+    def retry_bulk_message_job(self, group_by: str, current_user: Users) -> Optional[dict]:
+        """
+        リトライ上限に達した送信先を再送する
+
+        Args:
+            group_by (str): 一斉送信のグループ化キー
+            current_user (Users): 現在のユーザー
+
+        Returns:
+            dict: 再開後のジョブの進捗（自分のジョブが見つからない場合は None）
+        """
+        job = self.reservation_message_crud.get_bulk_message_job(group_by, current_user.id)
+        if job is None:
+            return None
+        if self.reservation_message_crud.retry_failed_recipients(job):
+            wake_bulk_message_dispatcher()
+        return self.__job_status(job)
+
     ########################################################
     # メイン処理
     ########################################################
-    def _handle_message_sending(self, request: BulkMessageSendRequest, current_user: Users):
+    def _handle_message_sending(self, request: BulkMessageSendRequest, current_user: Users) -> ReservationMessage:
         """
         メッセージ送信の処理（クラス内完結）
-        受信者へのメッセージ送信を制御
+        対象ユーザーを取得して一斉送信ジョブとして登録する（commit しない）
 
         Args:
             request: BulkMessageSendRequest
             current_user: Users
 
         Returns:
-            tuple: (sent_count, message_ids, group_by, target_user_ids)
+            ReservationMessage: 一斉送信ジョブ
         """
         # 対象ユーザーIDリストを取得（DB接続）
         target_user_ids = bulk_message_crud.get_target_user_ids(
@@ -124,284 +154,52 @@ class BulkMessageDomain:
             send_to_follower_users=request.send_to_follower_users,
             send_to_plan_subscribers=request.send_to_plan_subscribers
         )
+        # 自分自身には送らない
+        target_user_ids = [user_id for user_id in target_user_ids if user_id != current_user.id]
 
         if not target_user_ids:
             raise Exception(status_code=400, detail="送信対象のユーザーが見つかりません")
 
-        # メッセージ送信（DB接続）
-        sent_count, message_ids, group_by = bulk_message_crud.send_bulk_messages(
-            db=self.db,
-            creator_user_id=current_user.id,
+        # 一斉送信ジョブを登録（DB接続）
+        return self.reservation_message_crud.create_bulk_message_job(
+            group_by=str(uuid.uuid4()),
+            sender_user_id=current_user.id,
             message_text=request.message_text,
             target_user_ids=target_user_ids,
             asset_storage_key=request.asset_storage_key,
             asset_type=request.asset_type,
-            scheduled_at=request.scheduled_at
+            scheduled_at=request.scheduled_at,
         )
 
-        return sent_count, message_ids, group_by, target_user_ids
-
-    def _handle_scheduled_message(self, group_by: str, scheduled_at: datetime, sender_user_id: UUID):
-        """
-        スケジュール送信の処理（クラス内完結）
-        - ECSタスクのスケジュールを定義
-        - 予約メッセージを作成
-
-        Args:
-            group_by: グループ化キー
-            scheduled_at: 予約送信日時
-            sender_user_id: 送信者ユーザーID
-
-        Raises:
-            Exception: ECSタスクのスケジュール定義に失敗した場合
-        """
-        # 外部サービス（ECS）への接続
-        result = self.__set_ecs_scheduler(group_by, scheduled_at, sender_user_id)
-        if not result["result"]:
-            self.db.rollback()
-            raise Exception(status_code=500, detail="ECSタスクのスケジュールを定義できませんでした")
-        
-        # クラス内完結処理：予約メッセージオブジェクトの作成
-        reservation_message_obj = self.__create_reservation_message_object(
-            result["schedule_name"], group_by, scheduled_at
-        )
-        
-        # DB接続：予約メッセージの保存
-        self.__reservation_message(reservation_message_obj)
-
-    def _handle_immediate_message(self, request: BulkMessageSendRequest, target_user_ids: List[UUID], sender_user_id: UUID):
-        """
-        即時送信の処理（クラス内完結）
-        - 受信者に通知とメールを送信（ベストエフォート）
-
-        Args:
-            request: BulkMessageSendRequest
-            target_user_ids: 送信先ユーザーIDリスト
-            sender_user_id: 送信者ユーザーID
-        """
-        # 即時送信でアセットがない場合、受信者に通知とメールを送信（ベストエフォート）
-        try:
-            if request.asset_storage_key is None:
-                # 外部サービス（通知・メール）への接続
-                self.__notification_service(
-                    sender_user_id=sender_user_id,
-                    target_user_ids=target_user_ids,
-                    message_text=request.message_text,
-                )
-        except Exception as e:
-            # 通知送信エラーはログに記録するが、メッセージ送信は成功とする
-            self.logger.error(f"Failed to send notifications for bulk message: {e}")
-
-    ########################################################
-    # 外部サービス接続
-    ########################################################
-
-    def __reservation_message(self, reservation_message_obj: ReservationMessage):
-        """
-        データベース接続：予約メッセージの保存
-
-        Args:
-            reservation_message_obj: ReservationMessage
-        """
-        self.reservation_message_crud.create_reservation_message(
-            reservation_message=reservation_message_obj
-        )
-
-    def __set_ecs_scheduler(
-        self,
-        group_by: str,
-        scheduled_at: datetime,
-        sender_user_id: UUID
-    ) -> dict:
-        """
-        外部サービス接続：ECSスケジューラーへの接続
-        ECSタスクのスケジュールを定義
-
-        Args:
-            group_by: グループ化キー
-            scheduled_at: 予約送信日時
-            sender_user_id: 送信者ユーザーID
-
-        Returns:
-            dict: スケジュール情報
-        """
-        try:
-            scheduler = scheduler_client()
-
-            # (A) スケジュール名（ユニークに）
-            schedule_name = f"send-resv-msg-{sender_user_id}-{int(scheduled_at.timestamp())}"
-
-            # (B) 単発 at() 形式（秒まで）
-            # scheduled_at は UTC で受け取るため、JST (UTC+9) に変換
-            jst_timezone = timezone(timedelta(hours=9))
-            scheduled_at_jst = scheduled_at.astimezone(jst_timezone) if scheduled_at.tzinfo else scheduled_at.replace(tzinfo=timezone.utc).astimezone(jst_timezone)
-
-            # at() 式には JST時刻を渡す（ScheduleExpressionTimezone="Asia/Tokyo"と合わせる）
-            schedule_expression = f"at({scheduled_at_jst.strftime('%Y-%m-%dT%H:%M:%S')})"
-
-            self.logger.info(f"Creating schedule: {schedule_name} at {scheduled_at_jst.strftime('%Y-%m-%d %H:%M:%S %Z')} JST")
-
-            # (C) ネットワーク設定
-            ECS_SUBNETS = (
-                os.environ.get("ECS_SUBNETS", "").split(",")
-                if os.environ.get("ECS_SUBNETS")
-                else []
-            )
-            ECS_SECURITY_GROUPS = (
-                os.environ.get("ECS_SECURITY_GROUPS", "").split(",")
-                if os.environ.get("ECS_SECURITY_GROUPS")
-                else []
-            )
-            ECS_ASSIGN_PUBLIC_IP = os.environ.get("ECS_ASSIGN_PUBLIC_IP", "ENABLED")
-            network_configuration = {
-                "awsvpcConfiguration": {
-                    "Subnets": ECS_SUBNETS,
-                    "SecurityGroups": ECS_SECURITY_GROUPS,
-                    "AssignPublicIp": ECS_ASSIGN_PUBLIC_IP,
-                }
-            }
-
-            task_definition = os.environ["ECS_SEND_RESERVATION_MESSAGE_TASK_ARN"]
-            
-            # (D) ★ここが肝：ECS RunTask の overrides を Target.Input に入れる
-            overrides = {
-                "containerOverrides": [
-                    {
-                        "name": os.environ["ECS_SEND_RESERVATION_MESSAGE_CONTAINER"],
-                        "environment": [
-                            {"name": "GROUP_BY", "value": str(group_by)},
-                            {"name": "SENDER_USER_ID", "value": str(sender_user_id)},
-                        ],
-                    }
-                ]
-            }
-
-            scheduler.create_schedule(
-                Name=schedule_name,
-                ScheduleExpression=schedule_expression,
-                ScheduleExpressionTimezone="Asia/Tokyo",
-                FlexibleTimeWindow={"Mode": "OFF"},
-                State="ENABLED",
-                ActionAfterCompletion="DELETE",
-                Target={
-                    # ECS RunTask ターゲット
-                    "Arn": os.environ["ECS_SEND_RESERVATION_MESSAGE_CLUSTER_ARN"],      # ※クラスターARNを入れる
-                    "RoleArn": os.environ["SCHEDULER_ROLE_ARN"],           # SchedulerがRunTaskできるロール
-                    "EcsParameters": {
-                        "TaskDefinitionArn": task_definition,              # ARN推奨（名前だけだと環境でズレることがある）
-                        "LaunchType": "FARGATE",
-                        "NetworkConfiguration": network_configuration,
-                        # 必要なら PlatformVersion / CapacityProviderStrategy など
-                    },
-                    "Input": json.dumps(overrides),
-                },
-                # 可能なら実行後削除（ActionAfterCompletion はSDK/バージョンで差分が出ることがあるので注意）
-            )
-            return {
-                "schedule_name": schedule_name,
-                "result": True,
-            }
-        except Exception as e:
-            self.logger.error(f"Failed to define ECS task schedule: {e}")
-            return {
-                "schedule_name": schedule_name,
-                "result": False,
-            }
-
-    def __notification_service(
-        self,
-        sender_user_id: UUID,
-        target_user_ids: List[UUID],
-        message_text: str,
-    ) -> None:
-        """
-        外部サービス接続：通知・メールサービスへの接続
-        受信者に対して通知とメールを送信（即時送信時）
-        send_conversation_messageの通知ロジックを参考に実装
-        """
-        # 送信者のプロフィール情報を取得
-        sender_user = user_crud.get_user_by_id(self.db, sender_user_id)
-        if not sender_user:
-            self.logger.warning(f"Sender user not found: {sender_user_id}")
-            return
-
-        sender_profile = profile_crud.get_profile_by_user_id(self.db, sender_user_id)
-        sender_avatar_url = f"{os.getenv('CDN_BASE_URL')}/{sender_profile.avatar_url}" if sender_profile and sender_profile.avatar_url else None
-
-        # メッセージプレビューを生成
-        if message_text:
-            message_preview = message_text[:50] if len(message_text) > 50 else message_text
-
-        # 各受信者に通知とメールを送信
-        for recipient_user_id in target_user_ids:
-            try:
-                need_to_send_notification = self.common_function.get_user_need_to_send_notification(
-                    self.db, recipient_user_id, "userMessages"
-                )
-                if not need_to_send_notification:
-                    continue
-
-                recipient_user = user_crud.get_user_by_id(self.db, recipient_user_id)
-                if not recipient_user:
-                    continue
-
-                # アプリ内通知を作成（新しいメッセージ到着）
-                # 一斉送信の場合は、会話IDがないため、generic notificationを作成
-                notifications_crud.add_notification_for_bulk_message(
-                    db=self.db,
-                    recipient_user_id=recipient_user.id,
-                    sender_profile_name=sender_user.profile_name or "Unknown User",
-                    sender_avatar_url=sender_avatar_url,
-                    message_preview=message_preview,
-                )
-
-                # メール通知を送信
-                need_to_send_email_notification = self.common_function.get_user_need_to_send_notification(
-                    db=self.db, user_id=recipient_user.id, notification_type="message"
-                )
-                if need_to_send_email_notification and recipient_user.email:
-                    try:
-                        recipient_profile = profile_crud.get_profile_by_user_id(self.db, recipient_user.id)
-                        recipient_name = recipient_profile.username if recipient_profile and recipient_profile.username else recipient_user.profile_name
-
-                        send_message_notification_email(
-                            to=recipient_user.email,
-                            sender_name=sender_user.profile_name or "Unknown User",
-                            recipient_name=recipient_name or "User",
-                            message_preview=message_preview,
-                            conversation_url=f"{os.getenv('FRONTEND_URL', 'https://mijfans.jp/')}/message/conversation-list",
-                        )
-                        self.logger.info(f"Bulk message notification email sent to {recipient_user.email}")
-                    except Exception as e:
-                        self.logger.error(f"Failed to send notification email to {recipient_user.email}: {e}")
-            except Exception as e:
-                self.logger.error(f"Failed to send notification to recipient {recipient_user_id}: {e}")
-
     ########################################################
     # クラス内完結処理
     ########################################################
-    def __create_reservation_message_object(
-        self, 
-        event_bridge_name: str, 
-        group_by: str, 
-        scheduled_at: datetime
-    ) -> ReservationMessage:
+    def __job_status(self, job: ReservationMessage) -> dict:
         """
-        クラス内完結処理：予約メッセージオブジェクトの作成
+        クラス内完結処理：一斉送信ジョブの進捗を集計
 
         Args:
-            event_bridge_name: イベントブリッジ名
-            group_by: グループ化キー
-            scheduled_at: 予約送信日時
+            job: 一斉送信ジョブ
 
         Returns:
-            ReservationMessage: 予約メッセージオブジェクト
+            dict: ジョブの進捗
         """
-        return ReservationMessage(
-            event_bridge_name=event_bridge_name,
-            group_by=group_by,
-            scheduled_at=scheduled_at
-        )
+        counts = self.reservation_message_crud.get_recipient_counts(job.id)
+        return {
+            "group_by": job.group_by,
+            "status": job.status,
+            "total_count": job.total_count,
+            "sent_count": counts.get(ReservationMessageRecipientStatus.SENT, 0),
+            "failed_count": counts.get(ReservationMessageRecipientStatus.FAILED, 0),
+            "pending_count": counts.get(ReservationMessageRecipientStatus.PENDING, 0)
+            + counts.get(ReservationMessageRecipientStatus.PROCESSING, 0),
+            "scheduled_at": job.scheduled_at,
+            "schedule_registered": (
+                job.event_bridge_name is not None if job.scheduled_at is not None else None
+            ),
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+        }
 
     ########################################################
     # ユーティリティ関数　
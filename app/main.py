@@ -1,10 +1,13 @@
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+import asyncio
 import os
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.db.migrations import run_migrations
+from app.db.pagination import NEXT_CURSOR_HEADER
 from app.middlewares.csrf import CSRFMiddleware
+from app.middlewares.read_your_writes import ReadYourWritesMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from app.core.logger import Logger
 logger = Logger.get_logger()
@@ -17,6 +20,15 @@ load_dotenv(dotenv_path=env_file)
 logger.info(f" Loaded FastAPI ENV: {env_file}")
 
 from app.routers import api_router
+from app.core.config import settings
+from app.db.async_session import async_engine, async_read_engine
+from app.db.base import engine, read_engine
+from app.db.metrics import mark_metrics_process_dead, render_metrics, verify_metrics_token
+from app.services.ranking.post_ranking_refresher import run_post_ranking_refresher
+from app.services.realtime.connection_manager import manager as ws_manager
+from app.services.notifications.outbox_dispatcher import run_notification_outbox_dispatcher
+from app.services.bulk_message.job_dispatcher import run_bulk_message_job_dispatcher
+from app.services.image_pipeline.pipeline import run_image_pipeline_sweeper, shutdown_image_pipeline
 
 # ========================
 # ✅ Auto Alembic Upgrade
@@ -26,8 +38,57 @@ async def lifespan(app: FastAPI):
     # --- startup ---
     run_migrations()   # auto alembic upgrade head mỗi lần app start
 
+    # 同期コード（crud）からの WebSocket 配信に使うイベントループ
+    ws_manager.bind_loop(asyncio.get_running_loop())
+
+    # ランキングスナップショットのバックグラウンド更新
+    ranking_refresher = None
+    if settings.POST_RANKING_SNAPSHOT_ENABLED and settings.POST_RANKING_REFRESH_INTERVAL_SEC > 0:
+        ranking_refresher = asyncio.create_task(run_post_ranking_refresher())
+
+    # 通知アウトボックスのディスパッチャー
+    outbox_dispatcher = None
+    if settings.NOTIFICATION_OUTBOX_ENABLED:
+        outbox_dispatcher = asyncio.create_task(run_notification_outbox_dispatcher())
+
+    # 一斉送信ジョブのディスパッチャー
+    bulk_message_dispatcher = None
+    if settings.BULK_MESSAGE_JOB_ENABLED:
+        bulk_message_dispatcher = asyncio.create_task(run_bulk_message_job_dispatcher())
+
+    # 中断した画像変換ジョブの再実行
+    image_pipeline_sweeper = None
+    if settings.IMAGE_PIPELINE_SWEEP_INTERVAL_SEC > 0:
+        image_pipeline_sweeper = asyncio.create_task(run_image_pipeline_sweeper())
+
     yield
 
+    # --- shutdown ---
+    if ranking_refresher is not None:
+        ranking_refresher.cancel()
+        with suppress(asyncio.CancelledError):
+            await ranking_refresher
+    if outbox_dispatcher is not None:
+        outbox_dispatcher.cancel()
+        with suppress(asyncio.CancelledError):
+            await outbox_dispatcher
+    if bulk_message_dispatcher is not None:
+        bulk_message_dispatcher.cancel()
+        with suppress(asyncio.CancelledError):
+            await bulk_message_dispatcher
+    if image_pipeline_sweeper is not None:
+        image_pipeline_sweeper.cancel()
+        with suppress(asyncio.CancelledError):
+            await image_pipeline_sweeper
+    shutdown_image_pipeline()
+    await ws_manager.stop()
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+    if read_engine is not engine:
+        read_engine.dispose()
+    mark_metrics_process_dead()
+
 app = FastAPI(lifespan=lifespan)
 
 # ========================
@@ -69,6 +130,7 @@ app.add_middleware(
     allow_credentials=True,      # フロントのCookie/Authorization送信に必要
     allow_methods=["*"],
     allow_headers=["*"],         # 'authorization', 'x-csrf-token' 等も通る
+    expose_headers=[NEXT_CURSOR_HEADER],  # 一覧APIの次ページカーソル
 )
 
 # ========================
@@ -90,9 +152,26 @@ app.add_middleware(
 # ========================
 app.add_middleware(CSRFMiddleware)
 
+# ========================
+# Read-your-writes（更新直後の読み取りをプライマリへ）
+# ========================
+app.add_middleware(ReadYourWritesMiddleware)
+
 @app.get("/healthz")
 def healthz():
     return {"ok": True}
 
+# ========================
+# メトリクス（DBプール・スロークエリ等）
+# ========================
+if settings.METRICS_ENABLED and not settings.METRICS_TOKEN:
+    logger.warning("METRICS_ENABLED is set but METRICS_TOKEN is empty; /metrics is disabled")
+
+if settings.METRICS_ENABLED and settings.METRICS_TOKEN:
+    @app.get("/metrics", include_in_schema=False, dependencies=[Depends(verify_metrics_token)])
+    def metrics():
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+
 # ルータ
 app.include_router(api_router)
\ No newline at end of file
@@ -0,0 +1,48 @@
+# app/middlewares/read_your_writes.py
+import time
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.cookies import READ_PRIMARY_COOKIE, set_read_primary_cookie
+
+UNSAFE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+# サーバー間通知（Cookie を保持しない）は対象外
+EXCLUDE_PREFIXES = ("/webhook", "/webhooks", "/healthz", "/metrics")
+
+
+def reads_from_primary(request: Request) -> bool:
+    """
+    直前に更新系リクエストを送ったクライアントか（True ならレプリカではなくプライマリから読む）
+    """
+    raw = request.cookies.get(READ_PRIMARY_COOKIE)
+    if not raw:
+        return False
+    try:
+        return int(raw) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """
+    更新系リクエストが成功したら、一定時間そのクライアントの読み取りをプライマリへ固定する
+
+    レプリカの複製遅延で「更新したのに反映されていない」画面にならないようにするため
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if (
+            settings.DATABASE_READ_URL
+            and settings.DB_READ_YOUR_WRITES_SEC > 0
+            and request.method in UNSAFE_METHODS
+            and response.status_code < 400
+            and not request.url.path.startswith(EXCLUDE_PREFIXES)
+        ):
+            set_read_primary_cookie(
+                response, int(time.time()) + settings.DB_READ_YOUR_WRITES_SEC
+            )
+        return response
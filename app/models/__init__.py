@@ -44,9 +44,13 @@ from .withdraws import Withdraws
 from .bank_request_histories import BankRequestHistories
 from .advertising_agencies import AdvertisingAgencies, UserReferrals
 from .message_assets import MessageAssets
-from .reservation_message import ReservationMessage
+from .reservation_message import ReservationMessage, ReservationMessageRecipients
 from .time_sale import TimeSale
 from .push_notifications import PushNotifications
+from .post_ranking_snapshots import PostRankingSnapshots, PostRankingSnapshotStates
+from .post_stats import PostStats, CreatorStats
+from .notification_outbox import NotificationOutbox, NotificationOutboxRecipients
+from .broadcast_payloads import BroadcastPayloads
 
 __all__ = [
     "Users", "Profiles", "Creators", "Genres", "Categories", "Posts", "PostCategories",
@@ -59,5 +63,7 @@ __all__ = [
     "Admins", "SMSVerifications", "Banners", "Events", "UserEvents", "Companies", "CompanyUsers",
     "SearchHistory", "PasswordResetToken", "UserSettings", "GenerationMedia",
     "Banks", "UserBanks", "UserProviders", "Withdraws", "BankRequestHistories",
-    "AdvertisingAgencies", "UserReferrals", "MessageAssets", "ReservationMessage", "TimeSale", "PaymentTransactions", "Providers", "PushNotifications"
+    "AdvertisingAgencies", "UserReferrals", "MessageAssets", "ReservationMessage", "ReservationMessageRecipients", "TimeSale", "PaymentTransactions", "Providers", "PushNotifications",
+    "PostRankingSnapshots", "PostRankingSnapshotStates", "PostStats", "CreatorStats",
+    "NotificationOutbox", "NotificationOutboxRecipients", "BroadcastPayloads"
 ]
@@ -0,0 +1,23 @@
+from __future__ import annotations
+from uuid import UUID
+from datetime import datetime
+
+from sqlalchemy import Index, Text, func
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+class BroadcastPayloads(Base):
+    """NOTIFY に載らない大きさの WebSocket 配信メッセージ（NOTIFY では id だけを送り、受信側がここから読み込む）"""
+    __tablename__ = "broadcast_payloads"
+
+    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
+    topic: Mapped[str] = mapped_column(Text, nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False) # topic と message をエンコードした JSON
+    created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
+
+    # 保持期間を過ぎた行の削除用インデックス
+    __table_args__ = (
+        Index("idx_broadcast_payloads_created_at", "created_at"),
+    )
@@ -3,7 +3,7 @@ from typing import List, Optional, TYPE_CHECKING
 from uuid import UUID
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, Text, SmallInteger, BigInteger, func
+from sqlalchemy import ForeignKey, Text, SmallInteger, BigInteger, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
@@ -18,6 +18,15 @@ if TYPE_CHECKING:
 class ConversationMessages(Base):
     """会話ルームメッセージ"""
     __tablename__ = "conversation_messages"
+    __table_args__ = (
+        # 会話ごとの最新の表示対象メッセージ（未削除かつ status が NULL / ACTIVE）を top-1 で引くための部分インデックス
+        Index(
+            "idx_conversation_messages_visible_latest",
+            "conversation_id",
+            text("created_at DESC"),
+            postgresql_where=text("deleted_at IS NULL AND (status IS NULL OR status = 1)"),
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     conversation_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("conversations.id"), nullable=False)
@@ -3,7 +3,7 @@ from typing import List, Optional, TYPE_CHECKING, Union
 from uuid import UUID
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, Text, SmallInteger, BigInteger, func, UniqueConstraint, Boolean
+from sqlalchemy import ForeignKey, Text, SmallInteger, BigInteger, Integer, Index, func, text, UniqueConstraint, Boolean
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
@@ -28,6 +28,10 @@ class ConversationParticipants(Base):
     role: Mapped[int] = mapped_column(SmallInteger, nullable=False)
     joined_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
     last_read_message_id: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True), nullable=True)
+    # 未読数（自分以外が送った表示対象メッセージのうち未読のもの）。メッセージ送信/既読/削除時に更新する
+    unread_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    # 会話内で最後に表示対象となったメッセージ（決済待ち・予約中・削除済みを除く）
+    last_visible_message_id: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True), nullable=True)
     notifications_muted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     is_blocked: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
@@ -39,5 +43,10 @@ class ConversationParticipants(Base):
 
     __table_args__ = (
         UniqueConstraint("conversation_id", "user_id", name="unique_conversation_user"),
+        Index(
+            "idx_conversation_participants_user_unread",
+            "user_id",
+            postgresql_where=text("unread_count > 0"),
+        ),
     )
 
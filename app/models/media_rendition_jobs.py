@@ -32,7 +32,8 @@ class MediaRenditionJobs(Base):
     output_key: Mapped[Optional[str]] = mapped_column(Text, nullable=True)    # プレビュー 例 "preview/<post>/<asset>/preview.mp4"
 
     # 実行情報
-    job_id: Mapped[Optional[str]] = mapped_column(Text, nullable=True)      # MediaConvert JobId
+    job_id: Mapped[Optional[str]] = mapped_column(Text, nullable=True, index=True)      # MediaConvert JobId / 画像変換ジョブID
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)           # 失敗理由（画像の審査NG等。クライアントに返す）
 
     created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
@@ -3,7 +3,7 @@ from typing import List, Optional, TYPE_CHECKING
 from uuid import UUID
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, Text, SmallInteger, BigInteger, Integer, func, Boolean
+from sqlalchemy import ForeignKey, Text, SmallInteger, BigInteger, Integer, Index, func, Boolean
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
@@ -15,6 +15,10 @@ if TYPE_CHECKING:
 class MessageAssets(Base):
     """メッセージアセット"""
     __tablename__ = "message_assets"
+    # メッセージ一覧でページ内のメッセージのアセットをまとめて引くため
+    __table_args__ = (
+        Index("idx_message_assets_message_id", "message_id"),
+    )
 
     id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     message_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("conversation_messages.id"), nullable=False)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+from typing import Optional
+from uuid import UUID
+from datetime import datetime
+
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, SmallInteger, Text, UniqueConstraint, func, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+class NotificationOutbox(Base):
+    """通知アウトボックス（通知・メール・Web Push の送信をリクエストから切り離すためのキュー）"""
+    __tablename__ = "notification_outbox"
+
+    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
+    event_type: Mapped[int] = mapped_column(SmallInteger, nullable=False) # NotificationOutboxEventType
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    status: Mapped[int] = mapped_column(SmallInteger, nullable=False, server_default="1") # NotificationOutboxStatus
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    available_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now()) # この時刻以降に処理する（リトライ時は後ろにずらす）
+    locked_at: Mapped[Optional[datetime]] = mapped_column(nullable=True) # 処理中にした時刻（ワーカー停止時の取り戻し判定用）
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
+
+    # 未処理・処理中の行だけを対象にした取り出し用インデックス
+    __table_args__ = (
+        Index(
+            "idx_notification_outbox_pending",
+            "available_at",
+            postgresql_where=text("status IN (1, 2)"),
+        ),
+    )
+
+
+class NotificationOutboxRecipients(Base):
+    """通知アウトボックスの受信者ごとの進捗（リトライ時に通知・メール・Web Push を二重に送らないため）"""
+    __tablename__ = "notification_outbox_recipients"
+
+    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
+    outbox_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("notification_outbox.id", ondelete="CASCADE"), nullable=False)
+    user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    email_done: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false") # メール送信済み（または送信不要）
+    push_done: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false") # Web Push 送信済み
+    created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
+
+    # 行の作成とアプリ内通知の作成を同じトランザクションで行い、受信者ごとに 1 回だけ通知する
+    __table_args__ = (
+        UniqueConstraint("outbox_id", "user_id", name="uq_notification_outbox_recipients_user"),
+    )
@@ -3,7 +3,7 @@ from typing import Optional, TYPE_CHECKING
 from uuid import UUID
 from datetime import datetime
 
-from sqlalchemy import Boolean, ForeignKey, SmallInteger, func
+from sqlalchemy import Boolean, ForeignKey, Index, SmallInteger, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
@@ -26,4 +26,9 @@ class Notifications(Base):
     created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
 
+    # 通知一覧のキーセットページング用
+    __table_args__ = (
+        Index("idx_notifications_user_created", "user_id", "created_at", "id"),
+    )
+
     user: Mapped["Users"] = relationship("Users")
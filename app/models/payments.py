@@ -31,6 +31,10 @@ class Payments(Base):
     order_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True, comment="plan_id（サブスク）またはprice_id（単品販売）")
     order_type: Mapped[int] = mapped_column(SmallInteger, nullable=False, comment="1=plan_id, 2=price_id")
 
+    # order_id を型付きで保持（JOIN時に cast せずインデックスを使うため）
+    price_id: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True), nullable=True, index=True, comment="単品販売のprice_id（order_idと同値）")
+    plan_id: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True), nullable=True, index=True, comment="サブスクのplan_id（order_idと同値）")
+
     # 決済プロバイダー情報（0円の場合はNULL）
     provider_id: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("providers.id"), nullable=True)
     provider_payment_id: Mapped[Optional[str]] = mapped_column(Text, nullable=True, comment="Credix決済ID（session_id）")
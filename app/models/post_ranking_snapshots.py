@@ -0,0 +1,33 @@
+from __future__ import annotations
+from uuid import UUID
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+class PostRankingSnapshots(Base):
+    """投稿ランキング（総合）のスナップショット"""
+    __tablename__ = "post_ranking_snapshots"
+
+    # 期間ごとに 1..N の連番で順位を保持する（(period, rank) でキーセットページング）
+    period: Mapped[str] = mapped_column(String(16), primary_key=True, comment="daily / weekly / monthly / all_time")
+    rank: Mapped[int] = mapped_column(Integer, primary_key=True, comment="phase1(クリエイター毎のベスト投稿) → phase2 の通し順位")
+
+    post_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    creator_user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    purchase_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    bookmark_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    post_created_at: Mapped[datetime] = mapped_column(nullable=False)
+    refreshed_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
+
+
+class PostRankingSnapshotStates(Base):
+    """投稿ランキングスナップショットの期間ごとの更新状態"""
+    __tablename__ = "post_ranking_snapshot_states"
+
+    period: Mapped[str] = mapped_column(String(16), primary_key=True)
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    refreshed_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
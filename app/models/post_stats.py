@@ -0,0 +1,31 @@
+from __future__ import annotations
+from uuid import UUID
+from datetime import datetime
+
+from sqlalchemy import BigInteger, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+class PostStats(Base):
+    """投稿ごとのエンゲージメント集計（いいね・ブックマーク・購入・閲覧）"""
+    __tablename__ = "post_stats"
+
+    # likes / bookmarks / payments / post_views_tracking の書き込みと同一トランザクションで増減する
+    post_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    likes_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    bookmarks_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    purchase_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0", comment="単品購入（succeeded）の件数")
+    views_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
+
+
+class CreatorStats(Base):
+    """ユーザーごとのフォロー集計"""
+    __tablename__ = "creator_stats"
+
+    user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    followers_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    following_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
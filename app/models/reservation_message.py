@@ -3,19 +3,60 @@ from typing import List, Optional, TYPE_CHECKING
 from uuid import UUID
 from datetime import datetime
 
-from sqlalchemy import SmallInteger, func, Boolean, Text
+from sqlalchemy import ForeignKey, Index, Integer, SmallInteger, UniqueConstraint, func, Boolean, Text, text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
 
 class ReservationMessage(Base):
-    """予約メッセージ"""
+    """予約メッセージ（一斉送信ジョブ。group_by が送信単位の識別子）"""
     __tablename__ = "reservation_message"
 
     id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
-    event_bridge_name: Mapped[str] = mapped_column(Text, nullable=False)
+    event_bridge_name: Mapped[Optional[str]] = mapped_column(Text, nullable=True) # 即時送信の場合は NULL
     group_by: Mapped[str] = mapped_column(Text, nullable=False)
-    scheduled_at: Mapped[datetime] = mapped_column(nullable=False)
+    scheduled_at: Mapped[Optional[datetime]] = mapped_column(nullable=True) # 即時送信の場合は NULL
+    sender_user_id: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    message_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    asset_storage_key: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    asset_type: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
+    status: Mapped[int] = mapped_column(SmallInteger, nullable=False, server_default="1") # ReservationMessageStatus
+    total_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    started_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
     created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
\ No newline at end of file
+    updated_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("idx_reservation_message_group_by", "group_by"),
+    )
+
+
+class ReservationMessageRecipients(Base):
+    """一斉送信ジョブの送信先（送信先ごとの進捗・リトライ管理）"""
+    __tablename__ = "reservation_message_recipients"
+
+    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
+    reservation_message_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("reservation_message.id", ondelete="CASCADE"), nullable=False)
+    user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    status: Mapped[int] = mapped_column(SmallInteger, nullable=False, server_default="1") # ReservationMessageRecipientStatus
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    available_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now()) # この時刻以降に処理する（リトライ時は後ろにずらす）
+    locked_at: Mapped[Optional[datetime]] = mapped_column(nullable=True) # 処理中にした時刻（ワーカー停止時の取り戻し判定用）
+    message_id: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True), nullable=True) # 作成したメッセージ
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("reservation_message_id", "user_id", name="uq_reservation_message_recipients_user"),
+        # 進捗集計用
+        Index("idx_reservation_message_recipients_status", "reservation_message_id", "status"),
+        # 未処理・処理中の行だけを対象にした取り出し用インデックス
+        Index(
+            "idx_reservation_message_recipients_pending",
+            "available_at",
+            postgresql_where=text("status IN (1, 2)"),
+        ),
+    )
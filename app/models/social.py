@@ -3,7 +3,7 @@ from typing import Optional, TYPE_CHECKING
 from uuid import UUID
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, Text, SmallInteger, func, Float
+from sqlalchemy import ForeignKey, Index, Text, SmallInteger, func, Float
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
@@ -21,6 +21,12 @@ class Follows(Base):
     creator_user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
     created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
 
+    # フォロワー / フォロー中一覧のキーセットページング用
+    __table_args__ = (
+        Index("idx_follows_creator_created", "creator_user_id", "created_at", "follower_user_id"),
+        Index("idx_follows_follower_created", "follower_user_id", "created_at", "creator_user_id"),
+    )
+
     follower: Mapped["Users"] = relationship("Users", foreign_keys=[follower_user_id])
     creator: Mapped["Users"] = relationship("Users", foreign_keys=[creator_user_id])
 
@@ -62,6 +68,11 @@ class Bookmarks(Base):
     post_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("posts.id"), primary_key=True)
     created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
 
+    # ブックマーク一覧のキーセットページング用
+    __table_args__ = (
+        Index("idx_bookmarks_user_created", "user_id", "created_at", "post_id"),
+    )
+
     user: Mapped["Users"] = relationship("Users")
     post: Mapped["Posts"] = relationship("Posts")
 
@@ -34,6 +34,10 @@ class Subscriptions(Base):
     order_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True, comment="plan_id（サブスク）またはprice_id（単品販売）")
     order_type: Mapped[int] = mapped_column(SmallInteger, nullable=False, comment="1=plan_id, 2=price_id")
 
+    # order_id を型付きで保持（JOIN時に cast せずインデックスを使うため）
+    price_id: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True), nullable=True, index=True, comment="単品販売のprice_id（order_idと同値）")
+    plan_id: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True), nullable=True, index=True, comment="サブスクのplan_id（order_idと同値）")
+
     # 視聴権限期間管理
     access_start: Mapped[datetime] = mapped_column(nullable=False, index=True, comment="視聴可能開始日（プラン: 課金開始日、単品: 購入日）")
     access_end: Mapped[Optional[datetime]] = mapped_column(nullable=True, index=True, comment="視聴可能終了日（プラン: 課金期間終了日、単品: NULL=永久アクセス）")
@@ -53,9 +53,32 @@ class BulkMessageSendRequest(BaseModel):
 class BulkMessageSendResponse(BaseModel):
     """一斉送信レスポンス"""
     message: str
-    sent_count: int = Field(..., description="送信数（即時送信の場合）または予約数（予約送信の場合）")
+    sent_count: int = Field(..., description="受付時点で作成済みの数（バックグラウンドで作成するため受付直後は 0）")
+    queued_count: int = Field(0, description="作成待ちとして受け付けた送信先の数")
+    total_count: int = Field(0, description="送信先の総数")
     scheduled: bool = Field(..., description="予約送信かどうか")
     scheduled_at: Optional[datetime] = Field(None, description="予約送信日時")
+    group_by: Optional[str] = Field(None, description="一斉送信ジョブのID（進捗の取得に使う）")
+    status: Optional[int] = Field(None, description="ジョブのステータス 1=受付済み, 2=処理中, 3=完了, 4=完了（一部失敗）")
+
+    class Config:
+        from_attributes = True
+
+
+class BulkMessageJobStatusResponse(BaseModel):
+    """一斉送信ジョブの進捗レスポンス"""
+    group_by: str
+    status: int = Field(..., description="1=受付済み, 2=処理中, 3=完了, 4=完了（一部失敗）")
+    total_count: int = Field(..., description="送信先の総数")
+    sent_count: int = Field(..., description="作成済みの数")
+    failed_count: int = Field(..., description="リトライ上限に達した数")
+    pending_count: int = Field(..., description="未処理・処理中の数")
+    scheduled_at: Optional[datetime] = None
+    schedule_registered: Optional[bool] = Field(
+        None, description="予約送信のスケジュールを登録済みか（全送信先の作成後に登録する。即時送信の場合は null）"
+    )
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -65,10 +65,12 @@ class PaginatedNotificationAdminResponse(BaseModel):
 
 class PaginatedNotificationUserResponse(BaseModel):
   notifications: List[NotificationCreateResponse] = Field(..., description='通知一覧')
-  total: int = Field(..., description='総件数')
+  total: int = Field(..., description='総件数（cursor 指定時は上限件数で打ち切る）')
+  total_is_capped: bool = Field(False, description='total を上限件数で打ち切ったかどうか')
   page: int = Field(..., description='ページ番号')
   total_pages: int = Field(..., description='総ページ数')
   has_next: bool = Field(..., description='次のページが存在するかどうか')
+  next_cursor: Optional[str] = Field(None, description='次ページ取得用カーソル')
   
 class MarkNotificationAsReadRequest(BaseModel):
   notification_id: str = Field(..., description='通知ID')
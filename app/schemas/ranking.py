@@ -106,6 +106,7 @@ class RankingPostsDetailResponse(BaseModel):
     previous_page: int | None = None
     has_next: bool = False
     has_previous: bool = False
+    next_cursor: str | None = None
 
 
 class RankingCreators(BaseModel):
@@ -70,8 +70,10 @@ class HashtagSearchResult(BaseModel):
 
 class SearchSectionResponse(BaseModel):
     total: int
+    total_is_capped: bool = False  # cursor 指定時に total を上限件数で打ち切ったかどうか
     items: List
     has_more: bool
+    next_cursor: Optional[str] = None
 
 
 class SearchResponse(BaseModel):
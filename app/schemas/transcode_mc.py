@@ -8,4 +8,16 @@ from decimal import Decimal
 class TranscodeMCUpdateRequest(BaseModel):
     post_id: str
     media_assets: List[str]  # メディアアセットIDのリスト（文字列形式）
-    post_type: int
\ No newline at end of file
+    post_type: int
+
+class TranscodeMCJobError(BaseModel):
+    asset_id: UUID
+    error_message: Optional[str] = None  # 失敗理由（審査NG等）
+
+class TranscodeMCJobStatusResponse(BaseModel):
+    job_id: str
+    status: Literal["queued", "processing", "completed", "failed"]
+    total: int  # 画像数
+    completed: int
+    failed: int
+    errors: List[TranscodeMCJobError] = []  # 失敗した画像ごとの理由
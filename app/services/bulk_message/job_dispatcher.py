@@ -0,0 +1,210 @@
+"""
+一斉送信ジョブのディスパッチャー
+
+API は送信先を reservation_message_recipients に登録するだけにして、メッセージの作成はここで
+送信先をチャンクごとに取り出して行う（数万人規模の送信でもリクエストがタイムアウトしない）。
+
+- チャンクごとに「メッセージ作成・通知アウトボックスへの追加・送信先の送信済み化」を 1 トランザクションで確定する
+  （途中で止まっても、確定済みのチャンクは再送されず未処理の送信先から再開する）
+- チャンクが失敗した場合は送信先 1 件ずつに分けて再実行し、失敗した送信先だけを指数バックオフでリトライする
+- 各ワーカープロセスで BULK_MESSAGE_JOB_WORKERS 本のループを起動する（FOR UPDATE SKIP LOCKED で二重処理しない）
+- 予約送信のジョブは全送信先のメッセージ（予約中）を作成し終えてから予約送信バッチのスケジュールを登録する
+  （バッチは実行時点で存在する予約中のメッセージだけを送信済みにするため）
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import Logger
+from app.crud import bulk_message_crud, notification_outbox_crud
+from app.crud.reservation_message_crud import ReservationMessageCrud
+from app.db.base import SessionLocal
+from app.models.reservation_message import ReservationMessage, ReservationMessageRecipients
+from app.services.bulk_message.reservation_schedule import create_send_reservation_schedule
+
+logger = Logger.get_logger()
+
+_wake_event: asyncio.Event | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _send_to_recipients(
+    db: Session, job: ReservationMessage, recipients: List[ReservationMessageRecipients]
+) -> None:
+    """送信先へのメッセージを作成し、送信済みにして確定する"""
+    messages = bulk_message_crud.create_bulk_messages(
+        db,
+        creator_user_id=job.sender_user_id,
+        message_text=job.message_text,
+        target_user_ids=[recipient.user_id for recipient in recipients],
+        group_by=job.group_by,
+        asset_storage_key=job.asset_storage_key,
+        asset_type=job.asset_type,
+        scheduled_at=job.scheduled_at,
+    )
+
+    # 即時送信でアセットがない場合は受信者に通知・メール・Web Push を送る
+    # （予約送信は送信時のバッチ、アセット付きは審査承認時に通知する）
+    if job.scheduled_at is None and not job.asset_storage_key:
+        notification_outbox_crud.enqueue_new_messages(
+            db,
+            messages.values(),
+            job.message_text[:50] if job.message_text else None,
+        )
+
+    ReservationMessageCrud(db).mark_recipients_sent(recipients, messages)
+    db.commit()
+
+
+def _process_job_chunk(
+    db: Session, job: ReservationMessage, recipients: List[ReservationMessageRecipients]
+) -> None:
+    crud = ReservationMessageCrud(db)
+    try:
+        _send_to_recipients(db, job, recipients)
+        return
+    except Exception as e:
+        db.rollback()
+        if len(recipients) == 1:
+            logger.error(f"Bulk message job {job.group_by}: recipient {recipients[0].user_id} failed: {e}")
+            crud.mark_recipients_failed(
+                recipients,
+                str(e),
+                settings.BULK_MESSAGE_JOB_MAX_ATTEMPTS,
+                settings.BULK_MESSAGE_JOB_RETRY_BASE_SEC,
+            )
+            return
+        logger.warning(
+            f"Bulk message job {job.group_by}: chunk of {len(recipients)} failed, retrying one by one: {e}"
+        )
+
+    # 失敗した送信先を特定するため 1 件ずつ確定する
+    for recipient in recipients:
+        try:
+            _send_to_recipients(db, job, [recipient])
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Bulk message job {job.group_by}: recipient {recipient.user_id} failed: {e}")
+            crud.mark_recipients_failed(
+                [recipient],
+                str(e),
+                settings.BULK_MESSAGE_JOB_MAX_ATTEMPTS,
+                settings.BULK_MESSAGE_JOB_RETRY_BASE_SEC,
+            )
+
+
+def dispatch_bulk_message_jobs_once() -> int:
+    """
+    送信先を 1 チャンク取り出して処理する（同期・スレッドから呼ぶ）
+
+    Returns:
+        取り出した件数
+    """
+    # 取り出した行を commit 後も再読込せずに使う
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        crud = ReservationMessageCrud(db)
+        recipients = crud.claim_recipients(
+            settings.BULK_MESSAGE_JOB_CHUNK_SIZE,
+            settings.BULK_MESSAGE_JOB_STALE_SEC,
+        )
+        if not recipients:
+            return 0
+
+        by_job: Dict[UUID, List[ReservationMessageRecipients]] = {}
+        for recipient in recipients:
+            by_job.setdefault(recipient.reservation_message_id, []).append(recipient)
+        jobs = crud.get_bulk_message_jobs_by_ids(by_job.keys())
+
+        for job_id, group in by_job.items():
+            _process_job_chunk(db, jobs[job_id], group)
+
+        for job_id in crud.finish_completed_jobs(by_job.keys()):
+            logger.info(f"Bulk message job finished: {jobs[job_id].group_by}")
+        return len(recipients)
+    finally:
+        db.close()
+
+
+def _schedule_run_at(job: ReservationMessage) -> datetime:
+    """予約日時（作成し終えた時点で過ぎていれば BULK_MESSAGE_SCHEDULE_MIN_LEAD_SEC 後）"""
+    scheduled_at = job.scheduled_at
+    if scheduled_at.tzinfo is None:
+        scheduled_at = scheduled_at.replace(tzinfo=timezone.utc)
+    earliest = datetime.now(timezone.utc) + timedelta(seconds=settings.BULK_MESSAGE_SCHEDULE_MIN_LEAD_SEC)
+    return max(scheduled_at, earliest)
+
+
+def register_bulk_message_schedules_once(limit: int = 20) -> int:
+    """
+    メッセージを作成し終えた予約送信ジョブのスケジュールを登録する（同期・スレッドから呼ぶ）
+
+    Returns:
+        登録したジョブ数
+    """
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        crud = ReservationMessageCrud(db)
+        jobs = crud.claim_jobs_awaiting_schedule(limit, settings.BULK_MESSAGE_SCHEDULE_RETRY_SEC)
+        registered = 0
+        for job in jobs:
+            try:
+                schedule_name = create_send_reservation_schedule(
+                    job.group_by, job.sender_user_id, _schedule_run_at(job)
+                )
+            except Exception as e:
+                logger.error(f"Bulk message job {job.group_by}: failed to define ECS task schedule: {e}")
+                crud.mark_job_schedule_failed(job)
+                continue
+            crud.set_job_schedule(job, schedule_name)
+            registered += 1
+        db.commit()
+        return registered
+    finally:
+        db.close()
+
+
+def wake_bulk_message_dispatcher() -> None:
+    """
+    ジョブが登録されたときにディスパッチャーを起こす（どのスレッドからでも可）
+    """
+    if _loop is not None and _wake_event is not None and not _loop.is_closed():
+        _loop.call_soon_threadsafe(_wake_event.set)
+
+
+async def _run_worker() -> None:
+    while True:
+        # 処理中に届いた起床通知を取りこぼさないよう、取り出す前にクリアする
+        _wake_event.clear()
+        try:
+            claimed = await asyncio.to_thread(dispatch_bulk_message_jobs_once)
+            await asyncio.to_thread(register_bulk_message_schedules_once)
+        except Exception as e:
+            logger.error(f"Bulk message job loop error: {e}")
+            claimed = 0
+
+        # 取り出し上限いっぱいだった場合は続けて処理し、空なら起床通知かポーリング間隔まで待つ
+        if claimed >= settings.BULK_MESSAGE_JOB_CHUNK_SIZE:
+            continue
+        try:
+            await asyncio.wait_for(
+                _wake_event.wait(), timeout=settings.BULK_MESSAGE_JOB_POLL_INTERVAL_SEC
+            )
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_bulk_message_job_dispatcher() -> None:
+    """
+    BULK_MESSAGE_JOB_WORKERS 本のディスパッチループを実行する（lifespan から起動）
+    """
+    global _wake_event, _loop
+    _loop = asyncio.get_running_loop()
+    _wake_event = asyncio.Event()
+    await asyncio.gather(
+        *[_run_worker() for _ in range(max(settings.BULK_MESSAGE_JOB_WORKERS, 1))]
+    )
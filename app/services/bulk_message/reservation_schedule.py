@@ -0,0 +1,96 @@
+"""
+予約送信バッチ（batch-send-reservation-massage）の ECS スケジュール登録
+
+予約送信のメッセージはディスパッチャーが予約中（PENDING）で作成し、バッチは実行時点で存在する
+予約中のメッセージだけを送信済みにする。そのため、スケジュールはジョブの全送信先のメッセージを
+作成し終えてから登録する（ディスパッチャーから呼ぶ）
+"""
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+from app.core.logger import Logger
+from app.services.s3.client import scheduler_client
+
+logger = Logger.get_logger()
+
+_JST = timezone(timedelta(hours=9))
+
+
+def send_reservation_schedule_name(group_by: str, run_at: datetime) -> str:
+    """スケジュール名（ジョブと実行時刻ごとにユニーク）"""
+    return f"send-resv-msg-{group_by}-{int(run_at.timestamp())}"
+
+
+def create_send_reservation_schedule(group_by: str, sender_user_id, run_at: datetime) -> str:
+    """
+    予約送信バッチを run_at に 1 回だけ実行するスケジュールを登録する
+
+    同じ名前のスケジュールが登録済み（まだ実行前）の場合はそれをそのまま使う
+
+    Args:
+        group_by: 一斉送信ジョブのグループ化キー
+        sender_user_id: 送信者ユーザーID
+        run_at: 実行日時（naive の場合は UTC とみなす）
+
+    Returns:
+        str: スケジュール名
+    """
+    if run_at.tzinfo is None:
+        run_at = run_at.replace(tzinfo=timezone.utc)
+    schedule_name = send_reservation_schedule_name(group_by, run_at)
+
+    # at() 式には JST時刻を渡す（ScheduleExpressionTimezone="Asia/Tokyo"と合わせる）
+    run_at_jst = run_at.astimezone(_JST)
+    schedule_expression = f"at({run_at_jst.strftime('%Y-%m-%dT%H:%M:%S')})"
+    logger.info(f"Creating schedule: {schedule_name} at {run_at_jst.strftime('%Y-%m-%d %H:%M:%S')} JST")
+
+    network_configuration = {
+        "awsvpcConfiguration": {
+            "Subnets": os.environ.get("ECS_SUBNETS", "").split(",") if os.environ.get("ECS_SUBNETS") else [],
+            "SecurityGroups": (
+                os.environ.get("ECS_SECURITY_GROUPS", "").split(",")
+                if os.environ.get("ECS_SECURITY_GROUPS")
+                else []
+            ),
+            "AssignPublicIp": os.environ.get("ECS_ASSIGN_PUBLIC_IP", "ENABLED"),
+        }
+    }
+
+    # ECS RunTask の overrides を Target.Input に入れる
+    overrides = {
+        "containerOverrides": [
+            {
+                "name": os.environ["ECS_SEND_RESERVATION_MESSAGE_CONTAINER"],
+                "environment": [
+                    {"name": "GROUP_BY", "value": str(group_by)},
+                    {"name": "SENDER_USER_ID", "value": str(sender_user_id)},
+                ],
+            }
+        ]
+    }
+
+    scheduler = scheduler_client()
+    try:
+        scheduler.create_schedule(
+            Name=schedule_name,
+            ScheduleExpression=schedule_expression,
+            ScheduleExpressionTimezone="Asia/Tokyo",
+            FlexibleTimeWindow={"Mode": "OFF"},
+            State="ENABLED",
+            ActionAfterCompletion="DELETE",
+            Target={
+                # ECS RunTask ターゲット（クラスターARN）
+                "Arn": os.environ["ECS_SEND_RESERVATION_MESSAGE_CLUSTER_ARN"],
+                "RoleArn": os.environ["SCHEDULER_ROLE_ARN"],  # SchedulerがRunTaskできるロール
+                "EcsParameters": {
+                    "TaskDefinitionArn": os.environ["ECS_SEND_RESERVATION_MESSAGE_TASK_ARN"],
+                    "LaunchType": "FARGATE",
+                    "NetworkConfiguration": network_configuration,
+                },
+                "Input": json.dumps(overrides),
+            },
+        )
+    except scheduler.exceptions.ConflictException:
+        logger.info(f"Schedule already exists: {schedule_name}")
+    return schedule_name
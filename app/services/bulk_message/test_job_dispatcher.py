@@ -0,0 +1,102 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import app.services.bulk_message.job_dispatcher as job_dispatcher
+
+
+def _job(scheduled_at=None):
+    return SimpleNamespace(
+        id=uuid4(),
+        group_by="group-1",
+        sender_user_id=uuid4(),
+        message_text="hello",
+        asset_storage_key=None,
+        asset_type=None,
+        scheduled_at=scheduled_at,
+    )
+
+
+def _recipient():
+    return SimpleNamespace(id=uuid4(), user_id=uuid4(), attempts=1)
+
+
+@pytest.fixture
+def crud_mock(monkeypatch):
+    crud = MagicMock(name="ReservationMessageCrudMock")
+    monkeypatch.setattr(job_dispatcher, "ReservationMessageCrud", lambda db: crud)
+    return crud
+
+
+def test_process_job_chunk_sends_whole_chunk(monkeypatch, crud_mock):
+    db = MagicMock(name="SessionMock")
+    send = MagicMock()
+    monkeypatch.setattr(job_dispatcher, "_send_to_recipients", send)
+    recipients = [_recipient(), _recipient()]
+
+    job_dispatcher._process_job_chunk(db, _job(), recipients)
+
+    send.assert_called_once()
+    crud_mock.mark_recipients_failed.assert_not_called()
+
+
+def test_process_job_chunk_isolates_failing_recipient(monkeypatch, crud_mock):
+    db = MagicMock(name="SessionMock")
+    bad = _recipient()
+    good = _recipient()
+
+    def send(db, job, recipients):
+        if bad in recipients:
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(job_dispatcher, "_send_to_recipients", send)
+
+    job_dispatcher._process_job_chunk(db, _job(), [good, bad])
+
+    # チャンク全体 → 1 件ずつの順に再実行し、失敗した送信先だけを記録する
+    crud_mock.mark_recipients_failed.assert_called_once()
+    assert crud_mock.mark_recipients_failed.call_args.args[0] == [bad]
+
+
+def test_schedule_run_at_keeps_future_schedule():
+    scheduled_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    assert job_dispatcher._schedule_run_at(_job(scheduled_at)) == scheduled_at
+
+
+def test_schedule_run_at_moves_past_schedule_forward():
+    past = (datetime.now(timezone.utc) - timedelta(hours=1)).replace(tzinfo=None)
+    run_at = job_dispatcher._schedule_run_at(_job(past))
+    assert run_at > datetime.now(timezone.utc)
+
+
+def test_register_schedules_after_messages_are_created(monkeypatch, crud_mock):
+    db = MagicMock(name="SessionMock")
+    monkeypatch.setattr(job_dispatcher, "SessionLocal", lambda **kwargs: db)
+    ok_job = _job(datetime.now(timezone.utc) + timedelta(hours=1))
+    ng_job = _job(datetime.now(timezone.utc) + timedelta(hours=1))
+    crud_mock.claim_jobs_awaiting_schedule.return_value = [ok_job, ng_job]
+
+    def create_schedule(group_by, sender_user_id, run_at):
+        if sender_user_id == ng_job.sender_user_id:
+            raise RuntimeError("scheduler down")
+        return "send-resv-msg-ok"
+
+    monkeypatch.setattr(job_dispatcher, "create_send_reservation_schedule", create_schedule)
+
+    assert job_dispatcher.register_bulk_message_schedules_once() == 1
+    crud_mock.set_job_schedule.assert_called_once_with(ok_job, "send-resv-msg-ok")
+    crud_mock.mark_job_schedule_failed.assert_called_once_with(ng_job)
+    db.commit.assert_called_once()
+    db.close.assert_called_once()
+
+
+def test_dispatch_once_returns_zero_when_nothing_claimed(monkeypatch, crud_mock):
+    db = MagicMock(name="SessionMock")
+    monkeypatch.setattr(job_dispatcher, "SessionLocal", lambda **kwargs: db)
+    crud_mock.claim_recipients.return_value = []
+
+    assert job_dispatcher.dispatch_bulk_message_jobs_once() == 0
+    crud_mock.finish_completed_jobs.assert_not_called()
+    db.close.assert_called_once()
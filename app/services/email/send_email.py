@@ -6,13 +6,13 @@ from email.mime.text import MIMEText
 from typing import Mapping, Iterable
 import re
 import smtplib
-import boto3
 from botocore.config import Config
 from tenacity import retry, wait_exponential, stop_after_attempt
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from app.core.config import settings  # pydantic Settings想定
 import os
 from app.core.logger import Logger
+from app.services.s3.client import get_client
 logger = Logger.get_logger()
 # --------------------------
 # Jinja2
@@ -100,11 +100,14 @@ def _send_via_mailhog(to: str, subject: str, html: str, text: str | None = None)
 # --------------------------
 # SES v2（API）
 # --------------------------
+_SES_CONFIG = Config(retries={"max_attempts": 3, "mode": "standard"})
+
 def _ses_client():
-    return boto3.client(
+    # メールごとに作り直さず、プロセス内で共有する
+    return get_client(
         "sesv2",
         region_name=getattr(settings, "AWS_REGION", "ap-northeast-1"),
-        config=Config(retries={"max_attempts": 3, "mode": "standard"}),
+        config=_SES_CONFIG,
     )
 
 @retry(wait=wait_exponential(multiplier=0.5, min=1, max=10), stop=stop_after_attempt(3))
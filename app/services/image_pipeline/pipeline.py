@@ -0,0 +1,284 @@
+"""
+画像投稿の変換パイプライン
+
+API は画像ごとのメディアレンディションジョブ（同じ job_id）を登録して job_id を返すだけにして、
+変換はここでバックグラウンドに行う（画像枚数の多い投稿でもリクエストがワーカーを塞がない）。
+
+- ダウンロード・Rekognition 審査・アップロードは I/O 用スレッドプールで画像ごとに並列に行う
+- JPEG / WebP のエンコードはプロセスプールで行う（CPU コア数までスケールする）
+- 審査とエンコードは同時に開始し、審査で NG になった場合はエンコード結果を破棄する
+- 画像ごとの完了・失敗（失敗理由を含む）はメディアレンディションジョブに記録し、
+  全画像が完了したら投稿を承認する
+- 変換はジョブを受け付けたプロセスで行うため、プロセスが停止すると未完了のまま残る。
+  IMAGE_PIPELINE_STALE_SEC 以上更新のない未完了ジョブはスイーパーが取り戻して再実行する
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+
+from app.constants.enums import AuthenticatedFlag, MediaAssetStatus, MediaRenditionJobStatus, PostStatus
+from app.core.config import settings
+from app.core.logger import Logger
+from app.crud.media_assets_crud import update_media_asset
+from app.crud.media_rendition_jobs_crud import (
+    claim_stale_image_variant_jobs,
+    get_media_rendition_jobs_by_job_id,
+    update_media_rendition_jobs_status,
+)
+from app.crud.post_crud import (
+    add_mail_notification_for_post,
+    add_notification_for_post,
+    update_post_status,
+)
+from app.db.base import SessionLocal
+from app.services.s3.client import INGEST_BUCKET, MEDIA_BUCKET_NAME
+from app.services.s3.image_screening import (
+    _is_supported_magic,
+    _make_variant_keys,
+    _moderation_check,
+    _s3_download_bytes,
+    _s3_put_bytes,
+    _sanitize_and_variants,
+)
+from app.services.s3.keygen import transcode_mc_ffmpeg_key
+from app.utils.trigger_batch_notification_newpost_arrival import (
+    trigger_batch_notification_newpost_arrival,
+)
+
+logger = Logger.get_logger()
+
+_io_executor = ThreadPoolExecutor(
+    max_workers=max(settings.IMAGE_PIPELINE_IO_CONCURRENCY, 1),
+    thread_name_prefix="image-pipeline-io",
+)
+# 投稿単位の取りまとめ（画像の完了待ち・DB 更新）用
+_post_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="image-pipeline-post")
+_encode_executor: Optional[ProcessPoolExecutor] = None
+_encode_executor_lock = threading.Lock()
+
+
+# 想定外のエラーの詳細はログにだけ残し、クライアントにはこの理由を返す
+_UNEXPECTED_ERROR_MESSAGE = "Image processing failed"
+
+
+class ImagePipelineError(Exception):
+    """画像が処理できない（形式不正・審査 NG 等。メッセージは失敗理由としてクライアントに返す）"""
+
+
+@dataclass(frozen=True)
+class ImageAsset:
+    """変換対象の画像（スレッドに渡すため行から取り出しておく）"""
+    id: UUID
+    post_id: UUID
+    creator_user_id: UUID
+    storage_key: str
+
+
+def _get_encode_executor() -> ProcessPoolExecutor:
+    global _encode_executor
+    with _encode_executor_lock:
+        if _encode_executor is None:
+            # スレッドを持つ API プロセスからの fork を避けるため spawn で起動する
+            _encode_executor = ProcessPoolExecutor(
+                max_workers=settings.IMAGE_PIPELINE_PROCESSES or os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _encode_executor
+
+
+def _process_asset(asset: ImageAsset) -> Tuple[str, int]:
+    """
+    画像 1 枚をダウンロード・審査・エンコード・アップロードする（I/O 用スレッドで実行）
+
+    Returns:
+        (storage_key（拡張子なしのステム）, 元画像のバイト数)
+    """
+    img_bytes = _s3_download_bytes(INGEST_BUCKET, asset.storage_key)
+    if not _is_supported_magic(img_bytes):
+        raise ImagePipelineError("Unsupported image format")
+
+    # 子プロセスでは image_screening だけを読み込む（API 側のモジュールを import しない）
+    encoded = _get_encode_executor().submit(_sanitize_and_variants, img_bytes)
+    mod = _moderation_check(img_bytes, min_conf=80.0)
+    if mod["flagged"]:
+        encoded.cancel()
+        raise ImagePipelineError(f"Image rejected by moderation: {mod['labels']}")
+    try:
+        variants = encoded.result()
+    except HTTPException as e:
+        raise ImagePipelineError(str(e.detail))
+
+    base_output_key = transcode_mc_ffmpeg_key(
+        creator_id=asset.creator_user_id,
+        post_id=asset.post_id,
+        ext="jpg",
+    )
+    variant_keys = _make_variant_keys(base_output_key)
+    for filename, (bytes_data, ctype) in variants.items():
+        _s3_put_bytes(MEDIA_BUCKET_NAME, variant_keys[filename], bytes_data, ctype)
+
+    stem, _ext = base_output_key.rsplit(".", 1)
+    return stem, len(variants["original.jpg"][0])
+
+
+def _run_image_post_job(
+    job_id: str,
+    post_id: str,
+    assets: List[ImageAsset],
+    rendition_job_ids: Dict[UUID, UUID],
+    notify_new_post: bool,
+) -> None:
+    db = SessionLocal()
+    try:
+        update_media_rendition_jobs_status(
+            db, list(rendition_job_ids.values()), MediaRenditionJobStatus.PROGRESSING
+        )
+        db.commit()
+
+        futures = [(asset, _io_executor.submit(_process_asset, asset)) for asset in assets]
+        failed = 0
+        for asset, future in futures:
+            rendition_job_id = rendition_job_ids[asset.id]
+            try:
+                stem, size = future.result()
+            except Exception as e:
+                failed += 1
+                logger.error(f"Image pipeline failed: job_id={job_id}, asset_id={asset.id}: {e}")
+                update_media_rendition_jobs_status(
+                    db,
+                    [rendition_job_id],
+                    MediaRenditionJobStatus.FAILED,
+                    str(e) if isinstance(e, ImagePipelineError) else _UNEXPECTED_ERROR_MESSAGE,
+                )
+                db.commit()
+                continue
+
+            update_media_asset(
+                db,
+                asset.id,
+                {"storage_key": stem, "bytes": size, "status": MediaAssetStatus.APPROVED},
+            )
+            update_media_rendition_jobs_status(db, [rendition_job_id], MediaRenditionJobStatus.COMPLETE)
+            db.commit()
+
+        # 失敗した画像がある場合、投稿は変換中のまま（再申請で再変換する）
+        if failed:
+            return
+        # 再実行時は未完了だった画像だけを処理するため、同じ job_id の全画像の完了を確認する
+        if any(
+            job.status != MediaRenditionJobStatus.COMPLETE
+            for job in get_media_rendition_jobs_by_job_id(db, job_id)
+        ):
+            return
+
+        post = update_post_status(db, post_id, PostStatus.APPROVED, AuthenticatedFlag.AUTHENTICATED)
+        db.commit()
+        db.refresh(post)
+
+        # Email通知を追加（メール通知設定をチェック）
+        add_mail_notification_for_post(db, post_id=post_id, type="approved")
+        # 投稿に対する通知を追加
+        add_notification_for_post(db, post, post.creator_user_id, type="approved")
+
+        if notify_new_post:
+            # 新着投稿通知をトリガー
+            trigger_batch_notification_newpost_arrival(
+                post_id=post_id, creator_user_id=str(post.creator_user_id)
+            )
+        logger.info(f"Image pipeline completed: job_id={job_id}, post_id={post_id}, images={len(assets)}")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Image pipeline error: job_id={job_id}, post_id={post_id}: {e}")
+    finally:
+        db.close()
+
+
+def start_image_post_job(
+    job_id: str,
+    post_id: str,
+    assets: List[ImageAsset],
+    rendition_job_ids: Dict[UUID, UUID],
+    notify_new_post: bool = True,
+) -> None:
+    """
+    画像投稿の変換をバックグラウンドで開始する（ジョブ登録の commit 後に呼ぶ）
+
+    Args:
+        job_id: 画像ごとのメディアレンディションジョブに共通の job_id
+        rendition_job_ids: アセットID → メディアレンディションジョブID
+        notify_new_post: 完了時に新着投稿通知のバッチを起動するか
+    """
+    _post_executor.submit(
+        _run_image_post_job, job_id, post_id, assets, rendition_job_ids, notify_new_post
+    )
+
+
+def reclaim_stale_image_jobs() -> int:
+    """
+    中断した画像変換ジョブを取り戻して再実行する（同期・スレッドから呼ぶ）
+
+    Returns:
+        再実行した画像数
+    """
+    db = SessionLocal()
+    try:
+        rows = claim_stale_image_variant_jobs(db, settings.IMAGE_PIPELINE_STALE_SEC)
+        db.commit()
+    finally:
+        db.close()
+
+    by_job: Dict[str, list] = {}
+    for row in rows:
+        by_job.setdefault(row.job_id, []).append(row)
+    for job_id, job_rows in by_job.items():
+        post_id = str(job_rows[0].post_id)
+        logger.warning(f"Image pipeline reclaimed: job_id={job_id}, post_id={post_id}, images={len(job_rows)}")
+        start_image_post_job(
+            job_id,
+            post_id,
+            [
+                ImageAsset(
+                    id=row.asset_id,
+                    post_id=row.post_id,
+                    creator_user_id=row.creator_user_id,
+                    storage_key=row.input_key,
+                )
+                for row in job_rows
+            ],
+            {row.asset_id: row.id for row in job_rows},
+            # 一度も承認されていない投稿（新規投稿）のときだけ新着投稿通知を送る
+            notify_new_post=job_rows[0].authenticated_flg != AuthenticatedFlag.AUTHENTICATED,
+        )
+    return len(rows)
+
+
+async def run_image_pipeline_sweeper() -> None:
+    """
+    IMAGE_PIPELINE_SWEEP_INTERVAL_SEC ごとに中断した画像変換ジョブを再実行するループ（起動直後にも実行する）
+
+    各ワーカーで起動されるが、FOR UPDATE SKIP LOCKED で取り戻すため同じジョブを二重に再実行しない
+    """
+    while True:
+        try:
+            reclaimed = await asyncio.to_thread(reclaim_stale_image_jobs)
+            if reclaimed:
+                logger.info(f"Image pipeline sweeper: reclaimed {reclaimed} images")
+        except Exception as e:
+            logger.error(f"Image pipeline sweeper error: {e}")
+        await asyncio.sleep(settings.IMAGE_PIPELINE_SWEEP_INTERVAL_SEC)
+
+
+def shutdown_image_pipeline() -> None:
+    """エンコード用プロセスプールを停止する（lifespan の終了時）"""
+    global _encode_executor
+    with _encode_executor_lock:
+        if _encode_executor is not None:
+            _encode_executor.shutdown(wait=False, cancel_futures=True)
+            _encode_executor = None
@@ -0,0 +1,162 @@
+from concurrent.futures import Future
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+import app.services.image_pipeline.pipeline as pipeline
+from app.constants.enums import AuthenticatedFlag, MediaRenditionJobStatus
+
+
+class _ImmediateExecutor:
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def _asset():
+    return pipeline.ImageAsset(id=uuid4(), post_id=uuid4(), creator_user_id=uuid4(), storage_key="ingest/a.jpg")
+
+
+@pytest.fixture
+def env(monkeypatch):
+    """DB 更新・通知をモックにしたパイプライン"""
+    db = MagicMock(name="SessionMock")
+    post = SimpleNamespace(creator_user_id=uuid4())
+    mocks = SimpleNamespace(
+        db=db,
+        update_status=MagicMock(name="update_media_rendition_jobs_status"),
+        update_asset=MagicMock(name="update_media_asset"),
+        update_post=MagicMock(name="update_post_status", return_value=post),
+        jobs_by_job_id=MagicMock(name="get_media_rendition_jobs_by_job_id", return_value=[]),
+        trigger=MagicMock(name="trigger_batch_notification_newpost_arrival"),
+    )
+    monkeypatch.setattr(pipeline, "SessionLocal", lambda: db)
+    monkeypatch.setattr(pipeline, "_io_executor", _ImmediateExecutor())
+    monkeypatch.setattr(pipeline, "update_media_rendition_jobs_status", mocks.update_status)
+    monkeypatch.setattr(pipeline, "update_media_asset", mocks.update_asset)
+    monkeypatch.setattr(pipeline, "update_post_status", mocks.update_post)
+    monkeypatch.setattr(pipeline, "get_media_rendition_jobs_by_job_id", mocks.jobs_by_job_id)
+    monkeypatch.setattr(pipeline, "add_mail_notification_for_post", MagicMock())
+    monkeypatch.setattr(pipeline, "add_notification_for_post", MagicMock())
+    monkeypatch.setattr(pipeline, "trigger_batch_notification_newpost_arrival", mocks.trigger)
+    return mocks
+
+
+def _status_calls(update_status):
+    return [(call.args[1], call.args[2], *call.args[3:]) for call in update_status.call_args_list]
+
+
+def test_moderation_reject_records_reason_and_keeps_post_converting(monkeypatch, env):
+    asset = _asset()
+    rendition_job_id = uuid4()
+
+    def reject(asset):
+        raise pipeline.ImagePipelineError("Image rejected by moderation: ['Violence']")
+
+    monkeypatch.setattr(pipeline, "_process_asset", reject)
+
+    pipeline._run_image_post_job("job-1", str(asset.post_id), [asset], {asset.id: rendition_job_id}, True)
+
+    assert _status_calls(env.update_status) == [
+        ([rendition_job_id], MediaRenditionJobStatus.PROGRESSING),
+        ([rendition_job_id], MediaRenditionJobStatus.FAILED, "Image rejected by moderation: ['Violence']"),
+    ]
+    env.update_post.assert_not_called()
+
+
+def test_unexpected_error_is_not_returned_to_client(monkeypatch, env):
+    asset = _asset()
+
+    def boom(asset):
+        raise RuntimeError("connection reset by s3.internal")
+
+    monkeypatch.setattr(pipeline, "_process_asset", boom)
+
+    pipeline._run_image_post_job("job-1", str(asset.post_id), [asset], {asset.id: uuid4()}, True)
+
+    assert env.update_status.call_args.args[3] == pipeline._UNEXPECTED_ERROR_MESSAGE
+
+
+def test_all_images_complete_approves_post(monkeypatch, env):
+    assets = [_asset(), _asset()]
+    monkeypatch.setattr(pipeline, "_process_asset", lambda asset: (f"media/{asset.id}", 10))
+    env.jobs_by_job_id.return_value = [SimpleNamespace(status=MediaRenditionJobStatus.COMPLETE)] * 2
+
+    pipeline._run_image_post_job(
+        "job-1", "post-1", assets, {asset.id: uuid4() for asset in assets}, True
+    )
+
+    assert env.update_asset.call_count == 2
+    env.update_post.assert_called_once()
+    env.trigger.assert_called_once()
+
+
+def test_reclaimed_subset_waits_for_other_images(monkeypatch, env):
+    asset = _asset()
+    monkeypatch.setattr(pipeline, "_process_asset", lambda asset: ("media/a", 10))
+    # 同じ job_id に未完了の画像が残っている
+    env.jobs_by_job_id.return_value = [
+        SimpleNamespace(status=MediaRenditionJobStatus.COMPLETE),
+        SimpleNamespace(status=MediaRenditionJobStatus.PENDING),
+    ]
+
+    pipeline._run_image_post_job("job-1", "post-1", [asset], {asset.id: uuid4()}, True)
+
+    env.update_post.assert_not_called()
+
+
+def test_process_asset_drops_encode_when_moderation_rejects(monkeypatch):
+    encoded = MagicMock(name="EncodeFuture")
+    executor = MagicMock(name="ProcessPool")
+    executor.submit.return_value = encoded
+    monkeypatch.setattr(pipeline, "_s3_download_bytes", lambda bucket, key: b"img")
+    monkeypatch.setattr(pipeline, "_is_supported_magic", lambda data: True)
+    monkeypatch.setattr(pipeline, "_get_encode_executor", lambda: executor)
+    monkeypatch.setattr(
+        pipeline, "_moderation_check", lambda data, min_conf: {"flagged": True, "labels": ["Nudity"]}
+    )
+
+    with pytest.raises(pipeline.ImagePipelineError, match="moderation"):
+        pipeline._process_asset(_asset())
+    encoded.cancel.assert_called_once()
+
+
+def test_reclaim_restarts_stale_jobs_per_job_id(monkeypatch):
+    db = MagicMock(name="SessionMock")
+    monkeypatch.setattr(pipeline, "SessionLocal", lambda: db)
+    post_id = uuid4()
+
+    def row(job_id, authenticated_flg):
+        return SimpleNamespace(
+            id=uuid4(),
+            job_id=job_id,
+            asset_id=uuid4(),
+            input_key="ingest/a.jpg",
+            post_id=post_id,
+            creator_user_id=uuid4(),
+            authenticated_flg=authenticated_flg,
+        )
+
+    rows = [
+        row("new-post", AuthenticatedFlag.NOT_AUTHENTICATED),
+        row("new-post", AuthenticatedFlag.NOT_AUTHENTICATED),
+        row("updated-post", AuthenticatedFlag.AUTHENTICATED),
+    ]
+    monkeypatch.setattr(pipeline, "claim_stale_image_variant_jobs", lambda db, stale_after_sec: rows)
+    started = MagicMock(name="start_image_post_job")
+    monkeypatch.setattr(pipeline, "start_image_post_job", started)
+
+    assert pipeline.reclaim_stale_image_jobs() == 3
+
+    db.commit.assert_called_once()
+    calls = {call.args[0]: call for call in started.call_args_list}
+    assert len(calls["new-post"].args[2]) == 2
+    assert calls["new-post"].args[3] == {r.asset_id: r.id for r in rows[:2]}
+    assert calls["new-post"].kwargs["notify_new_post"] is True
+    assert calls["updated-post"].kwargs["notify_new_post"] is False
@@ -0,0 +1,284 @@
+"""
+通知アウトボックスのディスパッチャー
+
+リクエストはアウトボックスに 1 行積むだけにして、アプリ内通知の作成・メール・Web Push は
+ここでまとめて処理する（メールや Push の遅延がメッセージ送信のレスポンスに影響しない）。
+
+各ワーカープロセスで NOTIFICATION_OUTBOX_WORKERS 本のループを起動する。
+取り出しは FOR UPDATE SKIP LOCKED のため、プロセス・ループ間で同じ行を二重に処理しない。
+送信後の失敗や停止で同じ行を再処理するときは、受信者ごとの進捗（notification_outbox_recipients）で
+作成・送信済みの通知・メール・Web Push を飛ばす。
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.constants.enums import NotificationOutboxEventType
+from app.api.commons.function import CommonFunction
+from app.core.config import settings
+from app.core.logger import Logger
+from app.crud import notification_outbox_crud
+from app.crud.notifications_crud import new_message_notification_payload
+from app.crud.push_noti_crud import push_notification_to_users
+from app.db.base import SessionLocal
+from app.models.conversation_participants import ConversationParticipants
+from app.models.notification_outbox import NotificationOutbox
+from app.models.notifications import Notifications
+from app.models.profiles import Profiles
+from app.models.user import Users
+from app.schemas.notification import NotificationType
+from app.services.email.send_email import send_message_notification_email
+
+logger = Logger.get_logger()
+
+_email_executor = ThreadPoolExecutor(
+    max_workers=max(settings.NOTIFICATION_OUTBOX_EMAIL_CONCURRENCY, 1),
+    thread_name_prefix="notification-email",
+)
+
+_wake_event: asyncio.Event | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _handle_new_messages(db: Session, entries: List[NotificationOutbox]) -> None:
+    """
+    DM新着メッセージの通知をまとめて処理する
+
+    受信者・送信者・通知設定はバッチ全体で 1 クエリずつ取得し、通知は一括 INSERT、
+    メールは並列送信、Web Push は購読情報をまとめて取得して送る。
+    いずれも受信者ごとに送信済みを記録し、リトライ時は未完了の分だけを処理する
+    """
+    payloads = [entry.payload for entry in entries]
+    conversation_ids = {UUID(p["conversation_id"]) for p in payloads}
+    sender_ids = {UUID(p["sender_user_id"]) for p in payloads}
+
+    # 会話の参加者（受信者候補）とそのユーザー・プロフィール
+    participants_by_conversation: Dict[UUID, list] = {}
+    for conversation_id, user, profile in (
+        db.query(ConversationParticipants.conversation_id, Users, Profiles)
+        .join(Users, Users.id == ConversationParticipants.user_id)
+        .outerjoin(Profiles, Profiles.user_id == Users.id)
+        .filter(ConversationParticipants.conversation_id.in_(conversation_ids))
+        .all()
+    ):
+        participants_by_conversation.setdefault(conversation_id, []).append((user, profile))
+
+    # 送信者の表示名・アバター
+    senders = {
+        row.id: row
+        for row in db.query(Users.id, Users.profile_name, Profiles.avatar_url)
+        .outerjoin(Profiles, Profiles.user_id == Users.id)
+        .filter(Users.id.in_(sender_ids))
+        .all()
+    }
+
+    recipient_ids = {
+        user.id
+        for participants in participants_by_conversation.values()
+        for user, _profile in participants
+    }
+    preferences = CommonFunction.get_users_need_to_send_notification(
+        db, recipient_ids, ["userMessages", "message"]
+    )
+
+    now = datetime.now(timezone.utc)
+    frontend_url = os.getenv("FRONTEND_URL", "https://mijfans.jp/")
+    # ((outbox_id, user_id), 通知ペイロード, メール（送らない場合は None）)
+    candidates = []
+    for entry in entries:
+        payload = entry.payload
+        conversation_id = UUID(payload["conversation_id"])
+        sender_id = UUID(payload["sender_user_id"])
+        sender = senders.get(sender_id)
+        sender_name = (sender.profile_name if sender else None) or "Unknown User"
+        sender_avatar_url = (
+            f"{os.getenv('CDN_BASE_URL')}/{sender.avatar_url}"
+            if sender and sender.avatar_url
+            else None
+        )
+        message_preview = payload.get("message_preview")
+
+        for user, profile in participants_by_conversation.get(conversation_id, []):
+            if user.id == sender_id:
+                continue
+            if not preferences[user.id]["userMessages"]:
+                continue
+
+            notification_payload = new_message_notification_payload(
+                sender_name, sender_avatar_url, message_preview, conversation_id
+            )
+            email = None
+            if preferences[user.id]["message"] and user.email:
+                email = dict(
+                    to=user.email,
+                    sender_name=sender_name,
+                    recipient_name=(profile.username if profile and profile.username else user.profile_name)
+                    or "User",
+                    message_preview=message_preview,
+                    conversation_url=f"{frontend_url}/message/conversation/{conversation_id}",
+                )
+            candidates.append(((entry.id, user.id), notification_payload, email))
+
+    # 受信者ごとの進捗行とアプリ内通知を同じトランザクションで作る（確定してから外部送信する）。
+    # リトライ時は進捗行が作成済みの受信者には通知を作らない
+    created = notification_outbox_crud.add_recipients(db, [key for key, _payload, _email in candidates])
+    notifications = [
+        Notifications(
+            user_id=user_id,
+            type=NotificationType.USERS,
+            payload=notification_payload,
+            is_read=False,
+            created_at=now,
+            updated_at=now,
+        )
+        for (outbox_id, user_id), notification_payload, _email in candidates
+        if (outbox_id, user_id) in created
+    ]
+    db.add_all(notifications)
+    db.commit()
+
+    # 前回の試行で送信済みのメール・Web Push は送らない
+    progress = notification_outbox_crud.get_recipient_progress(db, [entry.id for entry in entries])
+    pushes = []
+    emails = []
+    for key, notification_payload, email in candidates:
+        recipient = progress.get(key)
+        if recipient is None:
+            continue
+        if not recipient.push_done:
+            pushes.append(
+                (
+                    key,
+                    (
+                        key[1],
+                        {
+                            "title": notification_payload["title"],
+                            "body": notification_payload["subtitle"],
+                            "url": f"{frontend_url}{notification_payload['redirect_url']}",
+                        },
+                    ),
+                )
+            )
+        if email is not None and not recipient.email_done:
+            emails.append((key, email))
+
+    # メールは並列に送る（送信失敗は send_message_notification_email 内でログに残る）
+    futures = [
+        (key, _email_executor.submit(send_message_notification_email, **email))
+        for key, email in emails
+    ]
+    push_notification_to_users(db, [push for _key, push in pushes])
+    notification_outbox_crud.mark_recipients_push_done(db, [key for key, _push in pushes])
+    db.commit()
+
+    wait([future for _key, future in futures])
+    notification_outbox_crud.mark_recipients_email_done(
+        db, [key for key, future in futures if future.exception() is None]
+    )
+    db.commit()
+    for _key, future in futures:
+        future.result()
+
+    logger.info(
+        f"Notification outbox: {len(entries)} messages -> "
+        f"{len(notifications)} notifications, {len(pushes)} pushes, {len(emails)} emails"
+    )
+
+
+_HANDLERS: Dict[int, Callable[[Session, List[NotificationOutbox]], None]] = {
+    NotificationOutboxEventType.NEW_MESSAGE: _handle_new_messages,
+}
+
+
+def dispatch_notification_outbox_once() -> int:
+    """
+    アウトボックスから 1 バッチ取り出して処理する（同期・スレッドから呼ぶ）
+
+    Returns:
+        取り出した件数
+    """
+    # 取り出した行を commit 後も再読込せずに使う
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        entries = notification_outbox_crud.claim_batch(
+            db,
+            settings.NOTIFICATION_OUTBOX_BATCH_SIZE,
+            settings.NOTIFICATION_OUTBOX_STALE_SEC,
+        )
+        if not entries:
+            return 0
+
+        by_type: Dict[int, List[NotificationOutbox]] = {}
+        for entry in entries:
+            by_type.setdefault(entry.event_type, []).append(entry)
+
+        for event_type, group in by_type.items():
+            handler = _HANDLERS.get(event_type)
+            try:
+                if handler is None:
+                    raise ValueError(f"Unknown notification outbox event_type: {event_type}")
+                handler(db, group)
+                notification_outbox_crud.mark_done(db, [entry.id for entry in group])
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Notification outbox dispatch error (event_type={event_type}): {e}")
+                notification_outbox_crud.mark_failed(
+                    db,
+                    group,
+                    str(e),
+                    settings.NOTIFICATION_OUTBOX_MAX_ATTEMPTS,
+                    settings.NOTIFICATION_OUTBOX_RETRY_BASE_SEC,
+                )
+        return len(entries)
+    finally:
+        db.close()
+
+
+def wake_notification_dispatcher() -> None:
+    """
+    アウトボックスへの追加が commit されたときにディスパッチャーを起こす（どのスレッドからでも可）
+    """
+    if _loop is not None and _wake_event is not None and not _loop.is_closed():
+        _loop.call_soon_threadsafe(_wake_event.set)
+
+
+async def _run_worker() -> None:
+    while True:
+        # 処理中に届いた起床通知を取りこぼさないよう、取り出す前にクリアする
+        _wake_event.clear()
+        try:
+            claimed = await asyncio.to_thread(dispatch_notification_outbox_once)
+        except Exception as e:
+            logger.error(f"Notification outbox loop error: {e}")
+            claimed = 0
+
+        # 取り出し上限いっぱいだった場合は続けて処理し、空なら起床通知かポーリング間隔まで待つ
+        if claimed >= settings.NOTIFICATION_OUTBOX_BATCH_SIZE:
+            continue
+        try:
+            await asyncio.wait_for(
+                _wake_event.wait(), timeout=settings.NOTIFICATION_OUTBOX_POLL_INTERVAL_SEC
+            )
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_notification_outbox_dispatcher() -> None:
+    """
+    NOTIFICATION_OUTBOX_WORKERS 本のディスパッチループを実行する（lifespan から起動）
+    """
+    global _wake_event, _loop
+    _loop = asyncio.get_running_loop()
+    _wake_event = asyncio.Event()
+    notification_outbox_crud.set_enqueued_listener(wake_notification_dispatcher)
+    try:
+        await asyncio.gather(
+            *[_run_worker() for _ in range(max(settings.NOTIFICATION_OUTBOX_WORKERS, 1))]
+        )
+    finally:
+        notification_outbox_crud.set_enqueued_listener(None)
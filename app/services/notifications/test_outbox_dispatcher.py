@@ -0,0 +1,129 @@
+from concurrent.futures import Future
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+import app.services.notifications.outbox_dispatcher as outbox_dispatcher
+
+
+class _ImmediateExecutor:
+    def submit(self, fn, **kwargs):
+        future = Future()
+        future.set_result(fn(**kwargs))
+        return future
+
+
+@pytest.fixture
+def dm():
+    """送信者 1 人・受信者 1 人の会話とアウトボックス 1 行"""
+    conversation_id = uuid4()
+    sender = SimpleNamespace(id=uuid4(), email="sender@example.com", profile_name="sender")
+    recipient = SimpleNamespace(id=uuid4(), email="to@example.com", profile_name="recipient")
+    entry = SimpleNamespace(
+        id=uuid4(),
+        payload={
+            "message_id": str(uuid4()),
+            "conversation_id": str(conversation_id),
+            "sender_user_id": str(sender.id),
+            "message_preview": "hi",
+        },
+    )
+
+    participants = MagicMock(name="ParticipantsQuery")
+    participants.join.return_value.outerjoin.return_value.filter.return_value.all.return_value = [
+        (conversation_id, sender, None),
+        (conversation_id, recipient, SimpleNamespace(username="recipient_name")),
+    ]
+    senders = MagicMock(name="SendersQuery")
+    senders.outerjoin.return_value.filter.return_value.all.return_value = [
+        SimpleNamespace(id=sender.id, profile_name="sender", avatar_url=None)
+    ]
+    db = MagicMock(name="SessionMock")
+    db.query.side_effect = [participants, senders]
+    return SimpleNamespace(db=db, entry=entry, recipient=recipient, key=(entry.id, recipient.id))
+
+
+@pytest.fixture
+def senders(monkeypatch):
+    monkeypatch.setattr(
+        outbox_dispatcher.CommonFunction,
+        "get_users_need_to_send_notification",
+        lambda db, user_ids, types: {
+            user_id: {"userMessages": True, "message": True} for user_id in user_ids
+        },
+    )
+    monkeypatch.setattr(outbox_dispatcher, "_email_executor", _ImmediateExecutor())
+    email = MagicMock(name="send_message_notification_email")
+    push = MagicMock(name="push_notification_to_users")
+    monkeypatch.setattr(outbox_dispatcher, "send_message_notification_email", email)
+    monkeypatch.setattr(outbox_dispatcher, "push_notification_to_users", push)
+    return SimpleNamespace(email=email, push=push)
+
+
+@pytest.fixture
+def crud(monkeypatch):
+    crud = MagicMock(name="notification_outbox_crud")
+    monkeypatch.setattr(outbox_dispatcher, "notification_outbox_crud", crud)
+    return crud
+
+
+def _progress(key, email_done=False, push_done=False):
+    return {key: SimpleNamespace(email_done=email_done, push_done=push_done)}
+
+
+def test_first_attempt_notifies_and_records_progress(dm, senders, crud):
+    crud.add_recipients.return_value = {dm.key}
+    crud.get_recipient_progress.return_value = _progress(dm.key)
+
+    outbox_dispatcher._handle_new_messages(dm.db, [dm.entry])
+
+    # 送信者自身には通知しない
+    crud.add_recipients.assert_called_once_with(dm.db, [dm.key])
+    (notifications,), _kwargs = dm.db.add_all.call_args
+    assert [n.user_id for n in notifications] == [dm.recipient.id]
+    senders.email.assert_called_once()
+    assert senders.email.call_args.kwargs["to"] == "to@example.com"
+    assert [user_id for user_id, _payload in senders.push.call_args.args[1]] == [dm.recipient.id]
+    crud.mark_recipients_push_done.assert_called_once_with(dm.db, [dm.key])
+    crud.mark_recipients_email_done.assert_called_once_with(dm.db, [dm.key])
+
+
+def test_retry_skips_completed_recipients(dm, senders, crud):
+    # 前回の試行で通知・メール・Web Push まで完了している（mark_done だけ失敗した）
+    crud.add_recipients.return_value = set()
+    crud.get_recipient_progress.return_value = _progress(dm.key, email_done=True, push_done=True)
+
+    outbox_dispatcher._handle_new_messages(dm.db, [dm.entry])
+
+    (notifications,), _kwargs = dm.db.add_all.call_args
+    assert notifications == []
+    senders.email.assert_not_called()
+    assert senders.push.call_args.args[1] == []
+
+
+def test_retry_sends_only_unfinished_channel(dm, senders, crud):
+    crud.add_recipients.return_value = set()
+    crud.get_recipient_progress.return_value = _progress(dm.key, email_done=False, push_done=True)
+
+    outbox_dispatcher._handle_new_messages(dm.db, [dm.entry])
+
+    senders.email.assert_called_once()
+    assert senders.push.call_args.args[1] == []
+    crud.mark_recipients_email_done.assert_called_once_with(dm.db, [dm.key])
+
+
+def test_dispatch_marks_failed_when_handler_raises(monkeypatch, crud):
+    db = MagicMock(name="SessionMock")
+    monkeypatch.setattr(outbox_dispatcher, "SessionLocal", lambda **kwargs: db)
+    entry = SimpleNamespace(id=uuid4(), event_type=99, payload={}, attempts=1)
+    crud.claim_batch.return_value = [entry]
+
+    assert outbox_dispatcher.dispatch_notification_outbox_once() == 1
+
+    db.rollback.assert_called_once()
+    crud.mark_done.assert_not_called()
+    crud.mark_failed.assert_called_once()
+    assert crud.mark_failed.call_args.args[1] == [entry]
+    db.close.assert_called_once()
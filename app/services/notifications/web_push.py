@@ -0,0 +1,193 @@
+"""
+Web Push の送信
+
+- VAPID 鍵はプロセスで 1 回だけ読み込み、署名済みの JWT は push サービスの origin（aud）ごとに
+  有効期限の手前まで使い回す（送信ごとの鍵の読み込み・ECDSA 署名をしない）
+- HTTP クライアントはプロセスで共有し、push サービスの origin ごとに接続を使い回す
+  （h2 パッケージがあれば HTTP/2 で多重化する。無い場合は HTTP/1.1 の keep-alive）
+- 送信は WEB_PUSH_CONCURRENCY 本のスレッドで並列に行い、失効した購読は結果として返す
+  （呼び出し元で 1 回の UPDATE でまとめて無効化する）
+"""
+import importlib.util
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+from uuid import UUID
+
+import httpx
+from py_vapid import Vapid
+from pywebpush import WebPusher, WebPushException
+
+from app.core.config import settings
+from app.core.logger import Logger
+
+logger = Logger.get_logger()
+
+# 購読が失効している（ブラウザ側で解除された等）ことを表すステータス
+_EXPIRED_STATUS_CODES = (404, 410)
+
+# 署名した JWT の有効期間と、失効のこの秒数前から再署名する
+_JWT_LIFETIME_SEC = 12 * 60 * 60
+_JWT_REFRESH_MARGIN_SEC = 60 * 60
+
+
+@dataclass(frozen=True)
+class WebPushSubscription:
+    """送信先の購読情報（スレッドに渡すため ORM オブジェクトから取り出しておく）"""
+    id: UUID
+    endpoint: str
+    p256dh: str
+    auth: str
+
+
+def _http2_available() -> bool:
+    # h2 は任意依存（入っていれば HTTP/2 を使う）
+    return importlib.util.find_spec("h2") is not None
+
+
+class WebPushSender:
+    """
+    VAPID 署名・接続を使い回して Web Push を並列送信する
+    """
+
+    def __init__(
+        self,
+        vapid_private_key: Optional[str],
+        vapid_subject: str,
+        concurrency: int,
+        timeout_sec: float,
+        ttl_sec: int,
+    ):
+        self.vapid_private_key = vapid_private_key
+        self.vapid_subject = vapid_subject
+        self.concurrency = max(concurrency, 1)
+        self.timeout_sec = timeout_sec
+        self.ttl_sec = ttl_sec
+        self._vapid: Optional[Vapid] = None
+        self._vapid_headers: Dict[str, Tuple[dict, float]] = {}
+        self._client: Optional[httpx.Client] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_vapid(self) -> Vapid:
+        if self._vapid is None:
+            if not self.vapid_private_key:
+                raise WebPushException("VAPID_PRIVATE_KEY is not set")
+            self._vapid = Vapid.from_string(private_key=self.vapid_private_key)
+        return self._vapid
+
+    def _get_vapid_headers(self, endpoint: str) -> dict:
+        """push サービスの origin ごとに署名済みの Authorization ヘッダーを返す"""
+        url = urlparse(endpoint)
+        audience = f"{url.scheme}://{url.netloc}"
+        now = time.time()
+        with self._lock:
+            cached = self._vapid_headers.get(audience)
+            if cached is not None and cached[1] - _JWT_REFRESH_MARGIN_SEC > now:
+                return cached[0]
+            expires_at = int(now) + _JWT_LIFETIME_SEC
+            headers = self._get_vapid().sign(
+                {"sub": self.vapid_subject, "aud": audience, "exp": expires_at}
+            )
+            self._vapid_headers[audience] = (headers, expires_at)
+            return headers
+
+    def _get_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    http2=_http2_available(),
+                    timeout=self.timeout_sec,
+                    limits=httpx.Limits(
+                        max_connections=self.concurrency,
+                        max_keepalive_connections=self.concurrency,
+                    ),
+                )
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.concurrency, thread_name_prefix="web-push"
+                )
+            return self._client
+
+    def _send_one(self, subscription: WebPushSubscription, data: bytes) -> bool:
+        """
+        1 件送信する
+
+        Returns:
+            購読が失効している（無効化すべき）場合は True
+        """
+        try:
+            encoded = WebPusher(
+                {
+                    "endpoint": subscription.endpoint,
+                    "keys": {"p256dh": subscription.p256dh, "auth": subscription.auth},
+                }
+            ).encode(data, content_encoding="aes128gcm")
+        except WebPushException as e:
+            # 鍵が壊れている購読には今後も送れない
+            logger.error(f"Invalid push subscription {subscription.id}: {e}")
+            return True
+
+        headers = {
+            "Content-Encoding": "aes128gcm",
+            "Content-Type": "application/octet-stream",
+            "TTL": str(self.ttl_sec),
+            **self._get_vapid_headers(subscription.endpoint),
+        }
+        try:
+            response = self._get_client().post(
+                subscription.endpoint, content=encoded["body"], headers=headers
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"Error pushing notification to subscription {subscription.id}: {e}")
+            return False
+
+        if response.status_code in _EXPIRED_STATUS_CODES:
+            logger.info(f"Push subscription expired: {subscription.id} ({response.status_code})")
+            return True
+        if response.status_code > 202:
+            logger.error(
+                f"Push failed for subscription {subscription.id}: {response.status_code} {response.text}"
+            )
+        return False
+
+    def send(self, messages: Sequence[Tuple[WebPushSubscription, bytes]]) -> List[UUID]:
+        """
+        まとめて並列に送信する（全件の完了を待つ）
+
+        Args:
+            messages: (購読, 送信データ) のリスト
+
+        Returns:
+            失効していた購読の ID
+        """
+        if not messages:
+            return []
+        self._get_client()
+        results = self._executor.map(lambda message: self._send_one(*message), messages)
+        return [
+            subscription.id
+            for (subscription, _data), expired in zip(messages, results)
+            if expired
+        ]
+
+
+_sender: Optional[WebPushSender] = None
+
+
+def get_web_push_sender() -> WebPushSender:
+    """プロセスで共有する送信クライアント"""
+    global _sender
+    if _sender is None:
+        _sender = WebPushSender(
+            vapid_private_key=os.environ.get("VAPID_PRIVATE_KEY"),
+            vapid_subject=settings.WEB_PUSH_VAPID_SUBJECT,
+            concurrency=settings.WEB_PUSH_CONCURRENCY,
+            timeout_sec=settings.WEB_PUSH_TIMEOUT_SEC,
+            ttl_sec=settings.WEB_PUSH_TTL_SEC,
+        )
+    return _sender
@@ -0,0 +1,41 @@
+import asyncio
+
+from app.core.config import settings
+from app.core.logger import Logger
+from app.crud.post_crud import refresh_post_ranking_snapshots
+from app.db.base import SessionLocal
+
+logger = Logger.get_logger()
+
+
+def run_post_ranking_refresh_once(min_interval_sec: int = 0) -> dict | None:
+    """
+    全期間の投稿ランキングスナップショットを更新する（同期・スレッドから呼ぶ）
+    """
+    db = SessionLocal()
+    try:
+        return refresh_post_ranking_snapshots(db, min_interval_sec=min_interval_sec)
+    finally:
+        db.close()
+
+
+async def run_post_ranking_refresher() -> None:
+    """
+    POST_RANKING_REFRESH_INTERVAL_SEC ごとにスナップショットを更新するループ
+
+    各ワーカーで起動されるが、advisory lock と最小更新間隔により
+    実際に再計算するのは 1 間隔につき 1 ワーカーのみ
+    """
+    interval = settings.POST_RANKING_REFRESH_INTERVAL_SEC
+    # 同時起動したワーカーが同じタイミングで集計しないよう半分の間隔で判定する
+    min_interval_sec = max(interval // 2, 1)
+    while True:
+        try:
+            refreshed = await asyncio.to_thread(
+                run_post_ranking_refresh_once, min_interval_sec
+            )
+            if refreshed is not None:
+                logger.info(f"ランキングスナップショット更新: {refreshed}")
+        except Exception as e:
+            logger.error(f"ランキングスナップショット更新ループエラー: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,249 @@
+"""
+WebSocket 配信のブローカー
+
+各ワーカーは自分に接続しているソケットしか持たないため、配信は必ずブローカーへ publish し、
+全ワーカーがブローカーから受け取って自分のローカル接続へ配る（送信元ワーカーも同じ経路で受け取る）。
+
+- memory: 同一プロセス内のみ（デフォルト。単一ワーカー・テスト用）
+- redis: Redis Pub/Sub（BROADCAST_REDIS_URL。redis パッケージが必要）
+- postgres: PostgreSQL の LISTEN/NOTIFY（プライマリDBを使う。追加のミドルウェア不要）
+"""
+import asyncio
+import json
+from contextlib import suppress
+from datetime import timedelta
+from typing import Awaitable, Callable, Optional, Set
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.core.logger import Logger
+from app.models.broadcast_payloads import BroadcastPayloads
+
+logger = Logger.get_logger()
+
+# ブローカー上のチャンネル名（全トピックを 1 チャンネルに流し、受信側でトピックごとに配る）
+BROADCAST_CHANNEL = "ws_broadcast"
+
+# PostgreSQL の NOTIFY ペイロード上限（8000 バイト）に余裕をもたせた値
+_PG_NOTIFY_MAX_BYTES = 7900
+
+# 受信したメッセージを配る関数（topic, message）
+BroadcastHandler = Callable[[str, dict], Awaitable[None]]
+
+
+def _encode(topic: str, message: dict) -> str:
+    return json.dumps({"topic": topic, "message": message}, ensure_ascii=False, default=str)
+
+
+class BroadcastBackend:
+    """ブローカーの共通インターフェース"""
+
+    def __init__(self):
+        self._handler: Optional[BroadcastHandler] = None
+
+    async def start(self, handler: BroadcastHandler) -> None:
+        """購読を開始する（受信したメッセージは handler に渡す）"""
+        self._handler = handler
+
+    async def stop(self) -> None:
+        """購読を終了する"""
+        self._handler = None
+
+    async def publish(self, topic: str, message: dict) -> None:
+        """全ワーカーへ配信する"""
+        raise NotImplementedError
+
+    async def _dispatch(self, raw) -> None:
+        if self._handler is None:
+            return
+        try:
+            if isinstance(raw, bytes):
+                raw = raw.decode()
+            envelope = json.loads(raw)
+            await self._handler(envelope["topic"], envelope["message"])
+        except Exception as e:
+            logger.error(f"Broadcast dispatch error: {e}")
+
+
+class InMemoryBroadcastBackend(BroadcastBackend):
+    """
+    同一プロセス内だけで配信するブローカー
+
+    他のブローカーと同じく JSON にエンコードしてから配るため、テストでの代用にも使える
+    """
+
+    async def publish(self, topic: str, message: dict) -> None:
+        await self._dispatch(_encode(topic, message))
+
+
+class RedisBroadcastBackend(BroadcastBackend):
+    """Redis Pub/Sub によるブローカー"""
+
+    def __init__(self, url: str):
+        super().__init__()
+        import redis.asyncio as aioredis  # 任意依存（BROADCAST_BACKEND=redis の場合のみ必要）
+
+        self._redis = aioredis.Redis.from_url(url)
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self, handler: BroadcastHandler) -> None:
+        await super().start(handler)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(BROADCAST_CHANNEL)
+        self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                # 接続が切れた場合も次の読み取りで再接続・再購読される
+                async for item in self._pubsub.listen():
+                    if item.get("type") == "message":
+                        await self._dispatch(item["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Redis broadcast listener error: {e}")
+                await asyncio.sleep(1)
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        await self._redis.aclose()
+        await super().stop()
+
+    async def publish(self, topic: str, message: dict) -> None:
+        await self._redis.publish(BROADCAST_CHANNEL, _encode(topic, message))
+
+
+class PostgresBroadcastBackend(BroadcastBackend):
+    """
+    PostgreSQL の LISTEN/NOTIFY によるブローカー
+
+    LISTEN 用にプール外の専用接続を 1 本持ち、切断時は再接続する。NOTIFY は非同期エンジンのプールから送る。
+    NOTIFY に載らない大きさのメッセージは broadcast_payloads に保存して topic と id だけを NOTIFY し、
+    受信側がテーブルから読み込んで配る
+    """
+
+    def __init__(self, url: Optional[str] = None):
+        super().__init__()
+        # asyncpg に直接渡すため SQLAlchemy のドライバ指定を外す
+        self._dsn = (
+            make_url(url or settings.ASYNC_DATABASE_URL)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        self._listener: Optional[asyncio.Task] = None
+        self._dispatching: Set[asyncio.Task] = set()
+
+    async def start(self, handler: BroadcastHandler) -> None:
+        await super().start(handler)
+        self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self._dsn)
+                terminated = asyncio.Event()
+                connection.add_termination_listener(lambda _conn: terminated.set())
+                await connection.add_listener(BROADCAST_CHANNEL, self._on_notify)
+                await terminated.wait()
+                logger.warning("Postgres broadcast listener connection lost; reconnecting")
+            except asyncio.CancelledError:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+                raise
+            except Exception as e:
+                logger.error(f"Postgres broadcast listener error: {e}")
+            await asyncio.sleep(1)
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        task = asyncio.create_task(self._receive(payload))
+        self._dispatching.add(task)
+        task.add_done_callback(self._dispatching.discard)
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        await super().stop()
+
+    async def _receive(self, payload: str) -> None:
+        """NOTIFY を受け取り、参照（payload_id）の場合はテーブルから本体を読み込んで配る"""
+        try:
+            envelope = json.loads(payload)
+            payload_id = envelope.get("payload_id")
+            if payload_id is not None:
+                from app.db.async_session import async_engine
+
+                async with async_engine.connect() as conn:
+                    payload = (
+                        await conn.execute(
+                            select(BroadcastPayloads.payload).where(BroadcastPayloads.id == payload_id)
+                        )
+                    ).scalar_one_or_none()
+                if payload is None:
+                    logger.warning(
+                        f"Broadcast payload not found (topic={envelope.get('topic')}, id={payload_id})"
+                    )
+                    return
+        except Exception as e:
+            logger.error(f"Broadcast receive error: {e}")
+            return
+        await self._dispatch(payload)
+
+    async def publish(self, topic: str, message: dict) -> None:
+        payload = _encode(topic, message)
+
+        from app.db.async_session import async_engine
+
+        # NOTIFY はコミット時に送られるため、受信側からは保存した行が必ず見える
+        async with async_engine.begin() as conn:
+            if len(payload.encode()) > _PG_NOTIFY_MAX_BYTES:
+                payload_id = (
+                    await conn.execute(
+                        insert(BroadcastPayloads)
+                        .values(topic=topic, payload=payload)
+                        .returning(BroadcastPayloads.id)
+                    )
+                ).scalar_one()
+                # 全ワーカーが読み終えた後の古い行を削除する
+                await conn.execute(
+                    delete(BroadcastPayloads).where(
+                        BroadcastPayloads.created_at
+                        < func.now() - timedelta(seconds=settings.BROADCAST_PAYLOAD_RETENTION_SEC)
+                    )
+                )
+                payload = json.dumps({"topic": topic, "payload_id": str(payload_id)})
+            await conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": BROADCAST_CHANNEL, "payload": payload},
+            )
+
+def create_broadcast_backend(kind: Optional[str] = None) -> BroadcastBackend:
+    """
+    BROADCAST_BACKEND に応じたブローカーを作成する
+    """
+    kind = (kind or settings.BROADCAST_BACKEND).lower()
+    if kind == "redis":
+        if not settings.BROADCAST_REDIS_URL:
+            raise RuntimeError("BROADCAST_BACKEND=redis requires BROADCAST_REDIS_URL")
+        return RedisBroadcastBackend(settings.BROADCAST_REDIS_URL)
+    if kind == "postgres":
+        return PostgresBroadcastBackend()
+    if kind != "memory":
+        raise RuntimeError(f"Unknown BROADCAST_BACKEND: {kind}")
+    return InMemoryBroadcastBackend()
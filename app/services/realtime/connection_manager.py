@@ -0,0 +1,109 @@
+import asyncio
+from typing import Dict, Optional, Set
+
+from fastapi import WebSocket
+
+from app.core.logger import Logger
+from app.services.realtime.broadcast import BroadcastBackend, create_broadcast_backend
+
+logger = Logger.get_logger()
+
+
+class ConnectionManager:
+    """
+    WebSocket接続を管理するクラス
+
+    接続はワーカーごとに保持し、配信はブローカー経由で全ワーカーへ流す。
+    各ワーカーはブローカーから受け取ったメッセージを自分に接続しているソケットにだけ送る
+    """
+
+    def __init__(self, backend: Optional[BroadcastBackend] = None):
+        # Key: conversation_id, Value: Set of WebSocket connections
+        self.active_connections: Dict[str, Set[WebSocket]] = {}
+        self._backend = backend
+        self._started = False
+        self._start_lock = asyncio.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def backend(self) -> BroadcastBackend:
+        if self._backend is None:
+            self._backend = create_broadcast_backend()
+        return self._backend
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """同期コードからの配信（publish_threadsafe）に使うイベントループを登録する（起動時）"""
+        self._loop = loop
+
+    async def start(self) -> None:
+        """ブローカーの購読を開始する（接続が来たときに一度だけ）"""
+        if self._started:
+            return
+        async with self._start_lock:
+            if not self._started:
+                await self.backend.start(self._deliver_local)
+                self._started = True
+
+    async def stop(self) -> None:
+        """ブローカーの購読を終了する（シャットダウン時）"""
+        if self._started:
+            await self.backend.stop()
+            self._started = False
+
+    async def connect(self, websocket: WebSocket, conversation_id: str):
+        """WebSocket接続を追加"""
+        await self.start()
+        await websocket.accept()
+        if conversation_id not in self.active_connections:
+            self.active_connections[conversation_id] = set()
+        self.active_connections[conversation_id].add(websocket)
+
+    def subscribe(self, websocket: WebSocket, topic: str):
+        """接続済みのWebSocketを別のトピックにも登録する"""
+        self.active_connections.setdefault(topic, set()).add(websocket)
+
+    def disconnect(self, websocket: WebSocket, conversation_id: str):
+        """WebSocket接続を削除"""
+        if conversation_id in self.active_connections:
+            self.active_connections[conversation_id].discard(websocket)
+            if not self.active_connections[conversation_id]:
+                del self.active_connections[conversation_id]
+
+    async def broadcast(self, topic: str, message: dict):
+        """トピックを購読している全員（全ワーカー）にメッセージを配信"""
+        try:
+            await self.backend.publish(topic, message)
+        except Exception as e:
+            # ブローカーに届かない場合でも、このワーカーの接続には配る
+            logger.error(f"Broadcast publish failed, delivering locally only: {e}")
+            await self._deliver_local(topic, message)
+
+    async def broadcast_to_conversation(self, conversation_id: str, message: dict):
+        """特定の会話に接続している全員（全ワーカー）にメッセージを配信"""
+        await self.broadcast(conversation_id, message)
+
+    def publish_threadsafe(self, topic: str, message: dict) -> None:
+        """
+        同期コード（スレッドプール・イベントループ上の同期呼び出し）から配信する（完了を待たない）
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self.broadcast(topic, message), loop)
+
+    async def _deliver_local(self, conversation_id: str, message: dict):
+        """このワーカーに接続しているソケットへ配信"""
+        if conversation_id in self.active_connections:
+            disconnected = set()
+            for connection in list(self.active_connections[conversation_id]):
+                try:
+                    await connection.send_json(message)
+                except Exception:
+                    disconnected.add(connection)
+
+            # 切断されたコネクションを削除
+            for conn in disconnected:
+                self.disconnect(conn, conversation_id)
+
+
+manager = ConnectionManager()
@@ -0,0 +1,85 @@
+import asyncio
+import json
+import sys
+import types
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+import app.services.realtime.broadcast as broadcast
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    conn = MagicMock(name="AsyncConnectionMock")
+    conn.execute = AsyncMock()
+
+    @asynccontextmanager
+    async def _conn():
+        yield conn
+
+    engine = MagicMock(name="AsyncEngineMock")
+    engine.begin = _conn
+    engine.connect = _conn
+    engine.conn = conn
+    monkeypatch.setitem(sys.modules, "app.db.async_session", types.SimpleNamespace(async_engine=engine))
+    return engine
+
+
+def _notified_payload(conn):
+    params = conn.execute.call_args_list[-1].args[1]
+    assert params["channel"] == broadcast.BROADCAST_CHANNEL
+    return params["payload"]
+
+
+def test_publish_notifies_small_message_inline(engine):
+    backend = broadcast.PostgresBroadcastBackend("postgresql+asyncpg://u:p@db/app")
+
+    asyncio.run(backend.publish("c1", {"text": "こんにちは"}))
+
+    assert engine.conn.execute.await_count == 1
+    assert json.loads(_notified_payload(engine.conn)) == {"topic": "c1", "message": {"text": "こんにちは"}}
+
+
+def test_publish_stores_large_message_and_notifies_reference(engine):
+    payload_id = uuid4()
+    engine.conn.execute.side_effect = [
+        MagicMock(scalar_one=MagicMock(return_value=payload_id)),
+        MagicMock(),
+        MagicMock(),
+    ]
+    backend = broadcast.PostgresBroadcastBackend("postgresql+asyncpg://u:p@db/app")
+    message = {"text": "あ" * 3000}
+
+    asyncio.run(backend.publish("c1", message))
+
+    insert_params = engine.conn.execute.call_args_list[0].args[0].compile().params
+    assert json.loads(insert_params["payload"]) == {"topic": "c1", "message": message}
+    notified = _notified_payload(engine.conn)
+    assert len(notified.encode()) <= broadcast._PG_NOTIFY_MAX_BYTES
+    assert json.loads(notified) == {"topic": "c1", "payload_id": str(payload_id)}
+
+
+def test_receive_loads_referenced_payload(engine):
+    stored = broadcast._encode("c1", {"text": "あ" * 3000})
+    engine.conn.execute.return_value = MagicMock(scalar_one_or_none=MagicMock(return_value=stored))
+    handler = AsyncMock()
+    backend = broadcast.PostgresBroadcastBackend("postgresql+asyncpg://u:p@db/app")
+    backend._handler = handler
+
+    asyncio.run(backend._receive(json.dumps({"topic": "c1", "payload_id": str(uuid4())})))
+
+    handler.assert_awaited_once_with("c1", {"text": "あ" * 3000})
+
+
+def test_receive_dispatches_inline_payload_without_query(engine):
+    handler = AsyncMock()
+    backend = broadcast.PostgresBroadcastBackend("postgresql+asyncpg://u:p@db/app")
+    backend._handler = handler
+
+    asyncio.run(backend._receive(broadcast._encode("c1", {"text": "hi"})))
+
+    engine.conn.execute.assert_not_awaited()
+    handler.assert_awaited_once_with("c1", {"text": "hi"})
@@ -0,0 +1,155 @@
+"""
+ユーザー単位のリアルタイムイベント（/ws/me で配信）
+
+新着メッセージ・既読・未読数の変化・通知の到着を、ユーザーごとのトピックへ push する。
+イベントはセッションに溜めておき、commit が成功したときだけ配信する（rollback 時は破棄）。
+crud は同期コード（スレッドプール）から呼ばれるため、配信はイベントループへ投げて待たない
+"""
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app.models.notifications import Notifications
+from app.services.realtime.connection_manager import manager
+
+_SESSION_EVENTS_KEY = "realtime_user_events"
+
+# user_id を持たない全体向け通知（運営からのお知らせ等）を配るトピック
+BROADCAST_NOTIFICATIONS_TOPIC = "notifications:all"
+
+
+def user_topic(user_id) -> str:
+    """ユーザー単位のトピック名"""
+    return f"user:{user_id}"
+
+
+def queue_user_event(db: Session, user_ids: Iterable[UUID], payload: dict) -> None:
+    """
+    commit 後に指定ユーザーへ配信するイベントを積む
+    """
+    pending = db.info.setdefault(_SESSION_EVENTS_KEY, [])
+    for user_id in user_ids:
+        if user_id is not None:
+            pending.append((user_topic(user_id), payload))
+
+
+def queue_topic_event(db: Session, topic: str, payload: dict) -> None:
+    """
+    commit 後に任意のトピックへ配信するイベントを積む
+    """
+    db.info.setdefault(_SESSION_EVENTS_KEY, []).append((topic, payload))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session) -> None:
+    pending = session.info.pop(_SESSION_EVENTS_KEY, None)
+    for topic, payload in pending or ():
+        manager.publish_threadsafe(topic, payload)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop(_SESSION_EVENTS_KEY, None)
+
+
+def message_event_payload(message) -> dict:
+    """new_message イベントのメッセージ部分"""
+    return {
+        "id": str(message.id),
+        "conversation_id": str(message.conversation_id),
+        "sender_user_id": str(message.sender_user_id) if message.sender_user_id else None,
+        "sender_admin_id": str(message.sender_admin_id) if message.sender_admin_id else None,
+        "type": message.type,
+        "body_text": message.body_text,
+        "created_at": message.created_at.isoformat() if message.created_at else None,
+    }
+
+
+def queue_new_message(db: Session, message, participants: Iterable) -> None:
+    """
+    参加者それぞれに新着メッセージと更新後の未読数を積む
+
+    participants は (user_id, unread_count) の組（apply_message_visible の RETURNING）
+    """
+    message_payload = message_event_payload(message)
+    sender_id = message.sender_user_id
+    for user_id, unread_count in participants:
+        queue_user_event(
+            db,
+            [user_id],
+            {
+                "type": "new_message",
+                "conversation_id": message_payload["conversation_id"],
+                "message": message_payload,
+                "unread_delta": 0 if user_id == sender_id else 1,
+                "unread_count": unread_count,
+            },
+        )
+
+
+def queue_read(
+    db: Session,
+    conversation_id: UUID,
+    reader_user_id: UUID,
+    message_id: UUID,
+    unread_count: int,
+    other_user_ids: Iterable[UUID],
+) -> None:
+    """
+    既読時: 本人には未読数の更新、相手には既読通知を積む
+    """
+    queue_user_event(
+        db,
+        [reader_user_id],
+        {
+            "type": "unread",
+            "conversation_id": str(conversation_id),
+            "unread_count": unread_count,
+        },
+    )
+    queue_user_event(
+        db,
+        other_user_ids,
+        {
+            "type": "read_receipt",
+            "conversation_id": str(conversation_id),
+            "user_id": str(reader_user_id),
+            "message_id": str(message_id),
+        },
+    )
+
+
+def notification_event_payload(notification) -> dict:
+    # flush 中に呼ばれるため、未ロードの属性（server_default 等）を読みに行かない
+    created_at = inspect(notification).dict.get("created_at")
+    return {
+        "type": "notification",
+        "notification": {
+            "id": str(notification.id),
+            "type": notification.type,
+            "payload": notification.payload,
+            "target_role": notification.target_role,
+            "created_at": created_at.isoformat() if created_at else None,
+        },
+    }
+
+
+def queue_notification(db: Optional[Session], notification) -> None:
+    """
+    通知の到着を積む（user_id が無い全体向け通知は全ユーザーのトピックへ）
+    """
+    if db is None:
+        return
+    payload = notification_event_payload(notification)
+    if notification.user_id is None:
+        queue_topic_event(db, BROADCAST_NOTIFICATIONS_TOPIC, payload)
+    else:
+        queue_user_event(db, [notification.user_id], payload)
+
+
+@event.listens_for(Notifications, "after_insert")
+def _on_notification_insert(mapper, connection, target) -> None:
+    # 通知の作成箇所は多数あるため、INSERT 時にまとめて拾う
+    queue_notification(object_session(target), target)
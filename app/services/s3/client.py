@@ -1,9 +1,10 @@
 # app/services/s3/client.py
 import os
+import threading
 from functools import lru_cache
 import boto3
 from botocore.config import Config
-from typing import Literal
+from typing import Any, Dict, Literal, Optional, Tuple
 from app.core.logger import Logger
 
 logger = Logger.get_logger()
@@ -66,6 +67,58 @@ ECS_SECURITY_GROUPS = (
 ECS_ASSIGN_PUBLIC_IP = os.environ.get("ECS_ASSIGN_PUBLIC_IP", "ENABLED")
 
 
+# boto3 クライアントのプロセス内キャッシュ（service, region, config, その他引数 ごと）
+# クライアント生成は数ms + 大量のアロケーションを伴うため、呼び出しごとに作らず使い回す。
+# 生成済みクライアントはスレッドセーフだが、生成に使うデフォルトセッションはそうではないためロックで保護する
+_CLIENTS: Dict[Tuple, Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+S3_CONFIG = Config(signature_version="s3v4")
+S3_ACCELERATE_CONFIG = Config(
+    signature_version="s3v4", s3={"use_accelerate_endpoint": True}
+)
+
+
+def _config_key(config: Optional[Config]) -> Optional[Tuple]:
+    if config is None:
+        return None
+    return tuple(sorted((k, repr(v)) for k, v in config._user_provided_options.items()))
+
+
+def get_client(
+    service: str,
+    region_name: Optional[str] = AWS_REGION,
+    config: Optional[Config] = None,
+    **kwargs,
+):
+    """
+    boto3 クライアントを取得（同じ引数なら同じインスタンスを返す）
+
+    Args:
+        service: サービス名（"s3", "ecs" など）
+        region_name: リージョン
+        config: botocore Config
+        **kwargs: boto3.client へのその他の引数（endpoint_url, 認証情報など）
+    """
+    key = (
+        service,
+        region_name,
+        _config_key(config),
+        tuple(sorted((k, v) for k, v in kwargs.items())),
+    )
+    client = _CLIENTS.get(key)
+    if client is not None:
+        return client
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = boto3.client(
+                service, region_name=region_name, config=config, **kwargs
+            )
+            _CLIENTS[key] = client
+    return client
+
+
 def s3_client(is_use_accelerate_endpoint: bool = False):
     """S3クライアントを取得
 
@@ -73,31 +126,15 @@ def s3_client(is_use_accelerate_endpoint: bool = False):
         boto3.client: S3クライアント
     """
     if is_use_accelerate_endpoint:
-        return boto3.client(
-            "s3",
-            region_name=AWS_REGION,
-            config=Config(
-                signature_version="s3v4", s3={"use_accelerate_endpoint": True}
-            ),
-        )
-    return boto3.client(
-        "s3",
-        region_name=AWS_REGION,
-        config=Config(signature_version="s3v4"),
-    )
+        return get_client("s3", config=S3_ACCELERATE_CONFIG)
+    return get_client("s3", config=S3_CONFIG)
 
 
 def ecs_client():
-    return boto3.client(
-        "ecs",
-        region_name=AWS_REGION,
-    )
+    return get_client("ecs")
 
 def scheduler_client():
-    return boto3.client(
-        "scheduler",
-        region_name=AWS_REGION,
-    )
+    return get_client("scheduler")
 
 
 def _bucket_and_kms(resource: Resource):
@@ -130,10 +167,7 @@ def bucket_exit_check(resource: Resource, key: str):
 
 
 def sms_client():
-    return boto3.client(
-        "sns",
-        region_name=AWS_REGION,
-    )
+    return get_client("sns")
 
 
 def delete_hls_directory(bucket: str, m3u8_key: str):
@@ -353,6 +387,6 @@ def upload_ogp_image_to_s3(s3_key: str, image_data: bytes) -> str:
 
 @lru_cache(maxsize=1)
 def s3_client_for_mc():
-    base = boto3.client("mediaconvert", region_name=AWS_REGION)
+    base = get_client("mediaconvert")
     ep = base.describe_endpoints(MaxResults=1)["Endpoints"][0]["Url"]
-    return boto3.client("mediaconvert", region_name=AWS_REGION, endpoint_url=ep)
+    return get_client("mediaconvert", endpoint_url=ep)
@@ -43,6 +43,14 @@ def _is_supported_magic(img_bytes: bytes) -> bool:
     # HEICはpillow-heifが開ける場合があるので厳密魔法は省略
     return False
 
+# 1080w 派生の横幅
+_VARIANT_WIDTH = 1080
+# 縮小時、LANCZOS の前に整数倍の縮小（reduce）を行う倍率の目安
+_REDUCING_GAP = 3.0
+# 全面ぼかしを縮小画像で行う際、縮小後のぼかし半径がこれを下回らない範囲で縮小する
+_MIN_REDUCED_BLUR_RADIUS = 2
+
+
 def _sanitize_and_variants(
     img_bytes: bytes,
     *,
@@ -56,15 +64,20 @@ def _sanitize_and_variants(
         "1080w.webp":      (bytes, "image/webp"),
         "blurred.webp":    (bytes, "image/webp"),
       }
+
+    デコードは 1 回だけ行い、派生画像はすべてデコード済みの画像から作る（画像全体のコピーを作らない）。
+    original.jpg / blurred.webp は原寸のため縮小デコード（draft）は使わない
     """
     try:
         im = Image.open(io.BytesIO(img_bytes))
+        im.load()
     except Exception:
         raise HTTPException(400, "Unsupported or corrupted image")
 
     # EXIFに基づく自動回転 + sRGB化（簡易）
-    im = ImageOps.exif_transpose(im)
-    im = im.convert("RGB")
+    ImageOps.exif_transpose(im, in_place=True)
+    if im.mode != "RGB":
+        im = im.convert("RGB")
 
     # original（再保存JPEG：EXIF除去・圧縮最適化）
     out_original = io.BytesIO()
@@ -72,41 +85,47 @@ def _sanitize_and_variants(
     original_bytes = out_original.getvalue()
 
     # 1080w（横1080px基準のWebP）
-    w_target = 1080
-    im_1080 = im.copy()
-    if im_1080.width > w_target:
-        h = int(im_1080.height * (w_target / im_1080.width))
-        im_1080 = im_1080.resize((w_target, h), Image.LANCZOS)
+    im_1080 = im
+    if im.width > _VARIANT_WIDTH:
+        h = int(im.height * (_VARIANT_WIDTH / im.width))
+        im_1080 = im.resize((_VARIANT_WIDTH, h), Image.LANCZOS, reducing_gap=_REDUCING_GAP)
     out_1080 = io.BytesIO()
     im_1080.save(out_1080, format="WEBP", quality=78, method=6)
     w1080_bytes = out_1080.getvalue()
-
-    # thumb（256pxサムネWebP）
-    im_t = im.copy()
-    im_t.thumbnail((256, 256), Image.LANCZOS)
-    out_thumb = io.BytesIO()
-    im_t.save(out_thumb, format="WEBP", quality=75, method=6)
-    thumb_bytes = out_thumb.getvalue()
+    del im_1080
 
     # ★ ぼかし（全面 or 指定領域）
-    im_blurred = _apply_blur(im, boxes=blur_boxes, radius=blur_radius)
+    if blur_boxes:
+        im_blurred = _apply_blur(im, boxes=blur_boxes, radius=blur_radius)
+    else:
+        im_blurred = _apply_reduced_blur(im, radius=blur_radius)
     out_blurred = io.BytesIO()
     im_blurred.save(out_blurred, format="WEBP", quality=80, method=6)
     blurred_bytes = out_blurred.getvalue()
 
-    # ぼかし版サムネ
-    im_blurred_t = im_blurred.copy()
-    im_blurred_t.thumbnail((256, 256), Image.LANCZOS)
-    out_blurred_thumb = io.BytesIO()
-    im_blurred_t.save(out_blurred_thumb, format="WEBP", quality=80, method=6)
-    blurred_thumb_bytes = out_blurred_thumb.getvalue()
-
     return {
         "original.jpg":        (original_bytes, "image/jpeg"),
         "1080w.webp":          (w1080_bytes,   "image/webp"),
         "blurred.webp":        (blurred_bytes,  "image/webp"),
     }
 
+def _apply_reduced_blur(im: Image.Image, radius: int = 15) -> Image.Image:
+    """
+    画像全体のガウスぼかしを縮小画像で行い、元のサイズに戻す
+
+    強いぼかしは高周波成分を残さないため、縮小してからぼかしても見た目はほぼ変わらない
+    （原寸でぼかすより計算量・メモリが縮小率の 2 乗で減る）
+    """
+    from PIL import ImageFilter
+
+    factor = max(int(radius // _MIN_REDUCED_BLUR_RADIUS), 1)
+    factor = min(factor, im.width, im.height)
+    if factor <= 1:
+        return im.filter(ImageFilter.GaussianBlur(radius=radius))
+
+    reduced = im.reduce(factor).filter(ImageFilter.GaussianBlur(radius=radius / factor))
+    return reduced.resize(im.size, Image.BILINEAR)
+
 def _moderation_check(img_bytes: bytes, min_conf: float = 80.0) -> Dict:
     """
     任意: 不適切判定。NGなら {'flagged': True, 'labels': [...]} を返す。
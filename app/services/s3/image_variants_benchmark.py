@@ -0,0 +1,134 @@
+"""
+画像派生生成（_sanitize_and_variants）のベンチマーク
+
+変更前の実装（原寸のコピー 3 回・原寸ぼかし・未使用サムネ生成）と現在の実装を比較する。
+各実装は別プロセスで実行し、処理時間・ピーク RSS・出力のサイズと形式を出力する。
+
+    python -m app.services.s3.image_variants_benchmark [画像ファイル ...] [--repeat N]
+
+画像を指定しない場合は 40MP 相当（7728x5152）のテスト画像を生成して使う。
+"""
+import argparse
+import io
+import multiprocessing
+import resource
+import sys
+import time
+from typing import Dict, Tuple
+
+from PIL import Image, ImageFilter, ImageOps
+
+from app.services.s3.image_screening import _apply_blur, _sanitize_and_variants
+
+
+def _legacy_sanitize_and_variants(img_bytes: bytes) -> Dict[str, Tuple[bytes, str]]:
+    """変更前の実装（比較用）"""
+    im = Image.open(io.BytesIO(img_bytes))
+    im = ImageOps.exif_transpose(im)
+    im = im.convert("RGB")
+
+    out_original = io.BytesIO()
+    im.save(out_original, format="JPEG", quality=85, optimize=True)
+
+    im_1080 = im.copy()
+    if im_1080.width > 1080:
+        h = int(im_1080.height * (1080 / im_1080.width))
+        im_1080 = im_1080.resize((1080, h), Image.LANCZOS)
+    out_1080 = io.BytesIO()
+    im_1080.save(out_1080, format="WEBP", quality=78, method=6)
+
+    im_t = im.copy()
+    im_t.thumbnail((256, 256), Image.LANCZOS)
+    im_t.save(io.BytesIO(), format="WEBP", quality=75, method=6)
+
+    im_blurred = _apply_blur(im, radius=15)
+    out_blurred = io.BytesIO()
+    im_blurred.save(out_blurred, format="WEBP", quality=80, method=6)
+
+    im_blurred_t = im_blurred.copy()
+    im_blurred_t.thumbnail((256, 256), Image.LANCZOS)
+    im_blurred_t.save(io.BytesIO(), format="WEBP", quality=80, method=6)
+
+    return {
+        "original.jpg": (out_original.getvalue(), "image/jpeg"),
+        "1080w.webp": (out_1080.getvalue(), "image/webp"),
+        "blurred.webp": (out_blurred.getvalue(), "image/webp"),
+    }
+
+
+_IMPLEMENTATIONS = {
+    "legacy": _legacy_sanitize_and_variants,
+    "current": _sanitize_and_variants,
+}
+
+
+def _run(name: str, img_bytes: bytes, repeat: int, queue) -> None:
+    func = _IMPLEMENTATIONS[name]
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        variants = func(img_bytes)
+        elapsed.append(time.perf_counter() - start)
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    outputs = {
+        filename: (Image.open(io.BytesIO(data)).format, Image.open(io.BytesIO(data)).size, ctype)
+        for filename, (data, ctype) in variants.items()
+    }
+    blurred = Image.open(io.BytesIO(variants["blurred.webp"][0])).convert("RGB")
+    queue.put(
+        (
+            min(elapsed),
+            max_rss_kb,
+            outputs,
+            blurred.resize((256, int(256 * blurred.height / blurred.width))).tobytes(),
+        )
+    )
+
+
+def _measure(name: str, img_bytes: bytes, repeat: int):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run, args=(name, img_bytes, repeat, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def _sample_image(width: int = 7728, height: int = 5152) -> bytes:
+    """ノイズとグラデーションを含む JPEG（カメラ写真相当の圧縮率になるように）"""
+    im = Image.effect_noise((width // 4, height // 4), 60).convert("RGB")
+    im = im.resize((width, height), Image.BICUBIC).filter(ImageFilter.SMOOTH)
+    gradient = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    im = Image.blend(im, gradient, 0.5)
+    out = io.BytesIO()
+    im.save(out, format="JPEG", quality=92)
+    return out.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("images", nargs="*")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    inputs = [(path, open(path, "rb").read()) for path in args.images] or [
+        ("sample 7728x5152", _sample_image())
+    ]
+    for label, img_bytes in inputs:
+        print(f"== {label} ({len(img_bytes) / 1e6:.1f} MB)")
+        results = {name: _measure(name, img_bytes, args.repeat) for name in _IMPLEMENTATIONS}
+        for name, (elapsed, max_rss_kb, outputs, _preview) in results.items():
+            print(f"{name:>8}: {elapsed:.2f}s  peak RSS {max_rss_kb / 1024:.0f} MB")
+        legacy_outputs, current_outputs = results["legacy"][2], results["current"][2]
+        for filename in legacy_outputs:
+            mark = "ok" if legacy_outputs[filename] == current_outputs.get(filename) else "MISMATCH"
+            print(f"  {filename}: {current_outputs.get(filename)} [{mark}]")
+        diff = [
+            abs(a - b) for a, b in zip(results["legacy"][3], results["current"][3])
+        ]
+        print(f"  blurred.webp mean abs diff (256px preview): {sum(diff) / len(diff):.2f}/255")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
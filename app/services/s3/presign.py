@@ -1,7 +1,11 @@
 # app/services/s3/presign.py
-from typing import Literal, Optional, Union, List
-import boto3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Literal, Optional, Tuple, Union, List
 from .client import (
+    get_client,
     s3_client,
     INGEST_BUCKET,
     KMS_ALIAS_INGEST,
@@ -15,18 +19,144 @@ from .client import (
     KMS_ALIAS_MESSAGE_ASSETS,
 )
 from app.schemas.video_temp import CompletedPart
+from app.core.config import settings
+from app.core.logger import Logger
+
+logger = Logger.get_logger()
 
 Resource = Literal["ingest", "identity", "public", "media", "temp-video", "message-assets"]
 
-# KMSクライアント（キャッシュ）
-_kms_client = None
+class PresignUrlCache:
+    """
+    署名付きGET URLのキャッシュ（有効期限の安全マージン手前まで同じURLを返す）
+
+    プロセス内は上限付きLRU。shared（redis-py 互換の get/set(ex=) を持つクライアント）を
+    渡すと複数プロセス間でも共有し、ローカルに無いときだけ参照する
+    """
+
+    def __init__(self, max_entries: int, safety_margin_sec: int, shared: Any = None):
+        self.max_entries = max_entries
+        self.safety_margin_sec = safety_margin_sec
+        self.shared = shared
+        self._entries: "OrderedDict[Tuple, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _shared_key(cache_key: Tuple) -> str:
+        return "presign:" + "|".join("" if part is None else str(part) for part in cache_key)
+
+    def get(self, cache_key: Tuple) -> Optional[Tuple[str, int]]:
+        """
+        (URL, 残り有効秒数) を返す（無い/期限が近い場合は None）
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                url, expires_at = entry
+                if expires_at - self.safety_margin_sec > now:
+                    self._entries.move_to_end(cache_key)
+                    return url, int(expires_at - now)
+                del self._entries[cache_key]
+
+        if self.shared is None:
+            return None
+        try:
+            raw = self.shared.get(self._shared_key(cache_key))
+        except Exception as e:
+            logger.warning(f"Presign cache backend get failed: {e}")
+            return None
+        if not raw:
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode()
+        expires_at_str, url = raw.split(" ", 1)
+        expires_at = float(expires_at_str)
+        if expires_at - self.safety_margin_sec <= now:
+            return None
+        self._store_local(cache_key, url, expires_at)
+        return url, int(expires_at - now)
+
+    def set(self, cache_key: Tuple, url: str, expires_at: float) -> None:
+        ttl = int(expires_at - self.safety_margin_sec - time.time())
+        if ttl <= 0:
+            return
+        self._store_local(cache_key, url, expires_at)
+        if self.shared is not None:
+            try:
+                self.shared.set(self._shared_key(cache_key), f"{expires_at} {url}", ex=ttl)
+            except Exception as e:
+                logger.warning(f"Presign cache backend set failed: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _store_local(self, cache_key: Tuple, url: str, expires_at: float) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[cache_key] = (url, expires_at)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _build_shared_backend():
+    if not settings.PRESIGN_CACHE_REDIS_URL:
+        return None
+    try:
+        import redis  # 任意依存（共有キャッシュを使う場合のみ必要）
+    except ImportError:
+        logger.warning("PRESIGN_CACHE_REDIS_URL is set but redis is not installed; using local cache only")
+        return None
+    return redis.Redis.from_url(settings.PRESIGN_CACHE_REDIS_URL, socket_timeout=0.2)
+
+
+_presign_cache = PresignUrlCache(
+    max_entries=settings.PRESIGN_CACHE_MAX_ENTRIES,
+    safety_margin_sec=settings.PRESIGN_CACHE_SAFETY_MARGIN_SEC,
+    shared=_build_shared_backend(),
+)
+
+
+def _url_expires_at(client, expires_in: int) -> float:
+    """
+    署名したURLが実際に失効する時刻
+
+    一時認証情報（タスクロール等）で署名したURLは認証情報の失効時刻で無効になるため、
+    expires_in と認証情報の期限の早い方をとる
+    """
+    expires_at = time.time() + expires_in
+    credentials = getattr(getattr(client, "_request_signer", None), "_credentials", None)
+    credential_expiry = getattr(credentials, "_expiry_time", None)
+    if isinstance(credential_expiry, datetime):
+        if credential_expiry.tzinfo is None:
+            credential_expiry = credential_expiry.replace(tzinfo=timezone.utc)
+        expires_at = min(expires_at, credential_expiry.timestamp())
+    return expires_at
+
+
+def _cached_presigned_get(
+    client,
+    cache_key: Tuple,
+    params: dict,
+    expires_in: int,
+) -> Tuple[str, int]:
+    """
+    キャッシュがあればそれを、無ければ署名してキャッシュしたURLを返す（URL, 残り有効秒数）
+    """
+    cached = _presign_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    url = client.generate_presigned_url("get_object", Params=params, ExpiresIn=expires_in)
+    _presign_cache.set(cache_key, url, _url_expires_at(client, expires_in))
+    return url, expires_in
+
 
 def _get_kms_client():
-    """KMSクライアントを取得（シングルトン）"""
-    global _kms_client
-    if _kms_client is None:
-        _kms_client = boto3.client('kms')
-    return _kms_client
+    """KMSクライアントを取得（プロセス内で共有）"""
+    return get_client("kms", region_name=None)
 
 def _resolve_kms_key_arn(key_id: str) -> str:
     """
@@ -123,7 +253,8 @@ def presign_get(
     inline: bool = True,
     content_type: str | None = None,
 ) -> dict:
-    bucket, _alias = _bucket_and_kms(resource)
+    # KMS を持たないリソース（temp-video / public）はバケット名だけが返るため get_bucket_name を使う
+    bucket = get_bucket_name(resource)
     client = s3_client()
 
     params = {"Bucket": bucket, "Key": key}
@@ -136,12 +267,41 @@ def presign_get(
         dispo = "inline" if inline else "attachment"
         params["ResponseContentDisposition"] = f'{dispo}; filename="{filename}"'
 
-    url = client.generate_presigned_url(
-        "get_object",
-        Params=params,
-        ExpiresIn=expires_in
+    url, remaining = _cached_presigned_get(
+        client,
+        (resource, key, params.get("ResponseContentDisposition"), content_type, expires_in),
+        params,
+        expires_in,
     )
-    return {"download_url": url, "expires_in": expires_in}
+    return {"download_url": url, "expires_in": remaining}
+
+def presign_get_many(
+    resource: Resource,
+    keys: Iterable[str],
+    expires_in: int = 43200,
+) -> Dict[str, str]:
+    """
+    複数キーの署名付きGET URLをまとめて生成する
+
+    署名はローカル計算のみのため、1つのクライアントで全キーを署名する（重複キーは1回だけ、
+    キャッシュ済みのキーは署名しない）
+
+    Returns:
+        dict: {key: 署名付きURL}
+    """
+    bucket = get_bucket_name(resource)
+    client = s3_client()
+    urls: Dict[str, str] = {}
+    for key in keys:
+        if not key or key in urls:
+            continue
+        urls[key], _remaining = _cached_presigned_get(
+            client,
+            (resource, key, None, None, expires_in),
+            {"Bucket": bucket, "Key": key},
+            expires_in,
+        )
+    return urls
 
 def presign_put_public(
     resource: Resource,
@@ -281,15 +441,17 @@ def presign_get_temp_video(
     # インライン表示（ダウンロードではなくブラウザで再生）
     params["ResponseContentDisposition"] = "inline"
 
-    url = client.generate_presigned_url(
-        "get_object",
-        Params=params,
-        ExpiresIn=expires_in
+    # アクセラレートエンドポイントのURLは通常のURLと別に扱う
+    url, remaining = _cached_presigned_get(
+        client,
+        (f"{resource}:accelerate", key, "inline", content_type, expires_in),
+        params,
+        expires_in,
     )
 
     return {
         "download_url": url,
-        "expires_in": expires_in
+        "expires_in": remaining
     }
 
 
@@ -0,0 +1,65 @@
+import pytest
+from unittest.mock import MagicMock
+
+import app.services.s3.presign as presign
+
+
+@pytest.fixture
+def s3_mock(monkeypatch):
+    client = MagicMock(name="S3ClientMock")
+    client.generate_presigned_url.side_effect = (
+        lambda method, Params, ExpiresIn: f"https://{Params['Bucket']}/{Params['Key']}?sig"
+    )
+    monkeypatch.setattr(presign, "s3_client", lambda is_use_accelerate_endpoint=False: client)
+    monkeypatch.setattr(presign, "TEMP_VIDEO_BUCKET_NAME", "temp-bucket")
+    monkeypatch.setattr(presign, "MEDIA_BUCKET_NAME", "media-bucket")
+    monkeypatch.setattr(presign, "KMS_ALIAS_MEDIA", "alias/media")
+    presign._presign_cache.clear()
+    yield client
+    presign._presign_cache.clear()
+
+
+def test_presign_get_temp_video(s3_mock):
+    # temp-video は KMS を持たない（バケット名だけのリソース）
+    result = presign.presign_get("temp-video", "temp-videos/u1/a.mp4", expires_in=600)
+    assert result == {"download_url": "https://temp-bucket/temp-videos/u1/a.mp4?sig", "expires_in": 600}
+
+
+def test_presign_get_media(s3_mock):
+    result = presign.presign_get("media", "a/b.jpg", filename="b.jpg", inline=False)
+    assert result["download_url"] == "https://media-bucket/a/b.jpg?sig"
+    params = s3_mock.generate_presigned_url.call_args.kwargs["Params"]
+    assert params["ResponseContentDisposition"] == 'attachment; filename="b.jpg"'
+
+
+def test_presign_get_uses_cache(s3_mock):
+    first = presign.presign_get("media", "a/b.jpg")
+    second = presign.presign_get("media", "a/b.jpg")
+    assert first["download_url"] == second["download_url"]
+    assert s3_mock.generate_presigned_url.call_count == 1
+
+
+def test_presign_get_many_signs_each_key_once(s3_mock):
+    urls = presign.presign_get_many("temp-video", ["k1", "k2", "k1", "", None])
+    assert urls == {"k1": "https://temp-bucket/k1?sig", "k2": "https://temp-bucket/k2?sig"}
+    assert s3_mock.generate_presigned_url.call_count == 2
+
+
+def test_presign_url_cache_expires_with_margin(monkeypatch):
+    cache = presign.PresignUrlCache(max_entries=2, safety_margin_sec=60)
+    now = 1_000_000.0
+    monkeypatch.setattr(presign.time, "time", lambda: now)
+    cache.set(("k",), "url", now + 3600)
+    assert cache.get(("k",)) == ("url", 3600)
+
+    now += 3600 - 60
+    assert cache.get(("k",)) is None
+
+
+def test_presign_url_cache_evicts_oldest(monkeypatch):
+    cache = presign.PresignUrlCache(max_entries=2, safety_margin_sec=0)
+    monkeypatch.setattr(presign.time, "time", lambda: 0.0)
+    for key in ("a", "b", "c"):
+        cache.set((key,), key, 100)
+    assert cache.get(("a",)) is None
+    assert cache.get(("c",)) == ("c", 100)
@@ -1,8 +1,9 @@
 import json
 import os
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from uuid import UUID
-from pywebpush import WebPushException, webpush
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from models.notifications import Notifications
 from models.user import Users
@@ -10,6 +11,7 @@ from models.push_notifications import PushNotifications
 from common.logger import Logger
 from common.db_session import get_db
 from common.email_service import EmailService
+from common.web_push import WebPushSender, WebPushSubscription
 from pathlib import Path
 
 class AdminNotification:
@@ -18,12 +20,16 @@ class AdminNotification:
         self.logger = logger
         self.db: Session = next(get_db())
         self.email_service = EmailService(Path(__file__).parent / "mailtemplates")
-        self.thread_pool = []
         self.notification_id = os.environ.get(
             "NOTIFICATION_ID", "cdf0b860-4680-4981-962b-70060110a640"
         )
         self.frontend_url = os.environ.get("FRONTEND_URL", "http://192.168.1.6:3002")
-        self.webpush_private_key = os.environ.get("VAPID_PRIVATE_KEY")
+        self.email_concurrency = int(os.environ.get("EMAIL_CONCURRENCY", "16"))
+        self.web_push_sender = WebPushSender(
+            logger,
+            os.environ.get("VAPID_PRIVATE_KEY"),
+            concurrency=int(os.environ.get("WEB_PUSH_CONCURRENCY", "32")),
+        )
 
     def _exec(self):
         self.logger.info(f"NOTIFICATION_ID {self.notification_id}")
@@ -37,15 +43,14 @@ class AdminNotification:
             self.logger.error(f"Target user not found: {self.notification_id}")
             return
 
-        for user in target_user:
-            thread = Thread(
-                target=self._send_notification_task, args=(user, notification)
-            )
-            self.thread_pool.append(thread)
-            thread.start()
-
-        for thread in self.thread_pool:
-            thread.join()
+        # メールはスレッド数を抑えて並列に送り、その間に Web Push をまとめて送る
+        # （スレッドからセッションを触らないよう、宛先と本文は先に取り出しておく）
+        message = notification.payload.get("title", "mijfans 運営からのお知らせ")
+        emails = [user.email for user in target_user]
+        with ThreadPoolExecutor(max_workers=self.email_concurrency) as executor:
+            for email in emails:
+                executor.submit(self._send_email_notification, email, message)
+            self._push_notification_to_users(notification)
         return
 
     def _get_notification(self):
@@ -68,19 +73,15 @@ class AdminNotification:
             target_user = self.db.query(Users).filter(Users.role == 2).all()
         return target_user
 
-    def _send_notification_task(self, user: Users, notification: Notifications):
-        self._send_email_notification(user, notification)
-        self._push_notification_to_user(user)
-
-    def _send_email_notification(self, user: Users, notification: Notifications):
+    def _send_email_notification(self, email: str, message: str):
         try:
             self.email_service.send_templated(
-                to=user.email,
+                to=email,
                 subject="【mijfans】運営からのお知らせ",
                 template_html="admin_notification.html",
                 ctx={
                     "brand": "mijfans",
-                    "message": notification.payload.get("title", "mijfans 運営からのお知らせ"),
+                    "message": message,
                     "notification_url": f"{self.frontend_url}/notifications?tab=system",
                     "support_email": "support@mijfans.jp",
                 },
@@ -89,43 +90,49 @@ class AdminNotification:
             self.logger.error(f"Error sending email notification to user: {e}")
             return
 
-    def _push_notification_to_user(self, user: Users):
+    def _push_notification_to_users(self, notification: Notifications):
         try:
-            title = "mijfans 運営からのお知らせ"
-            body = "mijfans 運営からのお知らせ"
-            url = f"{self.frontend_url}/notifications?tab=system"
-            push_notifications = (
+            data = json.dumps(
+                {
+                    "title": "mijfans 運営からのお知らせ",
+                    "body": "mijfans 運営からのお知らせ",
+                    "url": f"{self.frontend_url}/notifications?tab=system",
+                }
+            ).encode()
+            # 対象ユーザーの購読情報を 1 クエリで取得する
+            query = (
                 self.db.query(PushNotifications)
-                .filter(PushNotifications.user_id == user.id)
+                .join(Users, Users.id == PushNotifications.user_id)
                 .filter(PushNotifications.is_active.is_(True))
-                .all()
             )
-            for push_notification in push_notifications:
-                try:
-                    sub = {
-                        "endpoint": push_notification.endpoint,
-                        "keys": {
-                            "p256dh": push_notification.p256dh,
-                            "auth": push_notification.auth,
-                        },
-                    }
-                    webpush(
-                        subscription_info=sub,
-                        data=json.dumps(
-                            {
-                                "title": title,
-                                "body": body,
-                                "url": url,
-                            }
-                        ),
-                        vapid_private_key=self.webpush_private_key,
-                        vapid_claims={
-                            "sub": "mailto:support@mijfans.jp",
-                        },
-                    )
-                except WebPushException as e:
-                    self.logger.error(f"Error pushing notification to user: {e}")
-                    continue
+            if notification.target_role == 2:
+                query = query.filter(Users.role == 2)
+            messages = [
+                (
+                    WebPushSubscription(
+                        id=push_notification.id,
+                        endpoint=push_notification.endpoint,
+                        p256dh=push_notification.p256dh,
+                        auth=push_notification.auth,
+                    ),
+                    data,
+                )
+                for push_notification in query.all()
+            ]
+
+            expired_ids = self.web_push_sender.send(messages)
+            if expired_ids:
+                self.db.execute(
+                    update(PushNotifications)
+                    .where(PushNotifications.id.in_(expired_ids))
+                    .values(is_active=False, updated_at=datetime.now(timezone.utc))
+                    .execution_options(synchronize_session=False)
+                )
+                self.db.commit()
+            self.logger.info(
+                f"Pushed {len(messages)} notifications ({len(expired_ids)} expired subscriptions deactivated)"
+            )
         except Exception as e:
+            self.db.rollback()
             self.logger.error(f"Error pushing notification to user: {e}")
             return
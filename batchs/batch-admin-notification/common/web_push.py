@@ -0,0 +1,135 @@
+"""
+Web Push の並列送信
+
+- VAPID 鍵は 1 回だけ読み込み、署名済みの JWT は push サービスの origin（aud）ごとに使い回す
+- requests.Session の接続プールで push サービスへの接続を使い回す
+- 送信は concurrency 本のスレッドで並列に行い、失効した購読の ID を返す
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+from uuid import UUID
+
+import requests
+from py_vapid import Vapid
+from pywebpush import WebPusher, WebPushException
+from requests.adapters import HTTPAdapter
+
+# 購読が失効している（ブラウザ側で解除された等）ことを表すステータス
+_EXPIRED_STATUS_CODES = (404, 410)
+
+# 署名した JWT の有効期間と、失効のこの秒数前から再署名する
+_JWT_LIFETIME_SEC = 12 * 60 * 60
+_JWT_REFRESH_MARGIN_SEC = 60 * 60
+
+
+@dataclass(frozen=True)
+class WebPushSubscription:
+    id: UUID
+    endpoint: str
+    p256dh: str
+    auth: str
+
+
+class WebPushSender:
+    def __init__(
+        self,
+        logger,
+        vapid_private_key: Optional[str],
+        vapid_subject: str = "mailto:support@mijfans.jp",
+        concurrency: int = 32,
+        timeout_sec: float = 10,
+        ttl_sec: int = 0,
+    ):
+        self.logger = logger
+        self.vapid_private_key = vapid_private_key
+        self.vapid_subject = vapid_subject
+        self.concurrency = max(concurrency, 1)
+        self.timeout_sec = timeout_sec
+        self.ttl_sec = ttl_sec
+        self._vapid: Optional[Vapid] = None
+        self._vapid_headers: Dict[str, Tuple[dict, float]] = {}
+        self._lock = threading.Lock()
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.concurrency, pool_maxsize=self.concurrency
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def _get_vapid_headers(self, endpoint: str) -> dict:
+        url = urlparse(endpoint)
+        audience = f"{url.scheme}://{url.netloc}"
+        now = time.time()
+        with self._lock:
+            cached = self._vapid_headers.get(audience)
+            if cached is not None and cached[1] - _JWT_REFRESH_MARGIN_SEC > now:
+                return cached[0]
+            if self._vapid is None:
+                if not self.vapid_private_key:
+                    raise WebPushException("VAPID_PRIVATE_KEY is not set")
+                self._vapid = Vapid.from_string(private_key=self.vapid_private_key)
+            expires_at = int(now) + _JWT_LIFETIME_SEC
+            headers = self._vapid.sign(
+                {"sub": self.vapid_subject, "aud": audience, "exp": expires_at}
+            )
+            self._vapid_headers[audience] = (headers, expires_at)
+            return headers
+
+    def _send_one(self, subscription: WebPushSubscription, data: bytes) -> bool:
+        """1 件送信し、購読が失効していれば True を返す"""
+        try:
+            encoded = WebPusher(
+                {
+                    "endpoint": subscription.endpoint,
+                    "keys": {"p256dh": subscription.p256dh, "auth": subscription.auth},
+                }
+            ).encode(data, content_encoding="aes128gcm")
+        except WebPushException as e:
+            self.logger.error(f"Invalid push subscription {subscription.id}: {e}")
+            return True
+
+        try:
+            headers = {
+                "Content-Encoding": "aes128gcm",
+                "Content-Type": "application/octet-stream",
+                "TTL": str(self.ttl_sec),
+                **self._get_vapid_headers(subscription.endpoint),
+            }
+            response = self._session.post(
+                subscription.endpoint,
+                data=encoded["body"],
+                headers=headers,
+                timeout=self.timeout_sec,
+            )
+        except (requests.RequestException, WebPushException) as e:
+            self.logger.error(f"Error pushing notification to user: {e}")
+            return False
+
+        if response.status_code in _EXPIRED_STATUS_CODES:
+            return True
+        if response.status_code > 202:
+            self.logger.error(
+                f"Push failed for subscription {subscription.id}: {response.status_code} {response.text}"
+            )
+        return False
+
+    def send(self, messages: Sequence[Tuple[WebPushSubscription, bytes]]) -> List[UUID]:
+        """
+        まとめて並列に送信し、失効していた購読の ID を返す
+        """
+        if not messages:
+            return []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            results = list(
+                executor.map(lambda message: self._send_one(*message), messages)
+            )
+        return [
+            subscription.id
+            for (subscription, _data), expired in zip(messages, results)
+            if expired
+        ]
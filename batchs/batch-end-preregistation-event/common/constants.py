@@ -7,4 +7,10 @@ POSTGRES_DB=os.environ.get("POSTGRES_DB", "mij_db")
 POSTGRES_SERVER=os.environ.get("POSTGRES_SERVER", "localhost")
 POSTGRES_PORT=os.environ.get("POSTGRES_PORT", "5432")
 
-DATABASE_URL=f"postgresql+psycopg2://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
\ No newline at end of file
+DATABASE_URL=f"postgresql+psycopg2://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
+
+# DBコネクションプール設定（既定値は SQLAlchemy の既定と同じ）
+DB_POOL_SIZE=int(os.environ.get("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW=int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE_SEC=int(os.environ.get("DB_POOL_RECYCLE_SEC", "1800"))
+DB_STATEMENT_TIMEOUT_MS=int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", "0"))  # 0 で無効
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+S3 の並列転送
+
+- boto3 の TransferConfig（マルチパートの閾値・チャンクサイズ・パートの並列数）を調整して転送する
+- 多数のファイル（HLS セグメント等）はスレッドプールで並列にアップロードする
+- SegmentUploadWatcher で、ffmpeg の書き込み中に完成したセグメントから先にアップロードできる
+"""
+import re
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from boto3.s3.transfer import TransferConfig
+
+_MB = 1024 * 1024
+
+# HLS セグメント名（<ストリーム>__<連番>.ts）
+_SEGMENT_RE = re.compile(r"^(?P<stem>.+)__(?P<index>\d+)\.ts$")
+
+
+class S3TransferManager:
+    def __init__(
+        self,
+        client,
+        upload_concurrency: int = 16,
+        multipart_threshold_mb: int = 16,
+        multipart_chunksize_mb: int = 16,
+        max_concurrency: int = 16,
+    ):
+        """
+        Args:
+            client: boto3 の S3 クライアント（max_pool_connections は
+                upload_concurrency + max_concurrency 以上にしておく）
+            upload_concurrency: 同時にアップロードするファイル数
+            multipart_threshold_mb: この大きさ以上のファイルをマルチパートで転送する
+            multipart_chunksize_mb: マルチパートの 1 パートの大きさ
+            max_concurrency: 1 ファイルあたりのパートの並列数
+        """
+        self.client = client
+        self.config = TransferConfig(
+            multipart_threshold=max(multipart_threshold_mb, 5) * _MB,
+            multipart_chunksize=max(multipart_chunksize_mb, 5) * _MB,
+            max_concurrency=max(max_concurrency, 1),
+            use_threads=True,
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(upload_concurrency, 1),
+            thread_name_prefix="s3-upload",
+        )
+
+    def download_file(self, bucket: str, key: str, path: str) -> None:
+        """大きいファイルはレンジ GET で並列にダウンロードする"""
+        self.client.download_file(bucket, key, path, Config=self.config)
+
+    def submit_upload(
+        self, path: str, bucket: str, key: str, extra_args: Optional[dict] = None
+    ) -> Future:
+        """アップロードをスレッドプールに投入する"""
+        return self._executor.submit(
+            self.client.upload_file,
+            path,
+            bucket,
+            key,
+            ExtraArgs=extra_args or {},
+            Config=self.config,
+        )
+
+    @staticmethod
+    def wait_all(futures: Iterable[Future]) -> None:
+        """
+        すべての完了を待つ。失敗したものがあればその例外を送出する
+        """
+        futures = list(futures)
+        done, _not_done = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in done:
+            if future.exception() is not None:
+                for pending in futures:
+                    pending.cancel()
+                raise future.exception()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class SegmentUploadWatcher:
+    """
+    出力ディレクトリを監視し、書き込みが終わったセグメントから順にアップロードを投入する。
+    同じストリームでより新しい番号のセグメントが作られていれば、それより前は完成している
+    （ffmpeg の HLS muxer はセグメントを閉じてから次を開く）。
+    各ストリームの最後のセグメントとプレイリストは、エンコード終了後にまとめてアップロードする。
+    """
+
+    def __init__(self, local_dir: str, submit: Callable[[Path], Future]):
+        self.local_dir = Path(local_dir)
+        self.submit = submit
+        self.submitted: Set[str] = set()
+        self.futures: List[Future] = []
+
+    def poll(self) -> None:
+        """完成したセグメントを投入する（失敗したアップロードがあれば例外を送出する）"""
+        for future in self.futures:
+            if future.done() and future.exception() is not None:
+                raise future.exception()
+
+        streams: Dict[str, List[tuple]] = {}
+        for p in self.local_dir.glob("*.ts"):
+            m = _SEGMENT_RE.match(p.name)
+            if m:
+                streams.setdefault(m.group("stem"), []).append((int(m.group("index")), p))
+
+        for segments in streams.values():
+            segments.sort()
+            # 最後の 1 つは書き込み中の可能性がある
+            for _index, p in segments[:-1]:
+                if str(p) in self.submitted:
+                    continue
+                self.submitted.add(str(p))
+                self.futures.append(self.submit(p))
@@ -1,9 +1,12 @@
+import hashlib
 import json
 import os
 import pathlib
 import re
 import shutil
 import subprocess
+import tempfile
+import threading
 import boto3
 import requests
 import time
@@ -12,11 +15,32 @@ import glob
 import mimetypes
 import shlex
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Callable, Dict, Iterable, List, Tuple, Optional
 
-from common.logger import Logger
+from botocore.config import Config as BotoConfig
 
-s3 = boto3.client("s3")
+from common.logger import Logger
+from common.s3_transfer import S3TransferManager, SegmentUploadWatcher
+
+# S3 transfer tuning (files uploaded in parallel / multipart threshold, part size, parts in parallel)
+S3_UPLOAD_CONCURRENCY = int(os.environ.get("S3_UPLOAD_CONCURRENCY", "16"))
+S3_MULTIPART_THRESHOLD_MB = int(os.environ.get("S3_MULTIPART_THRESHOLD_MB", "16"))
+S3_MULTIPART_CHUNKSIZE_MB = int(os.environ.get("S3_MULTIPART_CHUNKSIZE_MB", "16"))
+S3_MAX_CONCURRENCY = int(os.environ.get("S3_MAX_CONCURRENCY", "16"))
+# upload finished segments while ffmpeg is still encoding
+PIPELINED_UPLOAD = os.environ.get("PIPELINED_UPLOAD", "false").lower() in ("1", "true", "yes")
+
+s3 = boto3.client(
+    "s3",
+    config=BotoConfig(max_pool_connections=S3_UPLOAD_CONCURRENCY + S3_MAX_CONCURRENCY),
+)
+transfer = S3TransferManager(
+    s3,
+    upload_concurrency=S3_UPLOAD_CONCURRENCY,
+    multipart_threshold_mb=S3_MULTIPART_THRESHOLD_MB,
+    multipart_chunksize_mb=S3_MULTIPART_CHUNKSIZE_MB,
+    max_concurrency=S3_MAX_CONCURRENCY,
+)
 logger = Logger.get_logger()
 
 EXTINF_RE = re.compile(r"^#EXTINF:([0-9.]+),\s*$")
@@ -25,13 +49,23 @@ EXTINF_RE = re.compile(r"^#EXTINF:([0-9.]+),\s*$")
 # -----------------------------
 # small utils
 # -----------------------------
-def run(cmd: List[str], capture: bool = False) -> subprocess.CompletedProcess:
+def run(
+    cmd: List[str],
+    capture: bool = False,
+    on_poll: Optional[Callable[[], None]] = None,
+    poll_interval: float = 2.0,
+) -> subprocess.CompletedProcess:
     """
     Keep behavior: raise on non-zero exit.
     Improve: always capture stdout/stderr so ECS logs show real ffmpeg errors.
+    If on_poll is given, call it every poll_interval seconds while the command runs
+    (the command is killed if on_poll raises).
     """
     logger.info("RUN: " + " ".join(shlex.quote(c) for c in cmd))
-    cp = subprocess.run(cmd, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if on_poll is None:
+        cp = subprocess.run(cmd, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    else:
+        cp = _run_polling(cmd, on_poll, poll_interval)
     if cp.returncode != 0:
         logger.error(
             f"Command failed rc={cp.returncode}\n"
@@ -44,135 +78,192 @@ def run(cmd: List[str], capture: bool = False) -> subprocess.CompletedProcess:
     return cp
 
 
+def _run_polling(
+    cmd: List[str], on_poll: Callable[[], None], poll_interval: float
+) -> subprocess.CompletedProcess:
+    proc = subprocess.Popen(cmd, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    out: dict = {}
+
+    def communicate() -> None:
+        out["stdout"], out["stderr"] = proc.communicate()
+
+    reader = threading.Thread(target=communicate, daemon=True)
+    reader.start()
+    try:
+        while reader.is_alive():
+            on_poll()
+            reader.join(poll_interval)
+    except BaseException:
+        proc.kill()
+        reader.join()
+        raise
+    return subprocess.CompletedProcess(cmd, proc.returncode, out.get("stdout"), out.get("stderr"))
+
+
 def guess_content_type(path: str) -> str:
     ct, _ = mimetypes.guess_type(path)
     return ct or "application/octet-stream"
 
 
+def submit_upload_sse_kms(
+    p: pathlib.Path, base: pathlib.Path, bucket: str, prefix: str, kms_key_arn: str
+):
+    rel = p.relative_to(base).as_posix()
+    key = f"{prefix.rstrip('/')}/{rel}"
+    return transfer.submit_upload(
+        str(p),
+        bucket,
+        key,
+        extra_args={
+            "ServerSideEncryption": "aws:kms",
+            "SSEKMSKeyId": kms_key_arn,
+            "ContentType": guess_content_type(str(p)),
+        },
+    )
+
+
 def upload_dir_sse_kms(
-    local_dir: str, bucket: str, prefix: str, kms_key_arn: str
+    local_dir: str,
+    bucket: str,
+    prefix: str,
+    kms_key_arn: str,
+    skip: Iterable[str] = (),
 ) -> None:
+    """
+    Upload every file under local_dir in parallel (files in skip were already submitted).
+    Segments go first and playlists last, so a playlist never points at a missing segment.
+    """
     base = pathlib.Path(local_dir)
-    for p in base.rglob("*"):
-        if not p.is_file():
-            continue
-        rel = p.relative_to(base).as_posix()
-        key = f"{prefix.rstrip('/')}/{rel}"
-        s3.upload_file(
-            str(p),
-            bucket,
-            key,
-            ExtraArgs={
-                "ServerSideEncryption": "aws:kms",
-                "SSEKMSKeyId": kms_key_arn,
-                "ContentType": guess_content_type(str(p)),
-            },
+    skip = set(skip)
+    files = [p for p in base.rglob("*") if p.is_file() and str(p) not in skip]
+    playlists = [p for p in files if p.suffix == ".m3u8"]
+    others = [p for p in files if p.suffix != ".m3u8"]
+    for group in (others, playlists):
+        transfer.wait_all(
+            [submit_upload_sse_kms(p, base, bucket, prefix, kms_key_arn) for p in group]
         )
 
 
 # -----------------------------
 # ffprobe helpers
 # -----------------------------
+class MediaProbe:
+    """
+    Probe a media file once (ffprobe -show_streams -show_format) and derive
+    every value (duration, size/rotation, fps, color, profile/level) from that
+    single result instead of spawning one ffprobe per field.
+    """
+
+    _cache: Dict[str, "MediaProbe"] = {}
+
+    def __init__(self, path: str):
+        self.path = path
+        cp = run(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-show_streams",
+                "-show_format",
+                "-of",
+                "json",
+                path,
+            ],
+            capture=True,
+        )
+        self.data = json.loads(cp.stdout or "{}")
+
+    @classmethod
+    def of(cls, path: str) -> "MediaProbe":
+        """Return the cached probe for path (probe on first use)."""
+        probe = cls._cache.get(path)
+        if probe is None:
+            probe = cls._cache[path] = cls(path)
+        return probe
+
+    @property
+    def format(self) -> dict:
+        return self.data.get("format") or {}
+
+    @property
+    def video(self) -> dict:
+        """First video stream (same as -select_streams v:0)."""
+        for st in self.data.get("streams") or []:
+            if st.get("codec_type") == "video":
+                return st
+        return {}
+
+    @property
+    def duration_ms(self) -> int:
+        return int(float(self.format["duration"]) * 1000)
+
+    @property
+    def video_wh(self) -> tuple[int, int]:
+        st = self.video
+        return int(st["width"]), int(st["height"])
+
+    @property
+    def video_info(self) -> tuple[int, int, int]:
+        """
+        Return (w,h,rotate) in "display orientation".
+        If rotate is 90/270, swap w/h.
+        """
+        w, h = self.video_wh
+        rotate = int(self.video.get("tags", {}).get("rotate", "0") or 0) % 360
+        if rotate in (90, 270):
+            w, h = h, w
+        return w, h, rotate
+
+    @property
+    def fps(self) -> float:
+        fr = self.video.get("avg_frame_rate", "0/1")
+        try:
+            num, den = fr.split("/")
+            den_f = float(den)
+            return float(num) / den_f if den_f != 0 else 0.0
+        except Exception:
+            return 0.0
+
+    @property
+    def color_info(self) -> dict:
+        """
+        Return pix_fmt + color metadata (when available).
+        """
+        st = self.video
+        return {
+            "pix_fmt": (st.get("pix_fmt") or "").strip(),
+            "color_transfer": (st.get("color_transfer") or "").strip(),
+            "color_primaries": (st.get("color_primaries") or "").strip(),
+            "color_space": (st.get("color_space") or "").strip(),
+            "color_range": (st.get("color_range") or "").strip(),
+        }
+
+    @property
+    def h264_profile_level(self) -> tuple[str, float]:
+        st = self.video
+        profile = (st.get("profile") or "").strip()
+        level_raw = st.get("level", 0)  # 30, 40, 42...
+        try:
+            level = float(level_raw) / 10.0
+        except Exception:
+            level = 0.0
+        return profile, level
+
+
 def ffprobe_duration_ms(path: str) -> int:
-    cp = run(
-        [
-            "ffprobe",
-            "-v",
-            "error",
-            "-show_entries",
-            "format=duration",
-            "-of",
-            "json",
-            path,
-        ],
-        capture=True,
-    )
-    dur = float(json.loads(cp.stdout)["format"]["duration"])
-    return int(dur * 1000)
+    return MediaProbe.of(path).duration_ms
 
 
 def ffprobe_video_info(path: str) -> tuple[int, int, int]:
-    """
-    Return (w,h,rotate) in "display orientation".
-    If rotate is 90/270, swap w/h.
-    """
-    cp = run(
-        [
-            "ffprobe",
-            "-v",
-            "error",
-            "-select_streams",
-            "v:0",
-            "-show_entries",
-            "stream=width,height:stream_tags=rotate",
-            "-of",
-            "json",
-            path,
-        ],
-        capture=True,
-    )
-    st = json.loads(cp.stdout)["streams"][0]
-    w = int(st["width"])
-    h = int(st["height"])
-    rotate = int(st.get("tags", {}).get("rotate", "0") or 0) % 360
-    if rotate in (90, 270):
-        w, h = h, w
-    return w, h, rotate
+    return MediaProbe.of(path).video_info
 
 
 def ffprobe_fps(path: str) -> float:
-    cp = run(
-        [
-            "ffprobe",
-            "-v",
-            "error",
-            "-select_streams",
-            "v:0",
-            "-show_entries",
-            "stream=avg_frame_rate",
-            "-of",
-            "json",
-            path,
-        ],
-        capture=True,
-    )
-    st = json.loads(cp.stdout)["streams"][0]
-    fr = st.get("avg_frame_rate", "0/1")
-    try:
-        num, den = fr.split("/")
-        den_f = float(den)
-        return float(num) / den_f if den_f != 0 else 0.0
-    except Exception:
-        return 0.0
+    return MediaProbe.of(path).fps
 
 
 def ffprobe_color_info(path: str) -> dict:
-    """
-    Return pix_fmt + color metadata (when available).
-    """
-    cp = run(
-        [
-            "ffprobe",
-            "-v",
-            "error",
-            "-select_streams",
-            "v:0",
-            "-show_entries",
-            "stream=pix_fmt,color_transfer,color_primaries,color_space,color_range",
-            "-of",
-            "json",
-            path,
-        ],
-        capture=True,
-    )
-    st = json.loads(cp.stdout).get("streams", [{}])[0] or {}
-    return {
-        "pix_fmt": (st.get("pix_fmt") or "").strip(),
-        "color_transfer": (st.get("color_transfer") or "").strip(),
-        "color_primaries": (st.get("color_primaries") or "").strip(),
-        "color_space": (st.get("color_space") or "").strip(),
-        "color_range": (st.get("color_range") or "").strip(),
-    }
+    return MediaProbe.of(path).color_info
 
 
 def is_hdr_colorinfo(ci: dict) -> bool:
@@ -195,46 +286,74 @@ def is_hdr_colorinfo(ci: dict) -> bool:
     return False
 
 
+_ffmpeg_filters: Optional[frozenset] = None
+
+
+def _ffmpeg_filters_cache_path() -> Optional[Path]:
+    """
+    Cache file keyed by the ffmpeg binary (path/size/mtime), so the result is
+    reused as long as the container image (ffmpeg build) stays the same.
+    """
+    binary = shutil.which("ffmpeg")
+    if not binary:
+        return None
+    real = os.path.realpath(binary)
+    st = os.stat(real)
+    key = hashlib.sha1(f"{real}:{st.st_size}:{st.st_mtime_ns}".encode()).hexdigest()[:16]
+    cache_dir = os.environ.get("FFMPEG_CAPS_CACHE_DIR") or tempfile.gettempdir()
+    return Path(cache_dir) / f"ffmpeg-filters-{key}.json"
+
+
+def ffmpeg_filters() -> frozenset:
+    """
+    Names of filters available in the current ffmpeg binary.
+    Detected once per ffmpeg build (file cache) and once per process (memory).
+    """
+    global _ffmpeg_filters
+    if _ffmpeg_filters is not None:
+        return _ffmpeg_filters
+
+    cache_path = _ffmpeg_filters_cache_path()
+    if cache_path and cache_path.is_file():
+        try:
+            _ffmpeg_filters = frozenset(json.loads(cache_path.read_text()))
+            return _ffmpeg_filters
+        except Exception:
+            logger.warning(f"Ignoring broken ffmpeg capability cache: {cache_path}")
+
+    cp = run(["ffmpeg", "-hide_banner", "-filters"], capture=True)
+    names = set()
+    for line in ((cp.stdout or "") + "\n" + (cp.stderr or "")).splitlines():
+        # lines look like: " ... zscale            V->V       Apply resizing..."
+        parts = line.split()
+        if len(parts) >= 3 and "->" in parts[2]:
+            names.add(parts[1])
+    _ffmpeg_filters = frozenset(names)
+
+    if cache_path:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(sorted(_ffmpeg_filters)))
+            os.replace(tmp, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write ffmpeg capability cache {cache_path}: {e}")
+    return _ffmpeg_filters
+
+
 def ffmpeg_has_filters(filters: List[str]) -> bool:
     """
     Check if current ffmpeg binary has needed filters (zscale/tonemap).
     """
     try:
-        cp = run(["ffmpeg", "-hide_banner", "-filters"], capture=True)
-        txt = (cp.stdout or "") + "\n" + (cp.stderr or "")
-        # lines look like: " ... zscale  V->V ..."
-        for f in filters:
-            if f not in txt:
-                return False
-        return True
+        available = ffmpeg_filters()
+        return all(f in available for f in filters)
     except Exception:
         return False
 
 
 def ffprobe_h264_profile_level(path: str) -> tuple[str, float]:
-    cp = run(
-        [
-            "ffprobe",
-            "-v",
-            "error",
-            "-select_streams",
-            "v:0",
-            "-show_entries",
-            "stream=profile,level",
-            "-of",
-            "json",
-            path,
-        ],
-        capture=True,
-    )
-    st = json.loads(cp.stdout)["streams"][0]
-    profile = (st.get("profile") or "").strip()
-    level_raw = st.get("level", 0)  # 30, 40, 42...
-    try:
-        level = float(level_raw) / 10.0
-    except Exception:
-        level = 0.0
-    return profile, level
+    return MediaProbe.of(path).h264_profile_level
 
 
 def avc1_from_profile_level(profile: str, level: float) -> str:
@@ -252,26 +371,6 @@ def avc1_from_profile_level(profile: str, level: float) -> str:
     return f"avc1.{profile_idc:02x}{constraints:02x}{level_idc:02x}"
 
 
-def ffprobe_video_wh(path: str) -> tuple[int, int]:
-    cp = run(
-        [
-            "ffprobe",
-            "-v",
-            "error",
-            "-select_streams",
-            "v:0",
-            "-show_entries",
-            "stream=width,height",
-            "-of",
-            "json",
-            path,
-        ],
-        capture=True,
-    )
-    st = json.loads(cp.stdout)["streams"][0]
-    return int(st["width"]), int(st["height"])
-
-
 # -----------------------------
 # HLS playlist helpers
 # -----------------------------
@@ -525,15 +624,6 @@ def first_segment_path(
     return segs[0] if segs else None
 
 
-def first_segment_wh(
-    out_dir: str, rid: str, label: str, encode_run_id: str
-) -> tuple[int, int]:
-    seg0 = first_segment_path(out_dir, rid, label, encode_run_id)
-    if not seg0:
-        return (0, 0)
-    return ffprobe_video_wh(seg0)
-
-
 def send_webhook(*, url: str, secret: str, detail: dict) -> None:
     if not url:
         return
@@ -587,19 +677,20 @@ def main() -> None:
         logger.info(f"OUTPUT_PREFIX={OUTPUT_PREFIX}")
         logger.info(f"RID={RID}")
 
-        # 1) download
-        s3.download_file(INPUT_BUCKET, INPUT_KEY, str(in_path))
+        # 1) download (ranged GETs in parallel for large inputs)
+        transfer.download_file(INPUT_BUCKET, INPUT_KEY, str(in_path))
 
-        # 2) probe
-        duration_ms = ffprobe_duration_ms(str(in_path))
-        w_disp, h_disp, _rot = ffprobe_video_info(str(in_path))
+        # 2) probe (single ffprobe run for every input field)
+        probe = MediaProbe.of(str(in_path))
+        duration_ms = probe.duration_ms
+        w_disp, h_disp, _rot = probe.video_info
         is_portrait = h_disp > w_disp
-        fps = ffprobe_fps(str(in_path))
+        fps = probe.fps
         if fps <= 0:
             fps = 25.0
 
         # detect HDR and filter availability
-        ci = ffprobe_color_info(str(in_path))
+        ci = probe.color_info
         hdr = is_hdr_colorinfo(ci)
         has_tm = ffmpeg_has_filters(["zscale", "tonemap"])
 
@@ -627,7 +718,18 @@ def main() -> None:
             is_portrait=is_portrait,
             do_tonemap=do_tonemap,
         )
-        run(cmd)
+        watcher = None
+        if PIPELINED_UPLOAD:
+            # upload finished segments while ffmpeg keeps encoding
+            watcher = SegmentUploadWatcher(
+                str(out_dir),
+                lambda p: submit_upload_sse_kms(
+                    p, out_dir, OUTPUT_BUCKET, OUTPUT_PREFIX, KMS_KEY_ARN
+                ),
+            )
+            run(cmd, on_poll=watcher.poll)
+        else:
+            run(cmd)
 
         # 4) rewrite media playlists (integer EXTINF like MediaConvert)
         for label, *_rest in renditions:
@@ -640,8 +742,6 @@ def main() -> None:
         for label, _tw, _th, maxrate_k, _buf_k, _crf, a_br in renditions:
             audio_bps = 128_000 if a_br == "128k" else 96_000
 
-            w_real, h_real = first_segment_wh(str(out_dir), RID, label, ENCODE_RUN_ID)
-
             bw = int(maxrate_k * 1000 + audio_bps)
 
             avg_video = avg_bitrate_from_segments(
@@ -649,11 +749,14 @@ def main() -> None:
             )
             avg_bw = int(avg_video + audio_bps)
 
+            # size and profile/level come from one probe of the first segment
             seg0 = first_segment_path(str(out_dir), RID, label, ENCODE_RUN_ID)
             if seg0:
-                prof, lvl = ffprobe_h264_profile_level(seg0)
-                avc1 = avc1_from_profile_level(prof, lvl)
+                seg_probe = MediaProbe.of(seg0)
+                w_real, h_real = seg_probe.video_wh
+                avc1 = avc1_from_profile_level(*seg_probe.h264_profile_level)
             else:
+                w_real, h_real = (0, 0)
                 avc1 = "avc1.640028"
 
             codecs = f"{avc1},mp4a.40.2"
@@ -671,8 +774,16 @@ def main() -> None:
 
         write_master_m3u8_mediaconvert_like(str(out_dir), RID, variants)
 
-        # 6) upload
-        upload_dir_sse_kms(str(out_dir), OUTPUT_BUCKET, OUTPUT_PREFIX, KMS_KEY_ARN)
+        # 6) upload (the rest of the segments, then playlists)
+        if watcher is not None:
+            transfer.wait_all(watcher.futures)
+        upload_dir_sse_kms(
+            str(out_dir),
+            OUTPUT_BUCKET,
+            OUTPUT_PREFIX,
+            KMS_KEY_ARN,
+            skip=watcher.submitted if watcher is not None else (),
+        )
 
         # 7) webhook detail
         output_details = []
@@ -715,6 +826,8 @@ def main() -> None:
 
     except Exception as e:
         logger.error(f"Error: {e}")
+        # drop queued uploads of a failed job
+        transfer.shutdown()
         try:
             detail = {
                 "timestamp": int(time.time() * 1000),
@@ -1,6 +1,7 @@
 import os
 import json
 from datetime import datetime, timezone
+from sqlalchemy import update
 from sqlalchemy.orm import Session, aliased
 from models.posts import Posts
 from common.db_session import get_db
@@ -13,7 +14,7 @@ from models.user import Users
 from models.user_settings import UserSettings
 from models.notifications import Notifications
 from models.push_notifications import PushNotifications
-from pywebpush import webpush, WebPushException
+from common.web_push import WebPushSender, WebPushSubscription
 
 
 class NewPostArrivalDomain:
@@ -26,6 +27,13 @@ class NewPostArrivalDomain:
             "CREATOR_USER_ID", "0d3c6214-977a-456e-b93b-2e953da114b5"
         )
         self.email_service = EmailService(Path(__file__).parent / "mailtemplates")
+        self.web_push_sender = WebPushSender(
+            logger,
+            os.environ.get("VAPID_PRIVATE_KEY"),
+            concurrency=int(os.environ.get("WEB_PUSH_CONCURRENCY", "32")),
+        )
+        # Web Push は送信対象を溜めておき、最後にまとめて並列送信する
+        self.push_targets = []
 
     def _exec(self):
         self.logger.info(f"CREATOR_USER_ID {self.creator_user_id}")
@@ -33,6 +41,7 @@ class NewPostArrivalDomain:
         followers = self._creator_followers()
         for follower in followers:
             self._send_notification_to_follower(follower)
+        self._push_notifications()
 
     def _creator_followers(self):
         CreatorProfile = aliased(Profiles)
@@ -79,7 +88,7 @@ class NewPostArrivalDomain:
             if should_send:
                 self._send_email_notification(follower)
                 self._insert_notification(follower)
-                self._push_notification_to_user(follower)
+                self.push_targets.append(follower)
         except Exception as e:
             self.logger.exception(
                 f"Error sending notification to follower {follower.follower_username}: {e}"
@@ -119,43 +128,49 @@ class NewPostArrivalDomain:
         self.db.commit()
         return
 
-    def _push_notification_to_user(self, follower: Follows) -> None:
+    def _push_notifications(self) -> None:
+        if not self.push_targets:
+            return
         try:
-            title = f"{follower.creator_username} が新しく投稿しました。"
-            body = f"{follower.creator_username} が新しく投稿しました。"
-            url = f"{os.environ.get('FRONTEND_URL', 'http://localhost:3002')}/post/detail?post_id={self.post_id}"
-            push_notifications = (
-                self.db.query(PushNotifications)
-                .filter(PushNotifications.user_id == follower.Follows.follower_user_id)
+            data_by_user = {}
+            for follower in self.push_targets:
+                data_by_user[follower.Follows.follower_user_id] = json.dumps(
+                    {
+                        "title": f"{follower.creator_username} が新しく投稿しました。",
+                        "body": f"{follower.creator_username} が新しく投稿しました。",
+                        "url": f"{os.environ.get('FRONTEND_URL', 'http://localhost:3002')}/post/detail?post_id={self.post_id}",
+                    }
+                ).encode()
+            # 送信対象フォロワーの購読情報を 1 クエリで取得する
+            messages = [
+                (
+                    WebPushSubscription(
+                        id=push_notification.id,
+                        endpoint=push_notification.endpoint,
+                        p256dh=push_notification.p256dh,
+                        auth=push_notification.auth,
+                    ),
+                    data_by_user[push_notification.user_id],
+                )
+                for push_notification in self.db.query(PushNotifications)
+                .filter(PushNotifications.user_id.in_(data_by_user.keys()))
                 .filter(PushNotifications.is_active.is_(True))
                 .all()
+            ]
+
+            expired_ids = self.web_push_sender.send(messages)
+            if expired_ids:
+                self.db.execute(
+                    update(PushNotifications)
+                    .where(PushNotifications.id.in_(expired_ids))
+                    .values(is_active=False, updated_at=datetime.now(timezone.utc))
+                    .execution_options(synchronize_session=False)
+                )
+                self.db.commit()
+            self.logger.info(
+                f"Pushed {len(messages)} notifications ({len(expired_ids)} expired subscriptions deactivated)"
             )
-            for push_notification in push_notifications:
-                try:
-                    sub = {
-                        "endpoint": push_notification.endpoint,
-                        "keys": {
-                            "p256dh": push_notification.p256dh,
-                            "auth": push_notification.auth,
-                        },
-                    }
-                    webpush(
-                        subscription_info=sub,
-                        data=json.dumps(
-                            {
-                                "title": title,
-                                "body": body,
-                                "url": url,
-                            }
-                        ),
-                        vapid_private_key=os.environ.get("VAPID_PRIVATE_KEY"),
-                        vapid_claims={
-                            "sub": "mailto:support@mijfans.jp",
-                        },
-                    )
-                except WebPushException as e:
-                    self.logger.error(f"Error pushing notification to user: {e}")
-                    continue
         except Exception as e:
+            self.db.rollback()
             self.logger.error(f"Error pushing notification to user: {e}")
             return
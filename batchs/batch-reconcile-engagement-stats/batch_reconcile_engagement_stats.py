@@ -0,0 +1,116 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy import func, or_, select
+from common.logger import Logger
+from common.db_session import get_db
+from models.posts import Posts
+from models.payments import Payments, Prices
+from models.post_stats import CreatorStats, PostStats
+from models.social import Bookmarks, Follows, Likes, PostViewsTracking
+
+PAYMENT_SUCCEEDED = 2
+
+
+class BatchReconcileEngagementStats:
+    """
+    post_stats / creator_stats の増分カウンタを元テーブルから再集計し、ずれている行だけ補正する
+
+    集計中に確定した増減が上書きされた場合も次回実行で補正されるため、低負荷時間帯に定期実行する
+    """
+
+    def __init__(self, logger: Logger):
+        self.logger: Logger = logger
+        self.db: Session = next(get_db())
+
+    def _exec(self):
+        try:
+            post_fixed = self._reconcile_post_stats()
+            self.logger.info(f"Reconciled post_stats rows: {post_fixed}")
+            creator_fixed = self._reconcile_creator_stats()
+            self.logger.info(f"Reconciled creator_stats rows: {creator_fixed}")
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            self.logger.error(f"Error reconciling engagement stats: {e}")
+            raise e
+
+    def _count_by(self, column):
+        return (
+            select(column.label("key"), func.count().label("cnt"))
+            .group_by(column)
+            .subquery()
+        )
+
+    def _upsert_if_changed(self, model, key_column: str, source, columns) -> int:
+        """
+        正しい値を INSERT ... ON CONFLICT DO UPDATE で書き込む（値が異なる行のみ更新）
+        """
+        table = model.__table__
+        stmt = pg_insert(table).from_select([key_column, *columns], source)
+        changed = or_(*[table.c[col].is_distinct_from(stmt.excluded[col]) for col in columns])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key_column],
+            set_={**{col: stmt.excluded[col] for col in columns}, "updated_at": func.now()},
+            where=changed,
+        ).returning(table.c[key_column])
+        return len(self.db.execute(stmt).all())
+
+    def _reconcile_post_stats(self) -> int:
+        likes = self._count_by(Likes.post_id)
+        bookmarks = self._count_by(Bookmarks.post_id)
+        views = self._count_by(PostViewsTracking.post_id)
+        purchases = (
+            select(Prices.post_id.label("key"), func.count().label("cnt"))
+            .select_from(Payments)
+            .join(Prices, Prices.id == Payments.price_id)
+            .where(Payments.status == PAYMENT_SUCCEEDED)
+            .group_by(Prices.post_id)
+            .subquery()
+        )
+        source = (
+            select(
+                Posts.id,
+                func.coalesce(likes.c.cnt, 0),
+                func.coalesce(bookmarks.c.cnt, 0),
+                func.coalesce(purchases.c.cnt, 0),
+                func.coalesce(views.c.cnt, 0),
+            )
+            .outerjoin(likes, likes.c.key == Posts.id)
+            .outerjoin(bookmarks, bookmarks.c.key == Posts.id)
+            .outerjoin(purchases, purchases.c.key == Posts.id)
+            .outerjoin(views, views.c.key == Posts.id)
+        )
+        return self._upsert_if_changed(
+            PostStats,
+            "post_id",
+            source,
+            ["likes_count", "bookmarks_count", "purchase_count", "views_count"],
+        )
+
+    def _reconcile_creator_stats(self) -> int:
+        followers = self._count_by(Follows.creator_user_id)
+        following = self._count_by(Follows.follower_user_id)
+        # フォロー関係が一度でもあったユーザー（既存行 + 現在のフォロー関係）のみ対象
+        user_ids = (
+            select(CreatorStats.user_id.label("user_id"))
+            .union(
+                select(Follows.creator_user_id),
+                select(Follows.follower_user_id),
+            )
+            .subquery()
+        )
+        source = (
+            select(
+                user_ids.c.user_id,
+                func.coalesce(followers.c.cnt, 0),
+                func.coalesce(following.c.cnt, 0),
+            )
+            .outerjoin(followers, followers.c.key == user_ids.c.user_id)
+            .outerjoin(following, following.c.key == user_ids.c.user_id)
+        )
+        return self._upsert_if_changed(
+            CreatorStats,
+            "user_id",
+            source,
+            ["followers_count", "following_count"],
+        )
@@ -0,0 +1,12 @@
+from common.logger import Logger
+from batch_reconcile_engagement_stats import BatchReconcileEngagementStats
+
+def main():
+    logger = Logger.get_logger()
+    logger.info("START BATCH RECONCILE ENGAGEMENT STATS")
+    batch_reconcile_engagement_stats = BatchReconcileEngagementStats(logger)
+    batch_reconcile_engagement_stats._exec()
+    logger.info("END BATCH RECONCILE ENGAGEMENT STATS")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import SmallInteger, func
+from sqlalchemy.orm import Mapped, mapped_column
+from common.db_session import Base
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+class Prices(Base):
+    __tablename__ = "prices"
+
+    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
+    post_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+
+class Payments(Base):
+    __tablename__ = "payments"
+
+    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
+    price_id: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True), nullable=True)
+    status: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=1, comment="1=pending, 2=succeeded, 3=failed, 4=refunded, 5=partially_refunded")
@@ -0,0 +1,24 @@
+from datetime import datetime
+from uuid import UUID
+from sqlalchemy import BigInteger, func
+from sqlalchemy.orm import Mapped, mapped_column
+from common.db_session import Base
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+class PostStats(Base):
+    __tablename__ = "post_stats"
+
+    post_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
+    likes_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    bookmarks_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    purchase_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    views_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
+
+class CreatorStats(Base):
+    __tablename__ = "creator_stats"
+
+    user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
+    followers_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    following_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
@@ -0,0 +1,14 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import func
+from sqlalchemy.orm import Mapped, mapped_column
+from common.db_session import Base
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+class Posts(Base):
+    __tablename__ = "posts"
+
+    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
+    creator_user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
@@ -0,0 +1,34 @@
+from datetime import datetime
+from uuid import UUID
+from sqlalchemy import func
+from sqlalchemy.orm import Mapped, mapped_column
+from common.db_session import Base
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+class Follows(Base):
+    __tablename__ = "follows"
+
+    follower_user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
+    creator_user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
+
+class Likes(Base):
+    __tablename__ = "likes"
+
+    user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
+    post_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
+
+class Bookmarks(Base):
+    __tablename__ = "bookmarks"
+
+    user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
+    post_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
+
+class PostViewsTracking(Base):
+    __tablename__ = "post_views_tracking"
+
+    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
+    post_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
@@ -3,7 +3,7 @@ from typing import Optional
 from uuid import UUID
 from datetime import datetime
 
-from sqlalchemy import SmallInteger, Boolean, func
+from sqlalchemy import SmallInteger, Boolean, Integer, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -22,6 +22,8 @@ class ConversationParticipants(Base):
     role: Mapped[int] = mapped_column(SmallInteger, nullable=False)
     joined_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
     last_read_message_id: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True), nullable=True)
+    unread_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    last_visible_message_id: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True), nullable=True)
     notifications_muted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     is_blocked: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=func.now())
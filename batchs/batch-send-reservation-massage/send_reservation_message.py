@@ -1,6 +1,7 @@
 import os
 from datetime import datetime, timezone
 from typing import List
+from sqlalchemy import case, update, func
 from sqlalchemy.orm import Session
 from uuid import UUID
 from pathlib import Path
@@ -149,6 +150,31 @@ class SendReservationMessage:
             conversation.last_message_id = msg.id
             conversation.last_message_at = reservation_message.scheduled_at
 
+        self._apply_participant_counters(msg)
+
+    def _apply_participant_counters(self, msg: ConversationMessages) -> None:
+        """
+        参加者の未読カウンタを更新（送信者以外は unread_count +1、送信者は既読扱い）
+        """
+        sender_id = msg.sender_user_id or msg.sender_admin_id
+        is_sender = ConversationParticipants.participant_id == sender_id
+        self.db.execute(
+            update(ConversationParticipants)
+            .where(ConversationParticipants.conversation_id == msg.conversation_id)
+            .values(
+                last_visible_message_id=msg.id,
+                unread_count=case(
+                    (is_sender, 0), else_=ConversationParticipants.unread_count + 1
+                ),
+                last_read_message_id=case(
+                    (is_sender, msg.id),
+                    else_=ConversationParticipants.last_read_message_id,
+                ),
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
 
     def _exec(self) -> None:
         """
@@ -0,0 +1,43 @@
+"""add notification outbox
+
+Revision ID: 0b7e4f2a9c61
+Revises: f1a83c6d92e4
+Create Date: 2026-10-16 23:02:47.120396
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7e4f2a9c61'
+down_revision: Union[str, Sequence[str], None] = 'f1a83c6d92e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('notification_outbox',
+    sa.Column('id', postgresql.UUID(as_uuid=True), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('event_type', sa.SmallInteger(), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('status', sa.SmallInteger(), server_default='1', nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('available_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('locked_at', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_notification_outbox'))
+    )
+    op.create_index('idx_notification_outbox_pending', 'notification_outbox', ['available_at'], unique=False, postgresql_where=sa.text('status IN (1, 2)'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_notification_outbox_pending', table_name='notification_outbox', postgresql_where=sa.text('status IN (1, 2)'))
+    op.drop_table('notification_outbox')
@@ -0,0 +1,76 @@
+"""add bulk message jobs
+
+Revision ID: 3d6a9b1e7c25
+Revises: 0b7e4f2a9c61
+Create Date: 2026-10-17 00:41:12.583104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d6a9b1e7c25'
+down_revision: Union[str, Sequence[str], None] = '0b7e4f2a9c61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('reservation_message', 'event_bridge_name', existing_type=sa.Text(), nullable=True)
+    op.alter_column('reservation_message', 'scheduled_at', existing_type=sa.DateTime(), nullable=True)
+    op.add_column('reservation_message', sa.Column('sender_user_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column('reservation_message', sa.Column('message_text', sa.Text(), nullable=True))
+    op.add_column('reservation_message', sa.Column('asset_storage_key', sa.Text(), nullable=True))
+    op.add_column('reservation_message', sa.Column('asset_type', sa.SmallInteger(), nullable=True))
+    op.add_column('reservation_message', sa.Column('status', sa.SmallInteger(), server_default='1', nullable=False))
+    op.add_column('reservation_message', sa.Column('total_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('reservation_message', sa.Column('started_at', sa.DateTime(), nullable=True))
+    op.add_column('reservation_message', sa.Column('finished_at', sa.DateTime(), nullable=True))
+    op.create_foreign_key(op.f('fk_reservation_message_sender_user_id_users'), 'reservation_message', 'users', ['sender_user_id'], ['id'])
+    op.create_index('idx_reservation_message_group_by', 'reservation_message', ['group_by'], unique=False)
+    # 既存の予約（メッセージ作成済み）は完了扱いにする
+    op.execute("UPDATE reservation_message SET status = 3")
+
+    op.create_table('reservation_message_recipients',
+    sa.Column('id', postgresql.UUID(as_uuid=True), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('reservation_message_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('status', sa.SmallInteger(), server_default='1', nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('available_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('locked_at', sa.DateTime(), nullable=True),
+    sa.Column('message_id', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['reservation_message_id'], ['reservation_message.id'], name=op.f('fk_reservation_message_recipients_reservation_message_id_reservation_message'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('fk_reservation_message_recipients_user_id_users')),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_reservation_message_recipients')),
+    sa.UniqueConstraint('reservation_message_id', 'user_id', name='uq_reservation_message_recipients_user')
+    )
+    op.create_index('idx_reservation_message_recipients_status', 'reservation_message_recipients', ['reservation_message_id', 'status'], unique=False)
+    op.create_index('idx_reservation_message_recipients_pending', 'reservation_message_recipients', ['available_at'], unique=False, postgresql_where=sa.text('status IN (1, 2)'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_reservation_message_recipients_pending', table_name='reservation_message_recipients', postgresql_where=sa.text('status IN (1, 2)'))
+    op.drop_index('idx_reservation_message_recipients_status', table_name='reservation_message_recipients')
+    op.drop_table('reservation_message_recipients')
+    op.drop_index('idx_reservation_message_group_by', table_name='reservation_message')
+    op.drop_constraint(op.f('fk_reservation_message_sender_user_id_users'), 'reservation_message', type_='foreignkey')
+    op.drop_column('reservation_message', 'finished_at')
+    op.drop_column('reservation_message', 'started_at')
+    op.drop_column('reservation_message', 'total_count')
+    op.drop_column('reservation_message', 'status')
+    op.drop_column('reservation_message', 'asset_type')
+    op.drop_column('reservation_message', 'asset_storage_key')
+    op.drop_column('reservation_message', 'message_text')
+    op.drop_column('reservation_message', 'sender_user_id')
+    op.alter_column('reservation_message', 'scheduled_at', existing_type=sa.DateTime(), nullable=False)
+    op.alter_column('reservation_message', 'event_bridge_name', existing_type=sa.Text(), nullable=False)
@@ -0,0 +1,45 @@
+"""add post ranking snapshots tables
+
+Revision ID: 3f8a2c1d9e47
+Revises: 099f23ffaa1e
+Create Date: 2026-10-16 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a2c1d9e47'
+down_revision: Union[str, Sequence[str], None] = '099f23ffaa1e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('post_ranking_snapshots',
+    sa.Column('period', sa.String(length=16), nullable=False, comment='daily / weekly / monthly / all_time'),
+    sa.Column('rank', sa.Integer(), nullable=False, comment='phase1(クリエイター毎のベスト投稿) → phase2 の通し順位'),
+    sa.Column('post_id', sa.UUID(), nullable=False),
+    sa.Column('creator_user_id', sa.UUID(), nullable=False),
+    sa.Column('purchase_count', sa.BigInteger(), nullable=False),
+    sa.Column('bookmark_count', sa.BigInteger(), nullable=False),
+    sa.Column('post_created_at', sa.DateTime(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('period', 'rank', name=op.f('pk_post_ranking_snapshots'))
+    )
+    op.create_table('post_ranking_snapshot_states',
+    sa.Column('period', sa.String(length=16), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('period', name=op.f('pk_post_ranking_snapshot_states'))
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('post_ranking_snapshot_states')
+    op.drop_table('post_ranking_snapshots')
@@ -0,0 +1,27 @@
+"""add index media_rendition_jobs job_id
+
+Revision ID: 5c2e8d7a4f10
+Revises: 3d6a9b1e7c25
+Create Date: 2026-10-17 03:12:47.218533
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e8d7a4f10'
+down_revision: Union[str, Sequence[str], None] = '3d6a9b1e7c25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_media_rendition_jobs_job_id'), 'media_rendition_jobs', ['job_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_media_rendition_jobs_job_id'), table_name='media_rendition_jobs')
@@ -0,0 +1,79 @@
+"""add post_stats and creator_stats tables
+
+Revision ID: 5d7e2f9a1c64
+Revises: 8c4e1b7a2d93
+Create Date: 2026-10-16 15:02:47.551903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d7e2f9a1c64'
+down_revision: Union[str, Sequence[str], None] = '8c4e1b7a2d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('post_stats',
+    sa.Column('post_id', sa.UUID(), nullable=False),
+    sa.Column('likes_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('bookmarks_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('purchase_count', sa.BigInteger(), server_default='0', nullable=False, comment='単品購入（succeeded）の件数'),
+    sa.Column('views_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], name=op.f('fk_post_stats_post_id_posts'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('post_id', name=op.f('pk_post_stats'))
+    )
+    op.create_table('creator_stats',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('followers_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('following_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('fk_creator_stats_user_id_users'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', name=op.f('pk_creator_stats'))
+    )
+
+    # backfill: 既存データから初期値を集計
+    op.execute(
+        """
+        INSERT INTO post_stats (post_id, likes_count, bookmarks_count, purchase_count, views_count)
+        SELECT p.id,
+               COALESCE(l.cnt, 0),
+               COALESCE(b.cnt, 0),
+               COALESCE(pay.cnt, 0),
+               COALESCE(v.cnt, 0)
+        FROM posts p
+        LEFT JOIN (SELECT post_id, COUNT(*) AS cnt FROM likes GROUP BY post_id) l ON l.post_id = p.id
+        LEFT JOIN (SELECT post_id, COUNT(*) AS cnt FROM bookmarks GROUP BY post_id) b ON b.post_id = p.id
+        LEFT JOIN (
+            SELECT pr.post_id, COUNT(*) AS cnt
+            FROM payments pm
+            JOIN prices pr ON pr.id = pm.price_id
+            WHERE pm.status = 2
+            GROUP BY pr.post_id
+        ) pay ON pay.post_id = p.id
+        LEFT JOIN (SELECT post_id, COUNT(*) AS cnt FROM post_views_tracking GROUP BY post_id) v ON v.post_id = p.id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO creator_stats (user_id, followers_count, following_count)
+        SELECT u.id, COALESCE(fr.cnt, 0), COALESCE(fg.cnt, 0)
+        FROM users u
+        LEFT JOIN (SELECT creator_user_id, COUNT(*) AS cnt FROM follows GROUP BY creator_user_id) fr ON fr.creator_user_id = u.id
+        LEFT JOIN (SELECT follower_user_id, COUNT(*) AS cnt FROM follows GROUP BY follower_user_id) fg ON fg.follower_user_id = u.id
+        WHERE fr.cnt IS NOT NULL OR fg.cnt IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('creator_stats')
+    op.drop_table('post_stats')
@@ -0,0 +1,53 @@
+"""add typed order reference (price_id, plan_id) to payments and subscriptions
+
+Revision ID: 8c4e1b7a2d93
+Revises: 3f8a2c1d9e47
+Create Date: 2026-10-16 13:41:05.218374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4e1b7a2d93'
+down_revision: Union[str, Sequence[str], None] = '3f8a2c1d9e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UUID_PATTERN = '^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('payments', 'subscriptions'):
+        op.add_column(table, sa.Column('price_id', sa.UUID(), nullable=True, comment='単品販売のprice_id（order_idと同値）'))
+        op.add_column(table, sa.Column('plan_id', sa.UUID(), nullable=True, comment='サブスクのplan_id（order_idと同値）'))
+
+        # backfill: order_type 1=price_id, 2=plan_id（チップ等の UUID でない order_id は NULL のまま）
+        op.execute(
+            sa.text(
+                f"UPDATE {table} SET price_id = order_id::uuid "
+                f"WHERE order_type = 1 AND order_id ~ :pattern"
+            ).bindparams(pattern=UUID_PATTERN)
+        )
+        op.execute(
+            sa.text(
+                f"UPDATE {table} SET plan_id = order_id::uuid "
+                f"WHERE order_type = 2 AND order_id ~ :pattern"
+            ).bindparams(pattern=UUID_PATTERN)
+        )
+
+        op.create_index(op.f(f'ix_{table}_price_id'), table, ['price_id'], unique=False)
+        op.create_index(op.f(f'ix_{table}_plan_id'), table, ['plan_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('subscriptions', 'payments'):
+        op.drop_index(op.f(f'ix_{table}_plan_id'), table_name=table)
+        op.drop_index(op.f(f'ix_{table}_price_id'), table_name=table)
+        op.drop_column(table, 'plan_id')
+        op.drop_column(table, 'price_id')
@@ -0,0 +1,41 @@
+"""add notification outbox recipients
+
+Revision ID: 8e4b1c7d2a93
+Revises: 5c2e8d7a4f10
+Create Date: 2026-10-17 05:41:19.503284
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4b1c7d2a93'
+down_revision: Union[str, Sequence[str], None] = '5c2e8d7a4f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('notification_outbox_recipients',
+    sa.Column('id', postgresql.UUID(as_uuid=True), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('outbox_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('email_done', sa.Boolean(), server_default='false', nullable=False),
+    sa.Column('push_done', sa.Boolean(), server_default='false', nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['outbox_id'], ['notification_outbox.id'], name=op.f('fk_notification_outbox_recipients_outbox_id_notification_outbox'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('fk_notification_outbox_recipients_user_id_users')),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_notification_outbox_recipients')),
+    sa.UniqueConstraint('outbox_id', 'user_id', name='uq_notification_outbox_recipients_user')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('notification_outbox_recipients')
@@ -0,0 +1,34 @@
+"""add keyset pagination indexes
+
+Revision ID: a41c6e0b9f25
+Revises: 5d7e2f9a1c64
+Create Date: 2026-10-16 16:20:14.873201
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41c6e0b9f25'
+down_revision: Union[str, Sequence[str], None] = '5d7e2f9a1c64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_follows_creator_created', 'follows', ['creator_user_id', 'created_at', 'follower_user_id'], unique=False)
+    op.create_index('idx_follows_follower_created', 'follows', ['follower_user_id', 'created_at', 'creator_user_id'], unique=False)
+    op.create_index('idx_bookmarks_user_created', 'bookmarks', ['user_id', 'created_at', 'post_id'], unique=False)
+    op.create_index('idx_notifications_user_created', 'notifications', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_notifications_user_created', table_name='notifications')
+    op.drop_index('idx_bookmarks_user_created', table_name='bookmarks')
+    op.drop_index('idx_follows_follower_created', table_name='follows')
+    op.drop_index('idx_follows_creator_created', table_name='follows')
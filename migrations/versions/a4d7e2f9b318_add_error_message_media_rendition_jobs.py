@@ -0,0 +1,28 @@
+"""add error_message media_rendition_jobs
+
+Revision ID: a4d7e2f9b318
+Revises: 8e4b1c7d2a93
+Create Date: 2026-10-17 06:18:52.734105
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d7e2f9b318'
+down_revision: Union[str, Sequence[str], None] = '8e4b1c7d2a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('media_rendition_jobs', sa.Column('error_message', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('media_rendition_jobs', 'error_message')
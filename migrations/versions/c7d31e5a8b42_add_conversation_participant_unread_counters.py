@@ -0,0 +1,67 @@
+"""add conversation participant unread counters
+
+Revision ID: c7d31e5a8b42
+Revises: a41c6e0b9f25
+Create Date: 2026-10-16 19:42:08.518334
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d31e5a8b42'
+down_revision: Union[str, Sequence[str], None] = 'a41c6e0b9f25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('conversation_participants', sa.Column('unread_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('conversation_participants', sa.Column('last_visible_message_id', postgresql.UUID(as_uuid=True), nullable=True))
+
+    # 既存データのバックフィル（表示対象 = 未削除かつ status が NULL / ACTIVE(1)）
+    op.execute(
+        """
+        UPDATE conversation_participants cp
+        SET last_visible_message_id = (
+                SELECT m.id
+                FROM conversation_messages m
+                WHERE m.conversation_id = cp.conversation_id
+                  AND m.deleted_at IS NULL
+                  AND (m.status IS NULL OR m.status = 1)
+                ORDER BY m.created_at DESC
+                LIMIT 1
+            ),
+            unread_count = (
+                SELECT count(*)
+                FROM conversation_messages m
+                WHERE m.conversation_id = cp.conversation_id
+                  AND m.deleted_at IS NULL
+                  AND (m.status IS NULL OR m.status = 1)
+                  AND m.sender_user_id IS DISTINCT FROM cp.participant_id
+                  AND m.sender_admin_id IS DISTINCT FROM cp.participant_id
+                  AND (
+                      cp.last_read_message_id IS NULL
+                      OR m.created_at > (
+                          SELECT r.created_at
+                          FROM conversation_messages r
+                          WHERE r.id = cp.last_read_message_id
+                      )
+                  )
+            )
+        """
+    )
+
+    op.create_index('idx_conversation_participants_user_unread', 'conversation_participants', ['user_id'], unique=False, postgresql_where=sa.text('unread_count > 0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_conversation_participants_user_unread', table_name='conversation_participants', postgresql_where=sa.text('unread_count > 0'))
+    op.drop_column('conversation_participants', 'last_visible_message_id')
+    op.drop_column('conversation_participants', 'unread_count')
@@ -0,0 +1,37 @@
+"""add broadcast payloads table
+
+Revision ID: d91b6e3f5a27
+Revises: a4d7e2f9b318
+Create Date: 2026-10-17 07:02:45.318226
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91b6e3f5a27'
+down_revision: Union[str, Sequence[str], None] = 'a4d7e2f9b318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('broadcast_payloads',
+    sa.Column('id', postgresql.UUID(as_uuid=True), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('topic', sa.Text(), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_broadcast_payloads'))
+    )
+    op.create_index('idx_broadcast_payloads_created_at', 'broadcast_payloads', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_broadcast_payloads_created_at', table_name='broadcast_payloads')
+    op.drop_table('broadcast_payloads')
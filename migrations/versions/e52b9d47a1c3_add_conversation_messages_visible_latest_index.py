@@ -0,0 +1,28 @@
+"""add conversation messages visible latest index
+
+Revision ID: e52b9d47a1c3
+Revises: c7d31e5a8b42
+Create Date: 2026-10-16 21:05:31.274610
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e52b9d47a1c3'
+down_revision: Union[str, Sequence[str], None] = 'c7d31e5a8b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_conversation_messages_visible_latest', 'conversation_messages', ['conversation_id', sa.text('created_at DESC')], unique=False, postgresql_where=sa.text('deleted_at IS NULL AND (status IS NULL OR status = 1)'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_conversation_messages_visible_latest', table_name='conversation_messages', postgresql_where=sa.text('deleted_at IS NULL AND (status IS NULL OR status = 1)'))
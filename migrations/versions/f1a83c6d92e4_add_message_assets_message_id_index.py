@@ -0,0 +1,28 @@
+"""add message assets message id index
+
+Revision ID: f1a83c6d92e4
+Revises: e52b9d47a1c3
+Create Date: 2026-10-16 22:18:04.913527
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a83c6d92e4'
+down_revision: Union[str, Sequence[str], None] = 'e52b9d47a1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_message_assets_message_id', 'message_assets', ['message_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_message_assets_message_id', table_name='message_assets')